@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+from datetime import datetime
+
+# Get the path to the 'utils' and 'signal' folders
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+signals = os.path.join(os.path.dirname(__file__), '..', '_Asset_SIGNAL')
+
+# Add the folders to the system path
+sys.path.append(utils)
+sys.path.append(signals)
+
+# Now you can import the scripts as modules
+import plotPrice2EVWMA
+import seriesDownsample
+import frameHandoff
+import tradingCalendar
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renders the EVWMA charts of every ticker in a CSV file, headless and in parallel.")
+    parser.add_argument('--format', dest='image_format', choices=['png', 'svg'], default='png', help='Image format. Defaults to png.')
+    parser.add_argument('--max-points', type=int, default=seriesDownsample.DEFAULT_MAX_POINTS,
+                        help=f'Lines longer than this are downsampled. Defaults to {seriesDownsample.DEFAULT_MAX_POINTS}.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes. Defaults to the CPU count.')
+    args = parser.parse_args()
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> BEGIN Processing - Batch EVWMA Charts ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
+
+    # Define the output directories and ensure they exist
+    output_dir = "E:/_scripts_PYTHON/_personal/_OUTPUT"
+    chart_dir = "E:/_scripts_PYTHON/_personal/_REPORT/_CHARTS"
+
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(chart_dir, exist_ok=True)
+
+    # Get today's date in YYYYMMDD format
+    today_date_str = datetime.now().strftime('%Y%m%d')
+
+    csv_file_path = input("Enter the path to the input CSV file: ")
+
+    try:
+        input_df = pd.read_csv(csv_file_path)
+    except FileNotFoundError:
+        print(f"Error: The file '{csv_file_path}' was not found.")
+        sys.exit(1)
+
+    if 'Ticker' not in input_df.columns:
+        print("Error: The CSV file must contain a 'Ticker' column.")
+        sys.exit(1)
+
+    # Same window as cnsBtchPrc2EVWMA, so its historical data CSVs of today are reused
+    start_date_str, end_date_str = tradingCalendar.download_window(tradingCalendar.BATCH_DOWNLOAD_SESSIONS)
+
+    # Downloads stay sequential in this process to respect the data provider's rate limits
+    csv_by_ticker = {}
+    for ticker_symbol in input_df['Ticker'].dropna().str.upper().unique():
+        csv_file = os.path.join(output_dir, f"{today_date_str}_{ticker_symbol}_historical_data.csv")
+        if not frameHandoff.covers_window(csv_file, start_date_str, end_date_str):
+            csv_file = plotPrice2EVWMA.download_historical_data(ticker_symbol, start_date_str, end_date_str, csv_file)
+        if csv_file:
+            csv_by_ticker[ticker_symbol] = csv_file
+        else:
+            print(f">>    Data download failed for {ticker_symbol}. Skipping.")
+
+    # The workers read the CSVs from disk, so the background writes must be done
+    frameHandoff.flush_writes()
+
+    print(f">> ")
+    print(f">>    Rendering charts for {len(csv_by_ticker)} tickers ...")
+    start_time = time.perf_counter()
+
+    rendered = plotPrice2EVWMA.render_charts_batch(
+        csv_by_ticker, chart_dir, args.image_format, args.max_points, args.workers
+    )
+
+    print(f">> ")
+    print(f">>    Rendered {sum(len(paths) for paths in rendered.values())} charts for {len(rendered)} tickers "
+          f"in {time.perf_counter() - start_time:.1f}s to '{chart_dir}'")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> END Processing - Batch EVWMA Charts ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import jobRunner
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Runs the single-ticker analyses of a job file without prompts, one preloaded download per ticker.",
+        epilog="Example: python cnsBtchJobRunner.py jobs.json --workers 4"
+    )
+    parser.add_argument('job_file', type=str, help=f"JSON job file. Analyses: {', '.join(jobRunner.ANALYSES)}.")
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes, one ticker at a time each. Defaults to 1.')
+    parser.add_argument('--report-dir', type=str, default=jobRunner.DEFAULT_REPORT_DIR,
+                        help='Folder of the run summary. Defaults to the _REPORT folder.')
+    parser.add_argument('--chart-dir', type=str, default=None,
+                        help='Folder the charts are saved to. Defaults to <report-dir>/_CHARTS.')
+    args = parser.parse_args()
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> BEGIN Processing - Job Runner ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
+
+    try:
+        jobs = jobRunner.load_job_file(args.job_file)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Could not read the job file '{args.job_file}': {e}")
+        sys.exit(1)
+
+    chart_dir = args.chart_dir or os.path.join(args.report_dir, '_CHARTS')
+    os.makedirs(args.report_dir, exist_ok=True)
+    os.makedirs(chart_dir, exist_ok=True)
+
+    n_tickers = len(jobRunner.group_by_ticker(jobs))
+    print(f">>    {len(jobs)} jobs for {n_tickers} tickers on {max(args.workers, 1)} worker(s)")
+    start_time = time.perf_counter()
+    summary = jobRunner.run_jobs(jobs, chart_dir=chart_dir, workers=max(args.workers, 1))
+    elapsed = time.perf_counter() - start_time
+
+    summary_file = os.path.join(args.report_dir, f"{datetime.now().strftime('%Y%m%d')}_Job_Runner_Summary.csv")
+    summary.to_csv(summary_file, index=False)
+
+    print(f">> ")
+    for status, count in summary['status'].value_counts().items():
+        print(f">>    {status}: {count}")
+    for _, failed in summary[summary['status'] == 'failed'].iterrows():
+        print(f">>      {failed['ticker']} {failed['analysis']}: {failed['result']}")
+    print(f">>    Finished in {elapsed:.1f}s - summary saved to '{summary_file}'")
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> END Processing - Job Runner ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
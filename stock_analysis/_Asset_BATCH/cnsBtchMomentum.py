@@ -0,0 +1,155 @@
+import os
+import sys
+import argparse
+import pandas as pd
+from datetime import datetime
+
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the scripts as modules
+import momentum
+import runMetrics
+import workQueue
+
+def read_tickers(csv_file_path):
+    """The upper-case tickers of the 'Ticker' column of a CSV file, or None (with the error printed)."""
+    try:
+        input_df = pd.read_csv(csv_file_path)
+    except FileNotFoundError:
+        print(f"Error: The file '{csv_file_path}' was not found.")
+        return None
+    if 'Ticker' not in input_df.columns:
+        print("Error: The CSV file must contain a 'Ticker' column.")
+        return None
+    return list(dict.fromkeys(input_df['Ticker'].dropna().astype(str).str.strip().str.upper()))
+
+def write_momentum_report(html_section, report_dir, n_tickers):
+    """Writes the screener section into a dated HTML page and returns its path."""
+    today_date_str = datetime.now().strftime('%Y%m%d')
+    report_path = os.path.join(report_dir, f"{today_date_str}_Momentum_Screener_Report.html")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("<!DOCTYPE html>\n")
+        f.write("<html>\n")
+        f.write("<head>\n")
+        f.write("<meta charset=\"UTF-8\">\n")
+        f.write("<title>Momentum Stock Screener Report</title>\n")
+        f.write("<style>\n")
+        f.write("body { font-family: Arial, sans-serif; margin: 20px; background-color: #f4f4f9; }\n")
+        f.write("table { width: 100%; border-collapse: collapse; margin-top: 10px; }\n")
+        f.write("th, td { border: 1px solid #ddd; padding: 4px; text-align: left; }\n")
+        f.write("</style>\n")
+        f.write("</head>\n")
+        f.write("<body>\n")
+        f.write(f"<h2>Momentum Stock Screener Report - {n_tickers} Tickers - Generated - {datetime.now().strftime('%B %d, %Y')}</h2>\n")
+        f.write(html_section)
+        f.write("""<p style="font-size: small; color: #666;">Data provided by Yahoo Finance (yfinance).</p>\n""")
+        f.write("</body>\n")
+        f.write("</html>\n")
+    return report_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Runs the momentum screener (conservative and speculative screens) over every ticker in a CSV file.",
+        epilog="To spread a run over several processes or hosts, queue it with --queue-dir Q --role coordinator, "
+               "start any number of --role worker processes on Q and write the report with --role merge."
+    )
+    parser.add_argument('--queue-dir', type=str, default=None,
+                        help='Folder of a work queue shared by the workers (a local folder or a network share).')
+    parser.add_argument('--role', choices=['coordinator', 'worker', 'merge'], default=None,
+                        help='With --queue-dir: queue the tickers of the input CSV, fetch the metrics of queued '
+                             'tickers, or screen the fetched metrics and write the report.')
+    parser.add_argument('--batch-size', type=int, default=workQueue.DEFAULT_BATCH_SIZE,
+                        help=f'Tickers a worker claims at a time. Defaults to {workQueue.DEFAULT_BATCH_SIZE}.')
+    parser.add_argument('--lease-seconds', type=int, default=workQueue.DEFAULT_LEASE_SECONDS,
+                        help=f'Seconds before the tickers of a worker that stopped responding are handed to another. '
+                             f'Defaults to {workQueue.DEFAULT_LEASE_SECONDS}.')
+    args = parser.parse_args()
+    if (args.queue_dir is None) != (args.role is None):
+        parser.error("--queue-dir and --role go together")
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> BEGIN Processing - Momentum Screener ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
+
+    runMetrics.enable_metrics_from_env("cnsBtchMomentum")
+
+    # Define the output directory and ensure it exists
+    report_dir = "E:/_scripts_PYTHON/_personal/_REPORT"
+    os.makedirs(report_dir, exist_ok=True)
+
+    if args.role in ('worker', 'merge'):
+        queue = workQueue.queue_info(args.queue_dir)
+        if queue is None or queue['name'] != "cnsBtchMomentum":
+            print(f"Error: No cnsBtchMomentum queue in '{args.queue_dir}' - create it with --role coordinator.")
+            sys.exit(1)
+    else:
+        csv_file_path = input("Enter the path to the input CSV file: ")
+        tickers = read_tickers(csv_file_path)
+        if tickers is None:
+            sys.exit(1)
+
+    html_section = None
+    if args.role == 'coordinator':
+        # The workers measure every ticker up to the same moment, however late they
+        # start; tickers added to an existing queue of the run keep its end
+        queue = workQueue.queue_info(args.queue_dir)
+        end_date = datetime.now().isoformat(timespec='seconds')
+        if queue is not None and queue['params'].get('input') == os.path.abspath(csv_file_path):
+            end_date = queue['params'].get('end_date', end_date)
+        queue_params = {'input': os.path.abspath(csv_file_path), 'end_date': end_date}
+        try:
+            added = workQueue.create_queue(args.queue_dir, "cnsBtchMomentum", queue_params, tickers)
+        except ValueError as e:
+            print(f"Error: {e} - use a new queue folder for a new run.")
+            sys.exit(1)
+        counts = workQueue.queue_counts(args.queue_dir)
+        print(f">>  {added} tickers queued in '{workQueue.queue_path(args.queue_dir)}' "
+              f"({counts['pending']} pending, {counts['done']} done)")
+        print(f">>  Start the workers with --role worker, then write the report with --role merge")
+
+    elif args.role == 'worker':
+        worker_id = workQueue.default_worker_id()
+        print(f">>  Worker {worker_id} on '{workQueue.queue_path(args.queue_dir)}'")
+        try:
+            worker_stats = workQueue.run_worker(
+                args.queue_dir,
+                lambda ticker, params: {'ticker': ticker, 'metrics': momentum.fetch_screener_metrics(
+                    ticker, datetime.fromisoformat(params['end_date']))},
+                worker_id, args.batch_size, args.lease_seconds
+            )
+            print(f">>  Worker {worker_id}: {worker_stats['done']} tickers in {worker_stats['batches']} batches, "
+                  f"{worker_stats['failed']} errors")
+        except KeyboardInterrupt:
+            print(f"\n>>  Interrupted - the unprocessed tickers of the batch went back to the queue.")
+
+    elif args.role == 'merge':
+        raw_data = {queued['ticker']: queued['metrics'] for queued in workQueue.load_results(args.queue_dir)}
+        counts = workQueue.queue_counts(args.queue_dir)
+        print(f">>  Work queue: {workQueue.queue_path(args.queue_dir)} ({counts['done']} done, {counts['failed']} failed, "
+              f"{counts['pending'] + counts['leased']} unfinished)")
+        for ticker, error in workQueue.failed_items(args.queue_dir):
+            print(f">>    {ticker} failed: {error}")
+        html_section = momentum.run_stock_screener_report(list(raw_data), report_dir, raw_data=raw_data)
+        n_tickers = len(raw_data)
+
+    else:
+        html_section = momentum.run_stock_screener_report(tickers, report_dir)
+        n_tickers = len(tickers)
+
+    if html_section is not None:
+        report_path = write_momentum_report(html_section, report_dir, n_tickers)
+        print(f">>  Report saved to: {report_path}")
+
+    runMetrics.finish_metrics()
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> END Processing - Momentum Screener ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
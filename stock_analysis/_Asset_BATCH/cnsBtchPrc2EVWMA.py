@@ -1,11 +1,30 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import yfinance as yf
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
 import itertools
+import argparse
+
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import reportWriter
+import marketData
+import frameHandoff
+import timeframeBars
+import runMetrics
+import resultCache
+import deadTickers
+import runJournal
+import csvNormalize
+import candlePatterns
+import tradingCalendar
+import workQueue
 
 def calculate_ema(data, span):
     """
@@ -24,77 +43,16 @@ def clean_csv_header(input_filepath, ticker, output_filepath=None):
     """
     Reads a CSV file, replaces 'Price' with 'Date' in the first line,
     and removes specific second and third lines if they match the specified format.
+    The file is streamed through csvNormalize, so it is never read into memory whole.
 
     Args:
         input_filepath (str): The path to the input CSV file.
         output_filepath (str, optional): The path to save the cleaned CSV file.
-                                        If None, the input file will be overwritten.
-                                        Defaults to None.
+                                         If None, the input file will be overwritten.
+                                         Defaults to None.
     """
-    if output_filepath is None:
-        output_filepath = input_filepath
+    csvNormalize.clean_csv_header(input_filepath, ticker, output_filepath)
 
-    lines = []
-    try:
-        with open(input_filepath, 'r') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        print(f"Error: The file '{input_filepath}' was not found.")
-        return
-    except Exception as e:
-        print(f"An error occurred while reading the file: {e}")
-        return
-
-    modified_lines = []
-    
-    # Process the first line
-    if lines:
-        first_line = lines[0].strip()
-        if first_line.startswith('Price,'):
-            modified_lines.append('date' + first_line[5:] + '\n')
-            print(f"Modified first line: '{first_line.strip()}' -> 'date{first_line[5:].strip()}'")
-        else:
-            modified_lines.append(lines[0])
-            print(f"First line not modified: '{first_line.strip()}'")
-    else:
-        print("The CSV file is empty.")
-        return
-
-    # Process subsequent lines for removal
-    lines_to_skip = 0
-    if len(lines) > 1:
-        second_line = lines[1].strip()
-        # Check for the exact format "Ticker,JNJ,JNJ,JNJ,JNJ,JNJ"
-        if second_line.startswith('Ticker,') and all(part == ticker for part in second_line.split(',')[1:]):
-            lines_to_skip += 1
-            print(f"Skipping second line: '{second_line}'")
-        else:
-            modified_lines.append(lines[1])
-            print(f"Second line not skipped: '{second_line}'")
-
-    if len(lines) > 2 and lines_to_skip == 1: # Only check third line if second was skipped
-        third_line = lines[2].strip()
-        # Check for the exact format "Date,,,,"
-        if third_line == 'Date,,,,,':
-            lines_to_skip += 1
-            print(f"Skipping third line: '{third_line}'")
-        else:
-            # If the second line was skipped but the third wasn't, add the third line back.
-            # This handles cases where only the second line matches for skipping.
-            if lines_to_skip == 1: # This means the second line was skipped, but third was not.
-                modified_lines.append(lines[2])
-                print(f"Third line not skipped: '{third_line}'")
-
-    # Add remaining lines
-    modified_lines.extend(lines[lines_to_skip + 1:])
-
-    try:
-        with open(output_filepath, 'w') as f:
-            f.writelines(modified_lines)
-        print(f"CSV file cleaned successfully. Output saved to '{output_filepath}'")
-    except Exception as e:
-        print(f"An error occurred while writing the file: {e}")
-    
 def download_historical_data(ticker, start_date, end_date, output_filename):
     """
     Downloads historical stock data using yfinance and saves it to a CSV file.
@@ -112,10 +70,13 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
     # print(f"Attempting to download historical data for {ticker} from {start_date} to {end_date}...")
     try:
         # Download data with auto_adjust=True for adjusted prices directly in 'Close'
-        data = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True)
+        data = marketData.download(ticker, start=start_date, end=end_date, auto_adjust=True)
 
         if data.empty:
+            # Only Yahoo's "no price data" answer gets here - marketData raises
+            # network errors and rate limits, which the except below reports
             print(f"No data downloaded for {ticker} in the specified date range. Please check the ticker and dates.")
+            deadTickers.record_dead(ticker, "No data downloaded")
             return None
 
         # --- CRUCIAL FIX: Handle MultiIndex columns from yfinance output ---
@@ -148,7 +109,8 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
 
         # Set index name to 'date' (lowercase) before saving
         data.index.name = 'date'
-        data.to_csv(output_filename, index=True, header=True)
+        frameHandoff.save_frame(data, output_filename)
+        deadTickers.record_alive(ticker)
         # print(f"Historical data for {ticker} saved to {output_filename}")
         
         # We are skipping the clean_csv_header call here as it's not designed for yfinance output
@@ -163,16 +125,25 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
         print(f"An error occurred during data download for {ticker}: {e}")
         return None
         
-def calculate_indicators_from_csv(csv_filepath):
+def read_price_csv(csv_filepath):
+    """Parses a historical data CSV written by download_historical_data()."""
+    return pd.read_csv(csv_filepath, index_col='date', parse_dates=True)
+
+def calculate_indicators_from_csv(csv_filepath, timeframe='1d', ticker=None):
     """
     Reads historical data from a CSV file and calculates EVWMA, VWAP, MACD,
     two EVWMAs (short/long), and EVWMA-based Oscillator, Signal, and Histogram.
     Uses lowercase column names for consistency.
+
+    With timeframe '1wk' or '1mo' the daily bars of the CSV are first aggregated
+    into weekly or monthly bars (cached per ticker when `ticker` is given), and
+    the EVWMA volume spans are scaled to the longer bars.
     """
     try:
         # print(f"Reading historical data from: {csv_filepath}...")
         # CRUCIAL FIX: Use 'date' (lowercase) for index_col
-        data = pd.read_csv(csv_filepath, index_col='date', parse_dates=True)
+        with runMetrics.span('csv_parse'):
+            data = frameHandoff.load_frame(csv_filepath, read_price_csv)
 
         if data.empty:
             print(f"No data found in {csv_filepath}.")
@@ -198,6 +169,8 @@ def calculate_indicators_from_csv(csv_filepath):
             print("No valid numeric data remaining after processing.")
             return None
 
+        data = timeframeBars.get_timeframe_bars(ticker, data, timeframe)
+
         # print(f"Data loaded from CSV. Shape: {data.shape}")
 
         # 1. Calculate VWAP (Volume Weighted Average Price)
@@ -225,7 +198,7 @@ def calculate_indicators_from_csv(csv_filepath):
 
         # 3. Calculate EVWMA (Elastic Volume Weighted Moving Average) - Short Term
         # --- ADJUST THESE VOLUME SPAN VALUES FOR MORE/LESS SIGNALS ---
-        volume_span_short = 40_500_000
+        volume_span_short = timeframeBars.scale_span(40_500_000, timeframe)
         
         # print(f"Calculating Short-term EVWMA with volume span: {volume_span_short:,.0f}.")
         data['evwma_short'] = np.nan
@@ -245,7 +218,7 @@ def calculate_indicators_from_csv(csv_filepath):
             # print("Short-term EVWMA calculated.")
 
         # 4. Calculate EVWMA (Elastic Volume Weighted Moving Average) - Long Term
-        volume_span_long = 120_000_000 # Corrected the typo '_000_000_000'
+        volume_span_long = timeframeBars.scale_span(120_000_000, timeframe) # Corrected the typo '_000_000_000'
         
         # print(f"Calculating Long-term EVWMA with volume span: {volume_span_long:,.0f}.")
         data['evwma_long'] = np.nan
@@ -407,245 +380,573 @@ def evaluate_double_evwma_signals(df):
 
     return buy_triggered, last_buy_date, sell_triggered, last_sell_date
         
-def generate_consolidated_html_report(all_results):
+# The result cache hashes the functions above; bump this when the leaning /
+# overall rules in the main loop change, so cached statuses are recomputed
+RESULT_RULES_VERSION = 2
+
+# Sessions since a signal the leaning / overall rules accept - the trading-day
+# equivalents of the 60 / 30 / 15 / 225 calendar days they were written in
+SIGNAL_WINDOW_SESSIONS = 41
+RECENT_SIGNAL_SESSIONS = 21
+FRESH_DOUBLE_SESSIONS = 10
+DOUBLE_WINDOW_SESSIONS = 155
+
+CONSOLIDATED_REPORT_STYLE = """
+        body {
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            padding: 0;
+            background-color: #f4f4f4;
+            color: #333;
+        }
+        .container {
+            max-width: 1000px;
+            margin: auto;
+            background: #fff;
+            padding: 20px 40px;
+            border-radius: 8px;
+            box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
+        }
+        h1, h2, h3 {
+            color: #0056b3;
+            border-bottom: 2px solid #ddd;
+            padding-bottom: 5px;
+        }
+        .section {
+            margin-bottom: 30px;
+        }
+        .ticker-card {
+            border: 1px solid #ccc;
+            border-radius: 6px;
+            padding: 15px;
+            margin-bottom: 15px;
+        }
+        .ticker-card h4 {
+            margin-top: 0;
+            color: #333;
+            border-bottom: 1px dashed #eee;
+            padding-bottom: 5px;
+        }
+        .signal-info {
+            font-size: 0.9em;
+            color: #666;
+        }
+        .signal-info span {
+            font-weight: bold;
+            color: #000;
+        }
+        .status-buy {
+            background-color: #d4edda;
+            border-color: #c3e6cb;
+            color: #155724;
+        }
+        .status-sell {
+            background-color: #f8d7da;
+            border-color: #f5c6cb;
+            color: #721c24;
+        }
+        .status-undetermined {
+            background-color: #fff3cd;
+            border-color: #ffeeba;
+            color: #856404;
+        }
+        .summary-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 10px;
+        }
+        .summary-table th, .summary-table td {
+            padding: 8px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }
+        .summary-table th {
+            background-color: #f2f2f2;
+            font-weight: bold;
+        }"""
+
+FINVIZ_TICKER_URL = "https://elite.finviz.com/screener.ashx?v=341&t="
+
+# Precompiled row templates - rendered once per ticker and streamed straight to the report file
+BUY_ROW_TEMPLATE = reportWriter.compile_template("""<tr>
+    <td><a href="https://elite.finviz.com/screener.ashx?v=341&t={ticker_symbol}">{ticker_symbol}</a></td>
+    <td>{single_buy_triggered} ({single_last_buy})</td>
+    <td>{oscillator_buy_triggered} ({oscillator_last_buy})</td>
+    <td>{double_buy_triggered} ({double_last_buy})</td>
+    <td>{candle_bullish_triggered} ({candle_last_bullish})</td>
+    <td>{overall_status_upper}</td>
+</tr>
+""")
+
+SELL_ROW_TEMPLATE = reportWriter.compile_template("""<tr>
+    <td><a href="https://elite.finviz.com/screener.ashx?v=341&t={ticker_symbol}">{ticker_symbol}</a></td>
+    <td>{single_sell_triggered} ({single_last_sell})</td>
+    <td>{oscillator_sell_triggered} ({oscillator_last_sell})</td>
+    <td>{double_sell_triggered} ({double_last_sell})</td>
+    <td>{candle_bearish_triggered} ({candle_last_bearish})</td>
+    <td>{overall_status_upper}</td>
+</tr>
+""")
+
+UNDETERMINED_ROW_TEMPLATE = reportWriter.compile_template("""<tr>
+    <td><a href="https://elite.finviz.com/screener.ashx?v=341&t={ticker_symbol}">{ticker_symbol}</a></td>
+    <td>Buy: {single_buy_triggered} ({single_last_buy})<br>Sell: {single_sell_triggered} ({single_last_sell})</td>
+    <td>Buy: {oscillator_buy_triggered} ({oscillator_last_buy})<br>Sell: {oscillator_sell_triggered} ({oscillator_last_sell})</td>
+    <td>Buy: {double_buy_triggered} ({double_last_buy})<br>Sell: {double_sell_triggered} ({double_last_sell})</td>
+    <td>Buy: {candle_bullish_triggered} ({candle_last_bullish})<br>Sell: {candle_bearish_triggered} ({candle_last_bearish})</td>
+    <td>{overall_status_upper}</td>
+</tr>
+""")
+
+DEAD_TICKER_ROW_TEMPLATE = reportWriter.compile_template("""<tr>
+    <td>{ticker}</td>
+    <td>{status}</td>
+    <td>{reason}</td>
+    <td>{first_seen}</td>
+    <td>{failures}</td>
+    <td>{next_probe}</td>
+</tr>
+""")
+
+DEAD_TICKER_COLUMNS = ["Ticker", "This Run", "Reason", "First Seen", "Failed Probes", "Next Probe"]
+
+# (Heading, CSS class, column headings, row template, JSON row fields, membership test)
+CONSOLIDATED_REPORT_SECTIONS = [
+    ("Leaning Buy", "status-buy",
+     ["Ticker", "Single EVWMA Buy", "Oscillator Buy", "Double Crossover Buy", "Candle Pattern Buy", "Overall"],
+     BUY_ROW_TEMPLATE, "buy",
+     lambda r: r['leaning_status'] == 'Leaning Buy'),
+    ("Leaning Sell", "status-sell",
+     ["Ticker", "Single EVWMA Sell", "Oscillator Sell", "Double Crossover Sell", "Candle Pattern Sell", "Overall"],
+     SELL_ROW_TEMPLATE, "sell",
+     lambda r: r['leaning_status'] == 'Leaning Sell'),
+    ("Overall Buy", "status-buy",
+     ["Ticker", "Single EVWMA Buy", "Oscillator Buy", "Double Crossover Buy", "Candle Pattern Buy", "Overall"],
+     BUY_ROW_TEMPLATE, "buy",
+     lambda r: r['overall_status'] == 'Overall Buy'),
+    ("Overall Sell", "status-sell",
+     ["Ticker", "Single EVWMA Sell", "Oscillator Sell", "Double Crossover Sell", "Candle Pattern Sell", "Overall"],
+     SELL_ROW_TEMPLATE, "sell",
+     lambda r: r['overall_status'] == 'Overall Sell'),
+    ("Undetermined", "status-undetermined",
+     ["Ticker", "Single EVWMA", "Oscillator", "Double Crossover", "Candle Pattern", "Overall"],
+     UNDETERMINED_ROW_TEMPLATE, "both",
+     lambda r: r['leaning_status'] == 'Undetermined' and r['overall_status'] == 'Overall Undetermined'),
+]
+
+# Candle pattern fields of a result; results journaled or cached before the
+# pattern engine was added do not have them
+CANDLE_RESULT_DEFAULTS = {
+    'candle_bullish_triggered': False,
+    'candle_last_bullish': 'N/A',
+    'candle_bearish_triggered': False,
+    'candle_last_bearish': 'N/A',
+    'candle_patterns': 'None',
+}
+
+def _json_signal_row(r, side):
+    """Flattens one ticker result into the cell values of a compact JSON table row."""
+    r = dict(CANDLE_RESULT_DEFAULTS, **r)
+    if side == "both":
+        return [r['ticker_symbol'],
+                f"Buy: {r['single_buy_triggered']} ({r['single_last_buy']})\nSell: {r['single_sell_triggered']} ({r['single_last_sell']})",
+                f"Buy: {r['oscillator_buy_triggered']} ({r['oscillator_last_buy']})\nSell: {r['oscillator_sell_triggered']} ({r['oscillator_last_sell']})",
+                f"Buy: {r['double_buy_triggered']} ({r['double_last_buy']})\nSell: {r['double_sell_triggered']} ({r['double_last_sell']})",
+                f"Buy: {r['candle_bullish_triggered']} ({r['candle_last_bullish']})\nSell: {r['candle_bearish_triggered']} ({r['candle_last_bearish']})",
+                r['overall_status'].upper()]
+    candle_side = 'bullish' if side == 'buy' else 'bearish'
+    return [r['ticker_symbol'],
+            f"{r[f'single_{side}_triggered']} ({r[f'single_last_{side}']})",
+            f"{r[f'oscillator_{side}_triggered']} ({r[f'oscillator_last_{side}']})",
+            f"{r[f'double_{side}_triggered']} ({r[f'double_last_{side}']})",
+            f"{r[f'candle_{candle_side}_triggered']} ({r[f'candle_last_{candle_side}']})",
+            r['overall_status'].upper()]
+
+def write_consolidated_html_report(all_results, html_file_path, compact=None, dead_tickers=None):
+    """
+    Streams the EVWMA consolidated report to disk, one section and row at a time.
+
+    Args:
+        all_results (list): The per-ticker result dictionaries.
+        html_file_path (str): The path of the HTML report to create.
+        compact (bool, optional): Write each section as a compact JSON data blob
+                                  rendered in the browser. If None, compact mode
+                                  is used once the run exceeds
+                                  reportWriter.COMPACT_REPORT_THRESHOLD tickers.
+        dead_tickers (list, optional): Rows from deadTickers.run_entries(), listed
+                                       in a last section when not empty.
+
+    Returns:
+        str: The report path.
     """
-    Generates a single HTML string for the EVWMA report, showing all tickers.
+    if compact is None:
+        compact = len(all_results) > reportWriter.COMPACT_REPORT_THRESHOLD
+
+    with reportWriter.open_report(html_file_path) as f:
+        reportWriter.write_page_header(f, "EVWMA Consolidated Report", CONSOLIDATED_REPORT_STYLE)
+        f.write('<div class="container">\n')
+        f.write('<h1>EVWMA Signal Consolidated Report</h1>\n')
+        f.write(f"<h3>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</h3>\n")
+
+        if compact:
+            reportWriter.write_json_table_renderer(f)
+
+        for section_index, (heading, css_class, columns, row_template, side, belongs) in enumerate(CONSOLIDATED_REPORT_SECTIONS):
+            section_results = sorted((r for r in all_results if belongs(r)), key=lambda x: x['ticker_symbol'])
+
+            f.write(f'<div class="section {css_class}">\n<h2>{heading}</h2>\n')
+            if compact:
+                reportWriter.write_json_table(
+                    f, f"section-{section_index}", columns,
+                    (_json_signal_row(r, side) for r in section_results),
+                    link_prefix=FINVIZ_TICKER_URL
+                )
+            else:
+                reportWriter.write_table(
+                    f, columns,
+                    (dict(CANDLE_RESULT_DEFAULTS, **r, overall_status_upper=r['overall_status'].upper()) for r in section_results),
+                    row_template
+                )
+            f.write('</div>\n')
+
+        if dead_tickers:
+            f.write('<div class="section status-undetermined">\n<h2>Tickers Without Data</h2>\n')
+            reportWriter.write_table(
+                f, DEAD_TICKER_COLUMNS,
+                (dict(r, first_seen=r['first_seen'][:10], next_probe=r['next_probe'][:10]) for r in dead_tickers),
+                DEAD_TICKER_ROW_TEMPLATE
+            )
+            f.write('</div>\n')
+
+        f.write('</div>\n')
+        reportWriter.write_page_footer(f)
+
+    return html_file_path
+
+def process_ticker(ticker_symbol, timeframe, download_start_date_str, download_end_date_str, output_dir, result_code_version):
+    """
+    Downloads one ticker's bars, evaluates its EVWMA and candlestick signals
+    and prints them - the per-ticker step of the serial run and of a queue
+    worker.
+
+    Args:
+        ticker_symbol (str): The ticker, upper case.
+        timeframe (str): '1d', '1wk' or '1mo'.
+        download_start_date_str (str): First day of the download window ('YYYY-MM-DD').
+        download_end_date_str (str): Exclusive last day of the download window.
+        output_dir (str): Folder of the historical data CSVs.
+        result_code_version (str): resultCache.code_version() of the signal rules.
+
+    Returns:
+        dict: The ticker's result row for the consolidated report, or None when
+              it is skipped as dead or has no data / indicators.
     """
-    leaning_buy_tickers = sorted([r for r in all_results if r['leaning_status'] == 'Leaning Buy'], key=lambda x: x['ticker_symbol'])
-    leaning_sell_tickers = sorted([r for r in all_results if r['leaning_status'] == 'Leaning Sell'], key=lambda x: x['ticker_symbol'])
-    overall_buy_tickers = sorted([r for r in all_results if r['overall_status'] == 'Overall Buy'], key=lambda x: x['ticker_symbol'])
-    overall_sell_tickers = sorted([r for r in all_results if r['overall_status'] == 'Overall Sell'], key=lambda x: x['ticker_symbol'])
-    undetermined_tickers = sorted([r for r in all_results if r['leaning_status'] == 'Undetermined' and r['overall_status'] == 'Overall Undetermined'], key=lambda x: x['ticker_symbol'])
+    today_date_str = datetime.now().strftime('%Y%m%d')
+    end_date_str = datetime.now().strftime('%Y-%m-%d')
+    print(f"\n>> --------------------------------------------------------------------")
+    print(f">> Processing Ticker: {ticker_symbol}")
+    print(f">> Historical data range: {download_start_date_str} to {end_date_str} ({timeframe} bars)")
+    print(f">> --------------------------------------------------------------------")
+    
+    # CRITICAL CHANGE: Prefix with today's date and place in the correct directory.
+    csv_file = os.path.join(output_dir, f"{today_date_str}_{ticker_symbol}_historical_data.csv")
+
+    dead_entry = deadTickers.should_skip(ticker_symbol)
+    if dead_entry is not None:
+        print(f">>  Skipping {ticker_symbol}: {dead_entry['reason']} (next probe {dead_entry['next_probe'][:10]})")
+        runMetrics.count('dead_tickers_skipped')
+        return None
+
+    if resultCache.cache_enabled() and frameHandoff.covers_window(csv_file, download_start_date_str, download_end_date_str):
+        # Same-day rerun (e.g. after a crash): today's download is reused - unless
+        # a single-ticker script has since written the file over its own window
+        csv_file_name = csv_file
+    else:
+        with runMetrics.span('download', ticker=ticker_symbol):
+            csv_file_name = download_historical_data(ticker_symbol, download_start_date_str, download_end_date_str, csv_file)
+
+    result_key = None
+    if csv_file_name:
+        # Keyed on the bars themselves: the CSV of this download may still be being written
+        price_frame = frameHandoff.load_frame(csv_file_name, read_price_csv)
+        result_key = resultCache.result_key(ticker_symbol, price_frame, {'timeframe': timeframe}, result_code_version)
+        cached_result = resultCache.get_result(result_key)
+        if cached_result is not None:
+            print(f">>  Unchanged data for {ticker_symbol} - reusing its cached signals ({cached_result['overall_status']} / {cached_result['leaning_status']})")
+            runMetrics.count('result_cache_hits')
+            return cached_result
     
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>EVWMA Consolidated Report</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 20px;
-                padding: 0;
-                background-color: #f4f4f4;
-                color: #333;
-            }}
-            .container {{
-                max-width: 1000px;
-                margin: auto;
-                background: #fff;
-                padding: 20px 40px;
-                border-radius: 8px;
-                box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
-            }}
-            h1, h2, h3 {{
-                color: #0056b3;
-                border-bottom: 2px solid #ddd;
-                padding-bottom: 5px;
-            }}
-            .section {{
-                margin-bottom: 30px;
-            }}
-            .ticker-card {{
-                border: 1px solid #ccc;
-                border-radius: 6px;
-                padding: 15px;
-                margin-bottom: 15px;
-            }}
-            .ticker-card h4 {{
-                margin-top: 0;
-                color: #333;
-                border-bottom: 1px dashed #eee;
-                padding-bottom: 5px;
-            }}
-            .signal-info {{
-                font-size: 0.9em;
-                color: #666;
-            }}
-            .signal-info span {{
-                font-weight: bold;
-                color: #000;
-            }}
-            .status-buy {{
-                background-color: #d4edda;
-                border-color: #c3e6cb;
-                color: #155724;
-            }}
-            .status-sell {{
-                background-color: #f8d7da;
-                border-color: #f5c6cb;
-                color: #721c24;
-            }}
-            .status-undetermined {{
-                background-color: #fff3cd;
-                border-color: #ffeeba;
-                color: #856404;
-            }}
-            .summary-table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 10px;
-            }}
-            .summary-table th, .summary-table td {{
-                padding: 8px;
-                text-align: left;
-                border-bottom: 1px solid #ddd;
-            }}
-            .summary-table th {{
-                background-color: #f2f2f2;
-                font-weight: bold;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>EVWMA Signal Consolidated Report</h1>
-            <h3>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</h3>
+    if csv_file_name: # Proceed only if data was downloaded successfully
+        with runMetrics.span('indicators', ticker=ticker_symbol):
+            df_indicators_from_csv = calculate_indicators_from_csv(csv_file_name, timeframe, ticker_symbol)
+
+        if df_indicators_from_csv is not None and not df_indicators_from_csv.empty:
+            runMetrics.count('tickers_processed')
+            runMetrics.count('rows_processed', len(df_indicators_from_csv))
+
+            # Calculate and print Average Daily Volume
+            avg_volume = df_indicators_from_csv['volume'].mean()
+            
+            # --- SIGNAL EVALUATION AND PRINTING SECTION ---
+            print(f">> --------------------------------------------------------------------")
+            print(f">>  EVWMA Reported Results - {ticker_symbol} ...")
+            print(f">> --------------------------------------------------------------------")
+            print(f">> ")
+            with runMetrics.span('signal_single', ticker=ticker_symbol):
+                single_buy_triggered, single_last_buy, single_sell_triggered, single_last_sell = evaluate_single_evwma_signals(df_indicators_from_csv)
+            print(f">>  LEADING - Single EVWMA for Stock Ticker - {ticker_symbol}")
+            print(f">>    Buy Signal Triggered - {single_buy_triggered}")
+            print(f">>    Buy Signal Last Triggered - {single_last_buy}")
+            print(f">>    Sell Signal Triggered - {single_sell_triggered}")
+            print(f">>    Sell Signal Last Triggered - {single_last_sell}")
+            print(f">> ")
+            with runMetrics.span('signal_oscillator', ticker=ticker_symbol):
+                oscillator_buy_triggered, oscillator_last_buy, oscillator_sell_triggered, oscillator_last_sell = evaluate_oscillator_evwma_signals(df_indicators_from_csv)
+            print(f">>  INBETWEEN - Evaluating Oscillator EVWMA for Stock Ticker - {ticker_symbol}")
+            print(f">>    Buy Signal Triggered - {oscillator_buy_triggered}")
+            print(f">>    Buy Signal Last Triggered - {oscillator_last_buy}")
+            print(f">>    Sell Signal Triggered - {oscillator_sell_triggered}")
+            print(f">>    Sell Signal Last Triggered - {oscillator_last_sell}")		
+            print(f">> ")            
+            with runMetrics.span('signal_double', ticker=ticker_symbol):
+                double_buy_triggered, double_last_buy, double_sell_triggered, double_last_sell = evaluate_double_evwma_signals(df_indicators_from_csv)
+            print(f">>  LAGGING - Double EVWMA Crossover for Stock Ticker - {ticker_symbol}")
+            print(f">>    Buy Signal Triggered - {double_buy_triggered}")
+            print(f">>    Buy Signal Last Triggered - {double_last_buy}")
+            print(f">>    Sell Signal Triggered - {double_sell_triggered}")
+            print(f">>    Sell Signal Last Triggered - {double_last_sell}")
+            print(f">> ")
+            with runMetrics.span('signal_candles', ticker=ticker_symbol):
+                candlePatterns.detect_patterns(df_indicators_from_csv)
+                candle_bullish_triggered, candle_last_bullish, candle_bearish_triggered, candle_last_bearish, candle_latest = candlePatterns.evaluate_pattern_signals(df_indicators_from_csv)
+            candle_patterns = candlePatterns.describe_patterns(candle_latest)
+            print(f">>  CONFIRMING - Candlestick Patterns for Stock Ticker - {ticker_symbol}")
+            print(f">>    Patterns on Latest Bar - {candle_patterns}")
+            print(f">>    Bullish Pattern Triggered - {candle_bullish_triggered}")
+            print(f">>    Bullish Pattern Last Triggered - {candle_last_bullish}")
+            print(f">>    Bearish Pattern Triggered - {candle_bearish_triggered}")
+            print(f">>    Bearish Pattern Last Triggered - {candle_last_bearish}")
+            print(f">> ")
+
+            # #################################################################################
+            # Refactored Logic for Leaning and Overall Signals
+            # #################################################################################
+            leaning_buy = False
+            leaning_sell = False
+            all_buy_currently_triggered = False
+            all_sell_currently_triggered = False
             
-            <div class="section status-buy">
-                <h2>Leaning Buy</h2>
-                <table class="summary-table">
-                    <thead>
-                        <tr>
-                            <th>Ticker</th>
-                            <th>Single EVWMA Buy</th>
-                            <th>Oscillator Buy</th>
-                            <th>Double Crossover Buy</th>
-                            <th>Overall</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {"".join([f"""
-                        <tr>
-                            <td><a href="https://elite.finviz.com/screener.ashx?v=341&t={r['ticker_symbol']}">{r['ticker_symbol']}</a></td>
-                            <td>{r['single_buy_triggered']} ({r['single_last_buy']})</td>
-                            <td>{r['oscillator_buy_triggered']} ({r['oscillator_last_buy']})</td>
-                            <td>{r['double_buy_triggered']} ({r['double_last_buy']})</td>
-                            <td>{r['overall_status'].upper()}</td>
-                        </tr>
-                        """ for r in leaning_buy_tickers])}
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="section status-sell">
-                <h2>Leaning Sell</h2>
-                <table class="summary-table">
-                    <thead>
-                        <tr>
-                            <th>Ticker</th>
-                            <th>Single EVWMA Sell</th>
-                            <th>Oscillator Sell</th>
-                            <th>Double Crossover Sell</th>
-                            <th>Overall</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {"".join([f"""
-                        <tr>
-                            <td><a href="https://elite.finviz.com/screener.ashx?v=341&t={r['ticker_symbol']}">{r['ticker_symbol']}</a></td>
-                            <td>{r['single_sell_triggered']} ({r['single_last_sell']})</td>
-                            <td>{r['oscillator_sell_triggered']} ({r['oscillator_last_sell']})</td>
-                            <td>{r['double_sell_triggered']} ({r['double_last_sell']})</td>
-                            <td>{r['overall_status'].upper()}</td>
-                        </tr>
-                        """ for r in leaning_sell_tickers])}
-                    </tbody>
-                </table>
-            </div>
+            today = date.today()
+
+            try:
+                signal_dates = [single_last_buy, oscillator_last_buy, single_last_sell,
+                                oscillator_last_sell, double_last_buy, double_last_sell]
+                (single_buy_date_obj, oscillator_buy_date_obj, single_sell_date_obj,
+                 oscillator_sell_date_obj, double_buy_date_obj, double_sell_date_obj) = tradingCalendar.as_dates(signal_dates)
+
+                # Calculate time differences in sessions - one lookup for all six dates
+                (single_buy_days_diff, oscillator_buy_days_diff, single_sell_days_diff,
+                 oscillator_sell_days_diff, double_buy_days_diff, double_sell_days_diff) = tradingCalendar.trading_days_between(signal_dates, today)
+
+                # This should be Leaning Sell
+                # CVX	    Buy: False (2025-09-10) Sell: False (2025-09-03)
+                #           Buy: False (2025-08-21) Sell: False (2025-09-05)
+                #           Buy: False (2025-06-06) Sell: False (2025-05-21)
+                # 
+                # This should be a Overall Sell
+                # AMZN	    Buy: False (2025-09-08) Sell: False (2025-09-10)	
+                #           Buy: False (2025-09-04) Sell: False (2025-09-10)
+                #           Buy: False (2025-09-04) Sell: False (2025-09-10)
+                # 
+                # DIS	    Buy: False (2025-08-13) Sell: False (2025-09-09)	
+                #           Buy: False (2025-08-18) Sell: False (2025-09-11)	
+                #           Buy: False (2025-08-29) Sell: True (2025-09-12)
+
+                # This should be Leaning Buy
+                # JPM	 Buy: False (2025-09-09) Sell: False (2025-09-05)	
+                #        Buy: False (2025-09-11) Sell: False (2025-09-08)
+                #        Buy: False (2025-04-11) Sell: False (2025-04-03)
+                # 
+                # MMM	 Buy: False (2025-09-11) Sell: False (2025-09-09)	
+                #        Buy: False (2025-09-11) Sell: False (2025-09-03)	
+                #        Buy: False (2025-05-14) Sell: False (2025-04-04)
+                # 
+                # UNH	 Buy: False (2025-09-11) Sell: False (2025-09-09)
+                #        Buy: False (2025-09-05) Sell: False (2025-08-26)
+                #        Buy: False (2025-08-13) Sell: False (2025-07-09)
+                # 
+                # WMT	 Buy: False (2025-09-11) Sell: False (2025-09-10)
+                #        Buy: False (2025-09-02) Sell: False (2025-08-13)
+                #        Buy: False (2025-09-03) Sell: False (2025-08-21)
+                
+                # This should be an Overall Sell
+                # NKE	 Buy: False (2025-08-22) Sell: False (2025-08-29)
+                #        Buy: False (2025-08-13) Sell: False (2025-08-29)
+                #        Buy: False (2025-08-13) Sell: False (2025-09-03)                        
+
+                # New Conditional Logic
+                if (single_buy_days_diff <= SIGNAL_WINDOW_SESSIONS and oscillator_buy_days_diff <= SIGNAL_WINDOW_SESSIONS and single_sell_days_diff <= SIGNAL_WINDOW_SESSIONS and oscillator_sell_days_diff <= SIGNAL_WINDOW_SESSIONS and double_buy_days_diff <= DOUBLE_WINDOW_SESSIONS and double_sell_days_diff <= DOUBLE_WINDOW_SESSIONS):
+                    
+                    # Buy conditions
+                    if (single_buy_days_diff <= RECENT_SIGNAL_SESSIONS and oscillator_buy_days_diff <= RECENT_SIGNAL_SESSIONS and double_buy_days_diff <= FRESH_DOUBLE_SESSIONS):
+                        if single_buy_date_obj == oscillator_buy_date_obj and oscillator_buy_date_obj == double_buy_date_obj:
+                            all_buy_currently_triggered = True
+                        elif (oscillator_buy_date_obj > single_buy_date_obj) and (double_buy_date_obj == oscillator_buy_date_obj):
+                            all_buy_currently_triggered = True                                    
+                        elif (oscillator_buy_date_obj > single_buy_date_obj) and (double_buy_date_obj > oscillator_buy_date_obj) and (double_buy_date_obj > double_sell_date_obj):
+                            all_buy_currently_triggered = True
+                        elif (single_buy_date_obj == oscillator_buy_date_obj) and (oscillator_buy_date_obj > double_buy_date_obj):
+                            leaning_buy = True
+                        elif (oscillator_buy_date_obj > single_buy_date_obj) and (oscillator_buy_date_obj > double_buy_date_obj):
+                            leaning_buy = True
+                        elif (oscillator_buy_date_obj < single_buy_date_obj) and (oscillator_buy_date_obj < double_buy_date_obj) and (single_buy_date_obj > single_sell_date_obj) and (oscillator_buy_date_obj > oscillator_sell_date_obj) and (double_buy_date_obj > double_sell_date_obj):
+                            leaning_buy = True
+                        elif (single_sell_date_obj > single_buy_date_obj) and (oscillator_sell_date_obj > oscillator_buy_date_obj) and (double_sell_date_obj > double_buy_date_obj):
+                            all_sell_currently_triggered = True
+                            
+                    # Sell conditions
+                    elif (single_sell_days_diff <= RECENT_SIGNAL_SESSIONS and oscillator_sell_days_diff <= RECENT_SIGNAL_SESSIONS and double_sell_days_diff <= FRESH_DOUBLE_SESSIONS):
+                        if single_sell_date_obj == oscillator_sell_date_obj and oscillator_sell_date_obj == double_sell_date_obj:
+                            all_sell_currently_triggered = True
+                        elif (oscillator_sell_date_obj > single_sell_date_obj) and (double_sell_date_obj == oscillator_sell_date_obj):
+                            all_sell_currently_triggered = True                                     
+                        elif (oscillator_sell_date_obj > single_sell_date_obj) and (double_sell_date_obj > oscillator_sell_date_obj) and (double_sell_date_obj > double_buy_date_obj):
+                            all_sell_currently_triggered = True
+                        elif (single_sell_date_obj > single_buy_date_obj) and (oscillator_sell_date_obj > oscillator_buy_date_obj) and (double_sell_date_obj > double_buy_date_obj):
+                            all_sell_currently_triggered = True                                     
+                        elif (single_sell_date_obj == oscillator_sell_date_obj) and (oscillator_sell_date_obj > double_sell_date_obj):
+                            leaning_sell = True
+                        elif (oscillator_sell_date_obj > single_sell_date_obj) and (oscillator_sell_date_obj > double_sell_date_obj):
+                            leaning_sell = True
+                
+                    # Mixed conditions
+                    elif (single_buy_days_diff <= RECENT_SIGNAL_SESSIONS and oscillator_buy_days_diff <= RECENT_SIGNAL_SESSIONS and (double_buy_days_diff >= RECENT_SIGNAL_SESSIONS and double_buy_days_diff <= DOUBLE_WINDOW_SESSIONS)):
+                        if (single_buy_date_obj > single_sell_date_obj) and (oscillator_buy_date_obj > oscillator_sell_date_obj) and (double_buy_date_obj > double_sell_date_obj):
+                            leaning_buy = True
+                        elif (single_buy_date_obj > single_sell_date_obj) and (oscillator_buy_date_obj < oscillator_sell_date_obj) and (double_buy_date_obj > double_sell_date_obj):
+                            leaning_sell = True                                      
+                    elif (single_sell_days_diff <= RECENT_SIGNAL_SESSIONS and oscillator_sell_days_diff <= RECENT_SIGNAL_SESSIONS and (double_sell_days_diff >= RECENT_SIGNAL_SESSIONS and double_sell_days_diff <= DOUBLE_WINDOW_SESSIONS)):
+                        if (single_sell_date_obj < single_buy_date_obj) and (oscillator_sell_date_obj > oscillator_buy_date_obj) and (double_buy_date_obj > double_sell_date_obj):
+                            leaning_sell = True                                
+                            
+            except ValueError:
+                print(f"Warning: Could not parse date for {ticker_symbol}. Signal evaluation skipped.")
+
+            # #################################################################################
             
-            <div class="section status-buy">
-                <h2>Overall Buy</h2>
-                <table class="summary-table">
-                    <thead>
-                        <tr>
-                            <th>Ticker</th>
-                            <th>Single EVWMA Buy</th>
-                            <th>Oscillator Buy</th>
-                            <th>Double Crossover Buy</th>
-                            <th>Overall</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {"".join([f"""
-                        <tr>
-                            <td><a href="https://elite.finviz.com/screener.ashx?v=341&t={r['ticker_symbol']}">{r['ticker_symbol']}</a></td>
-                            <td>{r['single_buy_triggered']} ({r['single_last_buy']})</td>
-                            <td>{r['oscillator_buy_triggered']} ({r['oscillator_last_buy']})</td>
-                            <td>{r['double_buy_triggered']} ({r['double_last_buy']})</td>
-                            <td>{r['overall_status'].upper()}</td>
-                        </tr>
-                        """ for r in overall_buy_tickers])}
-                    </tbody>
-                </table>
-            </div>
+            print(f">> --------------------------------------------------------------------")
+            print(f">>  Reported Conclusion - {ticker_symbol} ...")
+            print(f">> --------------------------------------------------------------------")
+            print(f">> ")
+
+            leaning_status = "Undetermined"
+            overall_status = "Overall Undetermined"
             
-            <div class="section status-sell">
-                <h2>Overall Sell</h2>
-                <table class="summary-table">
-                    <thead>
-                        <tr>
-                            <th>Ticker</th>
-                            <th>Single EVWMA Sell</th>
-                            <th>Oscillator Sell</th>
-                            <th>Double Crossover Sell</th>
-                            <th>Overall</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {"".join([f"""
-                        <tr>
-                            <td><a href="https://elite.finviz.com/screener.ashx?v=341&t={r['ticker_symbol']}">{r['ticker_symbol']}</a></td>
-                            <td>{r['single_sell_triggered']} ({r['single_last_sell']})</td>
-                            <td>{r['oscillator_sell_triggered']} ({r['oscillator_last_sell']})</td>
-                            <td>{r['double_sell_triggered']} ({r['double_last_sell']})</td>
-                            <td>{r['overall_status'].upper()}</td>
-                        </tr>
-                        """ for r in overall_sell_tickers])}
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="section status-undetermined">
-                <h2>Undetermined</h2>
-                <table class="summary-table">
-                    <thead>
-                        <tr>
-                            <th>Ticker</th>
-                            <th>Single EVWMA</th>
-                            <th>Oscillator</th>
-                            <th>Double Crossover</th>
-                            <th>Overall</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {"".join([f"""
-                        <tr>
-                            <td><a href="https://elite.finviz.com/screener.ashx?v=341&t={r['ticker_symbol']}">{r['ticker_symbol']}</a></td>
-                            <td>Buy: {r['single_buy_triggered']} ({r['single_last_buy']})<br>Sell: {r['single_sell_triggered']} ({r['single_last_sell']})</td>
-                            <td>Buy: {r['oscillator_buy_triggered']} ({r['oscillator_last_buy']})<br>Sell: {r['oscillator_sell_triggered']} ({r['oscillator_last_sell']})</td>
-                            <td>Buy: {r['double_buy_triggered']} ({r['double_last_buy']})<br>Sell: {r['double_sell_triggered']} ({r['double_last_sell']})</td>
-                            <td>{r['overall_status'].upper()}</td>
-                        </tr>
-                        """ for r in undetermined_tickers])}
-                    </tbody>
-                </table>
-            </div>
-        </div>
-    </body>
-    </html>
+            if all_buy_currently_triggered:
+                overall_status = "Overall Buy"
+                print(f">>    OVERALL - EVWMA FORECAST - BUY Signal Triggered !!!")
+            elif all_sell_currently_triggered:
+                overall_status = "Overall Sell"
+                print(f">>    OVERALL - EVWMA FORECAST - SELL Signal Triggered !!!")
+            elif leaning_buy:
+                leaning_status = "Leaning Buy"
+                print(f">>    LEANING - EVWMA FORECAST - BUY Signals within last 33 Days !!! ")
+            elif leaning_sell:
+                leaning_status = "Leaning Sell"
+                print(f">>    LEANING - EVWMA FORECAST - SELL Signals within last 33 Days !!! ")
+            else:
+                print(f">>    UNDETERMINED - EVWMA FORECAST - NOT enough evidence to draw a conclusion !!!")
+
+
+            # Store the results for the final consolidated report
+            ticker_result = {
+                'ticker_symbol': ticker_symbol,
+                'leaning_status': leaning_status,
+                'overall_status': overall_status,
+                'single_buy_triggered': single_buy_triggered,
+                'single_last_buy': single_last_buy,
+                'single_sell_triggered': single_sell_triggered,
+                'single_last_sell': single_last_sell,
+                'oscillator_buy_triggered': oscillator_buy_triggered,
+                'oscillator_last_buy': oscillator_last_buy,
+                'oscillator_sell_triggered': oscillator_sell_triggered,
+                'oscillator_last_sell': oscillator_last_sell,
+                'double_buy_triggered': double_buy_triggered,
+                'double_last_buy': double_last_buy,
+                'double_sell_triggered': double_sell_triggered,
+                'double_last_sell': double_last_sell,
+                'candle_bullish_triggered': candle_bullish_triggered,
+                'candle_last_bullish': candle_last_bullish,
+                'candle_bearish_triggered': candle_bearish_triggered,
+                'candle_last_bearish': candle_last_bearish,
+                'candle_patterns': candle_patterns,
+            }
+            resultCache.put_result(result_key, ticker_symbol, ticker_result)
+            return ticker_result
+
+        else:
+            print(">>  Failed to calculate indicators from CSV.")
+    else:
+        print(">>  Data download failed, unable to proceed with indicator calculation and charting.")
+
+    return None
+
+def process_queued_ticker(ticker_symbol, params, output_dir, result_code_version):
     """
-    return html_content
+    A queue worker's step: process_ticker() with the settings the coordinator
+    stored in the queue. The ticker's dead ticker row (if any) is returned with
+    its result, as the merge step does not see the workers' dead ticker lists.
+
+    Returns:
+        dict: 'result' (the report row or None) and 'dead_ticker' (the
+              deadTickers.run_entries() row or None).
+    """
+    ticker_result = process_ticker(ticker_symbol, params['timeframe'], params['download_start'], params['download_end'],
+                                   output_dir, result_code_version)
+    dead_ticker = next((row for row in deadTickers.run_entries() if row['ticker'] == ticker_symbol), None)
+    return {'result': ticker_result, 'dead_ticker': dead_ticker}
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Evaluates the EVWMA signals of every ticker in a CSV file.",
+        epilog="To spread a run over several processes or hosts, queue it with --queue-dir Q --role coordinator, "
+               "start any number of --role worker processes on Q and write the report with --role merge."
+    )
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue today\'s latest unfinished run on the same input file and timeframe, '
+                             'processing only the tickers it has not finished.')
+    parser.add_argument('--queue-dir', type=str, default=None,
+                        help='Folder of a work queue shared by the workers (a local folder or a network share).')
+    parser.add_argument('--role', choices=['coordinator', 'worker', 'merge'], default=None,
+                        help='With --queue-dir: queue the tickers of the input CSV, process queued tickers, '
+                             'or write the report of the queued run.')
+    parser.add_argument('--batch-size', type=int, default=workQueue.DEFAULT_BATCH_SIZE,
+                        help=f'Tickers a worker claims at a time. Defaults to {workQueue.DEFAULT_BATCH_SIZE}.')
+    parser.add_argument('--lease-seconds', type=int, default=workQueue.DEFAULT_LEASE_SECONDS,
+                        help=f'Seconds before the tickers of a worker that stopped responding are handed to another. '
+                             f'Defaults to {workQueue.DEFAULT_LEASE_SECONDS}.')
+    args = parser.parse_args()
+    if (args.queue_dir is None) != (args.role is None):
+        parser.error("--queue-dir and --role go together")
+    if args.resume and args.queue_dir:
+        parser.error("--resume does not apply to a queued run - a worker always continues where the queue stands")
+
     print(f">> ")
     print(f">> --------------------------------------------------------------------")
     print(f">> BEGIN Processing - Evaluate Price to EVWMA ...")
     print(f">> --------------------------------------------------------------------")
     print(f">> ")
 
+    runMetrics.enable_metrics_from_env("cnsBtchPrc2EVWMA")
+    resultCache.open_cache_from_env("cnsBtchPrc2EVWMA")
+    deadTickers.open_dead_tickers_from_env()
+    result_code_version = resultCache.code_version(
+        [calculate_ema, calculate_indicators_from_csv, evaluate_single_evwma_signals,
+         evaluate_oscillator_evwma_signals, evaluate_double_evwma_signals,
+         candlePatterns.pattern_masks, candlePatterns.evaluate_pattern_signals],
+        RESULT_RULES_VERSION
+    )
+
     # Define the output directory and ensure it exists
     output_dir = "E:/_scripts_PYTHON/_personal/_OUTPUT"
     report_dir = "E:/_scripts_PYTHON/_personal/_REPORT"
@@ -653,257 +954,122 @@ if __name__ == "__main__":
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(report_dir, exist_ok=True)
     
-    # Get today's date in YYYYMMDD format
-    today_date_str = datetime.now().strftime('%Y%m%d')
+    if args.role in ('worker', 'merge'):
+        # The coordinator fixed the run's settings - nothing is asked
+        queue = workQueue.queue_info(args.queue_dir)
+        if queue is None or queue['name'] != "cnsBtchPrc2EVWMA":
+            print(f"Error: No cnsBtchPrc2EVWMA queue in '{args.queue_dir}' - create it with --role coordinator.")
+            sys.exit(1)
+        timeframe = queue['params']['timeframe']
+    else:
+        # --- REFACTORED LOGIC TO ACCEPT CSV INPUT ---
+        csv_file_path = input("Enter the path to the input CSV file: ")
+        timeframe = input("Enter the timeframe (1d, 1wk, 1mo, press Enter for 1d): ").strip() or '1d'
+        if timeframe not in timeframeBars.TIMEFRAMES:
+            print(f"Error: Unknown timeframe '{timeframe}'. Use one of: {', '.join(timeframeBars.TIMEFRAMES)}.")
+            exit()
+
+    if args.role == 'coordinator':
+        try:
+            input_df = pd.read_csv(csv_file_path)
+        except FileNotFoundError:
+            print(f"Error: The file '{csv_file_path}' was not found.")
+            sys.exit(1)
+        if 'Ticker' not in input_df.columns:
+            print("Error: The CSV file must contain a 'Ticker' column.")
+            sys.exit(1)
 
-    # --- REFACTORED LOGIC TO ACCEPT CSV INPUT ---
-    csv_file_path = input("Enter the path to the input CSV file: ")
+        # The workers take the download window and signal rules from the queue, so
+        # every host evaluates the same bars with the same code
+        download_start_date_str, download_end_date_str = tradingCalendar.download_window(tradingCalendar.BATCH_DOWNLOAD_SESSIONS)
+        queue_params = {
+            'input': os.path.abspath(csv_file_path),
+            'timeframe': timeframe,
+            'download_start': download_start_date_str,
+            'download_end': download_end_date_str,
+            'code_version': result_code_version,
+        }
+        try:
+            added = workQueue.create_queue(args.queue_dir, "cnsBtchPrc2EVWMA", queue_params,
+                                           input_df['Ticker'].dropna().astype(str).str.upper().tolist())
+        except ValueError as e:
+            print(f"Error: {e} - use a new queue folder for a new run.")
+            sys.exit(1)
+        counts = workQueue.queue_counts(args.queue_dir)
+        print(f">>  {added} tickers queued in '{workQueue.queue_path(args.queue_dir)}' "
+              f"({counts['pending']} pending, {counts['done']} done)")
+        print(f">>  Start the workers with --role worker, then write the report with --role merge")
+        print(f">> ")
+        sys.exit(0)
 
     all_ticker_results = []
-    
-    try:
-        # Read the input CSV file
-        input_df = pd.read_csv(csv_file_path)
 
-        if 'Ticker' not in input_df.columns:
-            print("Error: The CSV file must contain a 'Ticker' column.")
-            exit()
-            
-        # Set date defaults
-        start_date_str = (datetime.now() - timedelta(days=548)).strftime('%Y-%m-%d')
-        end_date_str = datetime.now().strftime('%Y-%m-%d')
-
-        # Process each ticker from the CSV
-        for index, row in input_df.iterrows():
-            ticker_symbol = row['Ticker'].upper()
-            print(f"\n>> --------------------------------------------------------------------")
-            print(f">> Processing Ticker: {ticker_symbol}")
-            print(f">> Historical data range: {start_date_str} to {end_date_str}")
-            print(f">> --------------------------------------------------------------------")
-            
-            try:
-                # Convert string dates to datetime.date objects for comparison
-                parsed_start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                parsed_end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                today_date = datetime.now().date()
-                
-                if parsed_start_date >= parsed_end_date:
-                    print(f"Error: Start date ({start_date_str}) must be strictly before end date ({end_date_str}). Skipping.")
-                    continue
-                
-                effective_download_end_date = parsed_end_date + timedelta(days=1)
-                
-                download_start_date_str = parsed_start_date.strftime('%Y-%m-%d')
-                download_end_date_str = effective_download_end_date.strftime('%Y-%m-%d')
-                
-            except ValueError:
-                print("Error: Invalid date format. Skipping.")
-                continue
+    if args.role == 'worker':
+        if queue['params']['code_version'] != result_code_version:
+            print("Error: The signal rules on this host differ from the coordinator's - update the scripts first.")
+            sys.exit(1)
+        worker_id = workQueue.default_worker_id()
+        print(f">>  Worker {worker_id} on '{workQueue.queue_path(args.queue_dir)}'")
+        try:
+            worker_stats = workQueue.run_worker(
+                args.queue_dir,
+                lambda ticker, params: process_queued_ticker(ticker, params, output_dir, result_code_version),
+                worker_id, args.batch_size, args.lease_seconds
+            )
+            print(f">>  Worker {worker_id}: {worker_stats['done']} tickers in {worker_stats['batches']} batches, "
+                  f"{worker_stats['failed']} errors")
+        except KeyboardInterrupt:
+            print(f"\n>>  Interrupted - the unprocessed tickers of the batch went back to the queue.")
 
-            # CRITICAL CHANGE: Prefix with today's date and place in the correct directory.
-            csv_file = os.path.join(output_dir, f"{today_date_str}_{ticker_symbol}_historical_data.csv")
+    elif args.role is None:
+        # Set date defaults - the last BATCH_DOWNLOAD_SESSIONS sessions up to today; the
+        # download end is the day after today, as yfinance's end date is exclusive
+        download_start_date_str, download_end_date_str = tradingCalendar.download_window(tradingCalendar.BATCH_DOWNLOAD_SESSIONS)
 
-            csv_file_name = download_historical_data(ticker_symbol, download_start_date_str, download_end_date_str, csv_file)
-            
-            if csv_file_name: # Proceed only if data was downloaded successfully
-                df_indicators_from_csv = calculate_indicators_from_csv(csv_file_name)
+        # Every finished ticker is journaled, so an interrupted run can be resumed -
+        # on the same day only, as the download window is part of the params
+        journal_dir = os.path.join(output_dir, "_JOURNAL")
+        journal_params = {'input': os.path.abspath(csv_file_path), 'timeframe': timeframe,
+                          'download_start': download_start_date_str, 'download_end': download_end_date_str}
+        completed_results = {}
+        run_finished = False
+        resume_path = runJournal.find_latest_journal("cnsBtchPrc2EVWMA", journal_params, journal_dir) if args.resume else None
+        if resume_path:
+            completed_results = runJournal.resume_journal(resume_path)
+            print(f">>  Resuming '{resume_path}': {len(completed_results)} tickers already done")
+        else:
+            if args.resume:
+                print(">>  No unfinished run of today on this input and timeframe - starting a new run")
+            runJournal.start_journal("cnsBtchPrc2EVWMA", journal_params, journal_dir)
+    
+        try:
+            # Read the input CSV file
+            input_df = pd.read_csv(csv_file_path)
 
-                if df_indicators_from_csv is not None and not df_indicators_from_csv.empty:
-                    # Calculate and print Average Daily Volume
-                    avg_volume = df_indicators_from_csv['volume'].mean()
-                    
-                    # --- SIGNAL EVALUATION AND PRINTING SECTION ---
-                    print(f">> --------------------------------------------------------------------")
-                    print(f">>  EVWMA Reported Results - {ticker_symbol} ...")
-                    print(f">> --------------------------------------------------------------------")
-                    print(f">> ")
-                    single_buy_triggered, single_last_buy, single_sell_triggered, single_last_sell = evaluate_single_evwma_signals(df_indicators_from_csv)
-                    print(f">>  LEADING - Single EVWMA for Stock Ticker - {ticker_symbol}")
-                    print(f">>    Buy Signal Triggered - {single_buy_triggered}")
-                    print(f">>    Buy Signal Last Triggered - {single_last_buy}")
-                    print(f">>    Sell Signal Triggered - {single_sell_triggered}")
-                    print(f">>    Sell Signal Last Triggered - {single_last_sell}")
-                    print(f">> ")
-                    oscillator_buy_triggered, oscillator_last_buy, oscillator_sell_triggered, oscillator_last_sell = evaluate_oscillator_evwma_signals(df_indicators_from_csv)
-                    print(f">>  INBETWEEN - Evaluating Oscillator EVWMA for Stock Ticker - {ticker_symbol}")
-                    print(f">>    Buy Signal Triggered - {oscillator_buy_triggered}")
-                    print(f">>    Buy Signal Last Triggered - {oscillator_last_buy}")
-                    print(f">>    Sell Signal Triggered - {oscillator_sell_triggered}")
-                    print(f">>    Sell Signal Last Triggered - {oscillator_last_sell}")		
-                    print(f">> ")            
-                    double_buy_triggered, double_last_buy, double_sell_triggered, double_last_sell = evaluate_double_evwma_signals(df_indicators_from_csv)
-                    print(f">>  LAGGING - Double EVWMA Crossover for Stock Ticker - {ticker_symbol}")
-                    print(f">>    Buy Signal Triggered - {double_buy_triggered}")
-                    print(f">>    Buy Signal Last Triggered - {double_last_buy}")
-                    print(f">>    Sell Signal Triggered - {double_sell_triggered}")
-                    print(f">>    Sell Signal Last Triggered - {double_last_sell}")
-                    print(f">> ")
-
-                    # #################################################################################
-                    # Refactored Logic for Leaning and Overall Signals
-                    # #################################################################################
-                    leaning_buy = False
-                    leaning_sell = False
-                    all_buy_currently_triggered = False
-                    all_sell_currently_triggered = False
-                    
-                    today = date.today()
-
-                    try:
-                        single_buy_date_obj = datetime.strptime(single_last_buy, '%Y-%m-%d').date()
-                        oscillator_buy_date_obj = datetime.strptime(oscillator_last_buy, '%Y-%m-%d').date()
-                        single_sell_date_obj = datetime.strptime(single_last_sell, '%Y-%m-%d').date()
-                        oscillator_sell_date_obj = datetime.strptime(oscillator_last_sell, '%Y-%m-%d').date()
-                        
-                        double_buy_date_obj = datetime.strptime(double_last_buy, '%Y-%m-%d').date()
-                        double_sell_date_obj = datetime.strptime(double_last_sell, '%Y-%m-%d').date()
-
-                        # Calculate time differences in days
-                        single_buy_days_diff = (today - single_buy_date_obj).days
-                        oscillator_buy_days_diff = (today - oscillator_buy_date_obj).days
-                        single_sell_days_diff = (today - single_sell_date_obj).days
-                        oscillator_sell_days_diff = (today - oscillator_sell_date_obj).days
-                        double_buy_days_diff = (today - double_buy_date_obj).days
-                        double_sell_days_diff = (today - double_sell_date_obj).days
-
-                        # This should be Leaning Sell
-                        # CVX	    Buy: False (2025-09-10) Sell: False (2025-09-03)
-                        #           Buy: False (2025-08-21) Sell: False (2025-09-05)
-                        #           Buy: False (2025-06-06) Sell: False (2025-05-21)
-                        # 
-                        # This should be a Overall Sell
-                        # AMZN	    Buy: False (2025-09-08) Sell: False (2025-09-10)	
-                        #           Buy: False (2025-09-04) Sell: False (2025-09-10)
-                        #           Buy: False (2025-09-04) Sell: False (2025-09-10)
-                        # 
-                        # DIS	    Buy: False (2025-08-13) Sell: False (2025-09-09)	
-                        #           Buy: False (2025-08-18) Sell: False (2025-09-11)	
-                        #           Buy: False (2025-08-29) Sell: True (2025-09-12)
-        
-                        # This should be Leaning Buy
-                        # JPM	 Buy: False (2025-09-09) Sell: False (2025-09-05)	
-                        #        Buy: False (2025-09-11) Sell: False (2025-09-08)
-                        #        Buy: False (2025-04-11) Sell: False (2025-04-03)
-                        # 
-                        # MMM	 Buy: False (2025-09-11) Sell: False (2025-09-09)	
-                        #        Buy: False (2025-09-11) Sell: False (2025-09-03)	
-                        #        Buy: False (2025-05-14) Sell: False (2025-04-04)
-                        # 
-                        # UNH	 Buy: False (2025-09-11) Sell: False (2025-09-09)
-                        #        Buy: False (2025-09-05) Sell: False (2025-08-26)
-                        #        Buy: False (2025-08-13) Sell: False (2025-07-09)
-                        # 
-                        # WMT	 Buy: False (2025-09-11) Sell: False (2025-09-10)
-                        #        Buy: False (2025-09-02) Sell: False (2025-08-13)
-                        #        Buy: False (2025-09-03) Sell: False (2025-08-21)
-                        
-                        # This should be an Overall Sell
-                        # NKE	 Buy: False (2025-08-22) Sell: False (2025-08-29)
-                        #        Buy: False (2025-08-13) Sell: False (2025-08-29)
-                        #        Buy: False (2025-08-13) Sell: False (2025-09-03)                        
-     
-                        # New Conditional Logic
-                        if (single_buy_days_diff <= 60 and oscillator_buy_days_diff <= 60 and single_sell_days_diff <= 60 and oscillator_sell_days_diff <= 60 and double_buy_days_diff <= 225 and double_sell_days_diff <= 225):
-                            
-                            # Buy conditions
-                            if (single_buy_days_diff <= 30 and oscillator_buy_days_diff <= 30 and double_buy_days_diff <= 15):
-                                if single_buy_date_obj == oscillator_buy_date_obj and oscillator_buy_date_obj == double_buy_date_obj:
-                                    all_buy_currently_triggered = True
-                                elif (oscillator_buy_date_obj > single_buy_date_obj) and (double_buy_date_obj == oscillator_buy_date_obj):
-                                    all_buy_currently_triggered = True                                    
-                                elif (oscillator_buy_date_obj > single_buy_date_obj) and (double_buy_date_obj > oscillator_buy_date_obj) and (double_buy_date_obj > double_sell_date_obj):
-                                    all_buy_currently_triggered = True
-                                elif (single_buy_date_obj == oscillator_buy_date_obj) and (oscillator_buy_date_obj > double_buy_date_obj):
-                                    leaning_buy = True
-                                elif (oscillator_buy_date_obj > single_buy_date_obj) and (oscillator_buy_date_obj > double_buy_date_obj):
-                                    leaning_buy = True
-                                elif (oscillator_buy_date_obj < single_buy_date_obj) and (oscillator_buy_date_obj < double_buy_date_obj) and (single_buy_date_obj > single_sell_date_obj) and (oscillator_buy_date_obj > oscillator_sell_date_obj) and (double_buy_date_obj > double_sell_date_obj):
-                                    leaning_buy = True
-                                elif (single_sell_date_obj > single_buy_date_obj) and (oscillator_sell_date_obj > oscillator_buy_date_obj) and (double_sell_date_obj > double_buy_date_obj):
-                                    all_sell_currently_triggered = True
-                                    
-                            # Sell conditions
-                            elif (single_sell_days_diff <= 30 and oscillator_sell_days_diff <= 30 and double_sell_days_diff <= 15):
-                                if single_sell_date_obj == oscillator_sell_date_obj and oscillator_sell_date_obj == double_sell_date_obj:
-                                    all_sell_currently_triggered = True
-                                elif (oscillator_sell_date_obj > single_sell_date_obj) and (double_sell_date_obj == oscillator_sell_date_obj):
-                                    all_sell_currently_triggered = True                                     
-                                elif (oscillator_sell_date_obj > single_sell_date_obj) and (double_sell_date_obj > oscillator_sell_date_obj) and (double_sell_date_obj > double_buy_date_obj):
-                                    all_sell_currently_triggered = True
-                                elif (single_sell_date_obj > single_buy_date_obj) and (oscillator_sell_date_obj > oscillator_buy_date_obj) and (double_sell_date_obj > double_buy_date_obj):
-                                    all_sell_currently_triggered = True                                     
-                                elif (single_sell_date_obj == oscillator_sell_date_obj) and (oscillator_sell_date_obj > double_sell_date_obj):
-                                    leaning_sell = True
-                                elif (oscillator_sell_date_obj > single_sell_date_obj) and (oscillator_sell_date_obj > double_sell_date_obj):
-                                    leaning_sell = True
-                        
-                            # Mixed conditions
-                            elif (single_buy_days_diff <= 30 and oscillator_buy_days_diff <= 30 and (double_buy_days_diff >= 30 and double_buy_days_diff <= 225)):
-                                if (single_buy_date_obj > single_sell_date_obj) and (oscillator_buy_date_obj > oscillator_sell_date_obj) and (double_buy_date_obj > double_sell_date_obj):
-                                    leaning_buy = True
-                                elif (single_buy_date_obj > single_sell_date_obj) and (oscillator_buy_date_obj < oscillator_sell_date_obj) and (double_buy_date_obj > double_sell_date_obj):
-                                    leaning_sell = True                                      
-                            elif (single_sell_days_diff <= 30 and oscillator_sell_days_diff <= 30 and (double_sell_days_diff >= 30 and double_sell_days_diff <= 225)):
-                                if (single_sell_date_obj < single_buy_date_obj) and (oscillator_sell_date_obj > oscillator_buy_date_obj) and (double_buy_date_obj > double_sell_date_obj):
-                                    leaning_sell = True                                
-                                    
-                    except ValueError:
-                        print(f"Warning: Could not parse date for {ticker_symbol}. Signal evaluation skipped.")
-
-                    # #################################################################################
-                    
-                    print(f">> --------------------------------------------------------------------")
-                    print(f">>  Reported Conclusion - {ticker_symbol} ...")
-                    print(f">> --------------------------------------------------------------------")
-                    print(f">> ")
+            if 'Ticker' not in input_df.columns:
+                print("Error: The CSV file must contain a 'Ticker' column.")
+                exit()
 
-                    leaning_status = "Undetermined"
-                    overall_status = "Overall Undetermined"
-                    
-                    if all_buy_currently_triggered:
-                        overall_status = "Overall Buy"
-                        print(f">>    OVERALL - EVWMA FORECAST - BUY Signal Triggered !!!")
-                    elif all_sell_currently_triggered:
-                        overall_status = "Overall Sell"
-                        print(f">>    OVERALL - EVWMA FORECAST - SELL Signal Triggered !!!")
-                    elif leaning_buy:
-                        leaning_status = "Leaning Buy"
-                        print(f">>    LEANING - EVWMA FORECAST - BUY Signals within last 33 Days !!! ")
-                    elif leaning_sell:
-                        leaning_status = "Leaning Sell"
-                        print(f">>    LEANING - EVWMA FORECAST - SELL Signals within last 33 Days !!! ")
-                    else:
-                        print(f">>    UNDETERMINED - EVWMA FORECAST - NOT enough evidence to draw a conclusion !!!")
-
-
-                    # Store the results for the final consolidated report
-                    all_ticker_results.append({
-                        'ticker_symbol': ticker_symbol,
-                        'leaning_status': leaning_status,
-                        'overall_status': overall_status,
-                        'single_buy_triggered': single_buy_triggered,
-                        'single_last_buy': single_last_buy,
-                        'single_sell_triggered': single_sell_triggered,
-                        'single_last_sell': single_last_sell,
-                        'oscillator_buy_triggered': oscillator_buy_triggered,
-                        'oscillator_last_buy': oscillator_last_buy,
-                        'oscillator_sell_triggered': oscillator_sell_triggered,
-                        'oscillator_last_sell': oscillator_last_sell,
-                        'double_buy_triggered': double_buy_triggered,
-                        'double_last_buy': double_last_buy,
-                        'double_sell_triggered': double_sell_triggered,
-                        'double_last_sell': double_last_sell,
-                    })
-
-                else:
-                    print(">>  Failed to calculate indicators from CSV.")
-            else:
-                print(">>  Data download failed, unable to proceed with indicator calculation and charting.")
+            if completed_results:
+                input_df = input_df[~input_df['Ticker'].astype(str).str.upper().isin(completed_results)]
+                print(f">>  {len(input_df)} tickers left to process")
+
+            # Process each ticker from the CSV
+            for index, row in input_df.iterrows():
+                ticker_symbol = row['Ticker'].upper()
+                ticker_result = process_ticker(ticker_symbol, timeframe, download_start_date_str, download_end_date_str,
+                                               output_dir, result_code_version)
+                if ticker_result is not None:
+                    all_ticker_results.append(ticker_result)
+                    runJournal.record_result(ticker_symbol, ticker_result)
+            run_finished = True
                 
-    except FileNotFoundError:
-        print(f"Error: The file '{csv_file_path}' was not found.")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        except FileNotFoundError:
+            print(f"Error: The file '{csv_file_path}' was not found.")
+        except KeyboardInterrupt:
+            print(f"\n>>  Interrupted - the report covers the finished tickers; rerun with --resume to process the rest.")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
         
     print(f">> ")  
     print(f">> --------------------------------------------------------------------")    
@@ -911,22 +1077,56 @@ if __name__ == "__main__":
     print(f">> --------------------------------------------------------------------")
     print(f">> ")
     
+    write_errors = frameHandoff.flush_writes()
+    if write_errors:
+        print(f">>  {len(write_errors)} historical data CSVs could not be written")
+
+    cache_stats = resultCache.save_cache()
+    if cache_stats:
+        print(f">>  Result cache: {cache_stats['hits']} reused, {cache_stats['misses']} computed, "
+              f"{cache_stats['entries']} stored, {cache_stats['evicted']} evicted")
+    dead_stats = deadTickers.save_dead_tickers()
+    if dead_stats:
+        print(f">>  Dead tickers: {dead_stats['skipped']} skipped, {dead_stats['recorded']} without data, "
+              f"{dead_stats['known']} on the list")
+
+    if args.role == 'worker':
+        # The report is written once, by the merge step
+        runMetrics.finish_metrics()
+        sys.exit(0)
+    elif args.role == 'merge':
+        queued_results = workQueue.load_results(args.queue_dir)
+        all_ticker_results = [queued['result'] for queued in queued_results if queued['result'] is not None]
+        dead_ticker_rows = sorted((queued['dead_ticker'] for queued in queued_results if queued['dead_ticker']),
+                                  key=lambda row: row['ticker'])
+        counts = workQueue.queue_counts(args.queue_dir)
+        print(f">>  Work queue: {workQueue.queue_path(args.queue_dir)} ({len(all_ticker_results)} tickers with results, "
+              f"{counts['done']} done, {counts['failed']} failed, {counts['pending'] + counts['leased']} unfinished)")
+        for ticker_symbol, error in workQueue.failed_items(args.queue_dir):
+            print(f">>    {ticker_symbol} failed: {error}")
+    else:
+        # The journal also holds the tickers of the earlier attempts of a resumed run
+        all_ticker_results = runJournal.load_results()
+        dead_ticker_rows = deadTickers.run_entries()
+        print(f">>  Run journal: {runJournal.journal_path()} ({len(all_ticker_results)} tickers)")
+        runJournal.close_journal(finished=run_finished)
+
     # --- CONSOLIDATED REPORTING SECTION ---
     print(f">> ")
     print(f">> --------------------------------------------------------------------")
     print(f">> Generating Consolidated HTML Report...")
     print(f">> --------------------------------------------------------------------")
     
-    html_report_content = generate_consolidated_html_report(all_ticker_results)
-    
     # Get today's date in YYYYMMDD format
     today_date_str = datetime.now().strftime('%Y%m%d')
     output_filename = f"price2EVWMA_Consolidated_Report.html"
-    html_file_path = os.path.join(report_dir, f"{today_date_str}_{output_filename}")
+    html_file_path = os.path.join(report_dir, f"{today_date_str}{timeframeBars.file_suffix(timeframe)}_{output_filename}")
     
     try:
-        with open(html_file_path, 'w') as f:
-            f.write(html_report_content)
+        with runMetrics.span('report'):
+            write_consolidated_html_report(all_ticker_results, html_file_path, dead_tickers=dead_ticker_rows)
         print(f">>    !!! Successfully generated Consolidated HTML report at:\n {html_file_path}")
     except Exception as e:
-        print(f"Error writing Consolidated HTML report: {e}")
\ No newline at end of file
+        print(f"Error writing Consolidated HTML report: {e}")
+
+    runMetrics.finish_metrics()
@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the scripts as modules
+import pricePanel
+import rsRanking
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Ranks the relative strength of every stored ticker against the whole universe and screens the strongest.",
+        epilog="Example: python cnsBtchRSRank.py --lookback 3M --min-percentile 90"
+    )
+    parser.add_argument('--history-dir', type=str, default=pricePanel.DEFAULT_HISTORY_DIR,
+                        help='Folder of stored history CSVs. Defaults to the _OUTPUT folder.')
+    parser.add_argument('--rs-dir', type=str, default=rsRanking.DEFAULT_RS_DIR,
+                        help='Folder of the RS rank history. Defaults to _OUTPUT/_RS.')
+    parser.add_argument('--lookback', choices=list(rsRanking.DEFAULT_LOOKBACKS), default='3M',
+                        help='Lookback of the screen. Defaults to 3M.')
+    parser.add_argument('--min-percentile', type=float, default=90.0,
+                        help='Lowest RS percentile that passes the screen. Defaults to 90 (the top decile).')
+    args = parser.parse_args()
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> BEGIN Processing - Relative Strength Ranking ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
+
+    report_dir = "E:/_scripts_PYTHON/_personal/_REPORT"
+    os.makedirs(report_dir, exist_ok=True)
+
+    # Only the stored histories are read - nothing is downloaded
+    frames = pricePanel.load_panel_frames(pricePanel.find_history_files(args.history_dir), fields=['close'])
+    if not frames:
+        print(f"Error: No stored history found in '{args.history_dir}'.")
+        sys.exit(1)
+
+    start_time = time.perf_counter()
+    handle = pricePanel.create_panel(frames, fields=['close'])
+    try:
+        summary = rsRanking.update_rank_history(pricePanel.field_array('close'), handle['dates'],
+                                                pricePanel.panel_tickers(), rsRanking.DEFAULT_LOOKBACKS, args.rs_dir)
+    finally:
+        pricePanel.close_panel(handle, unlink=True)
+
+    print(f">>    {len(frames)} tickers x {len(handle['dates'])} dates - "
+          f"{'rebuilt' if summary['rebuilt'] else 'appended'} {summary['added']} dates "
+          f"in {time.perf_counter() - start_time:.3f}s (last date {summary['last_date']})")
+
+    latest = summary['latest']
+    if latest is None or latest.empty:
+        print(f">>    No ticker has a ranked return on {summary['last_date']}.")
+        sys.exit(0)
+
+    screen = rsRanking.top_rs(latest, args.lookback, args.min_percentile)
+    print(f">> ")
+    print(f">>    RS {args.lookback} >= {args.min_percentile:g} on {summary['last_date']} "
+          f"({len(screen)} of {latest[f'rs_{args.lookback}'].notna().sum()} ranked tickers):")
+    for row in screen.itertuples(index=False):
+        print(f">>      {row.ticker:<8} RS {getattr(row, f'rs_{args.lookback}'):6.2f}   "
+              f"return {getattr(row, f'ret_{args.lookback}'):+.2%}")
+
+    output_filename = os.path.join(report_dir, f"{datetime.now().strftime('%Y%m%d')}_RS_{args.lookback}_Screen.csv")
+    screen.to_csv(output_filename, index=False)
+
+    print(f">> ")
+    print(f">>    Screen saved to '{output_filename}'")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> END Processing - Relative Strength Ranking ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
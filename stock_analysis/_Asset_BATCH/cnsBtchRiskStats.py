@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the scripts as modules
+import pricePanel
+import riskStats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Updates the beta / covariance / correlation statistics of every stored ticker from local daily returns.",
+        epilog="Example: python cnsBtchRiskStats.py --benchmark SPY --hits screener_hits.csv --threshold 0.7"
+    )
+    parser.add_argument('--history-dir', type=str, default=pricePanel.DEFAULT_HISTORY_DIR,
+                        help='Folder of stored history CSVs. Defaults to the _OUTPUT folder.')
+    parser.add_argument('--risk-dir', type=str, default=riskStats.DEFAULT_RISK_DIR,
+                        help='Folder of the risk state and beta file. Defaults to _OUTPUT/_RISK.')
+    parser.add_argument('--benchmark', type=str, default=riskStats.DEFAULT_BENCHMARK,
+                        help='Ticker the betas are measured against. Defaults to SPY.')
+    parser.add_argument('--hits', type=str, default=None,
+                        help="CSV file with a 'Ticker' column (e.g. today's screener hits) to group into correlated clusters.")
+    parser.add_argument('--threshold', type=float, default=0.7,
+                        help='Lowest return correlation that links two tickers into a cluster. Defaults to 0.7.')
+    args = parser.parse_args()
+    benchmark_ticker = args.benchmark.upper()
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> BEGIN Processing - Risk Statistics ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
+
+    # Only the stored histories are read - nothing is downloaded
+    frames = pricePanel.load_panel_frames(pricePanel.find_history_files(args.history_dir), fields=['close'])
+    if not frames:
+        print(f"Error: No stored history found in '{args.history_dir}'.")
+        sys.exit(1)
+
+    start_time = time.perf_counter()
+    handle = pricePanel.create_panel(frames, fields=['close'])
+    try:
+        tickers = pricePanel.panel_tickers()
+        returns = riskStats.daily_returns(pricePanel.field_array('close'))
+    finally:
+        pricePanel.close_panel(handle, unlink=True)
+
+    state = riskStats.load_risk_state(args.risk_dir)
+    added = riskStats.update_risk_state(state, returns, handle['dates'], tickers) if state is not None else None
+    if added is None:
+        state = riskStats.build_risk_state(returns, handle['dates'], tickers)
+        print(f">>    Risk state built over {state['returns'].shape[1]} bars of {len(tickers)} tickers")
+    else:
+        print(f">>    Risk state moved forward by {added} bars")
+    riskStats.save_risk_state(state, args.risk_dir)
+    print(f">>    Updated in {time.perf_counter() - start_time:.3f}s "
+          f"(window ends {pd.Timestamp(state['dates'][-1]).date() if len(state['dates']) else 'N/A'})")
+
+    betas = riskStats.state_betas(state, benchmark_ticker)
+    if betas is None:
+        print(f">>    {benchmark_ticker} has no stored history with {riskStats.MIN_BARS} bars - no betas written.")
+    else:
+        beta_file = os.path.join(args.risk_dir, f"betas_{benchmark_ticker}.csv")
+        betas.rename('Beta').rename_axis('Ticker').to_csv(beta_file)
+        print(f">>    {len(betas)} betas against {benchmark_ticker} saved to '{beta_file}'")
+
+    if args.hits:
+        try:
+            hits = pd.read_csv(args.hits)['Ticker'].dropna().astype(str).str.upper().tolist()
+        except (FileNotFoundError, KeyError) as e:
+            print(f"Error: Could not read the 'Ticker' column of '{args.hits}': {e}")
+            sys.exit(1)
+
+        clusters = riskStats.correlated_clusters(riskStats.correlation_matrix(state), hits, args.threshold)
+        print(f">> ")
+        print(f">>    Correlated clusters among {len(hits)} tickers (correlation >= {args.threshold:g}): {len(clusters)}")
+        for cluster in clusters:
+            print(f">>      {', '.join(cluster)}")
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> END Processing - Risk Statistics ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+from datetime import datetime
+
+# Get the path to the 'utils' and 'signal' folders
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+signals = os.path.join(os.path.dirname(__file__), '..', '_Asset_SIGNAL')
+
+# Add the folders to the system path
+sys.path.append(utils)
+sys.path.append(signals)
+
+# Now you can import the scripts as modules
+import smaScanner
+import timeframeBars
+import plotPrice2EVWMA
+import smaBuy
+import frameHandoff
+import tradingCalendar
+
+def parse_pairs(text):
+    """'21:7,15:45' -> [(21, 7), (15, 45)]"""
+    pairs = []
+    for item in text.split(','):
+        fast, slow = item.strip().split(':')
+        pairs.append((int(fast), int(slow)))
+    return pairs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Scans every ticker in a CSV file for SMA crossovers of many (fast, slow) pairs at once.",
+        epilog="Example: python cnsBtchSMAScan.py --pairs 21:7,15:45 --timeframe 1wk"
+    )
+    parser.add_argument('--pairs', type=str, default=','.join(f"{f}:{s}" for f, s in smaScanner.DEFAULT_SMA_PAIRS),
+                        help='Comma-separated fast:slow SMA periods. Defaults to the plotSMA pairs.')
+    parser.add_argument('--timeframe', choices=list(timeframeBars.TIMEFRAMES), default='1d',
+                        help='Bar timeframe. Defaults to 1d.')
+    args = parser.parse_args()
+
+    try:
+        sma_pairs = parse_pairs(args.pairs)
+    except ValueError:
+        print(f"Error: Invalid --pairs '{args.pairs}'. Use fast:slow pairs, e.g. 21:7,15:45.")
+        sys.exit(1)
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> BEGIN Processing - Batch SMA Crossover Scan ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
+
+    # Define the output directories and ensure they exist
+    output_dir = "E:/_scripts_PYTHON/_personal/_OUTPUT"
+    report_dir = "E:/_scripts_PYTHON/_personal/_REPORT"
+
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(report_dir, exist_ok=True)
+
+    # Get today's date in YYYYMMDD format
+    today_date_str = datetime.now().strftime('%Y%m%d')
+
+    csv_file_path = input("Enter the path to the input CSV file: ")
+
+    try:
+        input_df = pd.read_csv(csv_file_path)
+    except FileNotFoundError:
+        print(f"Error: The file '{csv_file_path}' was not found.")
+        sys.exit(1)
+
+    if 'Ticker' not in input_df.columns:
+        print("Error: The CSV file must contain a 'Ticker' column.")
+        sys.exit(1)
+
+    # Same window as cnsBtchPrc2EVWMA, so its historical data CSVs of today are reused
+    start_date_str, end_date_str = tradingCalendar.download_window(tradingCalendar.BATCH_DOWNLOAD_SESSIONS)
+
+    closes = {}
+    for ticker_symbol in input_df['Ticker'].dropna().str.upper().unique():
+        csv_file = os.path.join(output_dir, f"{today_date_str}_{ticker_symbol}_historical_data.csv")
+        if not frameHandoff.covers_window(csv_file, start_date_str, end_date_str):
+            csv_file = plotPrice2EVWMA.download_historical_data(ticker_symbol, start_date_str, end_date_str, csv_file)
+        if not csv_file:
+            print(f">>    Data download failed for {ticker_symbol}. Skipping.")
+            continue
+
+        data = smaBuy.load_data_from_csv(csv_file, args.timeframe, ticker_symbol)
+        if data.empty:
+            print(f">>    Failed to load data from {csv_file}. Skipping.")
+            continue
+        closes[ticker_symbol] = data['close']
+
+    print(f">> ")
+    print(f">>    Scanning {len(closes)} tickers for {len(sma_pairs)} SMA pairs ...")
+    start_time = time.perf_counter()
+    scan_df = smaScanner.scan_crossovers(closes, sma_pairs)
+    print(f">>    Scanned in {time.perf_counter() - start_time:.3f}s")
+
+    for fast, slow in sma_pairs:
+        pair_df = scan_df[(scan_df['fast'] == fast) & (scan_df['slow'] == slow)]
+        buys = sorted(pair_df.loc[pair_df['buy_signal'], 'ticker'])
+        sells = sorted(pair_df.loc[pair_df['sell_signal'], 'ticker'])
+        print(f">> ")
+        print(f">>    SMA {fast}/{slow} - Buy today ({len(buys)}): {', '.join(buys) or '-'}")
+        print(f">>    SMA {fast}/{slow} - Sell today ({len(sells)}): {', '.join(sells) or '-'}")
+
+    output_filename = os.path.join(report_dir, f"{today_date_str}{timeframeBars.file_suffix(args.timeframe)}_SMA_Crossover_Scan.csv")
+    scan_df.to_csv(output_filename, index=False)
+
+    print(f">> ")
+    print(f">>    Scan results saved to '{output_filename}'")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> END Processing - Batch SMA Crossover Scan ...")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> ")
@@ -1,6 +1,150 @@
 import csv
 import argparse
 import os
+import numpy as np
+import pandas as pd
+
+def load_ticker_prices(input_csv_file):
+    """
+    Reads only the ticker and close columns of a market export with the typed
+    C reader (column names are matched case-insensitively).
+
+    Args:
+        input_csv_file (str): The path to the input CSV file.
+
+    Returns:
+        tuple: (numpy array of tickers, numpy float64 array of close prices),
+               or None if the file cannot be used.
+    """
+    if not os.path.exists(input_csv_file):
+        print(f"Error: The input CSV file '{input_csv_file}' was not found.")
+        return None
+
+    header = pd.read_csv(input_csv_file, nrows=0).columns
+    columns_by_lower = {name.strip().lower(): name for name in header}
+
+    if not all(col in columns_by_lower for col in ['ticker', 'close']):
+        print(f"Error: The CSV file '{input_csv_file}' must contain 'ticker' and 'close' columns (case-insensitive).")
+        return None
+
+    ticker_col = columns_by_lower['ticker']
+    close_col = columns_by_lower['close']
+
+    # No NA parsing: symbols such as 'NA' or 'NULL' are tickers, and a
+    # non-numeric close becomes NaN in to_numeric() below
+    data = pd.read_csv(
+        input_csv_file,
+        usecols=[ticker_col, close_col],
+        dtype={ticker_col: str},
+        keep_default_na=False,
+        engine='c'
+    )
+
+    close_prices = pd.to_numeric(data[close_col], errors='coerce').to_numpy(dtype=np.float64)
+    tickers = data[ticker_col].to_numpy()
+
+    invalid = np.isnan(close_prices) | (tickers == '')
+    if invalid.any():
+        print(f"Warning: Skipped {int(invalid.sum())} row(s) with a missing ticker or a non-numeric 'close' price.")
+
+    return tickers[~invalid], close_prices[~invalid]
+
+def assign_price_bands(close_prices, price_bands):
+    """
+    Assigns every price to its band in one vectorized binary search.
+
+    Bands are inclusive on both ends and must not overlap; where two bands
+    share an edge, a price on that edge goes to the higher band.
+
+    Args:
+        close_prices (numpy.ndarray): The close prices.
+        price_bands (list): (min_price, max_price) tuples, already sorted by min_price.
+
+    Returns:
+        numpy.ndarray: The band index for each price, or -1 if it falls in no band.
+    """
+    band_lows = np.array([band[0] for band in price_bands], dtype=np.float64)
+    band_highs = np.array([band[1] for band in price_bands], dtype=np.float64)
+
+    band_index = np.searchsorted(band_lows, close_prices, side='right') - 1
+    in_band = band_index >= 0
+    in_band[in_band] = close_prices[in_band] <= band_highs[band_index[in_band]]
+
+    return np.where(in_band, band_index, -1)
+
+def validate_price_bands(price_bands):
+    """
+    Sorts the bands by their lower edge and checks that they do not overlap.
+
+    Returns:
+        list: The sorted bands, or None if they are invalid.
+    """
+    sorted_bands = sorted((float(low), float(high)) for low, high in price_bands)
+
+    for low, high in sorted_bands:
+        if low > high:
+            print(f"Error: Price band ${low:.2f} - ${high:.2f} has its minimum above its maximum.")
+            return None
+
+    for (_, previous_high), (low, _) in zip(sorted_bands, sorted_bands[1:]):
+        if low < previous_high:
+            print(f"Error: Price bands overlap at ${low:.2f} - ${previous_high:.2f}.")
+            return None
+
+    return sorted_bands
+
+def find_tickers_in_price_bands(input_csv_file, output_csv_file, price_bands):
+    """
+    Splits all stock tickers of a CSV file into price bands in a single pass
+    and writes one comma-separated row of tickers per band to a new CSV file.
+
+    Args:
+        input_csv_file (str): The path to the input CSV file.
+        output_csv_file (str): The path to the output CSV file.
+        price_bands (list): (min_price, max_price) tuples; inclusive and non-overlapping.
+
+    Returns:
+        dict: Sorted unique tickers keyed by (min_price, max_price), or None on error.
+    """
+    try:
+        sorted_bands = validate_price_bands(price_bands)
+        if not sorted_bands:
+            return None
+
+        loaded = load_ticker_prices(input_csv_file)
+        if loaded is None:
+            return None
+        tickers, close_prices = loaded
+
+        band_index = assign_price_bands(close_prices, sorted_bands)
+
+        # Group tickers by band: one stable sort instead of one scan per band
+        order = np.argsort(band_index, kind='stable')
+        boundaries = np.searchsorted(band_index[order], np.arange(len(sorted_bands) + 1), side='left')
+
+        tickers_by_band = {}
+        for i, band in enumerate(sorted_bands):
+            band_tickers = tickers[order[boundaries[i]:boundaries[i + 1]]]
+            tickers_by_band[band] = sorted(set(band_tickers))
+
+        with open(output_csv_file, mode='w', newline='') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(['Price Band', 'Filtered Tickers'])
+            for (min_price, max_price), found_tickers in tickers_by_band.items():
+                band_label = f"{min_price:.2f}-{max_price:.2f}"
+                if found_tickers:
+                    writer.writerow([band_label] + found_tickers)
+                    print(f"Found {len(found_tickers)} tickers between ${min_price:.2f} and ${max_price:.2f}.")
+                else:
+                    writer.writerow([band_label, 'No tickers found in the specified price range.'])
+                    print(f"No tickers found between ${min_price:.2f} and ${max_price:.2f}.")
+
+        print(f"Results for {len(sorted_bands)} price band(s) saved to '{output_csv_file}', one comma-delimited row per band.")
+        return tickers_by_band
+
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
 
 def find_tickers_in_price_range(input_csv_file, output_csv_file, min_price, max_price):
     """
@@ -13,31 +157,14 @@ def find_tickers_in_price_range(input_csv_file, output_csv_file, min_price, max_
         min_price (float): The minimum closing price for filtering.
         max_price (float): The maximum closing price for filtering.
     """
-    found_tickers = set()  # Use a set to store unique tickers
-
     try:
-        # Check if the input file exists
-        if not os.path.exists(input_csv_file):
-            print(f"Error: The input CSV file '{input_csv_file}' was not found.")
+        loaded = load_ticker_prices(input_csv_file)
+        if loaded is None:
             return
+        tickers, close_prices = loaded
 
-        with open(input_csv_file, mode='r', newline='') as infile:
-            reader = csv.DictReader(infile)
-            fieldnames = [name.lower() for name in reader.fieldnames]
-
-            if not all(col in fieldnames for col in ['ticker', 'close']):
-                print(f"Error: The CSV file '{input_csv_file}' must contain 'ticker' and 'close' columns (case-insensitive).")
-                return
-
-            for row in reader:
-                try:
-                    close_price = float(row['close'])
-                    if min_price <= close_price <= max_price:
-                        found_tickers.add(row['ticker'])
-                except ValueError:
-                    print(f"Warning: Could not convert 'close' price '{row['close']}' to a number for ticker '{row['ticker']}'. Skipping.")
-                except KeyError:
-                    print(f"Warning: 'close' column not found in row: {row}. Skipping.")
+        band_index = assign_price_bands(close_prices, [(min_price, max_price)])
+        found_tickers = set(tickers[band_index == 0])
 
         with open(output_csv_file, mode='w', newline='') as outfile:
             writer = csv.writer(outfile)
@@ -58,11 +185,21 @@ def find_tickers_in_price_range(input_csv_file, output_csv_file, min_price, max_
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
 
+def parse_price_bands(bands_argument):
+    """
+    Parses a band list such as '0.22-0.55,0.55-1,1-5' into (min, max) tuples.
+    """
+    price_bands = []
+    for band in bands_argument.split(','):
+        low, high = band.strip().split('-')
+        price_bands.append((float(low), float(high)))
+    return price_bands
+
 if __name__ == "__main__":
     # Define a custom usage message to make it clearer for the user
     parser = argparse.ArgumentParser(
         description="Filters stock tickers from a CSV file by their closing price.",
-        epilog="Example: python ticker_filter.py my_data.csv"
+        epilog="Example: python ticker_filter.py my_data.csv --bands 0.22-0.55,0.55-1,1-5"
     )
 
     # The CSV file path is a required positional argument
@@ -71,7 +208,7 @@ if __name__ == "__main__":
         type=str,
         help='The path to the input CSV file (e.g., OTCBB_20250828.csv).'
     )
-    
+
     # We add arguments for min and max price with default values
     parser.add_argument(
         '--min',
@@ -80,7 +217,7 @@ if __name__ == "__main__":
         default=0.22,
         help='The minimum closing price for filtering. Defaults to $0.22.'
     )
-    
+
     parser.add_argument(
         '--max',
         dest='max_price',
@@ -89,27 +226,42 @@ if __name__ == "__main__":
         help='The maximum closing price for filtering. Defaults to $0.55.'
     )
 
+    # Several bands at once - overrides --min/--max
+    parser.add_argument(
+        '--bands',
+        dest='price_bands',
+        type=parse_price_bands,
+        default=None,
+        help='Comma-separated price bands split in one pass, e.g. 0.22-0.55,0.55-1,1-5. Overrides --min/--max.'
+    )
+
     # Parse the command-line arguments. The -h and --help flags are handled automatically.
     args = parser.parse_args()
 
     # Define the output directory
     output_dir = "./_OUTPUT"
-    
+
     # Create the directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
     # Generate the output filename based on the input filename
     base_name = os.path.basename(args.csv_file)
     file_name_without_ext, ext = os.path.splitext(base_name)
-    output_filename = f"{file_name_without_ext}_filtered.csv"
-    
-    # Combine the directory and the filename
-    output_file = os.path.join(output_dir, output_filename)
-
-    # Call the main function with the parsed arguments and the new output filename
-    find_tickers_in_price_range(
-        args.csv_file,
-        output_file,
-        args.min_price,
-        args.max_price
-    )
+
+    if args.price_bands:
+        output_filename = f"{file_name_without_ext}_banded.csv"
+        output_file = os.path.join(output_dir, output_filename)
+        find_tickers_in_price_bands(args.csv_file, output_file, args.price_bands)
+    else:
+        output_filename = f"{file_name_without_ext}_filtered.csv"
+
+        # Combine the directory and the filename
+        output_file = os.path.join(output_dir, output_filename)
+
+        # Call the main function with the parsed arguments and the new output filename
+        find_tickers_in_price_range(
+            args.csv_file,
+            output_file,
+            args.min_price,
+            args.max_price
+        )
@@ -1,8 +1,17 @@
-import yfinance as yf
+import sys
 import pandas as pd
 from datetime import datetime
 import os
 
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import marketData
+
 def download_historical_data(ticker, start_date, end_date, interval='1d', save_csv=True, filename=None):
     """
     Downloads historical data for a given ticker from Yahoo Finance.
@@ -36,7 +45,7 @@ def download_historical_data(ticker, start_date, end_date, interval='1d', save_c
 
     try:
         print(f"Downloading historical data for {ticker} from {start_date} to {end_date} with interval {interval}...")
-        data = yf.download(ticker, start=start_date, end=end_date, interval=interval)
+        data = marketData.download(ticker, start=start_date, end=end_date, interval=interval)
 
         if data.empty:
             print(f"No data found for {ticker} within the specified range/interval.")
@@ -1,8 +1,19 @@
-import yfinance as yf
+import os
+import sys
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import marketData
+import riskStats
+
 # --- 1. Define Dual Screening Criteria ---
 
 # Conservative Screen: Focus on Quality, Value, and Stability
@@ -35,7 +46,7 @@ def get_technical_data(ticker, period_days):
     
     try:
         # Long-term data for 1Y Momentum and Beta
-        long_data = yf.Ticker(ticker).history(start=start_date_long, end=end_date, interval="1d")
+        long_data = marketData.history(ticker, start=start_date_long, end=end_date, interval="1d")
         
         # 1-Year Momentum
         if len(long_data) >= 252:
@@ -43,11 +54,12 @@ def get_technical_data(ticker, period_days):
         else:
             mom_1y = None
 
-        # Beta (requires market data, using S&P 500 as benchmark)
-        beta = yf.Ticker(ticker).info.get('beta')
+        # Beta against the S&P 500 from the daily closes above - no metadata request per ticker
+        benchmark_closes = riskStats.get_benchmark_closes(start_date_long, end_date)
+        beta = riskStats.series_beta(long_data['Close'], benchmark_closes) if benchmark_closes is not None else None
         
         # Short-term data for ATR, 1W/1M Momentum
-        short_data = yf.Ticker(ticker).history(start=start_date_short, end=end_date, interval="1d")
+        short_data = marketData.history(ticker, start=start_date_short, end=end_date, interval="1d")
         
         # Momentum for the specified short period
         mom_short = None
@@ -76,7 +88,7 @@ def get_rsi(ticker):
     start_date = end_date - timedelta(days=40)
     
     try:
-        data = yf.Ticker(ticker).history(start=start_date, end=end_date, interval="1d")['Close']
+        data = marketData.history(ticker, start=start_date, end=end_date, interval="1d")['Close']
         if data.empty or len(data) < 28:
             return None
 
@@ -95,7 +107,7 @@ def get_rsi(ticker):
 def get_fundamentals(ticker):
     """Pulls fundamental data (P/E, P/B, ROE) from yfinance Ticker object."""
     try:
-        info = yf.Ticker(ticker).info
+        info = marketData.info(ticker)
         p_e = info.get('trailingPE')
         p_b = info.get('priceToBook')
         roe = info.get('returnOnEquity')
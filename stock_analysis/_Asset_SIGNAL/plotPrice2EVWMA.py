@@ -1,11 +1,26 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import yfinance as yf
+from matplotlib.collections import PolyCollection
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import marketData
+import frameHandoff
+import seriesDownsample
+import csvNormalize
+
 def calculate_ema(data, span):
     """
     Calculates the Exponential Moving Average (EMA) manually.
@@ -23,77 +38,16 @@ def clean_csv_header(input_filepath, ticker, output_filepath=None):
     """
     Reads a CSV file, replaces 'Price' with 'Date' in the first line,
     and removes specific second and third lines if they match the specified format.
+    The file is streamed through csvNormalize, so it is never read into memory whole.
 
     Args:
         input_filepath (str): The path to the input CSV file.
         output_filepath (str, optional): The path to save the cleaned CSV file.
-                                        If None, the input file will be overwritten.
-                                        Defaults to None.
+                                         If None, the input file will be overwritten.
+                                         Defaults to None.
     """
-    if output_filepath is None:
-        output_filepath = input_filepath
-
-    lines = []
-    try:
-        with open(input_filepath, 'r') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        print(f"Error: The file '{input_filepath}' was not found.")
-        return
-    except Exception as e:
-        print(f"An error occurred while reading the file: {e}")
-        return
-
-    modified_lines = []
-    
-    # Process the first line
-    if lines:
-        first_line = lines[0].strip()
-        if first_line.startswith('Price,'):
-            modified_lines.append('date' + first_line[5:] + '\n')
-            print(f"Modified first line: '{first_line.strip()}' -> 'date{first_line[5:].strip()}'")
-        else:
-            modified_lines.append(lines[0])
-            print(f"First line not modified: '{first_line.strip()}'")
-    else:
-        print("The CSV file is empty.")
-        return
-
-    # Process subsequent lines for removal
-    lines_to_skip = 0
-    if len(lines) > 1:
-        second_line = lines[1].strip()
-        # Check for the exact format "Ticker,JNJ,JNJ,JNJ,JNJ,JNJ"
-        if second_line.startswith('Ticker,') and all(part == ticker for part in second_line.split(',')[1:]):
-            lines_to_skip += 1
-            print(f"Skipping second line: '{second_line}'")
-        else:
-            modified_lines.append(lines[1])
-            print(f"Second line not skipped: '{second_line}'")
-
-    if len(lines) > 2 and lines_to_skip == 1: # Only check third line if second was skipped
-        third_line = lines[2].strip()
-        # Check for the exact format "Date,,,,"
-        if third_line == 'Date,,,,,':
-            lines_to_skip += 1
-            print(f"Skipping third line: '{third_line}'")
-        else:
-            # If the second line was skipped but the third wasn't, add the third line back.
-            # This handles cases where only the second line matches for skipping.
-            if lines_to_skip == 1: # This means the second line was skipped, but third was not.
-                modified_lines.append(lines[2])
-                print(f"Third line not skipped: '{third_line}'")
-
-    # Add remaining lines
-    modified_lines.extend(lines[lines_to_skip + 1:])
+    csvNormalize.clean_csv_header(input_filepath, ticker, output_filepath)
 
-    try:
-        with open(output_filepath, 'w') as f:
-            f.writelines(modified_lines)
-        print(f"CSV file cleaned successfully. Output saved to '{output_filepath}'")
-    except Exception as e:
-        print(f"An error occurred while writing the file: {e}")
-        
 def download_historical_data(ticker, start_date, end_date, output_filename):
     """
     Downloads historical stock data using yfinance and saves it to a CSV file.
@@ -111,7 +65,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
     print(f"Attempting to download historical data for {ticker} from {start_date} to {end_date}...")
     try:
         # Download data with auto_adjust=True for adjusted prices directly in 'Close'
-        data = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True)
+        data = marketData.download(ticker, start=start_date, end=end_date, auto_adjust=True)
 
         if data.empty:
             print(f"No data downloaded for {ticker} in the specified date range. Please check the ticker and dates.")
@@ -147,7 +101,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
 
         # Set index name to 'date' (lowercase) before saving
         data.index.name = 'date'
-        data.to_csv(output_filename, index=True, header=True)
+        frameHandoff.save_frame(data, output_filename)
         print(f"Historical data for {ticker} saved to {output_filename}")
         
         # We are skipping the clean_csv_header call here as it's not designed for yfinance output
@@ -171,7 +125,7 @@ def calculate_indicators_from_csv(csv_filepath):
     try:
         print(f"Reading historical data from: {csv_filepath}...")
         # CRUCIAL FIX: Use 'date' (lowercase) for index_col
-        data = pd.read_csv(csv_filepath, index_col='date', parse_dates=True)
+        data = frameHandoff.load_frame(csv_filepath, lambda path: pd.read_csv(path, index_col='date', parse_dates=True))
 
         if data.empty:
             print(f"No data found in {csv_filepath}.")
@@ -296,11 +250,72 @@ def calculate_indicators_from_csv(csv_filepath):
         print(f"An error occurred during data loading or calculation: {e}")
         return None
 
-def generate_single_evwma_chart(df, title="Price Crossovers with Single EVWMA (Standard Logic)"):
+def downsample_chart_frame(df, line_columns, signal_index, max_points):
+    """
+    Returns the rows of df to draw, downsampled with LTTB when the series is
+    longer than max_points. Rows of signal_index (and the row before each) are
+    always kept, so the crossover markers still sit where the lines cross.
+    """
+    if not max_points or len(df) <= max_points:
+        return df
+
+    x = mdates.date2num(df.index)
+    keep = df.index.get_indexer(signal_index)
+    positions = seriesDownsample.downsample_positions(
+        x, [df[col].to_numpy() for col in line_columns], max_points, keep[keep >= 0]
+    )
+    return df.iloc[positions]
+
+def add_histogram_collection(ax, index, values, max_points=None, alpha=0.6):
+    """
+    Draws a green/red histogram as one PolyCollection instead of one bar patch per value.
+    Longer series than max_points keep the largest bar of each bucket, widened to fill it:
+    the kept bars meet halfway between their dates, so uneven gaps never make them overlap.
+    """
+    x = mdates.date2num(index)
+    values = np.asarray(values, dtype=np.float64)
+
+    if max_points and len(values) > max_points:
+        kept = seriesDownsample.extreme_indices(values, max_points)
+        x, values = x[kept], values[kept]
+
+    if len(x) > 1 and len(x) < len(index):
+        # Shared edges halfway between kept dates, so neighbouring buckets tile
+        middles = (x[:-1] + x[1:]) / 2
+        left = np.concatenate([[2 * x[0] - middles[0]], middles])
+        right = np.concatenate([middles, [2 * x[-1] - middles[-1]]])
+    else:
+        left, right = x - 0.5, x + 0.5
+    heights = np.nan_to_num(values)
+
+    # (bars, 4 corners, xy)
+    verts = np.stack([
+        np.column_stack([left, np.zeros_like(heights)]),
+        np.column_stack([left, heights]),
+        np.column_stack([right, heights]),
+        np.column_stack([right, np.zeros_like(heights)]),
+    ], axis=1)
+    colors = np.where(values >= 0, 'green', 'red')
+
+    ax.add_collection(PolyCollection(verts, facecolors=colors, edgecolors='none', alpha=alpha))
+    ax.autoscale_view()
+
+def finish_chart(fig, output_path=None):
+    """Shows the chart interactively, or saves it (PNG/SVG by extension) and frees the figure."""
+    if output_path:
+        fig.savefig(output_path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+def generate_single_evwma_chart(df, title="Price Crossovers with Single EVWMA (Standard Logic)", output_path=None, max_points=None):
     """
     Generates a chart of Close Price and a single EVWMA, showing standard crossover signals.
     X-axis labels are shown only at signal points.
     Uses lowercase column names.
+
+    With output_path the chart is saved instead of shown; with max_points long
+    series are downsampled before drawing.
     """
     # CRUCIAL FIX: Use lowercase column names
     if 'close' not in df.columns or 'evwma_short' not in df.columns:
@@ -309,9 +324,6 @@ def generate_single_evwma_chart(df, title="Price Crossovers with Single EVWMA (S
 
     fig, ax = plt.subplots(figsize=(14, 7))
 
-    ax.plot(df.index, df['close'], label='Close Price', color='blue', linewidth=1.5, alpha=0.7)
-    ax.plot(df.index, df['evwma_short'], label=f'EVWMA (Short)', color='red', linewidth=1.5)
-
     # --- STANDARD BUY SIGNAL: Price crosses ABOVE EVWMA (EVWMA goes below Price) ---
     buy_signals = df[
         (df['close'].shift(1) < df['evwma_short'].shift(1)) & # Price was below EVWMA
@@ -324,6 +336,10 @@ def generate_single_evwma_chart(df, title="Price Crossovers with Single EVWMA (S
         (df['close'] <= df['evwma_short'])                      # Price is now below or equal to EVWMA
     ]
 
+    plot_df = downsample_chart_frame(df, ['close', 'evwma_short'], buy_signals.index.append(sell_signals.index), max_points)
+    ax.plot(plot_df.index, plot_df['close'], label='Close Price', color='blue', linewidth=1.5, alpha=0.7)
+    ax.plot(plot_df.index, plot_df['evwma_short'], label=f'EVWMA (Short)', color='red', linewidth=1.5)
+
     # Plot Signals
     ax.scatter(buy_signals.index, buy_signals['close'], marker='^', color='green', s=100, label='Price Crosses Above EVWMA (Buy)', zorder=5)
     ax.scatter(sell_signals.index, sell_signals['close'], marker='v', color='red', s=100, label='Price Crosses Below EVWMA (Sell)', zorder=5)
@@ -350,14 +366,17 @@ def generate_single_evwma_chart(df, title="Price Crossovers with Single EVWMA (S
     ax.legend(loc='best', fontsize=10)
     ax.grid(True, linestyle='--', alpha=0.6)
     plt.tight_layout()
-    plt.show()
+    finish_chart(fig, output_path)
 
-def generate_double_evwma_chart(df, title="Double EVWMA Crossover Signals"):
+def generate_double_evwma_chart(df, title="Double EVWMA Crossover Signals", output_path=None, max_points=None):
     """
     Generates a chart of Close Price and two EVWMAs, showing signals based on
     the short EVWMA crossing the long EVWMA.
     X-axis labels are shown only at signal points.
     Uses lowercase column names.
+
+    With output_path the chart is saved instead of shown; with max_points long
+    series are downsampled before drawing.
     """
     # CRUCIAL FIX: Use lowercase column names
     if 'close' not in df.columns or 'evwma_short' not in df.columns or 'evwma_long' not in df.columns:
@@ -366,10 +385,6 @@ def generate_double_evwma_chart(df, title="Double EVWMA Crossover Signals"):
 
     fig, ax = plt.subplots(figsize=(14, 7))
 
-    ax.plot(df.index, df['close'], label='Close Price', color='blue', linewidth=1.5, alpha=0.7)
-    ax.plot(df.index, df['evwma_short'], label=f'EVWMA (Short)', color='red', linewidth=1.5)
-    ax.plot(df.index, df['evwma_long'], label=f'EVWMA (Long)', color='purple', linewidth=1.5)
-
     # --- Double EVWMA Crossover Signal Logic ---
     # Buy Signal: Short EVWMA crosses ABOVE Long EVWMA
     # CRUCIAL FIX: Use lowercase EVWMA column names
@@ -381,6 +396,11 @@ def generate_double_evwma_chart(df, title="Double EVWMA Crossover Signals"):
     sell_signals = df[df['evwma_short'].shift(1) > df['evwma_long'].shift(1)] \
                        [df['evwma_short'] <= df['evwma_long']]
 
+    plot_df = downsample_chart_frame(df, ['close', 'evwma_short', 'evwma_long'], buy_signals.index.append(sell_signals.index), max_points)
+    ax.plot(plot_df.index, plot_df['close'], label='Close Price', color='blue', linewidth=1.5, alpha=0.7)
+    ax.plot(plot_df.index, plot_df['evwma_short'], label=f'EVWMA (Short)', color='red', linewidth=1.5)
+    ax.plot(plot_df.index, plot_df['evwma_long'], label=f'EVWMA (Long)', color='purple', linewidth=1.5)
+
     # Plot Signals (on the Short EVWMA line for visual clarity)
     # CRUCIAL FIX: Use lowercase EVWMA column name
     ax.scatter(buy_signals.index, buy_signals['evwma_short'], marker='^', color='green', s=100, label='Short EVWMA Crosses Above Long (Buy)', zorder=5)
@@ -408,14 +428,17 @@ def generate_double_evwma_chart(df, title="Double EVWMA Crossover Signals"):
     ax.legend(loc='best', fontsize=10)
     ax.grid(True, linestyle='--', alpha=0.6)
     plt.tight_layout()
-    plt.show()
+    finish_chart(fig, output_path)
 
-def generate_evwma_macd_style_chart(df, title="EVWMA Oscillator (MACD Style) Signals"):
+def generate_evwma_macd_style_chart(df, title="EVWMA Oscillator (MACD Style) Signals", output_path=None, max_points=None):
     """
     Generates a chart with Close Price & EVWMAs in the top panel,
     and EVWMA Oscillator, Signal Line, and Histogram in a lower panel,
     showing signals based on Oscillator/Signal Line crossovers.
     Uses lowercase column names.
+
+    With output_path the chart is saved instead of shown; with max_points long
+    series are downsampled before drawing.
     """
     # CRUCIAL FIX: Use lowercase column names
     if not all(col in df.columns for col in ['close', 'evwma_short', 'evwma_long', 
@@ -426,11 +449,22 @@ def generate_evwma_macd_style_chart(df, title="EVWMA Oscillator (MACD Style) Sig
     # Create subplots: 2 rows, 1 column. Share x-axis (dates)
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 9), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
 
+    # --- Signals based on EVWMA Oscillator crossing EVWMA Signal ---
+    # CRUCIAL FIX: Use lowercase column names
+    buy_signals_osc = df[df['evwma_oscillator'].shift(1) < df['evwma_signal'].shift(1)] \
+                          [df['evwma_oscillator'] >= df['evwma_signal']]
+    
+    sell_signals_osc = df[df['evwma_oscillator'].shift(1) > df['evwma_signal'].shift(1)] \
+                           [df['evwma_oscillator'] <= df['evwma_signal']]
+
+    plot_df = downsample_chart_frame(df, ['close', 'evwma_short', 'evwma_long', 'evwma_oscillator', 'evwma_signal'],
+                                     buy_signals_osc.index.append(sell_signals_osc.index), max_points)
+
     # --- Top Panel: Price and EVWMAs ---
     # CRUCIAL FIX: Use lowercase column names
-    ax1.plot(df.index, df['close'], label='Close Price', color='blue', linewidth=1.5, alpha=0.7)
-    ax1.plot(df.index, df['evwma_short'], label=f'EVWMA (Short)', color='red', linewidth=1.5)
-    ax1.plot(df.index, df['evwma_long'], label=f'EVWMA (Long)', color='purple', linewidth=1.5)
+    ax1.plot(plot_df.index, plot_df['close'], label='Close Price', color='blue', linewidth=1.5, alpha=0.7)
+    ax1.plot(plot_df.index, plot_df['evwma_short'], label=f'EVWMA (Short)', color='red', linewidth=1.5)
+    ax1.plot(plot_df.index, plot_df['evwma_long'], label=f'EVWMA (Long)', color='purple', linewidth=1.5)
     
     ax1.set_title(title, fontsize=16)
     ax1.set_ylabel('Price', fontsize=12)
@@ -439,27 +473,18 @@ def generate_evwma_macd_style_chart(df, title="EVWMA Oscillator (MACD Style) Sig
 
     # --- Bottom Panel: EVWMA Oscillator, Signal, and Histogram ---
     # CRUCIAL FIX: Use lowercase column names
-    ax2.plot(df.index, df['evwma_oscillator'], label='EVWMA Oscillator', color='darkorange', linewidth=1.5)
-    ax2.plot(df.index, df['evwma_signal'], label='EVWMA Signal', color='green', linestyle='--', linewidth=1.5)
+    ax2.plot(plot_df.index, plot_df['evwma_oscillator'], label='EVWMA Oscillator', color='darkorange', linewidth=1.5)
+    ax2.plot(plot_df.index, plot_df['evwma_signal'], label='EVWMA Signal', color='green', linestyle='--', linewidth=1.5)
     
-    # Plot histogram
+    # Plot histogram as a single collection (one patch per bar is the slowest part of this chart)
     # CRUCIAL FIX: Use lowercase column name
-    colors = ['green' if val >= 0 else 'red' for val in df['evwma_histogram']]
-    ax2.bar(df.index, df['evwma_histogram'], color=colors, alpha=0.6, width=1)
+    add_histogram_collection(ax2, df.index, df['evwma_histogram'], max_points)
     
     ax2.axhline(0, color='gray', linestyle=':', linewidth=0.8)
     ax2.set_ylabel('Oscillator Value', fontsize=12)
     ax2.legend(loc='best', fontsize=10)
     ax2.grid(True, linestyle='--', alpha=0.6)
 
-    # --- Signals based on EVWMA Oscillator crossing EVWMA Signal ---
-    # CRUCIAL FIX: Use lowercase column names
-    buy_signals_osc = df[df['evwma_oscillator'].shift(1) < df['evwma_signal'].shift(1)] \
-                          [df['evwma_oscillator'] >= df['evwma_signal']]
-    
-    sell_signals_osc = df[df['evwma_oscillator'].shift(1) > df['evwma_signal'].shift(1)] \
-                           [df['evwma_oscillator'] <= df['evwma_signal']]
-
     # Plot signals in the main price panel, using the Close Price for placement
     # CRUCIAL FIX: Use lowercase column name
     ax1.scatter(buy_signals_osc.index, df.loc[buy_signals_osc.index, 'close'], marker='^', color='lime', s=150, label='Oscillator Buy Signal', zorder=5)
@@ -485,10 +510,103 @@ def generate_evwma_macd_style_chart(df, title="EVWMA Oscillator (MACD Style) Sig
 
     plt.tight_layout()
     plt.subplots_adjust(hspace=0.05)
-    plt.show()
+    finish_chart(fig, output_path)
 
+# ==============================================================================
+# Batch chart mode - headless rendering in a process pool
+# ==============================================================================
 
-if __name__ == "__main__":
+def use_headless_backend():
+    """Process pool initializer: renders with Agg, no display or GUI event loop needed."""
+    matplotlib.use('Agg')
+
+def render_ticker_charts(ticker_symbol, csv_filepath, chart_dir, image_format='png', max_points=seriesDownsample.DEFAULT_MAX_POINTS):
+    """
+    Calculates the indicators of one ticker and saves its three EVWMA charts.
+
+    Args:
+        ticker_symbol (str): The ticker, used in titles and file names.
+        csv_filepath (str): Historical data CSV written by download_historical_data.
+        chart_dir (str): Folder for the images.
+        image_format (str): 'png' or 'svg'.
+        max_points (int): Lines longer than this are downsampled with LTTB.
+
+    Returns:
+        tuple: (ticker_symbol, list of saved chart paths, or None on failure)
+    """
+    try:
+        df = calculate_indicators_from_csv(csv_filepath)
+        if df is None or df.empty:
+            return ticker_symbol, None
+
+        today_date_str = datetime.now().strftime('%Y%m%d')
+        charts = [
+            (generate_single_evwma_chart, f"LEADING - Single EVWMA Crossover - {ticker_symbol}", 'single_evwma'),
+            (generate_evwma_macd_style_chart, f"INBETWEEN - EVWMA Oscillator - {ticker_symbol}", 'evwma_oscillator'),
+            (generate_double_evwma_chart, f"LAGGING - Double EVWMA Crossover - {ticker_symbol}", 'double_evwma'),
+        ]
+
+        saved = []
+        for chart_function, title, suffix in charts:
+            output_path = os.path.join(chart_dir, f"{today_date_str}_{ticker_symbol}_{suffix}.{image_format}")
+            chart_function(df, title=title, output_path=output_path, max_points=max_points)
+            saved.append(output_path)
+        return ticker_symbol, saved
+
+    except Exception as e:
+        print(f">>    An error occurred while charting {ticker_symbol}: {e}")
+        return ticker_symbol, None
+
+def render_charts_batch(csv_by_ticker, chart_dir, image_format='png', max_points=seriesDownsample.DEFAULT_MAX_POINTS, workers=None):
+    """
+    Renders the EVWMA charts of many tickers in parallel worker processes.
+
+    Args:
+        csv_by_ticker (dict): Ticker symbol -> historical data CSV path.
+        chart_dir (str): Folder for the images.
+        image_format (str): 'png' or 'svg'.
+        max_points (int): Lines longer than this are downsampled with LTTB.
+        workers (int, optional): Worker processes. Defaults to the CPU count.
+
+    Returns:
+        dict: Ticker symbol -> list of saved chart paths, for the tickers that succeeded.
+    """
+    os.makedirs(chart_dir, exist_ok=True)
+    rendered = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_headless_backend) as pool:
+        futures = [
+            pool.submit(render_ticker_charts, ticker, csv_path, chart_dir, image_format, max_points)
+            for ticker, csv_path in csv_by_ticker.items()
+        ]
+        for future in as_completed(futures):
+            ticker_symbol, saved = future.result()
+            if saved:
+                rendered[ticker_symbol] = saved
+                print(f">>    Charts saved for {ticker_symbol}")
+            else:
+                print(f">>    No charts for {ticker_symbol}")
+
+    return rendered
+
+
+def analyze_ticker(ticker_symbol, start_date_input='', end_date_input='', chart_dir=None):
+    """
+    Downloads one ticker, saves its indicators and draws the three EVWMA charts -
+    the interactive run without the prompts, so the job runner can call it for
+    many tickers in one process.
+
+    Args:
+        ticker_symbol (str): The ticker, upper case.
+        start_date_input (str): Start date 'YYYY-MM-DD'; empty for the beginning of the current year.
+        end_date_input (str): End date 'YYYY-MM-DD'; empty for today.
+        chart_dir (str, optional): Saves the charts as PNGs in this folder instead of showing them.
+
+    Returns:
+        dict: 'indicators' (the CSV path) and 'charts' (the saved chart paths),
+              or None when the input is invalid or no data was found.
+    """
+    result = None
     print(f">> ")
     print(f">> --------------------------------------------------------------------")
     print(f">> BEGIN Processing - Evaluate Price to EVWMA ...")
@@ -503,12 +621,6 @@ if __name__ == "__main__":
     # Get today's date in YYYYMMDD format
     today_date_str = datetime.now().strftime('%Y%m%d')
 
-    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
-    
-    # --- MODIFIED DATE INPUT AND DEFAULTING LOGIC STARTS HERE ---
-    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
-    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
-
     # Determine start_date based on input or default
     if start_date_input:
         start_date_str = start_date_input
@@ -525,7 +637,6 @@ if __name__ == "__main__":
         # Default to the current date
         end_date_str = datetime.now().strftime('%Y-%m-%d')
         print(f">>    End date defaulted to: {end_date_str}")
-    # --- MODIFIED DATE INPUT AND DEFAULTING LOGIC ENDS HERE ---
 
     try:
         # Convert string dates to datetime.date objects for easier comparison
@@ -537,12 +648,12 @@ if __name__ == "__main__":
         # Validate that the start date is not in the future
         if parsed_start_date > today_date:
             print(f">>    Error: Start date ({start_date_str}) cannot be in the future.")
-            exit()
+            return None
             
         # Validate that start date is strictly before end date
         if parsed_start_date >= parsed_end_date:
             print(f">>    Error: Start date ({start_date_str}) must be strictly before end date ({end_date_str}).")
-            exit()
+            return None
 
         # Determine the effective end date for yfinance download
         # yfinance 'end' parameter is exclusive (it downloads up to the day *before* the 'end' date).
@@ -566,7 +677,7 @@ if __name__ == "__main__":
 
     except ValueError:
         print(">>    Error: Invalid date format. Please use YYYY-MM-DD.")
-        exit()
+        return None
 
     # CRITICAL CHANGE: Prefix with today's date and place in the correct directory.
     csv_file = os.path.join(output_dir, f"{today_date_str}_{ticker_symbol}_historical_data.csv")
@@ -599,14 +710,26 @@ if __name__ == "__main__":
             df_indicators_from_csv.to_csv(output_filename)
             print(f"\n>>    Indicators saved to {output_filename}")
 
+            # With a chart folder the charts are saved there instead of shown
+            chart_paths = {
+                suffix: os.path.join(chart_dir, f"{today_date_str}_{ticker_symbol}_{suffix}.png") if chart_dir else None
+                for suffix in ('single_evwma', 'evwma_oscillator', 'double_evwma')
+            }
+            if chart_dir:
+                os.makedirs(chart_dir, exist_ok=True)
+
             print("\n>>    Generating Single EVWMA Chart (Standard Crossover)...")
-            generate_single_evwma_chart(df_indicators_from_csv, title=f"LEADING - Single EVWMA Crossover - {ticker_symbol}")
+            generate_single_evwma_chart(df_indicators_from_csv, title=f"LEADING - Single EVWMA Crossover - {ticker_symbol}",
+                                        output_path=chart_paths['single_evwma'])
 
             print("\n>>    Generating EVWMA Oscillator (MACD Style) Chart...")
-            generate_evwma_macd_style_chart(df_indicators_from_csv, title=f"INBETWEEN - EVWMA Oscillator - {ticker_symbol}")
+            generate_evwma_macd_style_chart(df_indicators_from_csv, title=f"INBETWEEN - EVWMA Oscillator - {ticker_symbol}",
+                                            output_path=chart_paths['evwma_oscillator'])
             
             print("\n>>    Generating Double EVWMA Crossover Chart...")
-            generate_double_evwma_chart(df_indicators_from_csv, title=f"LAGGING - Double EVWMA Crossover - {ticker_symbol}")            
+            generate_double_evwma_chart(df_indicators_from_csv, title=f"LAGGING - Double EVWMA Crossover - {ticker_symbol}",
+                                        output_path=chart_paths['double_evwma'])
+            result = {'indicators': output_filename, 'charts': [path for path in chart_paths.values() if path]}
 
         else:
             print(">>    Failed to calculate indicators from CSV.")
@@ -617,4 +740,13 @@ if __name__ == "__main__":
     print(f">> --------------------------------------------------------------------")    
     print(f">> END Processing - Evaluate Price to EVWMA for - {ticker_symbol} ...")
     print(f">> --------------------------------------------------------------------")
-    print(f">> ")           
+    print(f">> ")
+
+    return result
+
+if __name__ == "__main__":
+    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
+    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
+    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
+
+    analyze_ticker(ticker_symbol, start_date_input, end_date_input)
@@ -1,18 +1,30 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import yfinance as yf
 from datetime import datetime, timedelta
 
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import marketData
+import frameHandoff
+import csvNormalize
+import equityMetrics
+
 # Keep clean_csv_header if you ever plan to use it for *other* CSV sources,
 # but it's not needed for yfinance output.
 def clean_csv_header(input_filepath, ticker, output_filepath=None):
     """
     Reads a CSV file, replaces 'Price' with 'Date' in the first line,
     and removes specific second and third lines if they match the specified format.
-    (This function is generally not needed for yfinance output, which is already clean.)
+    The file is streamed through csvNormalize, so it is never read into memory whole.
 
     Args:
         input_filepath (str): The path to the input CSV file.
@@ -20,67 +32,8 @@ def clean_csv_header(input_filepath, ticker, output_filepath=None):
                                          If None, the input file will be overwritten.
                                          Defaults to None.
     """
-    if output_filepath is None:
-        output_filepath = input_filepath
-
-    lines = []
-    try:
-        with open(input_filepath, 'r') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        print(f"Error: The file '{input_filepath}' was not found.")
-        return
-    except Exception as e:
-        print(f"An error occurred while reading the file: {e}")
-        return
-
-    modified_lines = []
-    
-    # Process the first line
-    if lines:
-        first_line = lines[0].strip()
-        # This modification is specific to a CSV format that YF.download does NOT produce
-        if first_line.startswith('Price,'):
-            modified_lines.append('date' + first_line[5:] + '\n') # Changed to lowercase 'date' here for consistency
-            print(f"Modified first line: '{first_line.strip()}' -> 'date{first_line[5:].strip()}'")
-        else:
-            modified_lines.append(lines[0])
-            print(f"First line not modified: '{first_line.strip()}'")
-    else:
-        print("The CSV file is empty.")
-        return
-
-    # Process subsequent lines for removal
-    lines_to_skip = 0
-    if len(lines) > 1:
-        second_line = lines[1].strip()
-        if second_line.startswith('Ticker,') and all(part == ticker for part in second_line.split(',')[1:]):
-            lines_to_skip += 1
-            print(f"Skipping second line: '{second_line}'")
-        else:
-            modified_lines.append(lines[1])
-            print(f"Second line not skipped: '{second_line}'")
-
-    if len(lines) > 2 and lines_to_skip == 1: # Only check third line if second was skipped
-        third_line = lines[2].strip()
-        if third_line == 'Date,,,,,': # This is specific to a non-yfinance CSV format
-            lines_to_skip += 1
-            print(f"Skipping third line: '{third_line}'")
-        else:
-            if lines_to_skip == 1:
-                modified_lines.append(lines[2])
-                print(f"Third line not skipped: '{third_line}'")
+    csvNormalize.clean_csv_header(input_filepath, ticker, output_filepath)
 
-    # Add remaining lines
-    modified_lines.extend(lines[lines_to_skip + 1:])
-
-    try:
-        with open(output_filepath, 'w') as f:
-            f.writelines(modified_lines)
-        print(f"CSV file cleaned successfully. Output saved to '{output_filepath}'")
-    except Exception as e:
-        print(f"An error occurred while writing the file: {e}")
-    
 def download_historical_data(ticker, start_date, end_date, output_filename):
     """
     Downloads historical stock data using yfinance and saves it to a CSV file.
@@ -110,7 +63,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
         new_output_filename = os.path.join(output_dir, f"{today_date_str}_{output_filename}")
 
         # Download data
-        data = yf.download(ticker, start=start_date, end=end_date)
+        data = marketData.download(ticker, start=start_date, end=end_date)
 
         if data.empty:
             print(f"No data downloaded for {ticker} in the specified date range. Please check the ticker and dates.")
@@ -138,7 +91,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
 
         # Save to CSV:
         data.index.name = 'date' # Set index name to 'date' (lowercase)
-        data.to_csv(new_output_filename, index=True, header=True)
+        frameHandoff.save_frame(data, new_output_filename)
         print(f"Historical data for {ticker} saved to {new_output_filename}")
         
         # REMOVED: No need to call clean_csv_header for yfinance output
@@ -156,7 +109,7 @@ def load_data_from_csv(file_path):
     """Loads historical stock data from a CSV file."""
     try:
         # Changed 'Date' to 'date' here to match the saved CSV header
-        df = pd.read_csv(file_path, parse_dates=['date'], index_col='date')
+        df = frameHandoff.load_frame(file_path, lambda path: pd.read_csv(path, parse_dates=['date'], index_col='date'))
         
         print(f"  >>: CSV file '{file_path}' FOUND")
         
@@ -248,15 +201,27 @@ def backtest_strategy(df, initial_capital=10000, commission_rate=0.001):
 
     return df
 
-# --- Main Execution ---
-if __name__ == "__main__":
+def analyze_ticker(ticker_symbol, start_date_input='', end_date_input='', chart_dir=None):
+    """
+    Backtests the SMA crossover strategy of one ticker over its last year and
+    charts the signals - the interactive run without the prompts, so the job
+    runner can call it for many tickers in one process.
+
+    Args:
+        ticker_symbol (str): The ticker, upper case.
+        start_date_input (str): Start date 'YYYY-MM-DD'; empty for the beginning of the current year.
+        end_date_input (str): End date 'YYYY-MM-DD'; empty for today.
+        chart_dir (str, optional): Saves the chart as a PNG in this folder instead of showing it.
+
+    Returns:
+        dict: The final value, ROI and equityMetrics.equity_metrics() of the
+              one-year backtest, or None when the input is invalid or no data was found.
+    """
+    result = None
     print("--- Analyze Stock with Technical Indicators ---")
 
-    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
     
     # --- MODIFIED DATE INPUT AND DEFAULTING LOGIC STARTS HERE ---
-    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
-    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
 
     # Determine start_date based on input or default
     if start_date_input:
@@ -285,11 +250,11 @@ if __name__ == "__main__":
         
         if parsed_start_date > today_date:
             print(f"Error: Start date ({start_date_str}) cannot be in the future.")
-            exit()
+            return None
             
         if parsed_start_date >= parsed_end_date:
             print(f"Error: Start date ({start_date_str}) must be strictly before end date ({end_date_str}).")
-            exit()
+            return None
 
         if parsed_end_date >= today_date:
             effective_download_end_date = today_date + timedelta(days=1)
@@ -302,7 +267,7 @@ if __name__ == "__main__":
 
     except ValueError:
         print("Error: Invalid date format. Please use YYYY-MM-DD.")
-        exit()
+        return None
 
     csv_file = f"{ticker_symbol}_historical_data.csv"
 
@@ -368,6 +333,16 @@ if __name__ == "__main__":
                     print(f"Net Profit (last year): ${net_profit_oneyear:,.2f}")
                     print(f"Return on Investment (ROI) (last year): {roi_oneyear:.2f}%")
 
+                    metrics_oneyear = equityMetrics.equity_metrics(backtested_data_oneyear['Total_Portfolio_Value'],
+                                                                   positions=backtested_data_oneyear['Position']).iloc[0]
+                    print(f"CAGR (last year): {metrics_oneyear['CAGR']:.2%}")
+                    print(f"Max Drawdown (last year): {metrics_oneyear['Max_Drawdown']:.2%} "
+                          f"(longest {metrics_oneyear['Max_Drawdown_Duration']:.0f} bars below a peak)")
+                    print(f"Sharpe / Sortino (last year): {metrics_oneyear['Sharpe']:.2f} / {metrics_oneyear['Sortino']:.2f}")
+                    print(f"Win Rate (last year): {metrics_oneyear['Win_Rate']:.2%} of {metrics_oneyear['Trades']:.0f} trades")
+                    print(f"Exposure (last year): {metrics_oneyear['Exposure']:.2%} of bars in the market")
+                    result = {'final_value': final_value_oneyear, 'roi': roi_oneyear, **metrics_oneyear.to_dict()}
+
 
                     # 6. Visualization for the Last Year
                     plt.figure(figsize=(14, 8))
@@ -407,6 +382,24 @@ if __name__ == "__main__":
                     plt.ylabel('Price')
                     plt.legend()
                     plt.grid(True)
-                    plt.show()
+                    if chart_dir:
+                        # Saved headless instead of shown
+                        os.makedirs(chart_dir, exist_ok=True)
+                        chart_path = os.path.join(chart_dir, f"{datetime.now().strftime('%Y%m%d')}_{ticker_symbol}_sma_backtest.png")
+                        plt.savefig(chart_path)
+                        plt.close()
+                        result['chart'] = chart_path
+                    else:
+                        plt.show()
         else:
             print(f"Failed to load data from {downloaded_csv_path}. Analysis aborted.")
+
+    return result
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
+    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
+    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
+
+    analyze_ticker(ticker_symbol, start_date_input, end_date_input)
@@ -1,12 +1,24 @@
+import io
 import os
+import sys
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import yfinance as yf
 from datetime import datetime, timedelta, date
 import itertools
 
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import reportWriter
+import marketData
+import frameHandoff
+import timeframeBars
+import csvNormalize
+
 def calculate_ema(data, span):
     """
     Calculates the Exponential Moving Average (EMA) manually.
@@ -24,77 +36,16 @@ def clean_csv_header(input_filepath, ticker, output_filepath=None):
     """
     Reads a CSV file, replaces 'Price' with 'Date' in the first line,
     and removes specific second and third lines if they match the specified format.
+    The file is streamed through csvNormalize, so it is never read into memory whole.
 
     Args:
         input_filepath (str): The path to the input CSV file.
         output_filepath (str, optional): The path to save the cleaned CSV file.
-                                        If None, the input file will be overwritten.
-                                        Defaults to None.
+                                         If None, the input file will be overwritten.
+                                         Defaults to None.
     """
-    if output_filepath is None:
-        output_filepath = input_filepath
+    csvNormalize.clean_csv_header(input_filepath, ticker, output_filepath)
 
-    lines = []
-    try:
-        with open(input_filepath, 'r') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        print(f"Error: The file '{input_filepath}' was not found.")
-        return
-    except Exception as e:
-        print(f"An error occurred while reading the file: {e}")
-        return
-
-    modified_lines = []
-    
-    # Process the first line
-    if lines:
-        first_line = lines[0].strip()
-        if first_line.startswith('Price,'):
-            modified_lines.append('date' + first_line[5:] + '\n')
-            print(f"Modified first line: '{first_line.strip()}' -> 'date{first_line[5:].strip()}'")
-        else:
-            modified_lines.append(lines[0])
-            print(f"First line not modified: '{first_line.strip()}'")
-    else:
-        print("The CSV file is empty.")
-        return
-
-    # Process subsequent lines for removal
-    lines_to_skip = 0
-    if len(lines) > 1:
-        second_line = lines[1].strip()
-        # Check for the exact format "Ticker,JNJ,JNJ,JNJ,JNJ,JNJ"
-        if second_line.startswith('Ticker,') and all(part == ticker for part in second_line.split(',')[1:]):
-            lines_to_skip += 1
-            print(f"Skipping second line: '{second_line}'")
-        else:
-            modified_lines.append(lines[1])
-            print(f"Second line not skipped: '{second_line}'")
-
-    if len(lines) > 2 and lines_to_skip == 1: # Only check third line if second was skipped
-        third_line = lines[2].strip()
-        # Check for the exact format "Date,,,,"
-        if third_line == 'Date,,,,,':
-            lines_to_skip += 1
-            print(f"Skipping third line: '{third_line}'")
-        else:
-            # If the second line was skipped but the third wasn't, add the third line back.
-            # This handles cases where only the second line matches for skipping.
-            if lines_to_skip == 1: # This means the second line was skipped, but third was not.
-                modified_lines.append(lines[2])
-                print(f"Third line not skipped: '{third_line}'")
-
-    # Add remaining lines
-    modified_lines.extend(lines[lines_to_skip + 1:])
-
-    try:
-        with open(output_filepath, 'w') as f:
-            f.writelines(modified_lines)
-        print(f"CSV file cleaned successfully. Output saved to '{output_filepath}'")
-    except Exception as e:
-        print(f"An error occurred while writing the file: {e}")
-    
 def download_historical_data(ticker, start_date, end_date, output_filename):
     """
     Downloads historical stock data using yfinance and saves it to a CSV file.
@@ -112,7 +63,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
     # print(f"Attempting to download historical data for {ticker} from {start_date} to {end_date}...")
     try:
         # Download data with auto_adjust=True for adjusted prices directly in 'Close'
-        data = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True)
+        data = marketData.download(ticker, start=start_date, end=end_date, auto_adjust=True)
 
         if data.empty:
             print(f"No data downloaded for {ticker} in the specified date range. Please check the ticker and dates.")
@@ -148,7 +99,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
 
         # Set index name to 'date' (lowercase) before saving
         data.index.name = 'date'
-        data.to_csv(output_filename, index=True, header=True)
+        frameHandoff.save_frame(data, output_filename)
         # print(f"Historical data for {ticker} saved to {output_filename}")
         
         # We are skipping the clean_csv_header call here as it's not designed for yfinance output
@@ -163,16 +114,20 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
         print(f"An error occurred during data download for {ticker}: {e}")
         return None
         
-def calculate_indicators_from_csv(csv_filepath):
+def calculate_indicators_from_csv(csv_filepath, timeframe='1d', ticker=None):
     """
     Reads historical data from a CSV file and calculates EVWMA, VWAP, MACD,
     two EVWMAs (short/long), and EVWMA-based Oscillator, Signal, and Histogram.
     Uses lowercase column names for consistency.
+
+    With timeframe '1wk' or '1mo' the daily bars of the CSV are first aggregated
+    into weekly or monthly bars (cached per ticker when `ticker` is given), and
+    the EVWMA volume spans are scaled to the longer bars.
     """
     try:
         # print(f"Reading historical data from: {csv_filepath}...")
         # CRUCIAL FIX: Use 'date' (lowercase) for index_col
-        data = pd.read_csv(csv_filepath, index_col='date', parse_dates=True)
+        data = frameHandoff.load_frame(csv_filepath, lambda path: pd.read_csv(path, index_col='date', parse_dates=True))
 
         if data.empty:
             print(f"No data found in {csv_filepath}.")
@@ -198,6 +153,8 @@ def calculate_indicators_from_csv(csv_filepath):
             print("No valid numeric data remaining after processing.")
             return None
 
+        data = timeframeBars.get_timeframe_bars(ticker, data, timeframe)
+
         # print(f"Data loaded from CSV. Shape: {data.shape}")
 
         # 1. Calculate VWAP (Volume Weighted Average Price)
@@ -225,7 +182,7 @@ def calculate_indicators_from_csv(csv_filepath):
 
         # 3. Calculate EVWMA (Elastic Volume Weighted Moving Average) - Short Term
         # --- ADJUST THESE VOLUME SPAN VALUES FOR MORE/LESS SIGNALS ---
-        volume_span_short = 40_500_000
+        volume_span_short = timeframeBars.scale_span(40_500_000, timeframe)
         
         # print(f"Calculating Short-term EVWMA with volume span: {volume_span_short:,.0f}.")
         data['evwma_short'] = np.nan
@@ -245,7 +202,7 @@ def calculate_indicators_from_csv(csv_filepath):
             # print("Short-term EVWMA calculated.")
 
         # 4. Calculate EVWMA (Elastic Volume Weighted Moving Average) - Long Term
-        volume_span_long = 120_000_000 # Corrected the typo '_000_000_000'
+        volume_span_long = timeframeBars.scale_span(120_000_000, timeframe) # Corrected the typo '_000_000_000'
         
         # print(f"Calculating Long-term EVWMA with volume span: {volume_span_long:,.0f}.")
         data['evwma_long'] = np.nan
@@ -407,150 +364,97 @@ def evaluate_double_evwma_signals(df):
 
     return buy_triggered, last_buy_date, sell_triggered, last_sell_date
         
-def generate_html_report(ticker_symbol, single_results, double_results, oscillator_results, leaning_status, overall_status):
-    """
-    Generates an HTML string for the EVWMA report.
-    """
-    single_buy_triggered, single_last_buy, single_sell_triggered, single_last_sell = single_results
-    double_buy_triggered, double_last_buy, double_sell_triggered, double_last_sell = double_results
-    oscillator_buy_triggered, oscillator_last_buy, oscillator_sell_triggered, oscillator_last_sell = oscillator_results
-
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>EVWMA Signal Report - {ticker_symbol}</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 20px;
-                padding: 0;
-                background-color: #f4f4f4;
-                color: #333;
-            }}
-            .container {{
-                max-width: 800px;
-                margin: auto;
-                background: #fff;
-                padding: 20px 40px;
-                border-radius: 8px;
-                box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
-            }}
-            h1, h2, h3 {{
-                color: #0056b3;
-                border-bottom: 2px solid #ddd;
-                padding-bottom: 5px;
-            }}
-            .section {{
-                margin-bottom: 20px;
-            }}
-            .signal-item {{
-                padding: 8px 0;
-                border-bottom: 1px solid #eee;
-            }}
-            .signal-item:last-child {{
-                border-bottom: none;
-            }}
-            .signal-result {{
-                font-weight: bold;
-                color: #28a745;
-            }}
-            .signal-result.no {{
-                color: #dc3545;
-            }}
-            .last-date {{
-                font-style: italic;
-                color: #6c757d;
-            }}
-            .overall {{
-                text-align: center;
-                margin-top: 30px;
-                padding: 20px;
-                background-color: #e9ecef;
-                border-radius: 8px;
-            }}
-            .overall h2 {{
-                border-bottom: none;
-                margin-top: 0;
-            }}
-            .overall-buy {{
-                font-size: 1.5em;
-                font-weight: bold;
-                color: #28a745;
-            }}
-            .overall-sell {{
-                font-size: 1.5em;
-                font-weight: bold;
-                color: #dc3545;
-            }}
-            .overall-none {{
-                font-size: 1.5em;
-                font-weight: bold;
-                color: #6c757d;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>EVWMA Signal Report</h1>
-            <h2>Stock Ticker: {ticker_symbol}</h2>
-
-            <div class="section">
-                <h3>LEADING - Single EVWMA Signals</h3>
-                <ul>
-                    <li class="signal-item">
-                        <b>Buy Signal Triggered:</b> <span class="signal-result {'no' if not single_buy_triggered else ''}">{single_buy_triggered}</span>
-                    </li>
-                    <li class="signal-item">
-                        <b>Last Buy Signal:</b> <span class="last-date">{single_last_buy}</span>
-                    </li>
-                    <li class="signal-item">
-                        <b>Sell Signal Triggered:</b> <span class="signal-result {'no' if not single_sell_triggered else ''}">{single_sell_triggered}</span>
-                    </li>
-                    <li class="signal-item">
-                        <b>Last Sell Signal:</b> <span class="last-date">{single_last_sell}</span>
-                    </li>
-                </ul>
-            </div>
-            
-            <div class="section">
-                <h3>INBETWEEN - Oscillator EVWMA Signals</h3>
-                <ul>
-                    <li class="signal-item">
-                        <b>Buy Signal Triggered:</b> <span class="signal-result {'no' if not oscillator_buy_triggered else ''}">{oscillator_buy_triggered}</span>
-                    </li>
-                    <li class="signal-item">
-                        <b>Last Buy Signal:</b> <span class="last-date">{oscillator_last_buy}</span>
-                    </li>
-                    <li class="signal-item">
-                        <b>Sell Signal Triggered:</b> <span class="signal-result {'no' if not oscillator_sell_triggered else ''}">{oscillator_sell_triggered}</span>
-                    </li>
-                    <li class="signal-item">
-                        <b>Last Sell Signal:</b> <span class="last-date">{oscillator_last_sell}</span>
-                    </li>
-                </ul>
-            </div>
-            
+TICKER_REPORT_STYLE = """
+        body {
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            padding: 0;
+            background-color: #f4f4f4;
+            color: #333;
+        }
+        .container {
+            max-width: 800px;
+            margin: auto;
+            background: #fff;
+            padding: 20px 40px;
+            border-radius: 8px;
+            box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
+        }
+        h1, h2, h3 {
+            color: #0056b3;
+            border-bottom: 2px solid #ddd;
+            padding-bottom: 5px;
+        }
+        .section {
+            margin-bottom: 20px;
+        }
+        .signal-item {
+            padding: 8px 0;
+            border-bottom: 1px solid #eee;
+        }
+        .signal-item:last-child {
+            border-bottom: none;
+        }
+        .signal-result {
+            font-weight: bold;
+            color: #28a745;
+        }
+        .signal-result.no {
+            color: #dc3545;
+        }
+        .last-date {
+            font-style: italic;
+            color: #6c757d;
+        }
+        .overall {
+            text-align: center;
+            margin-top: 30px;
+            padding: 20px;
+            background-color: #e9ecef;
+            border-radius: 8px;
+        }
+        .overall h2 {
+            border-bottom: none;
+            margin-top: 0;
+        }
+        .overall-buy {
+            font-size: 1.5em;
+            font-weight: bold;
+            color: #28a745;
+        }
+        .overall-sell {
+            font-size: 1.5em;
+            font-weight: bold;
+            color: #dc3545;
+        }
+        .overall-none {
+            font-size: 1.5em;
+            font-weight: bold;
+            color: #6c757d;
+        }"""
+
+# Precompiled template for one strategy block of the ticker report
+SIGNAL_SECTION_TEMPLATE = reportWriter.compile_template("""
             <div class="section">
-                <h3>LAGGING - Double EVWMA Crossover Signals</h3>
+                <h3>{heading}</h3>
                 <ul>
                     <li class="signal-item">
-                        <b>Buy Signal Triggered:</b> <span class="signal-result {'no' if not double_buy_triggered else ''}">{double_buy_triggered}</span>
+                        <b>Buy Signal Triggered:</b> <span class="signal-result {buy_class}">{buy_triggered}</span>
                     </li>
                     <li class="signal-item">
-                        <b>Last Buy Signal:</b> <span class="last-date">{double_last_buy}</span>
+                        <b>Last Buy Signal:</b> <span class="last-date">{last_buy}</span>
                     </li>
                     <li class="signal-item">
-                        <b>Sell Signal Triggered:</b> <span class="signal-result {'no' if not double_sell_triggered else ''}">{double_sell_triggered}</span>
+                        <b>Sell Signal Triggered:</b> <span class="signal-result {sell_class}">{sell_triggered}</span>
                     </li>
                     <li class="signal-item">
-                        <b>Last Sell Signal:</b> <span class="last-date">{double_last_sell}</span>
+                        <b>Last Sell Signal:</b> <span class="last-date">{last_sell}</span>
                     </li>
                 </ul>
             </div>
-            
+""")
+
+CONCLUSION_TEMPLATE = reportWriter.compile_template("""
             <div class="section">
                 <h3>Leaning towards Buy OR Sell</h3>
                 <p><b>{leaning_status}</b></p>
@@ -559,17 +463,68 @@ def generate_html_report(ticker_symbol, single_results, double_results, oscillat
             <div class="overall">
                 <h2>EVWMA Signal Conclusion</h2>
                 <p class="{overall_status}">
-                    {overall_status.upper()}
+                    {overall_status_upper}
                 </p>
             </div>
+""")
 
-        </div>
-    </body>
-    </html>
+def write_html_report(f, ticker_symbol, single_results, double_results, oscillator_results, leaning_status, overall_status):
     """
-    return html_content
+    Streams the EVWMA report for one ticker to an open file.
+    """
+    reportWriter.write_page_header(f, f"EVWMA Signal Report - {ticker_symbol}", TICKER_REPORT_STYLE)
+    f.write('        <div class="container">\n')
+    f.write('            <h1>EVWMA Signal Report</h1>\n')
+    f.write(f'            <h2>Stock Ticker: {ticker_symbol}</h2>\n')
+
+    for heading, (buy_triggered, last_buy, sell_triggered, last_sell) in (
+        ("LEADING - Single EVWMA Signals", single_results),
+        ("INBETWEEN - Oscillator EVWMA Signals", oscillator_results),
+        ("LAGGING - Double EVWMA Crossover Signals", double_results),
+    ):
+        f.write(SIGNAL_SECTION_TEMPLATE({
+            'heading': heading,
+            'buy_triggered': buy_triggered,
+            'buy_class': '' if buy_triggered else 'no',
+            'last_buy': last_buy,
+            'sell_triggered': sell_triggered,
+            'sell_class': '' if sell_triggered else 'no',
+            'last_sell': last_sell,
+        }))
+
+    f.write(CONCLUSION_TEMPLATE({
+        'leaning_status': leaning_status,
+        'overall_status': overall_status,
+        'overall_status_upper': overall_status.upper(),
+    }))
+    f.write('        </div>\n')
+    reportWriter.write_page_footer(f)
 
-if __name__ == "__main__":
+def generate_html_report(ticker_symbol, single_results, double_results, oscillator_results, leaning_status, overall_status):
+    """
+    Generates an HTML string for the EVWMA report.
+    """
+    buffer = io.StringIO()
+    write_html_report(buffer, ticker_symbol, single_results, double_results, oscillator_results, leaning_status, overall_status)
+    return buffer.getvalue()
+
+def analyze_ticker(ticker_symbol, start_date_input='', end_date_input='', timeframe='1d'):
+    """
+    Evaluates the single, oscillator and double EVWMA signals of one ticker and
+    writes its HTML report - the interactive run without the prompts, so the
+    job runner can call it for many tickers in one process.
+
+    Args:
+        ticker_symbol (str): The ticker, upper case.
+        start_date_input (str): Start date 'YYYY-MM-DD'; empty for the beginning of the current year.
+        end_date_input (str): End date 'YYYY-MM-DD'; empty for today.
+        timeframe (str): '1d', '1wk' or '1mo'.
+
+    Returns:
+        dict: 'leaning_status', 'overall_status' and 'report' (the HTML path),
+              or None when the input is invalid or no data was found.
+    """
+    result = None
     print(f">> ")
     print(f">> --------------------------------------------------------------------")
     print(f">> BEGIN Processing - Evaluate Price to EVWMA ...")
@@ -589,11 +544,9 @@ if __name__ == "__main__":
     # Get today's date in YYYYMMDD format
     today_date_str = datetime.now().strftime('%Y%m%d')
 
-    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
-    
-    # --- MODIFIED DATE INPUT AND DEFAULTING LOGIC STARTS HERE ---
-    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
-    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
+    if timeframe not in timeframeBars.TIMEFRAMES:
+        print(f"Error: Unknown timeframe '{timeframe}'. Use one of: {', '.join(timeframeBars.TIMEFRAMES)}.")
+        return None
 
     # Determine start_date based on input or default
     if start_date_input:
@@ -611,7 +564,6 @@ if __name__ == "__main__":
         # Default to the current date
         end_date_str = datetime.now().strftime('%Y-%m-%d')
         # print(f"End date defaulted to: {end_date_str}")
-    # --- MODIFIED DATE INPUT AND DEFAULTING LOGIC ENDS HERE ---
 
     try:
         # Convert string dates to datetime.date objects for easier comparison
@@ -623,12 +575,12 @@ if __name__ == "__main__":
         # Validate that the start date is not in the future
         if parsed_start_date > today_date:
             print(f"Error: Start date ({start_date_str}) cannot be in the future.")
-            exit()
+            return None
             
         # Validate that start date is strictly before end date
         if parsed_start_date >= parsed_end_date:
             print(f"Error: Start date ({start_date_str}) must be strictly before end date ({end_date_str}).")
-            exit()
+            return None
 
         # Determine the effective end date for yfinance download
         # yfinance 'end' parameter is exclusive (it downloads up to the day *before* the 'end' date).
@@ -651,7 +603,7 @@ if __name__ == "__main__":
 
     except ValueError:
         print("Error: Invalid date format. Please use YYYY-MM-DD.")
-        exit()
+        return None
 
     # CRITICAL CHANGE: Prefix with today's date and place in the correct directory.
     csv_file = os.path.join(output_dir, f"{today_date_str}_{ticker_symbol}_historical_data.csv")
@@ -660,7 +612,7 @@ if __name__ == "__main__":
     csv_file_name = download_historical_data(ticker_symbol, download_start_date_str, download_end_date_str, csv_file)
     
     if csv_file_name: # Proceed only if data was downloaded successfully
-        df_indicators_from_csv = calculate_indicators_from_csv(csv_file_name)
+        df_indicators_from_csv = calculate_indicators_from_csv(csv_file_name, timeframe, ticker_symbol)
 
         if df_indicators_from_csv is not None and not df_indicators_from_csv.empty:
             # Calculate and print Average Daily Volume
@@ -680,7 +632,7 @@ if __name__ == "__main__":
             # print(df_indicators_from_csv.tail())
 
             # CRITICAL CHANGE: Prefix with today's date and place in the correct directory.
-            output_filename = os.path.join(output_dir, f"{today_date_str}_{ticker_symbol}_indicators_from_csv_output.csv")
+            output_filename = os.path.join(output_dir, f"{today_date_str}_{ticker_symbol}{timeframeBars.file_suffix(timeframe)}_indicators_from_csv_output.csv")
             df_indicators_from_csv.to_csv(output_filename)
             # print(f">>  Indicators saved to {output_filename}")
             
@@ -971,25 +923,25 @@ if __name__ == "__main__":
                 leaning_status = f">>    LEANING - EVWMA FORECAST - NOT enough evidence to draw a conclusion !!! "
                 print(f">>    UNDETERMINED - EVWMA FORECAST - NOT enough evidence to draw a conclusion !!!")
                         
-            # Generate and save the HTML report
-            html_report_content = generate_html_report(
-                ticker_symbol,
-                (single_buy_triggered, single_last_buy, single_sell_triggered, single_last_sell),
-                (double_buy_triggered, double_last_buy, double_sell_triggered, double_last_sell),
-                (oscillator_buy_triggered, oscillator_last_buy, oscillator_sell_triggered, oscillator_last_sell),
-                leaning_status,
-                overall_status
-            )
-            
             # Get today's date in YYYYMMDD format
             today_date_str = datetime.now().strftime('%Y%m%d')
             
             output_filename = f"{ticker_symbol}_price2EVWMA_Report.html"
         
             html_file_path = os.path.join(report_dir, f"{today_date_str}_{output_filename}")
+            result = {'leaning_status': leaning_status, 'overall_status': overall_status, 'report': html_file_path}
             try:
-                with open(html_file_path, 'w') as f:
-                    f.write(html_report_content)
+                # Generate and stream the HTML report straight to disk
+                with reportWriter.open_report(html_file_path) as f:
+                    write_html_report(
+                        f,
+                        ticker_symbol,
+                        (single_buy_triggered, single_last_buy, single_sell_triggered, single_last_sell),
+                        (double_buy_triggered, double_last_buy, double_sell_triggered, double_last_sell),
+                        (oscillator_buy_triggered, oscillator_last_buy, oscillator_sell_triggered, oscillator_last_sell),
+                        leaning_status,
+                        overall_status
+                    )
                 print(f">>    !!! Successfully generated HTML report at:\n {html_file_path}")
             except Exception as e:
                 print(f"Error writing HTML report: {e}")                               
@@ -1002,4 +954,14 @@ if __name__ == "__main__":
     print(f">> --------------------------------------------------------------------")    
     print(f">> END Processing - Evaluate Price to EVWMA for - {ticker_symbol} ...")
     print(f">> --------------------------------------------------------------------")
-    print(f">> ")
\ No newline at end of file
+    print(f">> ")
+
+    return result
+
+if __name__ == "__main__":
+    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
+    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
+    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
+    timeframe = input("Enter the timeframe (1d, 1wk, 1mo, press Enter for 1d): ").strip() or '1d'
+
+    analyze_ticker(ticker_symbol, start_date_input, end_date_input, timeframe)
@@ -1,8 +1,19 @@
 import os
+import sys
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
 
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import marketData
+import frameHandoff
+import timeframeBars
+
 def download_historical_data(ticker, start_date, end_date, output_filename):
     """
     Downloads historical stock data using yfinance and saves it to a CSV file.
@@ -32,7 +43,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
         new_output_filename = os.path.join(output_dir, f"{today_date_str}_{output_filename}")
 
         # Download data
-        data = yf.download(ticker, start=start_date, end=end_date)
+        data = marketData.download(ticker, start=start_date, end=end_date)
 
         if data.empty:
             print(f"No data downloaded for {ticker} in the specified date range. Please check the ticker and dates.")
@@ -60,7 +71,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
 
         # Save to CSV:
         data.index.name = 'date' # Set index name to 'date' (lowercase)
-        data.to_csv(new_output_filename, index=True, header=True)
+        frameHandoff.save_frame(data, new_output_filename)
         print(f"Historical data for {ticker} saved to {new_output_filename}")
         
         return new_output_filename
@@ -70,11 +81,16 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
         return None
         
 # --- 1. Data Acquisition (Using CSV as discussed) ---
-def load_data_from_csv(file_path):
-    """Loads historical stock data from a CSV file."""
+def load_data_from_csv(file_path, timeframe='1d', ticker=None):
+    """
+    Loads historical stock data from a CSV file.
+
+    With timeframe '1wk' or '1mo' the daily bars are aggregated into weekly or
+    monthly bars (cached per ticker when `ticker` is given) before returning.
+    """
     try:
         # Changed 'Date' to 'date' here to match the saved CSV header
-        df = pd.read_csv(file_path, parse_dates=['date'], index_col='date')
+        df = frameHandoff.load_frame(file_path, lambda path: pd.read_csv(path, parse_dates=['date'], index_col='date'))
         
         # print(f"  >>: CSV file '{file_path}' FOUND")
         
@@ -95,6 +111,7 @@ def load_data_from_csv(file_path):
         df['volume'] = pd.to_numeric(df['volume'], errors='coerce', downcast='integer')
         df.dropna(subset=['close', 'volume'], inplace=True)
         df = df.sort_index(ascending=True)
+        df = timeframeBars.get_timeframe_bars(ticker, df, timeframe)
         return df[['close', 'volume']] # Return lowercase column names
     except FileNotFoundError:
         print(f"Error: CSV file '{file_path}' not found.")
@@ -148,15 +165,27 @@ def get_last_sell_signal_date(df):
         
     return last_signal_date
 
-# --- Main Execution ---
-if __name__ == "__main__":
+def analyze_ticker(ticker_symbol, start_date_input='', end_date_input='', timeframe='1d'):
+    """
+    Checks one ticker for the SMA sell signal - the interactive run without the
+    prompts, so the job runner can call it for many tickers in one process.
+
+    Args:
+        ticker_symbol (str): The ticker, upper case.
+        start_date_input (str): Start date 'YYYY-MM-DD'; empty for the beginning of the current year.
+        end_date_input (str): End date 'YYYY-MM-DD'; empty for today.
+        timeframe (str): '1d', '1wk' or '1mo'.
+
+    Returns:
+        dict: 'sell_signal' (bool) and 'last_sell' (the date or None), or None
+              when the input is invalid or no data was found.
+    """
+    result = None
     print("--- Analyze Stock for SMA Sell Signal ---")
 
-    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
-    
-    # --- MODIFIED DATE INPUT AND DEFAULTING LOGIC STARTS HERE ---
-    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
-    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
+    if timeframe not in timeframeBars.TIMEFRAMES:
+        print(f"Error: Unknown timeframe '{timeframe}'. Use one of: {', '.join(timeframeBars.TIMEFRAMES)}.")
+        return None
 
     # Determine start_date based on input or default
     if start_date_input:
@@ -184,11 +213,11 @@ if __name__ == "__main__":
         
         if parsed_start_date > today_date:
             print(f"Error: Start date ({start_date_str}) cannot be in the future.")
-            exit()
+            return None
             
         if parsed_start_date >= parsed_end_date:
             print(f"Error: Start date ({start_date_str}) must be strictly before end date ({end_date_str}).")
-            exit()
+            return None
 
         if parsed_end_date >= today_date:
             effective_download_end_date = today_date + timedelta(days=1)
@@ -201,7 +230,7 @@ if __name__ == "__main__":
 
     except ValueError:
         print("Error: Invalid date format. Please use YYYY-MM-DD.")
-        exit()
+        return None
 
     csv_file = f"{ticker_symbol}_historical_data.csv"
 
@@ -216,7 +245,7 @@ if __name__ == "__main__":
     print(f">> BEGIN Processing - {ticker_symbol} - Determining SMA Sell Signal ...")
     
     if downloaded_csv_path:
-        data = load_data_from_csv(downloaded_csv_path)
+        data = load_data_from_csv(downloaded_csv_path, timeframe, ticker_symbol)
 
         if not data.empty:
             # Add Technical Indicators
@@ -230,9 +259,21 @@ if __name__ == "__main__":
             # Find the date of the last sell signal and print it
             last_sell_date = get_last_sell_signal_date(data)
             print(f">>    Ticker Symbol - {ticker_symbol} - Last SMA Sell => {last_sell_date}")            
+            result = {'sell_signal': bool(has_sell_signal), 'last_sell': last_sell_date}
         else:
             print(f">>    Failed to load data from {downloaded_csv_path}.")
             
     print(f">> END Processing - {ticker_symbol} - Determining SMA Sell Signal ...")
     print(f">> --------------------------------------------------------------------")
-    print(f">> ")            
+    print(f">> ")
+
+    return result
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
+    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
+    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
+    timeframe = input("Enter the timeframe (1d, 1wk, 1mo, press Enter for 1d): ").strip() or '1d'
+
+    analyze_ticker(ticker_symbol, start_date_input, end_date_input, timeframe)
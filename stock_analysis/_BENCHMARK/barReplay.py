@@ -0,0 +1,342 @@
+import os
+import sys
+import json
+import time
+import heapq
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Get the path to the script folders under test
+stock_analysis = os.path.join(os.path.dirname(__file__), '..')
+utils = os.path.join(stock_analysis, '_UTILS')
+signals = os.path.join(stock_analysis, '_Asset_SIGNAL')
+
+# Add the folders to the system path
+sys.path.append(stock_analysis)
+sys.path.append(utils)
+sys.path.append(signals)
+
+# Now you can import the scripts as modules
+import streamingIndicators
+import pricePanel
+import benchmarkHotPaths
+
+# ==============================================================================
+# Bar replay engine
+# ==============================================================================
+# Replays stored daily bars of many tickers as one time-ordered event stream
+# into the streaming indicator consumers, either as fast as possible or at a
+# multiple of real time, and reports throughput and per-event latency.
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), '_RESULTS')
+
+LATENCY_PERCENTILES = [50, 90, 99, 99.9]
+
+# ------------------------------------------------------------------------------
+# Bar sources
+# ------------------------------------------------------------------------------
+
+def load_bar_stream(csv_path):
+    """
+    Reads one history CSV into a list of (timestamp_s, bar) events. The whole
+    file is parsed up front so the replay measures the consumers, not the disk.
+
+    Returns:
+        list: (POSIX timestamp in seconds, bar dict) tuples in date order, or
+              an empty list if the file has no usable bars.
+    """
+    try:
+        df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+    except Exception as e:
+        print(f">>  Skipping '{csv_path}': {e}")
+        return []
+
+    df.columns = [str(col).lower() for col in df.columns]
+    required_columns = ['open', 'high', 'low', 'close', 'volume']
+    if not all(col in df.columns for col in required_columns):
+        print(f">>  Skipping '{csv_path}': missing one of {', '.join(required_columns)}")
+        return []
+
+    df = df[required_columns].apply(pd.to_numeric, errors='coerce').dropna().sort_index()
+    # Seconds since the epoch, independent of the index's datetime unit
+    timestamps = (df.index - pd.Timestamp(0)).total_seconds().to_numpy()
+    return [(ts, bar) for ts, bar in zip(timestamps, df.to_dict('records'))]
+
+def synthetic_bar_streams(n_tickers, n_bars, seed=0):
+    """Random-walk streams for load tests without stored history."""
+    streams = {}
+    for i in range(n_tickers):
+        df = benchmarkHotPaths.generate_synthetic_ohlcv(n_bars, seed=seed + i)
+        timestamps = (df.index - pd.Timestamp(0)).total_seconds().to_numpy()
+        streams[f"SYN{i}"] = list(zip(timestamps, df.to_dict('records')))
+    return streams
+
+def merge_bar_streams(streams):
+    """
+    Merges the per-ticker streams into one stream in timestamp order.
+
+    A heap holds the next bar of every ticker, so each event costs O(log n)
+    in the number of tickers and no combined list is ever built.
+
+    Args:
+        streams (dict): Ticker -> list of (timestamp_s, bar) in time order.
+
+    Yields:
+        tuple: (timestamp_s, ticker, bar). Bars with the same timestamp come out
+               in ticker order.
+    """
+    heap = []
+    for ticker, bars in streams.items():
+        events = iter(bars)
+        first = next(events, None)
+        if first is not None:
+            heap.append((first[0], ticker, first[1], events))
+    heapq.heapify(heap)
+
+    while heap:
+        timestamp, ticker, bar, events = heap[0]
+        yield timestamp, ticker, bar
+        following = next(events, None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (following[0], ticker, following[1], events))
+
+# ------------------------------------------------------------------------------
+# Replay
+# ------------------------------------------------------------------------------
+
+def run_replay(streams, consumers, speed=None, max_events=None):
+    """
+    Pushes every bar to every subscribed consumer in timestamp order.
+
+    Latency is measured per event, from the moment it is due (its scheduled
+    time at `speed`, or the moment it leaves the merge when replaying as fast
+    as possible) until the last consumer has returned.
+
+    Args:
+        streams (dict): Ticker -> list of (timestamp_s, bar).
+        consumers (dict): Name -> on_bar(ticker, bar) function.
+        speed (float, optional): Market seconds replayed per wall-clock second,
+                                 e.g. 86400 for one trading day per second.
+                                 None replays as fast as possible.
+        max_events (int, optional): Stop after this many events.
+
+    Returns:
+        dict: Throughput, latency percentiles, per-consumer time and signal counts.
+    """
+    latencies = []
+    consumer_seconds = {name: 0.0 for name in consumers}
+    signal_counts = {}
+    first_timestamp = None
+    late_events = 0
+
+    start = time.perf_counter()
+    for timestamp, ticker, bar in merge_bar_streams(streams):
+        if speed:
+            if first_timestamp is None:
+                first_timestamp = timestamp
+            due = start + (timestamp - first_timestamp) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.001:
+                late_events += 1
+        else:
+            due = time.perf_counter()
+
+        for name, on_bar in consumers.items():
+            consumer_start = time.perf_counter()
+            for strategy, side in on_bar(ticker, bar):
+                key = f"{strategy} {side}"
+                signal_counts[key] = signal_counts.get(key, 0) + 1
+            consumer_seconds[name] += time.perf_counter() - consumer_start
+
+        latencies.append(time.perf_counter() - due)
+        if max_events and len(latencies) >= max_events:
+            break
+    elapsed = time.perf_counter() - start
+
+    latencies_us = np.asarray(latencies) * 1e6
+    return {
+        'tickers': len(streams),
+        'events': len(latencies),
+        'elapsed_s': elapsed,
+        'events_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'speed': speed,
+        'late_events': late_events,
+        'latency_us': {
+            f"p{p:g}": float(np.percentile(latencies_us, p)) if len(latencies_us) else 0.0
+            for p in LATENCY_PERCENTILES
+        } | {'max': float(latencies_us.max()) if len(latencies_us) else 0.0},
+        'consumer_s': consumer_seconds,
+        'signals': dict(sorted(signal_counts.items())),
+    }
+
+def print_replay_summary(result):
+    """Prints run_replay()'s result as a short table."""
+    mode = 'as fast as possible' if not result['speed'] else f"x{result['speed']:,.0f} real time"
+    print(f">>  Replayed {result['events']:,} bars of {result['tickers']:,} tickers {mode} "
+          f"in {result['elapsed_s']:.2f}s -> {result['events_per_s']:,.0f} events/s")
+    if result['speed']:
+        print(f">>  Events behind schedule by more than 1 ms: {result['late_events']:,}")
+
+    latency = "  ".join(f"{name} {value:,.1f}" for name, value in result['latency_us'].items())
+    print(f">>  End-to-end latency (us): {latency}")
+
+    for name, seconds in result['consumer_s'].items():
+        per_event = seconds / result['events'] * 1e6 if result['events'] else 0.0
+        print(f">>    {name:<20} {seconds:>8.3f}s  ({per_event:.2f} us/event)")
+
+    if result['signals']:
+        print(f">>  Signals:")
+        for key, value in result['signals'].items():
+            print(f">>    {key:<28} {value:>8,}")
+
+# ------------------------------------------------------------------------------
+# Validation against the batch indicators
+# ------------------------------------------------------------------------------
+
+def validate_consumers(df):
+    """
+    Replays one ticker through the streaming consumers and checks their
+    signal dates against the batch implementations on the same bars.
+
+    Args:
+        df (pandas.DataFrame): Lowercase OHLCV bars on a DatetimeIndex named 'date'.
+
+    Returns:
+        dict: Check name -> True if the streaming and batch results match.
+    """
+    import price2EVWMA
+    import plotSMA
+    import bollinger
+
+    stream_dates = {}
+    consumers = {
+        'evwma': streamingIndicators.make_evwma_consumer(),
+        'sma_crossover': streamingIndicators.make_sma_crossover_consumer(),
+        'bollinger_squeeze': streamingIndicators.make_bollinger_squeeze_consumer(
+            bollinger.LOOKBACK_PERIOD, bollinger.STD_DEV, bollinger.VOLATILITY_THRESHOLD, bollinger.B_WIDTH_AVG_PERIOD
+        ),
+    }
+    for day, bar in zip(df.index, df.to_dict('records')):
+        for on_bar in consumers.values():
+            for strategy, side in on_bar('VALIDATE', bar):
+                stream_dates.setdefault((strategy, side), []).append(day.strftime('%Y-%m-%d'))
+
+    def last_date(strategy, side):
+        dates = stream_dates.get((strategy, side))
+        return dates[-1] if dates else 'N/A'
+
+    checks = {}
+
+    # EVWMA: the real CSV pipeline, compared on the last buy/sell dates it reports
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, "VALIDATE_historical_data.csv")
+        df.to_csv(csv_path)
+        indicators = price2EVWMA.calculate_indicators_from_csv(csv_path)
+    for strategy, evaluate in (('evwma_single', price2EVWMA.evaluate_single_evwma_signals),
+                               ('evwma_oscillator', price2EVWMA.evaluate_oscillator_evwma_signals),
+                               ('evwma_double', price2EVWMA.evaluate_double_evwma_signals)):
+        _, batch_buy, _, batch_sell = evaluate(indicators)
+        checks[strategy] = (batch_buy, batch_sell) == (last_date(strategy, 'BUY'), last_date(strategy, 'SELL'))
+
+    # SMA crossover: every signal date
+    sma_df = plotSMA.generate_crossover_signals(plotSMA.add_moving_averages(df[['close', 'volume']].copy(), 21, 7))
+    batch_buys = [d.strftime('%Y-%m-%d') for d in sma_df.index[sma_df['Buy_Signal']]]
+    batch_sells = [d.strftime('%Y-%m-%d') for d in sma_df.index[sma_df['Sell_Signal']]]
+    checks['sma_crossover'] = (batch_buys == stream_dates.get(('sma_crossover', 'BUY'), [])
+                               and batch_sells == stream_dates.get(('sma_crossover', 'SELL'), []))
+
+    # Bollinger: the batch result has no dates, so the order of the signals is compared
+    batch_signals = [r['Signal'] for r in bollinger.analyze_boom_bust_cycle(df['close'].tolist(), 'VALIDATE') if r['Signal']]
+    stream_signals = sorted(
+        [(d, 1) for d in stream_dates.get(('bollinger_squeeze', 'BUY'), [])]
+        + [(d, -1) for d in stream_dates.get(('bollinger_squeeze', 'SELL'), [])]
+    )
+    checks['bollinger_squeeze'] = batch_signals == [s for _, s in stream_signals]
+
+    return checks
+
+def save_results(result, output_dir=DEFAULT_RESULTS_DIR):
+    """
+    Saves a replay run as '<YYYYMMDD_HHMMSS>_<commit>_replay.json'.
+
+    Returns:
+        str: The path of the JSON file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    commit = benchmarkHotPaths.get_git_commit()
+    path = os.path.join(output_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}_replay.json")
+    with open(path, 'w') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'result': result,
+        }, f, indent=2)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replays stored bars of many tickers through the streaming indicators.",
+        epilog="Example: python barReplay.py --synthetic 500 --bars 378 --speed 864000"
+    )
+    parser.add_argument('--history-dir', type=str, default=pricePanel.DEFAULT_HISTORY_DIR,
+                        help='Folder of stored history CSVs. Defaults to the _OUTPUT folder.')
+    parser.add_argument('--tickers', type=str, default=None,
+                        help='Comma-separated tickers to replay. Defaults to every ticker found.')
+    parser.add_argument('--synthetic', type=int, default=None,
+                        help='Replay this many synthetic tickers instead of stored history.')
+    parser.add_argument('--bars', type=int, default=benchmarkHotPaths.BATCH_WINDOW_BARS,
+                        help='Bars per synthetic ticker.')
+    parser.add_argument('--speed', type=float, default=None,
+                        help='Market seconds per wall-clock second (86400 = one day per second). '
+                             'Defaults to as fast as possible.')
+    parser.add_argument('--max-events', type=int, default=None, help='Stop after this many events.')
+    parser.add_argument('--consumers', type=str, default=','.join(streamingIndicators.DEFAULT_CONSUMERS),
+                        help='Comma-separated consumers to subscribe.')
+    parser.add_argument('--validate', action='store_true',
+                        help='Check the streaming signals against the batch code on the first ticker.')
+    parser.add_argument('--output', type=str, default=None, help='Folder for a JSON copy of the results.')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        bar_streams = synthetic_bar_streams(args.synthetic, args.bars)
+    else:
+        tickers = [t.strip().upper() for t in args.tickers.split(',')] if args.tickers else None
+        files = pricePanel.find_history_files(args.history_dir, tickers)
+        if not files:
+            print(f"Error: No history CSVs found in '{args.history_dir}'.")
+            sys.exit(1)
+        bar_streams = {ticker: load_bar_stream(path) for ticker, path in files.items()}
+        bar_streams = {ticker: bars for ticker, bars in bar_streams.items() if bars}
+
+    if args.validate:
+        first_ticker, first_bars = next(iter(bar_streams.items()))
+        frame = pd.DataFrame([bar for _, bar in first_bars],
+                             index=pd.DatetimeIndex([pd.Timestamp(ts, unit='s') for ts, _ in first_bars], name='date'))
+        print(f">>  Validating streaming consumers on {first_ticker} ({len(frame):,} bars)")
+        for check, passed in validate_consumers(frame).items():
+            print(f">>    {check:<20} {'ok' if passed else 'MISMATCH'}")
+        print(f">> ")
+
+    subscribed = {}
+    for name in [n.strip() for n in args.consumers.split(',') if n.strip()]:
+        if name not in streamingIndicators.DEFAULT_CONSUMERS:
+            print(f"Error: Unknown consumer '{name}'. Use: {', '.join(streamingIndicators.DEFAULT_CONSUMERS)}.")
+            sys.exit(1)
+        subscribed[name] = streamingIndicators.DEFAULT_CONSUMERS[name]()
+
+    replay_result = run_replay(bar_streams, subscribed, args.speed, args.max_events)
+    print_replay_summary(replay_result)
+
+    if args.output:
+        print(f"\n>>  Results saved to '{save_results(replay_result, args.output)}'")
@@ -0,0 +1,314 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Get the path to the script folders under test
+stock_analysis = os.path.join(os.path.dirname(__file__), '..')
+utils = os.path.join(stock_analysis, '_UTILS')
+signals = os.path.join(stock_analysis, '_Asset_SIGNAL')
+
+# Add the folders to the system path
+sys.path.append(stock_analysis)
+sys.path.append(utils)
+sys.path.append(signals)
+
+# Now you can import the scripts as modules
+import price2EVWMA
+import plotSMA
+import bollinger
+import momentum
+import equityMetrics
+import tradingCalendar
+
+# Bars and ticker counts per profile - 'full' runs the complete matrix and takes a long time
+# while the per-bar Python loops (EVWMA, backtest, Bollinger) are still in place
+BENCHMARK_PROFILES = {
+    'quick':    {'bars': [1_000],                       'tickers': [10]},
+    'standard': {'bars': [1_000, 100_000],              'tickers': [10, 1_000]},
+    'full':     {'bars': [1_000, 100_000, 1_000_000],   'tickers': [10, 1_000, 5_000]},
+}
+
+# Bars per ticker in the ticker sweep: the download window of the batch scripts
+BATCH_WINDOW_BARS = tradingCalendar.BATCH_DOWNLOAD_SESSIONS
+
+# Cases above this many bars in total are timed once instead of --repeat times
+SINGLE_RUN_BARS = 100_000
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), '_RESULTS')
+
+# ------------------------------------------------------------------------------
+# Synthetic market data
+# ------------------------------------------------------------------------------
+
+def generate_synthetic_ohlcv(n_bars, seed=0, start_price=50.0):
+    """
+    Generates a random-walk OHLCV frame with lognormal volume.
+
+    Args:
+        n_bars (int): The number of bars.
+        seed (int): Seed of the random generator, so every run sees the same data.
+        start_price (float): The first close.
+
+    Returns:
+        pandas.DataFrame: Lowercase 'open', 'high', 'low', 'close', 'volume'
+                          columns on a DatetimeIndex named 'date'. Business days
+                          are used while they fit in the pandas date range,
+                          minute bars beyond that.
+    """
+    rng = np.random.default_rng(seed)
+
+    log_returns = rng.normal(0.0002, 0.02, n_bars)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    spread = np.abs(rng.normal(0.0, 0.01, n_bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.maximum(np.minimum(open_, close) - spread, 0.01)
+    volume = np.round(rng.lognormal(np.log(2_000_000), 1.0, n_bars))
+
+    freq = 'B' if n_bars <= 50_000 else 'min'
+    index = pd.date_range('1990-01-01', periods=n_bars, freq=freq, name='date')
+
+    return pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+        index=index
+    )
+
+def add_synthetic_evwma_columns(df):
+    """
+    Adds the columns read by the evaluate_*_evwma_signals functions.
+
+    Plain EMAs stand in for the EVWMAs so large inputs can be prepared quickly;
+    the evaluators only compare columns, so their cost does not depend on how
+    the values were produced.
+    """
+    df['evwma_short'] = df['close'].ewm(span=20, adjust=False).mean()
+    df['evwma_long'] = df['close'].ewm(span=60, adjust=False).mean()
+    df['evwma_oscillator'] = df['evwma_short'] - df['evwma_long']
+    df['evwma_signal'] = df['evwma_oscillator'].ewm(span=9, adjust=False).mean()
+    return df
+
+def to_yfinance_columns(df):
+    """Renames the synthetic columns to the capitalized yfinance history layout."""
+    return df.rename(columns=str.capitalize)
+
+# ------------------------------------------------------------------------------
+# Benchmark cases
+# ------------------------------------------------------------------------------
+# Each case builds its inputs once per size with prepare(frames, work_dir) and
+# returns a callable that makes fresh per-run arguments (untimed); only the
+# call to the function under test is measured.
+
+def prepare_indicators_from_csv(frames, work_dir):
+    paths = []
+    for i, df in enumerate(frames):
+        path = os.path.join(work_dir, f"SYN{i}_historical_data.csv")
+        df.to_csv(path)
+        paths.append(path)
+    return lambda: [(path,) for path in paths]
+
+def prepare_evwma_signals(frames, work_dir):
+    evaluated = [add_synthetic_evwma_columns(df.copy()) for df in frames]
+    return lambda: [(df,) for df in evaluated]
+
+def prepare_backtest(frames, work_dir):
+    signalled = []
+    for df in frames:
+        sma_df = plotSMA.add_moving_averages(df[['close', 'volume']].copy(), 15, 45)
+        signalled.append(plotSMA.generate_crossover_signals(sma_df))
+    # backtest_strategy writes its columns into the frame, so every run gets a copy
+    return lambda: [(df.copy(),) for df in signalled]
+
+def prepare_bollinger(frames, work_dir):
+    closes = [df['close'].tolist() for df in frames]
+    return lambda: [(c, 'SYN') for c in closes]
+
+def prepare_momentum(frames, work_dir):
+    histories = [to_yfinance_columns(df) for df in frames]
+    return lambda: [(history.copy(),) for history in histories]
+
+def momentum_metrics(history):
+    """The momentum screener math for one ticker: 1Y/1M/1W momentum, ATR and RSI."""
+    momentum.calculate_technical_metrics(history, history.iloc[-22:])
+    momentum.calculate_technical_metrics(history, history.iloc[-6:])
+    momentum.calculate_rsi(history['Close'].iloc[-28:])
+
+def prepare_equity_metrics(frames, work_dir):
+    # Every ticker's closes as one equity curve, in the market while above its 45 bar SMA
+    closes = pd.DataFrame({i: df['close'].to_numpy() for i, df in enumerate(frames)}).T
+    positions = closes > closes.T.rolling(45).mean().T
+    return lambda: [(closes, positions)]
+
+BENCHMARK_CASES = [
+    ('price2EVWMA.calculate_indicators_from_csv', price2EVWMA.calculate_indicators_from_csv, prepare_indicators_from_csv),
+    ('price2EVWMA.evaluate_single_evwma_signals', price2EVWMA.evaluate_single_evwma_signals, prepare_evwma_signals),
+    ('price2EVWMA.evaluate_oscillator_evwma_signals', price2EVWMA.evaluate_oscillator_evwma_signals, prepare_evwma_signals),
+    ('price2EVWMA.evaluate_double_evwma_signals', price2EVWMA.evaluate_double_evwma_signals, prepare_evwma_signals),
+    ('plotSMA.backtest_strategy', plotSMA.backtest_strategy, prepare_backtest),
+    ('bollinger.analyze_boom_bust_cycle', bollinger.analyze_boom_bust_cycle, prepare_bollinger),
+    ('momentum.technical_metrics', momentum_metrics, prepare_momentum),
+    ('equityMetrics.equity_metrics', equityMetrics.equity_metrics, prepare_equity_metrics),
+]
+
+# ------------------------------------------------------------------------------
+# Runner
+# ------------------------------------------------------------------------------
+
+def time_case(func, make_args, repeats):
+    """
+    Times one case.
+
+    Returns:
+        list: Wall-clock seconds of each run; a run calls func once per argument tuple.
+    """
+    timings = []
+    for _ in range(repeats):
+        run_args = make_args()
+        start = time.perf_counter()
+        for args in run_args:
+            func(*args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def run_benchmarks(profile='quick', repeats=3, only=None):
+    """
+    Runs every case over the bar sweep (one ticker) and the ticker sweep
+    (BATCH_WINDOW_BARS bars per ticker) of a profile.
+
+    Args:
+        profile (str): A key of BENCHMARK_PROFILES.
+        repeats (int): Runs per case; small cases keep the best.
+        only (str, optional): Runs only cases whose name contains this text.
+
+    Returns:
+        list: One result dict per case and size.
+    """
+    sizes = [(n_bars, 1) for n_bars in BENCHMARK_PROFILES[profile]['bars']]
+    sizes += [(BATCH_WINDOW_BARS, n_tickers) for n_tickers in BENCHMARK_PROFILES[profile]['tickers']]
+
+    results = []
+    for n_bars, n_tickers in sizes:
+        frames = [generate_synthetic_ohlcv(n_bars, seed=i) for i in range(n_tickers)]
+        total_bars = n_bars * n_tickers
+        case_repeats = repeats if total_bars <= SINGLE_RUN_BARS else 1
+
+        for name, func, prepare in BENCHMARK_CASES:
+            if only and only not in name:
+                continue
+
+            work_dir = tempfile.mkdtemp(prefix='bench_')
+            try:
+                timings = time_case(func, prepare(frames, work_dir), case_repeats)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+            best = min(timings)
+            result = {
+                'case': name,
+                'n_bars': n_bars,
+                'n_tickers': n_tickers,
+                'repeats': case_repeats,
+                'best_s': best,
+                'mean_s': sum(timings) / len(timings),
+                'per_bar_us': best / total_bars * 1e6,
+            }
+            results.append(result)
+            print(f">>  {name:<48} {n_bars:>9,} bars x {n_tickers:>5,} tickers  "
+                  f"{best:>10.4f}s  ({result['per_bar_us']:.3f} us/bar)")
+
+    return results
+
+def get_git_commit():
+    """Returns the short hash of HEAD, or 'unknown' outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+def save_results(results, profile, output_dir=DEFAULT_RESULTS_DIR):
+    """
+    Saves a benchmark run as '<YYYYMMDD_HHMMSS>_<commit>_<profile>.json'.
+
+    Returns:
+        str: The path of the JSON file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    commit = get_git_commit()
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(output_dir, f"{stamp}_{commit}_{profile}.json")
+
+    with open(path, 'w') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'profile': profile,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.platform(),
+            'results': results,
+        }, f, indent=2)
+
+    return path
+
+def compare_results(baseline_path, results):
+    """
+    Prints the speed-up of this run against a saved run, per case and size.
+    Ratios above 1 are faster than the baseline.
+    """
+    try:
+        with open(baseline_path, 'r') as f:
+            baseline = json.load(f)
+    except Exception as e:
+        print(f"Error reading baseline '{baseline_path}': {e}")
+        return
+
+    previous = {(r['case'], r['n_bars'], r['n_tickers']): r['best_s'] for r in baseline['results']}
+
+    print(f"\n--- Compared to {baseline.get('commit', 'unknown')} ({baseline.get('created', '')}) ---\n")
+    for r in results:
+        key = (r['case'], r['n_bars'], r['n_tickers'])
+        if key not in previous:
+            continue
+        speedup = previous[key] / r['best_s'] if r['best_s'] else float('inf')
+        print(f">>  {r['case']:<48} {r['n_bars']:>9,} x {r['n_tickers']:>5,}  "
+              f"{previous[key]:>10.4f}s -> {r['best_s']:>10.4f}s  x{speedup:.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Times the indicator and signal hot paths on synthetic OHLCV data (no network).",
+        epilog="Example: python benchmarkHotPaths.py --profile standard --compare _RESULTS/<previous>.json"
+    )
+    parser.add_argument('--profile', choices=BENCHMARK_PROFILES.keys(), default='quick',
+                        help='Bar and ticker sweep to run. Defaults to quick.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per case for small inputs; the best run is reported. Defaults to 3.')
+    parser.add_argument('--only', type=str, default=None,
+                        help='Only run cases whose name contains this text.')
+    parser.add_argument('--output', type=str, default=DEFAULT_RESULTS_DIR,
+                        help='Folder for the JSON results.')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='A previous JSON result to compare against.')
+    args = parser.parse_args()
+
+    print(f">>  BENCHMARK profile '{args.profile}' on {get_git_commit()}\n")
+    benchmark_results = run_benchmarks(args.profile, args.repeat, args.only)
+
+    results_path = save_results(benchmark_results, args.profile, args.output)
+    print(f"\n>>  Results saved to '{results_path}'")
+
+    if args.compare:
+        compare_results(args.compare, benchmark_results)
@@ -0,0 +1,162 @@
+import os
+import sys
+import json
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+
+# Entry points to time: (folder relative to stock_analysis, module name)
+ENTRY_POINTS = [
+    ('.', 'processScreeners'),
+    ('.', 'processNews'),
+    ('.', 'bollinger'),
+    ('_Asset_BATCH', 'cnsBtchPrc2EVWMA'),
+    ('_Asset_SIGNAL', 'price2EVWMA'),
+    ('_UTILS', 'generateScreenerReport'),
+    ('_UTILS', 'momentum'),
+]
+
+# Import budget per entry point - quick runs should start in well under a second
+DEFAULT_BUDGET_S = 1.0
+
+STOCK_ANALYSIS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), '_RESULTS')
+
+def parse_importtime(stderr_text):
+    """
+    Parses the output of 'python -X importtime'.
+
+    Returns:
+        list: (depth, module, self_us, cumulative_us) tuples in output order.
+    """
+    entries = []
+    for line in stderr_text.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, package = line[len('import time:'):].split('|', 2)
+            # The package column is indented two spaces per nesting level, after one separator space
+            name = package.rstrip()[1:]
+            depth = (len(name) - len(name.lstrip())) // 2
+            entries.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+def time_entry_point(folder, module_name):
+    """
+    Imports one entry point in a fresh interpreter with -X importtime.
+
+    Returns:
+        dict: 'cumulative_s' of the module itself and its 5 heaviest direct imports,
+              or None if the import failed.
+    """
+    module_dir = os.path.join(STOCK_ANALYSIS_DIR, folder)
+    code = f"import sys; sys.path.insert(0, {module_dir!r}); import {module_name}"
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=module_dir
+    )
+    if completed.returncode != 0:
+        print(f">>  Import of {module_name} failed:\n{completed.stderr.strip().splitlines()[-1]}")
+        return None
+
+    entries = parse_importtime(completed.stderr)
+    own = [e for e in entries if e[1] == module_name]
+    if not own:
+        return None
+    depth = own[-1][0]
+
+    # Direct imports of the entry point are printed just before it, one level deeper
+    own_index = entries.index(own[-1])
+    children = []
+    for entry in reversed(entries[:own_index]):
+        if entry[0] <= depth:
+            break
+        if entry[0] == depth + 1:
+            children.append(entry)
+
+    heaviest = sorted(children, key=lambda e: e[3], reverse=True)[:5]
+    return {
+        'cumulative_s': own[-1][3] / 1e6,
+        'heaviest_imports': [{'module': e[1], 'cumulative_s': e[3] / 1e6} for e in heaviest],
+    }
+
+def run_import_benchmark(repeats=3, budget_s=DEFAULT_BUDGET_S):
+    """
+    Times every entry point; the best of `repeats` fresh interpreters is kept.
+
+    Returns:
+        list: One result dict per entry point.
+    """
+    results = []
+    for folder, module_name in ENTRY_POINTS:
+        runs = [time_entry_point(folder, module_name) for _ in range(repeats)]
+        runs = [r for r in runs if r is not None]
+        if not runs:
+            continue
+
+        best = min(runs, key=lambda r: r['cumulative_s'])
+        result = {
+            'entry_point': f"{folder}/{module_name}".lstrip('./'),
+            'cumulative_s': best['cumulative_s'],
+            'within_budget': best['cumulative_s'] <= budget_s,
+            'heaviest_imports': best['heaviest_imports'],
+        }
+        results.append(result)
+
+        status = "ok" if result['within_budget'] else "OVER BUDGET"
+        heaviest = ", ".join(f"{h['module']} {h['cumulative_s'] * 1000:.0f}ms" for h in best['heaviest_imports'][:3])
+        print(f">>  {result['entry_point']:<40} {best['cumulative_s'] * 1000:>8.1f} ms  {status:<12} {heaviest}")
+
+    return results
+
+def get_git_commit():
+    """Returns the short hash of HEAD, or 'unknown' outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=STOCK_ANALYSIS_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Times 'python -X importtime' for every stock_analysis entry point.",
+        epilog="Example: python benchmarkImportTime.py --compare _RESULTS/<previous>_importtime.json"
+    )
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters per entry point. Defaults to 3.')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_S, help='Import budget in seconds. Defaults to 1.0.')
+    parser.add_argument('--output', type=str, default=DEFAULT_RESULTS_DIR, help='Folder for the JSON results.')
+    parser.add_argument('--compare', type=str, default=None, help='A previous JSON result to compare against.')
+    args = parser.parse_args()
+
+    commit = get_git_commit()
+    print(f">>  IMPORT TIME on {commit} (budget {args.budget:.2f}s)\n")
+    import_results = run_import_benchmark(args.repeat, args.budget)
+
+    os.makedirs(args.output, exist_ok=True)
+    results_path = os.path.join(args.output, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}_importtime.json")
+    with open(results_path, 'w') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'python': platform.python_version(),
+            'budget_s': args.budget,
+            'results': import_results,
+        }, f, indent=2)
+    print(f"\n>>  Results saved to '{results_path}'")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        previous = {r['entry_point']: r['cumulative_s'] for r in baseline['results']}
+        print(f"\n--- Compared to {baseline.get('commit', 'unknown')} ---\n")
+        for r in import_results:
+            if r['entry_point'] in previous:
+                print(f">>  {r['entry_point']:<40} {previous[r['entry_point']] * 1000:>8.1f} ms -> {r['cumulative_s'] * 1000:>8.1f} ms")
+
+    # A non-zero exit lets a scheduled job flag a startup regression
+    sys.exit(0 if all(r['within_budget'] for r in import_results) else 1)
@@ -0,0 +1,140 @@
+import os
+import sys
+import time
+import pickle
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the scripts as modules
+import pricePanel
+import benchmarkHotPaths
+
+# ==============================================================================
+# Process pool transfer: pickled DataFrames vs. the shared memory price panel
+# ==============================================================================
+# Runs the same per-ticker EVWMA worker over many tickers twice - once with
+# every ticker's DataFrame submitted to the pool (pickled per task), once with
+# the workers reading the bars from a pricePanel block - and checks that both
+# return the same records.
+
+# EVWMA volume spans of cnsBtchPrc2EVWMA (daily bars)
+VOLUME_SPAN_SHORT = 40_500_000
+VOLUME_SPAN_LONG = 120_000_000
+
+def evwma_record(ticker, close, volume, dates):
+    """
+    The compact result a pool worker returns: the latest short/long EVWMA and
+    the dates of the last double EVWMA crossovers.
+
+    Args:
+        close, volume (numpy.ndarray): The ticker's bars; NaN bars are skipped.
+        dates (numpy.ndarray): int64 nanosecond timestamps of the bars.
+    """
+    valid = ~(np.isnan(close) | np.isnan(volume))
+    close, volume, dates = close[valid].tolist(), volume[valid].tolist(), dates[valid]
+
+    if not close:
+        return {'ticker': ticker, 'bars': 0}
+
+    short = long = close[0]
+    last_buy = last_sell = None
+    for i in range(1, len(close)):
+        previous_short, previous_long = short, long
+        short += min(volume[i] / VOLUME_SPAN_SHORT, 1.0) * (close[i] - short)
+        long += min(volume[i] / VOLUME_SPAN_LONG, 1.0) * (close[i] - long)
+        if previous_short < previous_long and short >= long:
+            last_buy = i
+        elif previous_short > previous_long and short <= long:
+            last_sell = i
+
+    def to_date(i):
+        return None if i is None else str(pd.Timestamp(int(dates[i])).date())
+
+    return {
+        'ticker': ticker,
+        'bars': len(close),
+        'last_close': close[-1],
+        'evwma_short': short,
+        'evwma_long': long,
+        'double_last_buy': to_date(last_buy),
+        'double_last_sell': to_date(last_sell),
+    }
+
+def frame_worker(ticker, df):
+    """Pool task with the DataFrame pickled into the worker."""
+    return evwma_record(ticker, df['close'].to_numpy(dtype=np.float64), df['volume'].to_numpy(dtype=np.float64),
+                        df.index.as_unit('ns').asi8)
+
+def panel_worker(ticker):
+    """Pool task reading the ticker's bars from the shared panel."""
+    arrays = pricePanel.ticker_arrays(ticker)
+    return evwma_record(ticker, arrays['close'], arrays['volume'], arrays['date'])
+
+def run_pickled(frames, workers, chunksize):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tickers = list(frames)
+        return list(pool.map(frame_worker, tickers, [frames[t] for t in tickers], chunksize=chunksize))
+
+def run_panel(frames, workers, chunksize):
+    handle = pricePanel.create_panel(frames)
+    try:
+        return pricePanel.map_panel(panel_worker, handle, workers=workers, chunksize=chunksize), handle
+    finally:
+        pricePanel.close_panel(handle, unlink=True)
+
+def load_frames(args):
+    if args.synthetic:
+        frames = {}
+        for i in range(args.synthetic):
+            df = benchmarkHotPaths.generate_synthetic_ohlcv(args.bars, seed=i)
+            frames[f"SYN{i}"] = df[pricePanel.PANEL_FIELDS]
+        return frames
+    files = pricePanel.find_history_files(args.history_dir)
+    return pricePanel.load_panel_frames(files)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compares pickled DataFrames with the shared memory price panel in a process pool.",
+        epilog="Example: python benchmarkPanelPool.py --synthetic 2000 --bars 2520 --workers 8"
+    )
+    parser.add_argument('--history-dir', type=str, default=pricePanel.DEFAULT_HISTORY_DIR,
+                        help='Folder of stored history CSVs. Defaults to the _OUTPUT folder.')
+    parser.add_argument('--synthetic', type=int, default=None,
+                        help='Use this many synthetic tickers instead of stored history.')
+    parser.add_argument('--bars', type=int, default=benchmarkHotPaths.BATCH_WINDOW_BARS,
+                        help='Bars per synthetic ticker.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes. Defaults to the CPU count.')
+    parser.add_argument('--chunksize', type=int, default=16, help='Tickers per pool task.')
+    args = parser.parse_args()
+
+    frames = load_frames(args)
+    if not frames:
+        print("Error: No tickers to process.")
+        sys.exit(1)
+
+    total_bars = sum(len(df) for df in frames.values())
+    pickled_bytes = sum(len(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)) for df in frames.values())
+    print(f">>  {len(frames):,} tickers, {total_bars:,} bars")
+
+    start = time.perf_counter()
+    pickled_records = run_pickled(frames, args.workers, args.chunksize)
+    pickled_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    panel_records, handle = run_panel(frames, args.workers, args.chunksize)
+    panel_s = time.perf_counter() - start
+    handle_bytes = len(pickle.dumps(handle, protocol=pickle.HIGHEST_PROTOCOL))
+
+    print(f">>  Pickled DataFrames  {pickled_s:>8.3f}s  ({pickled_bytes / 1e6:,.1f} MB sent to the workers)")
+    print(f">>  Shared price panel  {panel_s:>8.3f}s  ({handle_bytes / 1e3:,.1f} KB handle per worker, "
+          f"{np.prod(handle['shape']) * 8 / 1e6:,.1f} MB block)")
+    print(f">>  Records match: {'yes' if pickled_records == panel_records else 'NO'}")
@@ -1,17 +1,29 @@
 import os
+import sys
 import pandas as pd
 import pandas_ta as ta
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import yfinance as yf
 import mplfinance as mpf # <--- ADDED IMPORT for mplfinance
 from datetime import datetime, timedelta
 
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import marketData
+import csvNormalize
+import candlePatterns
+
 def clean_csv_header(input_filepath, ticker, output_filepath=None):
     """
     Reads a CSV file, replaces 'Price' with 'Date' in the first line,
     and removes specific second and third lines if they match the specified format.
+    The file is streamed through csvNormalize, so it is never read into memory whole.
 
     Args:
         input_filepath (str): The path to the input CSV file.
@@ -19,70 +31,8 @@ def clean_csv_header(input_filepath, ticker, output_filepath=None):
                                          If None, the input file will be overwritten.
                                          Defaults to None.
     """
-    if output_filepath is None:
-        output_filepath = input_filepath
-
-    lines = []
-    try:
-        with open(input_filepath, 'r') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        print(f"Error: The file '{input_filepath}' was not found.")
-        return
-    except Exception as e:
-        print(f"An error occurred while reading the file: {e}")
-        return
-
-    modified_lines = []
-    
-    # Process the first line
-    if lines:
-        first_line = lines[0].strip()
-        if first_line.startswith('Price,'):
-            modified_lines.append('date' + first_line[5:] + '\n')
-            print(f"Modified first line: '{first_line.strip()}' -> 'date{first_line[5:].strip()}'")
-        else:
-            modified_lines.append(lines[0])
-            print(f"First line not modified: '{first_line.strip()}'")
-    else:
-        print("The CSV file is empty.")
-        return
-
-    # Process subsequent lines for removal
-    lines_to_skip = 0
-    if len(lines) > 1:
-        second_line = lines[1].strip()
-        # Check for the exact format "Ticker,JNJ,JNJ,JNJ,JNJ,JNJ"
-        if second_line.startswith('Ticker,') and all(part == ticker for part in second_line.split(',')[1:]):
-            lines_to_skip += 1
-            print(f"Skipping second line: '{second_line}'")
-        else:
-            modified_lines.append(lines[1])
-            print(f"Second line not skipped: '{second_line}'")
-
-    if len(lines) > 2 and lines_to_skip == 1: # Only check third line if second was skipped
-        third_line = lines[2].strip()
-        # Check for the exact format "Date,,,,"
-        if third_line == 'Date,,,,,':
-            lines_to_skip += 1
-            print(f"Skipping third line: '{third_line}'")
-        else:
-            # If the second line was skipped but the third wasn't, add the third line back.
-            # This handles cases where only the second line matches for skipping.
-            if lines_to_skip == 1: # This means the second line was skipped, but third was not.
-                modified_lines.append(lines[2])
-                print(f"Third line not skipped: '{third_line}'")
-
-    # Add remaining lines
-    modified_lines.extend(lines[lines_to_skip + 1:])
+    csvNormalize.clean_csv_header(input_filepath, ticker, output_filepath)
 
-    try:
-        with open(output_filepath, 'w') as f:
-            f.writelines(modified_lines)
-        print(f"CSV file cleaned successfully. Output saved to '{output_filepath}'")
-    except Exception as e:
-        print(f"An error occurred while writing the file: {e}")
-        
 def download_historical_data(ticker, start_date, end_date, output_filename):
     """
     Downloads historical stock data using yfinance and saves it to a CSV file.
@@ -100,7 +50,7 @@ def download_historical_data(ticker, start_date, end_date, output_filename):
     print(f"Attempting to download historical data for {ticker} from {start_date} to {end_date}...")
     try:
         # Download data
-        data = yf.download(ticker, start=start_date, end=end_date)
+        data = marketData.download(ticker, start=start_date, end=end_date)
 
         if data.empty:
             print(f"No data downloaded for {ticker} in the specified date range. Please check the ticker and dates.")
@@ -253,7 +203,7 @@ def calculate_indicators_from_csv(csv_filepath, volume_span_short_param, volume_
         return None
 
 
-def generate_single_evwma_chart(df, title="Price & EVWMA Crossovers (Modified Sell Signal)"):
+def generate_single_evwma_chart(df, title="Price & EVWMA Crossovers (Modified Sell Signal)", output_path=None):
     """
     Generates a candlestick chart of Close Price and a single EVWMA, with RSI.
     Uses mplfinance for plotting.
@@ -319,20 +269,26 @@ def generate_single_evwma_chart(df, title="Price & EVWMA Crossovers (Modified Se
         apds.append(mpf.make_addplot(bottom_plot_data, type='scatter', marker='*', color='blue', markersize=200, panel=0, label='Potential Bottom'))
     
     # Plotting with mplfinance
-    mpf.plot(mpf_df,
-             type='candle',
-             style='yahoo',
-             volume=True,   # Include volume subplot below price
-             addplot=apds,
-             panel_ratios=(3, 1, 1), # Ratio of height for price, volume, RSI. Now explicitly 3 panels.
-             figscale=1.5,       # Adjust figure size (e.g., 1.5x default)
-             title=title,
-             ylabel='Price',
-             ylabel_lower='Volume',
-            )
-    plt.show()
-
-def generate_double_evwma_chart(df, title="Double EVWMA Crossover Signals"):
+    fig, axes = mpf.plot(mpf_df,
+                         type='candle',
+                         style='yahoo',
+                         volume=True,   # Include volume subplot below price
+                         addplot=apds,
+                         panel_ratios=(3, 1, 1), # Ratio of height for price, volume, RSI. Now explicitly 3 panels.
+                         figscale=1.5,       # Adjust figure size (e.g., 1.5x default)
+                         title=title,
+                         ylabel='Price',
+                         ylabel_lower='Volume',
+                         returnfig=True,
+                        )
+    # With output_path the chart is saved headless instead of shown
+    if output_path:
+        fig.savefig(output_path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+def generate_double_evwma_chart(df, title="Double EVWMA Crossover Signals", output_path=None):
     """
     Generates a candlestick chart of Close Price and two EVWMAs, showing signals based on
     the short EVWMA crossing the long EVWMA AND price crossing above the long EVWMA.
@@ -382,19 +338,25 @@ def generate_double_evwma_chart(df, title="Double EVWMA Crossover Signals"):
         apds.append(mpf.make_addplot(sell_plot_data, type='scatter', marker='v', color='red', markersize=100, label='Sell Signal'))
 
     # Plotting with mplfinance
-    mpf.plot(mpf_df,
-             type='candle',
-             style='yahoo',
-             volume=True,
-             addplot=apds,
-             figscale=1.5,
-             title=title,
-             ylabel='Price',
-             ylabel_lower='Volume',
-            )
-    plt.show()
-
-def generate_evwma_macd_style_chart(df, title="EVWMA Oscillator (MACD Style) Signals"):
+    fig, axes = mpf.plot(mpf_df,
+                         type='candle',
+                         style='yahoo',
+                         volume=True,
+                         addplot=apds,
+                         figscale=1.5,
+                         title=title,
+                         ylabel='Price',
+                         ylabel_lower='Volume',
+                         returnfig=True,
+                        )
+    # With output_path the chart is saved headless instead of shown
+    if output_path:
+        fig.savefig(output_path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+def generate_evwma_macd_style_chart(df, title="EVWMA Oscillator (MACD Style) Signals", output_path=None):
     """
     Generates a candlestick chart with EVWMAs in the top panel,
     and EVWMA Oscillator, Signal Line, and Histogram in a lower panel,
@@ -447,32 +409,52 @@ def generate_evwma_macd_style_chart(df, title="EVWMA Oscillator (MACD Style) Sig
         mpf.make_addplot(mpf_df['evwma_signal'], color='green', panel=2, linestyle='--', width=1.5),
         # Histogram bars need to be colored based on their value (positive/negative)
         mpf.make_addplot(mpf_df['evwma_hist'], type='bar', panel=2,
-                         color=['green' if x >= 0 else 'red' for x in mpf_df['evwma_hist']],
+                         color=np.where(mpf_df['evwma_hist'] >= 0, 'green', 'red').tolist(),
                          width=0.7),
     ])
 
-    mpf.plot(mpf_df,
-             type='candle',
-             style='yahoo',
-             volume=True,
-             addplot=apds,
-             panel_ratios=(3, 1, 1), # Ratio of height for price, volume, oscillator. Explicitly 3 panels.
-             figscale=1.5,
-             title=title,
-             ylabel='Price',
-             ylabel_lower='Volume',
-            )
-    plt.show()
+    fig, axes = mpf.plot(mpf_df,
+                         type='candle',
+                         style='yahoo',
+                         volume=True,
+                         addplot=apds,
+                         panel_ratios=(3, 1, 1), # Ratio of height for price, volume, oscillator. Explicitly 3 panels.
+                         figscale=1.5,
+                         title=title,
+                         ylabel='Price',
+                         ylabel_lower='Volume',
+                         returnfig=True,
+                        )
+    # With output_path the chart is saved headless instead of shown
+    if output_path:
+        fig.savefig(output_path)
+        plt.close(fig)
+    else:
+        plt.show()
 
 
-if __name__ == "__main__":
+def analyze_ticker(ticker_symbol, start_date_input='', end_date_input='', chart_dir=None):
+    """
+    Downloads one ticker, saves its indicators and candlestick patterns and
+    draws the three EVWMA charts - the interactive run without the prompts, so
+    the job runner can call it for many tickers in one process.
+
+    Args:
+        ticker_symbol (str): The ticker, upper case.
+        start_date_input (str): Start date 'YYYY-MM-DD'; empty for the beginning of the current year.
+        end_date_input (str): End date 'YYYY-MM-DD'; empty for today.
+        chart_dir (str, optional): Saves the charts as PNGs in this folder instead of showing them.
+
+    Returns:
+        dict: 'indicators' (the CSV path), 'last_bullish' / 'last_bearish'
+              pattern dates and 'charts' (the saved chart paths), or None when
+              the input is invalid or no data was found.
+    """
+    result = None
     print("--- Stock Data Downloader & Indicator Charting ---")
 
-    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
     
     # --- MODIFIED DATE INPUT AND DEFAULTING LOGIC STARTS HERE ---
-    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
-    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
 
     # Determine start_date based on input or default
     if start_date_input:
@@ -502,12 +484,12 @@ if __name__ == "__main__":
         # Validate that the start date is not in the future
         if parsed_start_date > today_date:
             print(f"Error: Start date ({start_date_str}) cannot be in the future.")
-            exit()
+            return None
             
         # Validate that start date is strictly before end date
         if parsed_start_date >= parsed_end_date:
             print(f"Error: Start date ({start_date_str}) must be strictly before end date ({end_date_str}).")
-            exit()
+            return None
 
         # Determine the effective end date for yfinance download
         # yfinance 'end' parameter is exclusive (it downloads up to the day *before* the 'end' date).
@@ -531,7 +513,7 @@ if __name__ == "__main__":
 
     except ValueError:
         print("Error: Invalid date format. Please use YYYY-MM-DD.")
-        exit()
+        return None
 
     csv_file = f"{ticker_symbol}_historical_data.csv"
 
@@ -560,20 +542,50 @@ if __name__ == "__main__":
             print("\n--- Calculated Indicators from CSV (last 5 rows) ---")
             print(df_indicators_from_csv.tail())
 
+            # One boolean 'pattern_<name>' column per candlestick pattern, saved with the indicators
+            candlePatterns.detect_patterns(df_indicators_from_csv)
+            bullish_triggered, last_bullish, bearish_triggered, last_bearish, latest_patterns = candlePatterns.evaluate_pattern_signals(df_indicators_from_csv)
+            print("\n--- Candlestick Patterns ---")
+            print(f"Patterns on the latest bar: {candlePatterns.describe_patterns(latest_patterns)}")
+            print(f"Last bullish pattern: {last_bullish} / Last bearish pattern: {last_bearish}")
+
             output_filename = f"{ticker_symbol}_indicators_output.csv"
             df_indicators_from_csv.to_csv(output_filename)
             print(f"\nIndicators saved to {output_filename}")
 
+            # With a chart folder the charts are saved there instead of shown
+            today_date_str = datetime.now().strftime('%Y%m%d')
+            chart_paths = {
+                suffix: os.path.join(chart_dir, f"{today_date_str}_{ticker_symbol}_{suffix}.png") if chart_dir else None
+                for suffix in ('candles_single_evwma', 'candles_double_evwma', 'candles_evwma_oscillator')
+            }
+            if chart_dir:
+                os.makedirs(chart_dir, exist_ok=True)
+
             print("\nGenerating Single EVWMA Chart (Modified Sell Signal & Bottom Signal)...")
-            generate_single_evwma_chart(df_indicators_from_csv, title=f"{ticker_symbol} Price & EVWMA Crossovers (Sell & Bottom Signals)")
+            generate_single_evwma_chart(df_indicators_from_csv, title=f"{ticker_symbol} Price & EVWMA Crossovers (Sell & Bottom Signals)",
+                                        output_path=chart_paths['candles_single_evwma'])
 
             print("\nGenerating Double EVWMA Crossover Chart...")
-            generate_double_evwma_chart(df_indicators_from_csv, title=f"{ticker_symbol} Double EVWMA Crossover Strategy")
+            generate_double_evwma_chart(df_indicators_from_csv, title=f"{ticker_symbol} Double EVWMA Crossover Strategy",
+                                        output_path=chart_paths['candles_double_evwma'])
 
             print("\nGenerating EVWMA Oscillator (MACD Style) Chart...")
-            generate_evwma_macd_style_chart(df_indicators_from_csv, title=f"{ticker_symbol} EVWMA Oscillator (MACD Style) Signals")
+            generate_evwma_macd_style_chart(df_indicators_from_csv, title=f"{ticker_symbol} EVWMA Oscillator (MACD Style) Signals",
+                                            output_path=chart_paths['candles_evwma_oscillator'])
+            result = {'indicators': output_filename, 'last_bullish': last_bullish, 'last_bearish': last_bearish,
+                      'charts': [path for path in chart_paths.values() if path]}
 
         else:
             print("Failed to calculate indicators from downloaded CSV data.")
     else:
-        print("Data download failed. Cannot proceed with chart generation.")
\ No newline at end of file
+        print("Data download failed. Cannot proceed with chart generation.")
+
+    return result
+
+if __name__ == "__main__":
+    ticker_symbol = input("Enter the stock ticker symbol (e.g., JNJ, AAPL): ").upper()
+    start_date_input = input("Enter the start date (YYYY-MM-DD, press Enter for beginning of current year): ")
+    end_date_input = input("Enter the end date (YYYY-MM-DD, press Enter for current date): ")
+
+    analyze_ticker(ticker_symbol, start_date_input, end_date_input)
@@ -0,0 +1,229 @@
+import csv
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+def build_screener_index(filenames=("stock_screener.dict", "news_screener.dict")):
+    """
+    Reads one or more screener dictionary files and builds a sparse
+    (ticker x subcategory x day) occurrence index. A subcategory is keyed on
+    its category as well, so names both files use (e.g. 'UNRECOGNIZED') stay
+    apart.
+
+    The index keeps the non-zero cells as COO triplets sorted by day, so any
+    trailing date window is a binary search away and every query below is a
+    sparse matrix operation instead of nested defaultdict(set) bookkeeping.
+
+    Args:
+        filenames (tuple): Paths to dictionary files with the layout
+                           'Date,Category,Subcategory,Ticker1,Ticker2,...'.
+
+    Returns:
+        dict: The index with keys 'tickers', 'categories' and 'subcategories'
+              (aligned: the category of each subcategory), 'days'
+              (datetime64[D]), 'ticker_idx', 'subcat_idx', 'day_idx' and
+              'counts', or None if no file could be read.
+    """
+    if isinstance(filenames, str):
+        filenames = (filenames,)
+
+    raw_dates = []
+    raw_categories = []
+    raw_subcats = []
+    raw_tickers = []
+
+    for filename in filenames:
+        if not os.path.exists(filename):
+            print(f"Warning: The file '{filename}' was not found. Skipping.")
+            continue
+
+        try:
+            with open(filename, 'r', newline='') as file:
+                reader = csv.reader(file)
+                next(reader, None) # Skip header
+
+                for row in reader:
+                    if len(row) < 4:
+                        continue
+                    file_date_str = row[0].strip()
+                    category = row[1].strip()
+                    subcategory = row[2].strip()
+                    for ticker in row[3:]:
+                        ticker = ticker.strip()
+                        # Empty screener runs are recorded as '<date><category>' - not a ticker
+                        if not ticker or ticker.startswith(file_date_str):
+                            continue
+                        raw_dates.append(file_date_str)
+                        raw_categories.append(category)
+                        raw_subcats.append(subcategory)
+                        raw_tickers.append(ticker)
+        except Exception as e:
+            print(f"An error occurred while reading the file '{filename}': {e}")
+
+    if not raw_tickers:
+        print("No screener history was loaded. Cannot build the index.")
+        return None
+
+    # Factorize each axis once; the integer codes become the sparse coordinates
+    tickers, ticker_codes = np.unique(np.array(raw_tickers), return_inverse=True)
+    subcat_codes, subcat_keys = pd.MultiIndex.from_arrays([raw_categories, raw_subcats]).factorize(sort=True)
+    day_values = pd.to_datetime(pd.Series(raw_dates), format='%Y%m%d', errors='coerce').to_numpy().astype('datetime64[D]')
+
+    valid = ~np.isnat(day_values)
+    days, day_codes = np.unique(day_values[valid], return_inverse=True)
+    ticker_codes = ticker_codes[valid]
+    subcat_codes = subcat_codes[valid]
+
+    # Collapse duplicate (ticker, subcategory, day) cells into counts
+    n_tickers, n_subcats = len(tickers), len(subcat_keys)
+    flat = (day_codes.astype(np.int64) * n_subcats + subcat_codes) * n_tickers + ticker_codes
+    flat, counts = np.unique(flat, return_counts=True)
+
+    # np.unique sorts the flat key, and day is its most significant part,
+    # so the triplets come out ordered by day
+    return {
+        'tickers': tickers,
+        'categories': subcat_keys.get_level_values(0).to_numpy(),
+        'subcategories': subcat_keys.get_level_values(1).to_numpy(),
+        'days': days,
+        'ticker_idx': flat % n_tickers,
+        'subcat_idx': (flat // n_tickers) % n_subcats,
+        'day_idx': flat // (n_tickers * n_subcats),
+        'counts': counts,
+    }
+
+def _window_slice(index, last_n_days=None, end_date=None):
+    """
+    Returns the slice of the day-sorted triplets that falls inside the window
+    [end_date - last_n_days, end_date]. Both bounds are found by binary search.
+    """
+    end_day = np.datetime64(end_date or datetime.now().date(), 'D')
+    hi = np.searchsorted(index['days'], end_day, side='right')
+
+    if last_n_days is None:
+        lo = 0
+    else:
+        start_day = end_day - np.timedelta64(last_n_days, 'D')
+        lo = np.searchsorted(index['days'], start_day, side='left')
+
+    start = np.searchsorted(index['day_idx'], lo, side='left')
+    stop = np.searchsorted(index['day_idx'], hi, side='left')
+    return slice(start, stop)
+
+def ticker_subcategory_matrix(index, last_n_days=None, end_date=None):
+    """
+    Collapses the day axis of the index over a trailing window.
+
+    Args:
+        index (dict): The index returned by build_screener_index.
+        last_n_days (int, optional): Size of the trailing window in calendar days.
+                                     If None, the whole history is used.
+        end_date (date, optional): Last day of the window. Defaults to today.
+
+    Returns:
+        scipy.sparse.csr_matrix: Occurrence counts, shape (n_tickers, n_subcategories).
+    """
+    window = _window_slice(index, last_n_days, end_date)
+    shape = (len(index['tickers']), len(index['subcategories']))
+    return sparse.csr_matrix(
+        (index['counts'][window], (index['ticker_idx'][window], index['subcat_idx'][window])),
+        shape=shape
+    )
+
+def tickers_in_multiple_screeners(index, min_screeners=2, last_n_days=45, end_date=None, min_occurrences=1):
+    """
+    Finds tickers that hit at least `min_screeners` different subcategories.
+
+    Args:
+        index (dict): The index returned by build_screener_index.
+        min_screeners (int): Minimum number of distinct subcategories.
+        last_n_days (int): Size of the trailing window in calendar days.
+        end_date (date, optional): Last day of the window. Defaults to today.
+        min_occurrences (int): A (ticker, subcategory) pair only counts once it
+                               occurred at least this many times in the window.
+
+    Returns:
+        pandas.DataFrame: Columns 'Ticker', 'Screeners' and 'TotalOccurrences',
+                          sorted by screener count (descending) then ticker.
+    """
+    counts = ticker_subcategory_matrix(index, last_n_days, end_date)
+    hits = counts.multiply(counts >= min_occurrences).tocsr()
+
+    screener_counts = np.asarray((hits > 0).sum(axis=1)).ravel()
+    total_occurrences = np.asarray(hits.sum(axis=1)).ravel()
+
+    selected = np.flatnonzero(screener_counts >= min_screeners)
+    result = pd.DataFrame({
+        'Ticker': index['tickers'][selected],
+        'Screeners': screener_counts[selected],
+        'TotalOccurrences': total_occurrences[selected],
+    })
+    return result.sort_values(['Screeners', 'Ticker'], ascending=[False, True]).reset_index(drop=True)
+
+def screener_jaccard_overlap(index, last_n_days=45, end_date=None):
+    """
+    Computes the pairwise Jaccard overlap of the ticker sets of every subcategory.
+
+    Args:
+        index (dict): The index returned by build_screener_index.
+        last_n_days (int): Size of the trailing window in calendar days.
+        end_date (date, optional): Last day of the window. Defaults to today.
+
+    Returns:
+        pandas.DataFrame: Square (subcategory x subcategory) Jaccard matrix,
+                          indexed by (Category, SubCategory) on both axes.
+    """
+    membership = (ticker_subcategory_matrix(index, last_n_days, end_date) > 0).astype(np.int32)
+
+    # Intersections for every pair in one sparse product; set sizes sit on the diagonal
+    intersections = (membership.T @ membership).toarray().astype(float)
+    sizes = np.diag(intersections)
+    unions = sizes[:, None] + sizes[None, :] - intersections
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        jaccard = np.where(unions > 0, intersections / unions, 0.0)
+
+    keys = pd.MultiIndex.from_arrays([index['categories'], index['subcategories']], names=['Category', 'SubCategory'])
+    return pd.DataFrame(jaccard, index=keys, columns=keys)
+
+def top_screener_pairs(index, last_n_days=45, end_date=None, top_n=10):
+    """
+    Lists the subcategory pairs with the highest Jaccard overlap.
+
+    Returns:
+        pandas.DataFrame: Columns 'CategoryA', 'SubCategoryA', 'CategoryB',
+                          'SubCategoryB' and 'Jaccard'.
+    """
+    jaccard = screener_jaccard_overlap(index, last_n_days, end_date)
+    upper_i, upper_j = np.triu_indices(len(jaccard), k=1)
+    values = jaccard.to_numpy()[upper_i, upper_j]
+
+    order = np.argsort(-values)[:top_n]
+    pair_a, pair_b = jaccard.index[upper_i[order]], jaccard.columns[upper_j[order]]
+    return pd.DataFrame({
+        'CategoryA': pair_a.get_level_values(0),
+        'SubCategoryA': pair_a.get_level_values(1),
+        'CategoryB': pair_b.get_level_values(0),
+        'SubCategoryB': pair_b.get_level_values(1),
+        'Jaccard': values[order],
+    })
+
+if __name__ == "__main__":
+    last_n_days = 45
+    screener_index = build_screener_index(("stock_screener.dict", "news_screener.dict"))
+
+    if screener_index is not None:
+        print(f">>  Indexed {len(screener_index['counts']):,} cells - {len(screener_index['tickers']):,} Tickers x "
+              f"{len(screener_index['subcategories'])} SubCategories x {len(screener_index['days'])} Days")
+
+        # Anchor the window on the most recent day in the history
+        latest_day = screener_index['days'][-1].astype(datetime)
+
+        print(f"\n--- Tickers in 2 or More SubCategories (Last {last_n_days} Days to {latest_day}) ---\n")
+        print(tickers_in_multiple_screeners(screener_index, 2, last_n_days, latest_day).to_string(index=False))
+
+        print(f"\n--- Most Overlapping SubCategory Pairs (Last {last_n_days} Days to {latest_day}) ---\n")
+        print(top_screener_pairs(screener_index, last_n_days, latest_day).to_string(index=False))
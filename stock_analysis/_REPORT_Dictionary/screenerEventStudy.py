@@ -0,0 +1,258 @@
+import os
+import sys
+import csv
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '..', '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import pricePanel
+
+# ==============================================================================
+# Screener / news event study - what followed an appearance in a subcategory
+# ==============================================================================
+# Every ticker listed on a row of stock_screener.dict or news_screener.dict is
+# an event: (date, category, subcategory, ticker). The events are joined to
+# the stored price history with one as-of merge - the entry bar of an event is
+# the ticker's first bar on or after the event date, so an event recorded on a
+# weekend or holiday enters on the next session - and the forward returns of
+# every horizon are read off precomputed columns of that bar:
+#
+#   forward return    close[entry + h] / close[entry] - 1
+#   abnormal return   forward return - the benchmark's forward return from the same date
+#
+# The benchmark is a ticker of the history (e.g. SPY) when one is given and
+# stored, otherwise the equal-weighted mean forward return of every stored
+# ticker on that date. Events whose horizon runs past the end of the history
+# have no return for it and are left out of that horizon's statistics.
+
+DEFAULT_HORIZONS = [1, 5, 20]
+# An event further than this many calendar days from its ticker's next bar
+# (e.g. after the history ends) gets no entry bar
+ENTRY_TOLERANCE_DAYS = 5
+
+def load_events(filenames=("stock_screener.dict", "news_screener.dict")):
+    """
+    Explodes the screener dictionary files into one row per (date, subcategory, ticker).
+
+    Args:
+        filenames (tuple): Dictionary files with the layout
+                           'Date,Category,Subcategory,Ticker1,Ticker2,...'.
+
+    Returns:
+        pandas.DataFrame: Columns 'event_date', 'category', 'subcategory' and
+                          'ticker', or an empty frame if no file could be read.
+    """
+    if isinstance(filenames, str):
+        filenames = (filenames,)
+
+    rows = []
+    for filename in filenames:
+        if not os.path.exists(filename):
+            print(f"Warning: The file '{filename}' was not found. Skipping.")
+            continue
+        try:
+            with open(filename, 'r', newline='') as file:
+                reader = csv.reader(file)
+                next(reader, None) # Skip header
+                rows.extend((row[0].strip(), row[1].strip(), row[2].strip(), row[3:]) for row in reader if len(row) >= 4)
+        except Exception as e:
+            print(f"An error occurred while reading the file '{filename}': {e}")
+
+    events = pd.DataFrame(rows, columns=['event_date', 'category', 'subcategory', 'ticker'])
+    events = events.explode('ticker', ignore_index=True)
+    events['ticker'] = events['ticker'].fillna('').astype(str).str.strip().str.upper()
+    # Empty screener runs are recorded as '<date><category>' - not a ticker
+    events = events[(events['ticker'] != '') & ~events['ticker'].str.match(r'^\d{8}')]
+    events['event_date'] = pd.to_datetime(events['event_date'], format='%Y%m%d', errors='coerce')
+    return events.dropna(subset=['event_date']).drop_duplicates().reset_index(drop=True)
+
+def load_price_history(history_dir, tickers=None):
+    """
+    Reads the newest stored history CSV of every ticker into one long table.
+
+    Args:
+        history_dir (str): Folder of '<date>_<TICKER>_historical_data.csv' files.
+        tickers (set, optional): Only read these tickers.
+
+    Returns:
+        pandas.DataFrame: Columns 'ticker', 'date' and 'close', sorted by ticker and date.
+    """
+    frames = []
+    for ticker, path in pricePanel.find_history_files(history_dir, tickers).items():
+        try:
+            df = pd.read_csv(path, usecols=['date', 'close'], parse_dates=['date'])
+        except Exception as e:
+            print(f">>    Could not read '{path}': {e}")
+            continue
+        df['ticker'] = ticker
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame({'ticker': pd.Series(dtype=str), 'date': pd.Series(dtype='datetime64[ns]'),
+                             'close': pd.Series(dtype=float)})
+    prices = pd.concat(frames, ignore_index=True)
+    prices['close'] = pd.to_numeric(prices['close'], errors='coerce')
+    prices['date'] = prices['date'].astype('datetime64[ns]')
+    prices = prices.dropna().drop_duplicates(['ticker', 'date'], keep='last')
+    return prices.sort_values(['ticker', 'date'], ignore_index=True)[['ticker', 'date', 'close']]
+
+def add_forward_returns(prices, horizons=DEFAULT_HORIZONS, benchmark=None):
+    """
+    Adds 'fwd_<h>' and 'abn_<h>' columns for every horizon to the long price table.
+
+    The returns of all tickers are computed at once: the table is sorted by
+    ticker and date, so close[i + h] is a shift of the whole column, masked
+    where it would reach into the next ticker.
+
+    Args:
+        prices (pandas.DataFrame): From load_price_history().
+        horizons (list): Forward horizons in bars.
+        benchmark (str, optional): Ticker whose forward returns are subtracted.
+                                   Defaults to the equal-weighted mean of all tickers.
+
+    Returns:
+        pandas.DataFrame: `prices` with the new columns.
+    """
+    close = prices['close'].to_numpy(dtype=np.float64)
+    ticker_codes = pd.factorize(prices['ticker'])[0]
+
+    for h in horizons:
+        future = np.full(len(close), np.nan)
+        same_ticker = np.zeros(len(close), dtype=bool)
+        if h < len(close):
+            future[:-h] = close[h:]
+            same_ticker[:-h] = ticker_codes[h:] == ticker_codes[:-h]
+        prices[f'fwd_{h}'] = np.where(same_ticker, future / close - 1.0, np.nan)
+
+    fwd_columns = [f'fwd_{h}' for h in horizons]
+    if benchmark and (prices['ticker'] == benchmark).any():
+        baseline = prices.loc[prices['ticker'] == benchmark].set_index('date')[fwd_columns]
+    else:
+        if benchmark:
+            print(f">>    No stored history for benchmark {benchmark} - using the equal-weighted mean of all tickers")
+        baseline = prices.groupby('date')[fwd_columns].mean()
+
+    aligned = baseline.reindex(prices['date']).to_numpy()
+    for column, h in enumerate(horizons):
+        prices[f'abn_{h}'] = prices[f'fwd_{h}'].to_numpy() - aligned[:, column]
+    return prices
+
+def join_events(events, prices, tolerance_days=ENTRY_TOLERANCE_DAYS):
+    """
+    Joins every event to its entry bar with an as-of merge.
+
+    Returns:
+        pandas.DataFrame: The events with the entry bar's 'date', 'close' and
+                          return columns; events without an entry bar keep NaN.
+    """
+    left = events.sort_values('event_date').reset_index(drop=True)
+    left['event_date'] = left['event_date'].astype('datetime64[ns]')
+    right = prices.sort_values('date')
+    # merge_asof needs both keys in the same datetime unit
+    right['date'] = right['date'].astype('datetime64[ns]')
+    return pd.merge_asof(
+        left, right,
+        left_on='event_date', right_on='date', by='ticker',
+        direction='forward', tolerance=pd.Timedelta(days=tolerance_days)
+    )
+
+def summarize_events(joined, horizons=DEFAULT_HORIZONS):
+    """
+    Aggregates the joined events per category and subcategory.
+
+    Returns:
+        pandas.DataFrame: 'Events' and 'Priced' counts, then for every horizon
+                          the number of events with a return ('N_<h>d'), the
+                          mean forward and abnormal return and their hit rates
+                          (share of events above zero).
+    """
+    stats = joined[['category', 'subcategory']].copy()
+    stats['priced'] = joined['date'].notna()
+    aggregations = {'Events': ('priced', 'size'), 'Priced': ('priced', 'sum')}
+    for h in horizons:
+        fwd, abn = joined[f'fwd_{h}'], joined[f'abn_{h}']
+        # NaN stays NaN, so a hit rate only counts the events with a return
+        stats[f'fwd_{h}'] = fwd
+        stats[f'abn_{h}'] = abn
+        stats[f'hit_{h}'] = (fwd > 0).astype(float).where(fwd.notna())
+        stats[f'abn_hit_{h}'] = (abn > 0).astype(float).where(abn.notna())
+        aggregations.update({
+            f'N_{h}d': (f'fwd_{h}', 'count'),
+            f'MeanRet_{h}d': (f'fwd_{h}', 'mean'),
+            f'HitRate_{h}d': (f'hit_{h}', 'mean'),
+            f'MeanAbnRet_{h}d': (f'abn_{h}', 'mean'),
+            f'AbnHitRate_{h}d': (f'abn_hit_{h}', 'mean'),
+        })
+
+    summary = stats.groupby(['category', 'subcategory']).agg(**aggregations).reset_index()
+    summary = summary.rename(columns={'category': 'Category', 'subcategory': 'SubCategory'})
+    return summary.sort_values(['Category', 'Events'], ascending=[True, False], ignore_index=True)
+
+def run_event_study(filenames, history_dir, horizons=DEFAULT_HORIZONS, benchmark=None):
+    """
+    Loads the events and the price history and returns (joined events, summary),
+    or None when either is empty.
+    """
+    events = load_events(filenames)
+    if events.empty:
+        print("No screener history was loaded. Cannot run the event study.")
+        return None
+
+    # Every stored ticker, not only the ones with events: the equal-weighted
+    # baseline (also the fallback for a benchmark without history) averages them all
+    prices = load_price_history(history_dir)
+    if prices.empty:
+        print(f"No stored price history found in '{history_dir}'. Cannot run the event study.")
+        return None
+
+    prices = add_forward_returns(prices, horizons, benchmark)
+    joined = join_events(events, prices)
+    return joined, summarize_events(joined, horizons)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measures the forward and abnormal returns that followed screener and news appearances.",
+        epilog="Example: python screenerEventStudy.py --horizons 1,5,20 --benchmark SPY"
+    )
+    parser.add_argument('--history-dir', type=str, default=pricePanel.DEFAULT_HISTORY_DIR,
+                        help='Folder of stored history CSVs. Defaults to the _OUTPUT folder.')
+    parser.add_argument('--horizons', type=str, default=','.join(str(h) for h in DEFAULT_HORIZONS),
+                        help='Comma-separated forward horizons in trading days.')
+    parser.add_argument('--benchmark', type=str, default=None,
+                        help='Ticker for the abnormal returns. Defaults to the equal-weighted mean of all stored tickers.')
+    parser.add_argument('--events-output', type=str, default=None,
+                        help='Also save every joined event to this CSV file.')
+    args = parser.parse_args()
+
+    try:
+        horizons = sorted({int(h) for h in args.horizons.split(',')})
+    except ValueError:
+        print(f"Error: Invalid --horizons '{args.horizons}'. Use whole numbers, e.g. 1,5,20.")
+        sys.exit(1)
+
+    result = run_event_study(("stock_screener.dict", "news_screener.dict"), args.history_dir, horizons,
+                             args.benchmark.upper() if args.benchmark else None)
+
+    if result is not None:
+        joined, summary = result
+        print(f">>  {len(joined):,} events, {int(joined['date'].notna().sum()):,} with a stored entry bar - "
+              f"{joined['ticker'].nunique():,} Tickers x {joined['subcategory'].nunique()} SubCategories")
+        print(f"\n--- Forward Returns after a Screener / News Appearance (Horizons {', '.join(f'{h}d' for h in horizons)}) ---\n")
+        with pd.option_context('display.float_format', '{:.4f}'.format, 'display.width', 250):
+            print(summary.to_string(index=False))
+
+        output_filename = f"{datetime.now().strftime('%Y%m%d')}_Screener_Event_Study.csv"
+        summary.to_csv(output_filename, index=False)
+        print(f"\nSummary saved to '{output_filename}'")
+        if args.events_output:
+            joined.to_csv(args.events_output, index=False)
+            print(f"Events saved to '{args.events_output}'")
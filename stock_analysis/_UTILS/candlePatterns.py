@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# Candlestick patterns - array comparisons over open / high / low / close
+# ==============================================================================
+# Every pattern is a handful of elementwise comparisons of the bar arrays.
+# Multi-bar patterns compare the bar with shifted copies of the arrays (the
+# bar before, two bars before, ...), so there is no loop over the bars and
+# the same code runs on one ticker (1-D arrays) or on many tickers at once
+# (2-D arrays, one row per ticker, bars along the last axis).
+#
+#   doji                body at most DOJI_BODY of the bar's range
+#   hammer              long lower shadow, small upper shadow, after a decline
+#   bullish_engulfing   up bar whose body covers the body of a down bar before it
+#   bearish_engulfing   down bar whose body covers the body of an up bar before it
+#   morning_star        long down bar, small bar below it, up bar closing past
+#                       the middle of the first body
+#   evening_star        the mirror image of the morning star
+#   three_soldiers      three long up bars, each opening in the body before and closing higher
+#   three_crows         three long down bars, each opening in the body before and closing lower
+#
+# A bar missing any of the prices (NaN) or a bar the pattern reaches back to
+# does not exist compares as False, so no pattern fires across the start of a
+# history or a gap.
+
+PATTERN_NAMES = ['doji', 'hammer', 'bullish_engulfing', 'bearish_engulfing',
+                 'morning_star', 'evening_star', 'three_soldiers', 'three_crows']
+BULLISH_PATTERNS = ['hammer', 'bullish_engulfing', 'morning_star', 'three_soldiers']
+BEARISH_PATTERNS = ['bearish_engulfing', 'evening_star', 'three_crows']
+
+# Column prefix of detect_patterns(), e.g. 'pattern_hammer'
+PATTERN_PREFIX = 'pattern_'
+
+# Shape thresholds, as fractions of the bar's high - low range
+DOJI_BODY = 0.1         # doji: body at most this
+SMALL_BODY = 0.3        # star: middle bar's body at most this
+LONG_BODY = 0.5         # star / soldiers / crows: body at least this
+HAMMER_SHADOW = 2.0     # hammer: lower shadow at least this many bodies
+HAMMER_UPPER = 0.1      # hammer: upper shadow at most this
+# Bars the close must have fallen over before a hammer
+TREND_BARS = 3
+
+def _shift(values, bars):
+    """`values` moved `bars` positions later along the last axis, NaN-filled at the start."""
+    shifted = np.full(values.shape, np.nan)
+    if bars < values.shape[-1]:
+        shifted[..., bars:] = values[..., :values.shape[-1] - bars]
+    return shifted
+
+def pattern_masks(open_, high, low, close):
+    """
+    Detects every pattern of PATTERN_NAMES on every bar.
+
+    Args:
+        open_, high, low, close (numpy.ndarray): Same-shaped float arrays, bars
+                                                 along the last axis.
+
+    Returns:
+        dict: Pattern name -> boolean array of the same shape, True on the bar
+              that completes the pattern.
+    """
+    o, h, l, c = (np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+
+    with np.errstate(invalid='ignore'):
+        body = np.abs(c - o)
+        price_range = h - l
+        upper_shadow = h - np.maximum(o, c)
+        lower_shadow = np.minimum(o, c) - l
+        up = c > o
+        down = c < o
+        long_body = body >= LONG_BODY * price_range
+
+        # The bar before (1) and two bars before (2)
+        o1, c1, o2, c2 = _shift(o, 1), _shift(c, 1), _shift(o, 2), _shift(c, 2)
+        body1 = _shift(body, 1)
+        range1 = _shift(price_range, 1)
+        up1, down1 = c1 > o1, c1 < o1
+        up2, down2 = c2 > o2, c2 < o2
+        long1, long2 = _shift(long_body, 1) == 1, _shift(long_body, 2) == 1
+
+        masks = {}
+        masks['doji'] = (price_range > 0) & (body <= DOJI_BODY * price_range)
+        masks['hammer'] = ((price_range > 0) & (body > 0)
+                           & (lower_shadow >= HAMMER_SHADOW * body)
+                           & (upper_shadow <= HAMMER_UPPER * price_range)
+                           & (c1 < _shift(c, 1 + TREND_BARS)))
+        masks['bullish_engulfing'] = down1 & up & (o <= c1) & (c >= o1) & (body > body1)
+        masks['bearish_engulfing'] = up1 & down & (o >= c1) & (c <= o1) & (body > body1)
+
+        small1 = body1 <= SMALL_BODY * range1
+        masks['morning_star'] = (down2 & long2 & small1 & (np.maximum(o1, c1) < c2)
+                                 & up & (c > (o2 + c2) / 2))
+        masks['evening_star'] = (up2 & long2 & small1 & (np.minimum(o1, c1) > c2)
+                                 & down & (c < (o2 + c2) / 2))
+
+        masks['three_soldiers'] = (up & up1 & up2 & long_body & long1 & long2
+                                   & (c > c1) & (c1 > c2)
+                                   & (o >= o1) & (o <= c1) & (o1 >= o2) & (o1 <= c2))
+        masks['three_crows'] = (down & down1 & down2 & long_body & long1 & long2
+                                & (c < c1) & (c1 < c2)
+                                & (o <= o1) & (o >= c1) & (o1 <= o2) & (o1 >= c2))
+    return masks
+
+def detect_patterns(df, prefix=PATTERN_PREFIX):
+    """
+    Adds one boolean column per pattern to a frame of bars.
+
+    Args:
+        df (pandas.DataFrame): Bars with lowercase 'open', 'high', 'low' and
+                               'close' columns, oldest first.
+        prefix (str): Prefix of the new columns.
+
+    Returns:
+        pandas.DataFrame: `df`, modified in place, with the columns
+                          '<prefix><pattern>' for every PATTERN_NAMES entry.
+    """
+    masks = pattern_masks(*(df[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close')))
+    for name in PATTERN_NAMES:
+        df[prefix + name] = masks[name]
+    return df
+
+def evaluate_pattern_signals(df, patterns=None, prefix=PATTERN_PREFIX):
+    """
+    Evaluates the pattern columns of detect_patterns() like the EVWMA signals
+    are evaluated: whether a pattern completes on the latest bar, and when one
+    last did.
+
+    Args:
+        df (pandas.DataFrame): A frame with the pattern columns, indexed by date.
+        patterns (list, optional): Patterns to consider. Defaults to all.
+
+    Returns:
+        tuple: (bullish triggered, last bullish date, bearish triggered,
+                last bearish date, patterns on the latest bar), dates as
+                'YYYY-MM-DD' or 'N/A'.
+    """
+    patterns = PATTERN_NAMES if patterns is None else patterns
+    latest = [name for name in patterns if len(df) and bool(df[prefix + name].iloc[-1])]
+
+    def side(names):
+        columns = [prefix + name for name in names if name in patterns]
+        if not columns or df.empty:
+            return False, 'N/A'
+        hits = df[columns].any(axis=1)
+        last = hits.index[hits.to_numpy()]
+        return bool(hits.iloc[-1]), last[-1].strftime('%Y-%m-%d') if len(last) else 'N/A'
+
+    bullish_triggered, last_bullish = side(BULLISH_PATTERNS)
+    bearish_triggered, last_bearish = side(BEARISH_PATTERNS)
+    return bullish_triggered, last_bullish, bearish_triggered, last_bearish, latest
+
+def _stack_bars(frames):
+    """Stacks the OHLC of many tickers into right-aligned (tickers x bars) arrays."""
+    tickers = list(frames)
+    length = max((len(df) for df in frames.values()), default=0)
+    arrays = {col: np.full((len(tickers), length), np.nan) for col in ('open', 'high', 'low', 'close')}
+    dates = np.full((len(tickers), length), np.datetime64('NaT'), dtype='datetime64[ns]')
+
+    for row, ticker in enumerate(tickers):
+        df = frames[ticker]
+        first = length - len(df)
+        for col, array in arrays.items():
+            array[row, first:] = df[col].to_numpy(dtype=np.float64)
+        dates[row, first:] = df.index.to_numpy(dtype='datetime64[ns]')
+    return tickers, arrays, dates
+
+def scan_patterns(frames, lookback=5):
+    """
+    Detects the patterns of many tickers in one pass over a stacked panel.
+
+    Args:
+        frames (dict): Ticker -> DataFrame of bars (lowercase OHLC columns,
+                       DatetimeIndex, oldest first).
+        lookback (int): Bars counted as recent for the 'recent' column.
+
+    Returns:
+        pandas.DataFrame: One row per ticker and pattern with 'ticker',
+                          'pattern', 'latest' (completed on the last bar),
+                          'recent' (completed within the last `lookback` bars)
+                          and 'last_date' (most recent completion, or None).
+    """
+    tickers, arrays, dates = _stack_bars(frames)
+    masks = pattern_masks(arrays['open'], arrays['high'], arrays['low'], arrays['close'])
+    length = dates.shape[1]
+
+    rows = []
+    for name in PATTERN_NAMES:
+        mask = masks[name]
+        if length:
+            last = length - 1 - np.argmax(mask[:, ::-1], axis=1)
+            last = np.where(mask.any(axis=1), last, -1)
+        else:
+            last = np.full(len(tickers), -1)
+        for row, ticker in enumerate(tickers):
+            rows.append({
+                'ticker': ticker,
+                'pattern': name,
+                'latest': bool(last[row] == length - 1 and length),
+                'recent': bool(last[row] >= max(length - lookback, 0)),
+                'last_date': pd.Timestamp(dates[row, last[row]]).date() if last[row] >= 0 else None,
+            })
+
+    return pd.DataFrame(rows, columns=['ticker', 'pattern', 'latest', 'recent', 'last_date'])
+
+def describe_patterns(names):
+    """['hammer', 'bullish_engulfing'] -> 'Hammer, Bullish Engulfing' (or 'None')."""
+    return ', '.join(name.replace('_', ' ').title() for name in names) or 'None'
@@ -0,0 +1,239 @@
+import os
+import csv
+import sys
+import argparse
+
+# ==============================================================================
+# Streaming normalization of yfinance CSV exports
+# ==============================================================================
+# yf.download(...).to_csv() writes a two-level header:
+#
+#   Price,Close,Close,High,High,...      (group_by='column', the default)
+#   Ticker,AAPL,MSFT,AAPL,MSFT,...
+#   Date,,,,,
+#
+# or the same with the 'Ticker' and 'Price' rows swapped (group_by='ticker').
+# Single-ticker downloads use the same layout with one ticker. The functions
+# below read such files row by row, so memory stays bounded by the chunk size
+# no matter how many dates or tickers the export holds.
+
+# Output column order of the per-ticker files, as written by download_historical_data()
+OUTPUT_COLUMNS = ['open', 'high', 'low', 'close', 'adj_close', 'volume']
+
+# Rows buffered over all tickers before they are appended to the per-ticker files
+# (~100 bytes each); every flush opens each ticker file once, so wide files want a large chunk
+DEFAULT_CHUNK_ROWS = 500_000
+
+def _field_name(name):
+    """'Adj Close' -> 'adj_close', 'Close' -> 'close'."""
+    return name.strip().replace(' ', '_').lower()
+
+def _is_date_row(row):
+    """The 'Date,,,,' (or 'Datetime,,,') line under a two-level header."""
+    return bool(row) and row[0].strip().lower() in ('date', 'datetime') and not any(cell.strip() for cell in row[1:])
+
+def read_column_layout(reader, ticker=None):
+    """
+    Reads the header lines of a yfinance CSV and maps every data column to
+    its (ticker, field).
+
+    Args:
+        reader: A csv.reader positioned at the start of the file.
+        ticker (str, optional): The ticker of a file with a plain one-line
+                                header, which does not name it.
+
+    Returns:
+        tuple: (list of (ticker, field) per data column, first data row or None).
+    """
+    first = next(reader, None)
+    if first is None:
+        return [], None
+    second = next(reader, None)
+
+    label_1 = first[0].strip().lower()
+    label_2 = second[0].strip().lower() if second else ''
+    if label_1 == 'price' and label_2 == 'ticker':
+        layout = list(zip(second[1:], (_field_name(f) for f in first[1:])))
+        pending = next(reader, None)
+    elif label_1 == 'ticker' and label_2 == 'price':
+        layout = list(zip(first[1:], (_field_name(f) for f in second[1:])))
+        pending = next(reader, None)
+    else:
+        if ticker is None:
+            raise ValueError("The CSV has a one-line header; pass the ticker it belongs to.")
+        layout = [(ticker, _field_name(f)) for f in first[1:]]
+        pending = second
+
+    if pending is not None and _is_date_row(pending):
+        pending = next(reader, None)
+
+    layout = [(t.strip().upper(), field) for t, field in layout]
+    return layout, pending
+
+def normalize_yfinance_csv(input_filepath, output_dir, ticker=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                           filename_template="{ticker}_historical_data.csv"):
+    """
+    Splits a yfinance CSV (one or many tickers) into one tidy CSV per ticker,
+    in a single pass and bounded memory.
+
+    Every output file has a 'date' column followed by the lowercase OHLCV
+    columns the file holds, in OUTPUT_COLUMNS order - the layout the signal
+    scripts read. Dates on which a ticker has no values at all (before its
+    listing or after a delisting, in a wide download) are left out.
+
+    Args:
+        input_filepath (str): The yfinance CSV.
+        output_dir (str): Folder for the per-ticker CSVs. Existing files are replaced.
+        ticker (str, optional): Ticker of a file with a plain one-line header.
+        chunk_rows (int): Rows buffered in memory, over all tickers, before
+                          they are appended to the output files.
+        filename_template (str): Output file name; '{ticker}' is replaced.
+
+    Returns:
+        dict: Ticker -> {'path': output path, 'rows': rows written}, or None on error.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        f = open(input_filepath, 'r', newline='')
+    except FileNotFoundError:
+        print(f"Error: The file '{input_filepath}' was not found.")
+        return None
+
+    with f:
+        reader = csv.reader(f)
+        try:
+            layout, pending = read_column_layout(reader, ticker)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return None
+        if not layout:
+            print(f"The CSV file '{input_filepath}' is empty.")
+            return None
+
+        # Column positions of every ticker's fields, in output order
+        positions = {}
+        for index, (column_ticker, field) in enumerate(layout, start=1):
+            positions.setdefault(column_ticker, {})[field] = index
+        columns = {t: [field for field in OUTPUT_COLUMNS if field in fields] for t, fields in positions.items()}
+        indexes = {t: [positions[t][field] for field in columns[t]] for t in positions}
+
+        results = {t: {'path': os.path.join(output_dir, filename_template.format(ticker=t)), 'rows': 0}
+                   for t in positions}
+        buffers = {t: [] for t in positions}
+        started = set()
+        buffered = 0
+
+        def flush():
+            for t, lines in buffers.items():
+                if not lines:
+                    continue
+                mode = 'a' if t in started else 'w'
+                with open(results[t]['path'], mode, newline='') as out:
+                    if mode == 'w':
+                        out.write(','.join(['date'] + columns[t]) + '\n')
+                    out.writelines(lines)
+                started.add(t)
+                results[t]['rows'] += len(lines)
+                lines.clear()
+
+        rows = reader if pending is None else _prepend(pending, reader)
+        for row in rows:
+            if not row or not row[0].strip():
+                continue
+            for t, ticker_indexes in indexes.items():
+                values = [row[i] if i < len(row) else '' for i in ticker_indexes]
+                if not any(values):
+                    continue
+                buffers[t].append(row[0] + ',' + ','.join(values) + '\n')
+                buffered += 1
+            if buffered >= chunk_rows:
+                flush()
+                buffered = 0
+        flush()
+
+    # Tickers without a single value get no file
+    return {t: r for t, r in results.items() if r['rows']}
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+def clean_csv_header(input_filepath, ticker, output_filepath=None):
+    """
+    Replaces 'Price' with 'date' in the first line of a single-ticker
+    yfinance CSV and drops the 'Ticker,...' and 'Date,,,,,' lines under it.
+    The file is streamed line by line; when it is cleaned in place, the
+    output goes to a temporary file that then replaces the input.
+
+    Args:
+        input_filepath (str): The path to the input CSV file.
+        ticker (str): The ticker the 'Ticker,...' line must name to be dropped.
+        output_filepath (str, optional): The path to save the cleaned CSV file.
+                                         If None, the input file will be overwritten.
+    """
+    if output_filepath is None:
+        output_filepath = input_filepath
+    in_place = os.path.abspath(output_filepath) == os.path.abspath(input_filepath)
+    target = output_filepath + '.tmp' if in_place else output_filepath
+
+    try:
+        with open(input_filepath, 'r') as src, open(target, 'w') as out:
+            first_line = src.readline()
+            if not first_line:
+                print("The CSV file is empty.")
+                out.close()
+                os.remove(target)
+                return
+
+            stripped = first_line.strip()
+            if stripped.startswith('Price,'):
+                out.write('date' + stripped[5:] + '\n')
+                print(f"Modified first line: '{stripped}' -> 'date{stripped[5:]}'")
+            else:
+                out.write(first_line)
+                print(f"First line not modified: '{stripped}'")
+
+            second_line = src.readline()
+            second = second_line.strip()
+            if second.startswith('Ticker,') and all(part == ticker for part in second.split(',')[1:]):
+                print(f"Skipping second line: '{second}'")
+                third_line = src.readline()
+                if third_line.strip() == 'Date,,,,,':
+                    print(f"Skipping third line: '{third_line.strip()}'")
+                else:
+                    out.write(third_line)
+            else:
+                out.write(second_line)
+
+            for line in src:
+                out.write(line)
+    except FileNotFoundError:
+        print(f"Error: The file '{input_filepath}' was not found.")
+        return
+    except Exception as e:
+        print(f"An error occurred while cleaning the file: {e}")
+        return
+
+    if in_place:
+        os.replace(target, output_filepath)
+    print(f"CSV file cleaned successfully. Output saved to '{output_filepath}'")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Splits a (multi-ticker) yfinance CSV export into one tidy CSV per ticker, streaming.",
+        epilog="Example: python csvNormalize.py backfill.csv --output-dir E:/_scripts_PYTHON/_personal/_OUTPUT/_BACKFILL"
+    )
+    parser.add_argument('input', type=str, help='The yfinance CSV export.')
+    parser.add_argument('--output-dir', type=str, default="E:/_scripts_PYTHON/_personal/_OUTPUT/_BACKFILL",
+                        help='Folder for the per-ticker CSVs.')
+    parser.add_argument('--ticker', type=str, default=None, help='Ticker of a file with a plain one-line header.')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f'Rows buffered before writing. Defaults to {DEFAULT_CHUNK_ROWS:,}.')
+    args = parser.parse_args()
+
+    written = normalize_yfinance_csv(args.input, args.output_dir, args.ticker, args.chunk_rows)
+    if written is None:
+        sys.exit(1)
+
+    print(f">>  Wrote {len(written):,} ticker files ({sum(r['rows'] for r in written.values()):,} rows) to '{args.output_dir}'")
@@ -0,0 +1,185 @@
+import os
+import json
+from datetime import datetime, timedelta
+
+import fileLock
+
+# ==============================================================================
+# Dead tickers - negative cache of symbols that download no usable data
+# ==============================================================================
+# Input ticker lists keep symbols that were delisted, renamed or mistyped.
+# Each of them costs a full download round trip on every run. A download that
+# comes back empty - Yahoo has no price data for the symbol - is recorded here
+# with its reason, and batch runs skip the symbol until its re-probe date.
+# Every failed re-probe doubles the interval (up to DEAD_TICKERS_MAX_RETRY_DAYS);
+# a successful download removes the symbol. Network errors and rate limits are
+# not recorded - they say nothing about the ticker itself, and
+# marketData.download() raises them rather than returning an empty frame.
+#
+#   DEAD_TICKERS=0                    disable the cache
+#   DEAD_TICKERS_DIR=<dir>            folder of dead_tickers.json (default: _OUTPUT/_CACHE)
+#   DEAD_TICKERS_RETRY_DAYS=<n>       first re-probe interval (default: 7)
+#   DEAD_TICKERS_MAX_RETRY_DAYS=<n>   longest re-probe interval (default: 56)
+#
+# Concurrent runs (the workers of a work queue) share the list: a save applies
+# this run's changes to the list as it is on disk, under a fileLock.
+
+DEFAULT_CACHE_DIR = "E:/_scripts_PYTHON/_personal/_OUTPUT/_CACHE"
+DEFAULT_RETRY_DAYS = 7
+DEFAULT_MAX_RETRY_DAYS = 56
+
+_dead = {
+    'enabled': False,
+    'path': None,
+    'entries': {},      # ticker -> {'reason', 'first_seen', 'last_probe', 'failures', 'next_probe'}
+    'dirty': False,
+    'changes': {},      # ticker -> its new entry, or None when removed, in this run
+    'retry_days': DEFAULT_RETRY_DAYS,
+    'max_retry_days': DEFAULT_MAX_RETRY_DAYS,
+    'skipped': [],      # Tickers skipped in this run
+    'recorded': [],     # Tickers that failed in this run
+}
+
+def open_dead_tickers(cache_dir=None, retry_days=None, max_retry_days=None):
+    """
+    Loads the dead ticker list shared by all batch pipelines.
+
+    Args:
+        cache_dir (str, optional): Folder of dead_tickers.json. Defaults to
+                                   DEAD_TICKERS_DIR or DEFAULT_CACHE_DIR.
+        retry_days (int, optional): Days until a newly dead ticker is probed again.
+        max_retry_days (int, optional): Cap of the doubling re-probe interval.
+
+    Returns:
+        str: The path of the list.
+    """
+    cache_dir = cache_dir or os.environ.get('DEAD_TICKERS_DIR', DEFAULT_CACHE_DIR)
+    retry_days = retry_days if retry_days is not None else int(os.environ.get('DEAD_TICKERS_RETRY_DAYS', DEFAULT_RETRY_DAYS))
+    max_retry_days = max_retry_days if max_retry_days is not None else int(os.environ.get('DEAD_TICKERS_MAX_RETRY_DAYS', DEFAULT_MAX_RETRY_DAYS))
+    path = os.path.join(cache_dir, "dead_tickers.json")
+
+    _dead.update({
+        'enabled': True,
+        'path': path,
+        'entries': _read_entries(path),
+        'dirty': False,
+        'changes': {},
+        'retry_days': retry_days,
+        'max_retry_days': max(max_retry_days, retry_days),
+        'skipped': [],
+        'recorded': [],
+    })
+    return path
+
+def _read_entries(path):
+    """The entries of a dead ticker list; an empty dict for a missing or unreadable one."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('tickers', {})
+    except Exception as e:
+        # Losing the list only costs one probe per dead ticker
+        print(f">>  Ignoring unreadable dead ticker list '{path}': {e}")
+        return {}
+
+def open_dead_tickers_from_env():
+    """Calls open_dead_tickers() unless DEAD_TICKERS is set to a false value; returns the path or None."""
+    if os.environ.get('DEAD_TICKERS', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return open_dead_tickers()
+
+def should_skip(ticker, now=None):
+    """
+    Returns the entry of a ticker that is known dead and not yet due for a
+    re-probe, or None if it should be downloaded. Skips are remembered for
+    the report.
+    """
+    if not _dead['enabled']:
+        return None
+    entry = _dead['entries'].get(ticker)
+    if entry is None:
+        return None
+    now = now or datetime.now()
+    if entry['next_probe'] <= now.isoformat(timespec='seconds'):
+        return None
+    _dead['skipped'].append(ticker)
+    return entry
+
+def record_dead(ticker, reason, now=None):
+    """
+    Records a download without usable data. A ticker that was already dead
+    waits twice as long before its next probe.
+
+    Args:
+        ticker (str): The ticker symbol.
+        reason (str): Why the download is unusable, shown in the report.
+    """
+    if not _dead['enabled']:
+        return
+    now = now or datetime.now()
+    stamp = now.isoformat(timespec='seconds')
+    entry = _dead['entries'].get(ticker)
+    failures = entry['failures'] + 1 if entry else 1
+    interval = min(_dead['retry_days'] * 2 ** (failures - 1), _dead['max_retry_days'])
+
+    _dead['entries'][ticker] = {
+        'reason': reason,
+        'first_seen': entry['first_seen'] if entry else stamp,
+        'last_probe': stamp,
+        'failures': failures,
+        'next_probe': (now + timedelta(days=interval)).isoformat(timespec='seconds'),
+    }
+    _dead['changes'][ticker] = _dead['entries'][ticker]
+    _dead['recorded'].append(ticker)
+    _dead['dirty'] = True
+
+def record_alive(ticker):
+    """Removes a ticker from the list after a successful download."""
+    if _dead['enabled'] and _dead['entries'].pop(ticker, None) is not None:
+        _dead['changes'][ticker] = None
+        _dead['dirty'] = True
+
+def run_entries():
+    """
+    Returns the dead tickers this run skipped or recorded, sorted by ticker,
+    as dicts with 'ticker', 'status' ('Skipped' or 'No data') and the entry fields.
+    """
+    rows = {}
+    for status, tickers in (('Skipped', _dead['skipped']), ('No data', _dead['recorded'])):
+        for ticker in tickers:
+            entry = _dead['entries'].get(ticker)
+            if entry is not None:
+                rows[ticker] = dict(entry, ticker=ticker, status=status)
+    return [rows[ticker] for ticker in sorted(rows)]
+
+def save_dead_tickers():
+    """
+    Applies this run's changes to the list on disk (other processes may have
+    saved theirs since it was loaded) and writes it, through a temporary file.
+
+    Returns:
+        dict: 'skipped', 'recorded' and 'known' counts, or None when disabled.
+    """
+    if not _dead['enabled']:
+        return None
+
+    if _dead['dirty']:
+        with fileLock.file_lock(_dead['path']):
+            entries = _read_entries(_dead['path'])
+            for ticker, entry in _dead['changes'].items():
+                if entry is None:
+                    entries.pop(ticker, None)
+                else:
+                    entries[ticker] = entry
+            temp_path = fileLock.temp_path(_dead['path'])
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'saved': datetime.now().isoformat(timespec='seconds'), 'tickers': entries},
+                          f, indent=1, sort_keys=True)
+            os.replace(temp_path, _dead['path'])
+        _dead['entries'] = entries
+        _dead['changes'] = {}
+        _dead['dirty'] = False
+
+    return {'skipped': len(_dead['skipped']), 'recorded': len(_dead['recorded']),
+            'known': len(_dead['entries'])}
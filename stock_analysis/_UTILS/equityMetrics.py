@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+import rsRanking
+
+# ==============================================================================
+# Equity curve metrics - risk / performance of many backtests at once
+# ==============================================================================
+# plotSMA.backtest_strategy() leaves a Total_Portfolio_Value column and the
+# scripts only print its final value. This summarizes a whole block of equity
+# curves - one row per strategy, parameter set or ticker, one column per bar -
+# with every metric computed along the date axis for all rows together, so a
+# parameter grid of thousands of backtests is measured and ranked in one call:
+#
+#   Total_Return            last value / first value - 1
+#   CAGR                    the total return compounded per year
+#   Max_Drawdown            deepest fall below a running peak (-0.25 = -25%)
+#   Max_Drawdown_Duration   most bars spent below a previous peak
+#   Sharpe / Sortino        annualized mean excess return over its standard /
+#                           downside deviation
+#   Win_Rate                winning trades / trades (positive bars / bars that
+#                           moved, without positions)
+#   Exposure                bars in the market / bars (bars that moved, without positions)
+#   Trades                  round trips, NaN without positions
+#
+# A row may start and end with NaN (curves of different lengths); NaNs inside a
+# curve carry its last value, i.e. a zero return.
+
+PERIODS_PER_YEAR = 252
+
+METRIC_COLUMNS = ['Total_Return', 'CAGR', 'Max_Drawdown', 'Max_Drawdown_Duration',
+                  'Sharpe', 'Sortino', 'Win_Rate', 'Exposure', 'Trades']
+
+def _as_block(values):
+    """A Series, DataFrame (rows are curves) or array -> (labels, 2-D float64 array)."""
+    if isinstance(values, pd.Series):
+        return [values.name], values.to_numpy(dtype=np.float64)[None, :]
+    if isinstance(values, pd.DataFrame):
+        return list(values.index), values.to_numpy(dtype=np.float64)
+    block = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    return list(range(block.shape[0])), block
+
+def _trade_stats(equity, positions, first, last):
+    """
+    Trades and winning trades of every row. A trade runs over the bars with a
+    non-zero position; it is won when the equity on the bar that closes it (the
+    last bar for an open trade) is above the equity on the bar before it opened.
+    """
+    n_rows, length = equity.shape
+    held = np.nan_to_num(positions) != 0
+    columns = np.arange(length)
+    held &= (columns[None, :] >= first[:, None]) & (columns[None, :] <= last[:, None])
+
+    opens = held.copy()
+    opens[:, 1:] &= ~held[:, :-1]
+    closes = held.copy()
+    closes[:, :-1] &= ~held[:, 1:]
+
+    # Row-major order lists the opens and closes of a row in the same order
+    rows, open_columns = np.nonzero(opens)
+    _, close_columns = np.nonzero(closes)
+    entry = equity[rows, np.maximum(open_columns - 1, first[rows])]
+    exit_ = equity[rows, np.minimum(close_columns + 1, last[rows])]
+
+    trades = np.bincount(rows, minlength=n_rows)
+    wins = np.bincount(rows[exit_ > entry], minlength=n_rows)
+    in_market = held.sum(axis=1)
+    return trades, wins, in_market
+
+def equity_metrics(equity, positions=None, periods_per_year=PERIODS_PER_YEAR, risk_free_rate=0.0):
+    """
+    Computes the risk / performance metrics of a block of equity curves.
+
+    Args:
+        equity (numpy.ndarray | pandas.DataFrame | pandas.Series): (curves x bars)
+            portfolio values, e.g. Total_Portfolio_Value of many backtests. The
+            index of a DataFrame labels the result rows.
+        positions (array-like, optional): Positions of the same shape (the
+            Position column of backtest_strategy()); non-zero means in the market.
+            Without them trades are not known and Win_Rate / Exposure are read
+            off the bar returns.
+        periods_per_year (int): Bars per year, for CAGR, Sharpe and Sortino.
+        risk_free_rate (float): Annual risk-free rate taken off every bar's return.
+
+    Returns:
+        pandas.DataFrame: One row per curve with the METRIC_COLUMNS, NaN
+                          where a curve has too few bars for a metric.
+    """
+    labels, raw = _as_block(equity)
+    n_rows, length = raw.shape
+    filled = rsRanking.fill_gaps(raw)
+    valid = ~np.isnan(filled)
+    has_bars = valid.any(axis=1)
+    columns = np.arange(length)
+    first = np.where(has_bars, np.argmax(valid, axis=1), 0)
+    last = np.where(has_bars, length - 1 - np.argmax(valid[:, ::-1], axis=1), 0) if length else first
+    rows = np.arange(n_rows)
+    bars = np.where(has_bars, last - first, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        start_value, end_value = filled[rows, first], filled[rows, last]
+        total_return = end_value / start_value - 1.0
+        cagr = np.where(end_value / start_value > 0,
+                        (end_value / start_value) ** (periods_per_year / bars) - 1.0, -1.0)
+        cagr[(bars == 0) | np.isnan(total_return)] = np.nan
+
+        # Drawdowns against the running peak; a NaN bar never counts as below it
+        peak = np.fmax.accumulate(filled, axis=1)
+        drawdown = filled / peak - 1.0
+        max_drawdown = np.nanmin(np.where(valid, drawdown, np.inf), axis=1)
+        max_drawdown[~has_bars] = np.nan
+        at_peak = ~(filled < peak)
+        last_peak = np.maximum.accumulate(np.where(at_peak, columns[None, :], -1), axis=1)
+        duration = (columns[None, :] - last_peak).max(axis=1) if length else np.zeros(n_rows, dtype=int)
+
+        returns = filled[:, 1:] / filled[:, :-1] - 1.0
+        excess = returns - risk_free_rate / periods_per_year
+        counts = (~np.isnan(returns)).sum(axis=1)
+        mean_excess = np.nansum(excess, axis=1) / counts
+        deviation = np.sqrt(np.nansum((excess - mean_excess[:, None]) ** 2, axis=1) / (counts - 1))
+        downside = np.sqrt(np.nansum(np.minimum(excess, 0.0) ** 2, axis=1) / counts)
+        sharpe = mean_excess / deviation * np.sqrt(periods_per_year)
+        sortino = mean_excess / downside * np.sqrt(periods_per_year)
+        sharpe[(counts < 2) | (deviation == 0)] = np.nan
+        sortino[(counts < 2) | (downside == 0)] = np.nan
+
+        if positions is None:
+            moved = (returns != 0) & ~np.isnan(returns)
+            win_rate = (returns > 0).sum(axis=1) / moved.sum(axis=1)
+            exposure = moved.sum(axis=1) / counts
+            trades = np.full(n_rows, np.nan)
+        else:
+            _, position_block = _as_block(positions)
+            if position_block.shape != raw.shape:
+                raise ValueError(f"positions have shape {position_block.shape}, the equity curves {raw.shape}")
+            trade_counts, wins, in_market = _trade_stats(filled, position_block, first, last)
+            win_rate = wins / trade_counts
+            exposure = in_market / (bars + 1)
+            trades = trade_counts.astype(np.float64)
+
+    metrics = pd.DataFrame({
+        'Total_Return': total_return,
+        'CAGR': cagr,
+        'Max_Drawdown': max_drawdown,
+        'Max_Drawdown_Duration': np.where(has_bars, duration, 0),
+        'Sharpe': sharpe,
+        'Sortino': sortino,
+        'Win_Rate': win_rate,
+        'Exposure': np.where(has_bars, exposure, np.nan),
+        'Trades': trades,
+    }, index=labels, columns=METRIC_COLUMNS)
+    return metrics
+
+def rank_equity_curves(metrics, by='Sharpe', ascending=False, top=None):
+    """
+    Orders the rows of equity_metrics() by one metric, best first (NaN last),
+    and numbers them in a 'Rank' column.
+
+    Args:
+        metrics (pandas.DataFrame): The result of equity_metrics().
+        by (str): The metric to rank on. Use ascending=True for metrics where
+                  lower is better, e.g. Max_Drawdown_Duration.
+        ascending (bool): Sort order.
+        top (int, optional): Keeps only the first `top` rows.
+
+    Returns:
+        pandas.DataFrame: The ranked metrics.
+    """
+    ranked = metrics.sort_values(by, ascending=ascending, na_position='last', kind='stable')
+    if top is not None:
+        ranked = ranked.head(top)
+    ranked = ranked.copy()
+    ranked.insert(0, 'Rank', np.arange(1, len(ranked) + 1))
+    return ranked
@@ -0,0 +1,61 @@
+import os
+import time
+import socket
+from contextlib import contextmanager
+
+# ==============================================================================
+# File lock - one writer at a time for the state files shared by concurrent runs
+# ==============================================================================
+# The result cache and the dead ticker list are JSON files that every batch
+# process loads at start and writes back at the end. With several workers on
+# one queue (workQueue) those saves overlap, so each save takes this lock,
+# merges its changes into the file as it is on disk and replaces it through a
+# temporary file of its own (temp_path()).
+#
+# The lock is a '<path>.lock' file created with O_EXCL, which local disks and
+# network shares both create atomically. A lock older than STALE_SECONDS was
+# left by a process that died while holding it and is broken.
+
+STALE_SECONDS = 120
+DEFAULT_TIMEOUT = 60
+
+def temp_path(path):
+    """A temporary file name next to `path` that no other process (or host) uses."""
+    return f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+
+@contextmanager
+def file_lock(path, timeout=DEFAULT_TIMEOUT, stale_seconds=STALE_SECONDS):
+    """
+    Holds the lock of `path` for the duration of the with block.
+
+    Raises:
+        TimeoutError: When the lock is not free within `timeout` seconds.
+    """
+    lock_path = path + '.lock'
+    os.makedirs(os.path.dirname(lock_path) or '.', exist_ok=True)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_seconds:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                # Released (or broken by another process) meanwhile
+                continue
+            if time.time() > deadline:
+                raise TimeoutError(f"Could not lock '{path}' within {timeout}s (lock file '{lock_path}')")
+            time.sleep(0.05)
+
+    try:
+        os.write(fd, f"{socket.gethostname()}:{os.getpid()}".encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
@@ -0,0 +1,186 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import tradingCalendar
+
+# ==============================================================================
+# Frame hand-off - downloaded bars passed to the indicator stage in memory
+# ==============================================================================
+# The signal scripts download a ticker, write it to '<date>_<TICKER>_historical_data.csv'
+# and read that file straight back to calculate the indicators. save_frame()
+# keeps the downloaded DataFrame in memory under its CSV path, so the
+# load_frame() that follows gets a copy of it instead of parsing the text
+# again. The CSV is still written for later runs and other scripts, by default
+# on a background thread:
+#
+#   PRICE_CSV_WRITE=async   write the CSV on a background thread (default)
+#   PRICE_CSV_WRITE=sync    write the CSV before save_frame() returns
+#   PRICE_CSV_WRITE=off     keep the frames in memory only
+#
+# Only the last MAX_FRAMES frames stay in memory; an older path is read from
+# its CSV, after waiting for a pending write of it.
+#
+# The single-ticker scripts write the same file names over their own date
+# range (January 1st to today by default), so a batch checks a file of today
+# with covers_window() before reusing it in place of its own download.
+
+WRITE_MODES = ('async', 'sync', 'off')
+DEFAULT_WRITE_MODE = 'async'
+MAX_FRAMES = 32
+
+_handoff = {
+    'frames': OrderedDict(),    # path -> DataFrame, most recent last
+    'pending': {},              # path -> Future of its background write
+    'writer': None,             # ThreadPoolExecutor with one thread, created on first use
+    'lock': threading.Lock(),
+    'errors': [],               # (path, message) of failed background writes
+}
+
+def _key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+def write_mode():
+    """The PRICE_CSV_WRITE mode; unknown values fall back to the default."""
+    mode = os.environ.get('PRICE_CSV_WRITE', DEFAULT_WRITE_MODE).lower()
+    return mode if mode in WRITE_MODES else DEFAULT_WRITE_MODE
+
+def _write_csv(df, path):
+    # Written under a temporary name, so a reader never sees half a file
+    temp_path = path + '.tmp'
+    df.to_csv(temp_path, index=True, header=True)
+    os.replace(temp_path, path)
+
+def _write_done(path, future):
+    with _handoff['lock']:
+        if _handoff['pending'].get(path) is future:
+            del _handoff['pending'][path]
+    error = future.exception()
+    if error is not None:
+        _handoff['errors'].append((path, str(error)))
+        print(f">>    Could not write '{path}': {error}")
+
+def save_frame(df, path):
+    """
+    Hands a downloaded frame to the next stage and persists it as CSV
+    according to PRICE_CSV_WRITE.
+
+    Args:
+        df (pandas.DataFrame): The normalized bars, indexed by 'date'. It must
+                               not be modified afterwards.
+        path (str): The CSV path the frame stands for.
+
+    Returns:
+        str: `path`.
+    """
+    key = _key(path)
+    frames = _handoff['frames']
+    frames[key] = df
+    frames.move_to_end(key)
+    while len(frames) > MAX_FRAMES:
+        frames.popitem(last=False)
+
+    mode = write_mode()
+    if mode == 'sync':
+        _write_csv(df, path)
+    elif mode == 'async':
+        if _handoff['writer'] is None:
+            _handoff['writer'] = ThreadPoolExecutor(max_workers=1, thread_name_prefix='csv_writer')
+        future = _handoff['writer'].submit(_write_csv, df, path)
+        with _handoff['lock']:
+            _handoff['pending'][path] = future
+        future.add_done_callback(lambda f, path=path: _write_done(path, f))
+    return path
+
+def load_frame(path, read_csv):
+    """
+    Returns the bars saved under `path`: a copy of the in-memory frame when
+    there is one, otherwise read_csv(path). A frame read from disk is kept
+    too, so a second load of the same path does not parse it again.
+
+    Args:
+        path (str): The CSV path.
+        read_csv (callable): Reads the CSV into a DataFrame, e.g.
+                             lambda p: pd.read_csv(p, index_col='date', parse_dates=True).
+
+    Returns:
+        pandas.DataFrame: A frame the caller may modify.
+    """
+    key = _key(path)
+    frames = _handoff['frames']
+    df = frames.get(key)
+    if df is None:
+        with _handoff['lock']:
+            future = _handoff['pending'].get(path)
+        if future is not None:
+            future.exception()
+        df = read_csv(path)
+        frames[key] = df
+        while len(frames) > MAX_FRAMES:
+            frames.popitem(last=False)
+    frames.move_to_end(key)
+    return df.copy()
+
+def flush_writes():
+    """
+    Waits for the background CSV writes to finish.
+
+    Returns:
+        list: (path, message) of the writes that failed.
+    """
+    with _handoff['lock']:
+        pending = list(_handoff['pending'].values())
+    for future in pending:
+        future.exception()
+    return list(_handoff['errors'])
+
+def csv_date_span(path):
+    """
+    The first and last date ('YYYY-MM-DD') of a historical data CSV, read from
+    its first and last lines only, or None for a missing or empty file.
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.readline()
+            first = f.readline()
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - 4096, 0))
+            tail = [line for line in f.read().splitlines() if line.strip()]
+    except OSError:
+        return None
+    if not first.strip() or not tail:
+        return None
+    return first.split(b',')[0].decode()[:10], tail[-1].split(b',')[0].decode()[:10]
+
+def covers_window(path, start_date, end_date):
+    """
+    Whether a historical data CSV holds the final bars of a download window:
+    the first bar on `start_date` (the first session of the window), the last
+    one on the last session before the exclusive `end_date` that has closed,
+    and the file written after that close - a file written earlier holds a
+    partial bar of that session, or none.
+
+    Args:
+        path (str): The CSV path.
+        start_date (str): First day of the window ('YYYY-MM-DD').
+        end_date (str): Exclusive end of the window, as passed to yfinance.
+
+    Returns:
+        bool: False as well for a missing or unreadable file.
+    """
+    span = csv_date_span(path)
+    if span is None:
+        return False
+    first, last = span
+    latest = tradingCalendar.previous_session(end_date)
+    if tradingCalendar.session_close(latest) > time.time():
+        # Still trading (or not open yet): the previous session holds the last final bar
+        latest = tradingCalendar.previous_session(latest)
+    if first != start_date or last != str(latest):
+        return False
+    try:
+        return os.path.getmtime(path) >= tradingCalendar.session_close(latest)
+    except OSError:
+        return False
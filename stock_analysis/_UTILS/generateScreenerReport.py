@@ -9,7 +9,11 @@ utils = os.path.join(os.path.dirname(__file__), '_UTILS')
 sys.path.append(utils)
 
 # Now you can import the script as a module
-import momentum
+# momentum pulls in pandas and the market data source; load it only when a section is analyzed
+from lazyImport import lazy_import
+import runMetrics
+
+momentum = lazy_import('momentum')
 
 def process_consolidated_report(reporttype: str, all_tickers: dict):
     """
@@ -91,8 +95,9 @@ def process_consolidated_report(reporttype: str, all_tickers: dict):
             # Convert the string to a list of strings
             ticker_string_array = ticker_string.split(',')
 
-            ticker_momentum_analysis_section = momentum.run_stock_screener_report(ticker_string_array)
-            f.write(ticker_momentum_analysis_section)
+            with runMetrics.span('screener_section', section=reportsection, tickers=len(ticker_string_array)):
+                ticker_momentum_analysis_section = momentum.run_stock_screener_report(ticker_string_array)
+                f.write(ticker_momentum_analysis_section)
             
             print(f">>  StockList Momentum Analysis Complete ...")
             print(f">> ") 
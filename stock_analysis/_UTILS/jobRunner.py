@@ -0,0 +1,221 @@
+import os
+import sys
+import json
+import time
+import inspect
+import importlib
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+# Get the path to the script folders the analyses live in
+stock_analysis = os.path.join(os.path.dirname(__file__), '..')
+signals = os.path.join(stock_analysis, '_Asset_SIGNAL')
+misc = os.path.join(stock_analysis, '_MISC')
+
+# Add the folders to the system path
+sys.path.append(stock_analysis)
+sys.path.append(signals)
+sys.path.append(misc)
+
+# Now you can import the scripts as modules
+import marketData
+
+# ==============================================================================
+# Job runner - the single-ticker analysis scripts without their prompts
+# ==============================================================================
+# price2EVWMA, plotPrice2EVWMA, plotSMA, smaBuy, smaSell, bollinger and
+# yf_Analyze_Asset_Candles ask for a ticker and dates with input(). Each has an
+# analyze_ticker() function taking the same answers as arguments, and this
+# runs them for a job file instead:
+#
+#   {
+#     "defaults": {"start": "2025-01-01", "end": "", "timeframe": "1d"},
+#     "jobs": [
+#       {"tickers": ["AAPL", "MSFT"], "analyses": ["price2EVWMA", "smaBuy", "smaSell"]},
+#       {"tickers_file": "watchlist.csv", "analyses": ["plotSMA"], "start": "2024-01-01"}
+#     ]
+#   }
+#
+# Every entry runs each of its analyses for each of its tickers ('tickers_file'
+# is a CSV with a 'Ticker' column) over its date range; empty dates mean the
+# scripts' own defaults. A setting an analysis does not take (a timeframe for
+# plotSMA, dates for bollinger) is an error rather than silently ignored. The
+# jobs of a ticker run together, on one preloaded download (marketData.preload()),
+# and the tickers are spread over worker processes. Charts are saved instead of
+# shown.
+
+DEFAULT_REPORT_DIR = "E:/_scripts_PYTHON/_personal/_REPORT"
+
+# Analysis name -> module with an analyze_ticker() function
+ANALYSES = {
+    'price2EVWMA': 'price2EVWMA',
+    'plotPrice2EVWMA': 'plotPrice2EVWMA',
+    'plotSMA': 'plotSMA',
+    'smaBuy': 'smaBuy',
+    'smaSell': 'smaSell',
+    'bollinger': 'bollinger',
+    'yf_Analyze_Asset_Candles': 'yf_Analyze_Asset_Candles',
+}
+
+# Analyses that read the whole history (period='max') rather than a date range
+FULL_HISTORY_ANALYSES = {'bollinger'}
+
+JOB_FIELDS = ['ticker', 'analysis', 'start', 'end', 'timeframe']
+
+# Job setting -> its default and the analyze_ticker() argument that takes it
+SETTING_DEFAULTS = {'start': '', 'end': '', 'timeframe': '1d'}
+SETTING_ARGUMENTS = {'start': 'start_date_input', 'end': 'end_date_input', 'timeframe': 'timeframe'}
+
+def _analysis_function(analysis):
+    # A plain import: a script that fails to import is retried by the next job, not left half-loaded
+    return importlib.import_module(ANALYSES[analysis]).analyze_ticker
+
+def unsupported_settings(analysis, settings):
+    """
+    The job settings an analysis would ignore: those set to something other
+    than their default that its analyze_ticker() has no argument for (e.g. a
+    'timeframe' for plotSMA, or dates for bollinger).
+
+    Returns:
+        list: The setting names; empty when the script cannot be imported, as
+              the job then fails on its own.
+    """
+    try:
+        accepted = inspect.signature(_analysis_function(analysis)).parameters
+    except ImportError:
+        return []
+    return [field for field, default in SETTING_DEFAULTS.items()
+            if (settings[field] or default) != default and SETTING_ARGUMENTS[field] not in accepted]
+
+def load_job_file(path):
+    """
+    Reads a job file and expands every entry into single jobs.
+
+    Returns:
+        list: Job dicts with 'ticker', 'analysis', 'start', 'end' and
+              'timeframe', in file order and without duplicates.
+
+    Raises:
+        ValueError: For an unknown analysis, an entry without tickers or a
+                    setting one of its analyses does not take.
+    """
+    with open(path, 'r') as f:
+        spec = json.load(f)
+
+    defaults = {**SETTING_DEFAULTS, **spec.get('defaults', {})}
+    base_dir = os.path.dirname(os.path.abspath(path))
+    jobs = {}
+    for number, entry in enumerate(spec.get('jobs', []), start=1):
+        tickers = list(entry.get('tickers', []))
+        if entry.get('tickers_file'):
+            tickers_file = os.path.join(base_dir, entry['tickers_file'])
+            tickers += pd.read_csv(tickers_file)['Ticker'].dropna().astype(str).tolist()
+        if not tickers:
+            raise ValueError(f"Job {number} has no tickers.")
+
+        analyses = entry.get('analyses', [])
+        unknown = [name for name in analyses if name not in ANALYSES]
+        if unknown or not analyses:
+            raise ValueError(f"Job {number} has unknown or no analyses: {', '.join(unknown) or '-'}. "
+                             f"Available: {', '.join(ANALYSES)}")
+
+        settings = {field: entry.get(field, defaults[field]) or '' for field in SETTING_DEFAULTS}
+        for analysis in analyses:
+            unsupported = unsupported_settings(analysis, settings)
+            if unsupported:
+                raise ValueError(f"Job {number}: {analysis} does not take "
+                                 f"{', '.join(f'{field}={settings[field]!r}' for field in unsupported)}; "
+                                 f"put it in a separate entry without these settings.")
+        for ticker in tickers:
+            for analysis in analyses:
+                job = {'ticker': ticker.strip().upper(), 'analysis': analysis, **settings}
+                jobs[tuple(job[field] for field in JOB_FIELDS)] = job
+    return list(jobs.values())
+
+def group_by_ticker(jobs):
+    """Ticker -> its jobs, in the order the tickers first appear."""
+    groups = {}
+    for job in jobs:
+        groups.setdefault(job['ticker'], []).append(job)
+    return groups
+
+def _preload_window(jobs):
+    """The marketData.preload() arguments that cover every job of one ticker."""
+    if any(job['analysis'] in FULL_HISTORY_ANALYSES for job in jobs):
+        return {'period': 'max'}
+    # The scripts start on January 1st without a start date and never download past today
+    starts = [job['start'] or f"{datetime.now().year}-01-01" for job in jobs]
+    tomorrow = (datetime.now().date() + timedelta(days=1)).strftime('%Y-%m-%d')
+    return {'start': min(starts), 'end': tomorrow}
+
+def _call_analysis(job, chart_dir):
+    """Calls the analysis' analyze_ticker() with the job settings it accepts."""
+    analyze_ticker = _analysis_function(job['analysis'])
+    arguments = {SETTING_ARGUMENTS[field]: job[field] or default for field, default in SETTING_DEFAULTS.items()}
+    arguments['chart_dir'] = chart_dir
+    accepted = inspect.signature(analyze_ticker).parameters
+    return analyze_ticker(job['ticker'], **{name: value for name, value in arguments.items() if name in accepted})
+
+def use_headless_backend():
+    """Renders the charts with Agg, so no display or GUI event loop is needed."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+def run_ticker_jobs(ticker, jobs, chart_dir):
+    """
+    Runs all jobs of one ticker on a single preloaded download.
+
+    Returns:
+        list: One record per job: the job fields plus 'status' ('ok', 'no result'
+              or 'failed'), 'seconds' and 'result' (the analysis' result as text).
+    """
+    window = _preload_window(jobs)
+    try:
+        bars = marketData.preload(ticker, **window)
+        print(f">>  {ticker}: {bars} bars preloaded for {len(jobs)} jobs")
+    except Exception as e:
+        # Each analysis then downloads (and reports the failure) on its own
+        print(f">>  {ticker}: could not preload bars: {e}")
+
+    records = []
+    try:
+        for job in jobs:
+            start_time = time.perf_counter()
+            try:
+                result = _call_analysis(job, chart_dir)
+                status = 'ok' if result is not None else 'no result'
+            except (Exception, SystemExit) as e:
+                # Some scripts sys.exit() on a bad download; that ends the job, not the run
+                result = f"{type(e).__name__}: {e}"
+                status = 'failed'
+            records.append({**job, 'status': status, 'seconds': round(time.perf_counter() - start_time, 3),
+                            'result': json.dumps(result, default=str) if status != 'failed' else result})
+    finally:
+        marketData.clear_preloaded(ticker)
+    return records
+
+def run_jobs(jobs, chart_dir=DEFAULT_REPORT_DIR, workers=1):
+    """
+    Runs jobs grouped by ticker, in this process (workers=1) or in a pool of
+    worker processes, one ticker at a time per worker.
+
+    Returns:
+        pandas.DataFrame: One row per job (see run_ticker_jobs()), in job order.
+    """
+    use_headless_backend()
+    groups = group_by_ticker(jobs)
+    records = []
+    if workers == 1:
+        for ticker, ticker_jobs in groups.items():
+            records += run_ticker_jobs(ticker, ticker_jobs, chart_dir)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=use_headless_backend) as pool:
+            futures = [pool.submit(run_ticker_jobs, ticker, ticker_jobs, chart_dir) for ticker, ticker_jobs in groups.items()]
+            for future in as_completed(futures):
+                records += future.result()
+
+    order = {tuple(job[field] for field in JOB_FIELDS): position for position, job in enumerate(jobs)}
+    records.sort(key=lambda record: order[tuple(record[field] for field in JOB_FIELDS)])
+    return pd.DataFrame(records, columns=JOB_FIELDS + ['status', 'seconds', 'result'])
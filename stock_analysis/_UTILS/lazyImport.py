@@ -0,0 +1,33 @@
+import sys
+import importlib.util
+
+def lazy_import(module_name):
+    """
+    Imports a module without running it until one of its attributes is used.
+
+    Keeps the entry points fast to start: a script can name every module it may
+    need at the top, as usual, while the heavy ones (and whatever they import)
+    only load on the code path that actually calls into them.
+
+        momentum = lazy_import('momentum')   # nothing loaded yet
+        momentum.run_stock_screener_report(tickers)   # loads momentum now
+
+    Args:
+        module_name (str): The module name, resolved on sys.path like a normal import.
+
+    Returns:
+        module: The (possibly not yet executed) module.
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{module_name}'", name=module_name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,373 @@
+import os
+import json
+import time
+import random
+import pandas as pd
+import runMetrics
+
+# ==============================================================================
+# Market data sources
+# ==============================================================================
+# Every script fetches prices through download(), history() and info() below
+# instead of calling yfinance directly. The active source is picked by the
+# MARKET_DATA_SOURCE environment variable (or use_data_source()):
+#
+#   yfinance  - live data (default)
+#   replay    - stored fixtures from MARKET_DATA_REPLAY_DIR, with optional
+#               MARKET_DATA_LATENCY_MS, MARKET_DATA_JITTER_MS,
+#               MARKET_DATA_FAILURE_RATE, MARKET_DATA_FAILURE_MODE ('raise' or
+#               'empty') and MARKET_DATA_SEED
+#
+# A replay fixture is '<TICKER>.csv' (a 'date' column plus Open, High, Low,
+# Close, Volume) and an optional '<TICKER>.json' holding the info dict.
+#
+# preload() fetches a ticker's daily bars once; until clear_preloaded(), every
+# download() of that ticker the preloaded window covers is cut from memory
+# instead of being requested again (the job runner runs several analyses of
+# a ticker on one download this way).
+
+DEFAULT_REPLAY_DIR = "E:/_scripts_PYTHON/_personal/_FIXTURES"
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Trading-day lengths of the yfinance period strings supported by replay
+REPLAY_PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 21, '3mo': 63, '6mo': 126,
+    '1y': 252, '2y': 504, '5y': 1260, '10y': 2520,
+}
+
+# --- yfinance source ---
+# yfinance is imported on the first live request, so offline runs never load it
+
+def _yfinance_download(ticker, start=None, end=None, interval='1d', period=None, auto_adjust=True, progress=True):
+    # yf.download() catches every per-ticker exception - rate limits and
+    # timeouts included - and returns an empty frame, which callers cannot tell
+    # from a delisted symbol. Ticker.history() with hidden exceptions off raises
+    # them instead; only Yahoo's answer that the symbol has no prices becomes
+    # the empty frame.
+    import yfinance as yf
+    from yfinance.exceptions import YFTickerMissingError
+    window = {'period': period} if period is not None else {'start': start, 'end': end}
+    hide_exceptions = yf.config.debug.hide_exceptions
+    yf.config.debug.hide_exceptions = False
+    try:
+        data = yf.Ticker(ticker).history(interval=interval, auto_adjust=auto_adjust, actions=False, **window)
+    except YFTickerMissingError as e:
+        # An error status from Yahoo is an outage, not a verdict on the symbol
+        if 'status_code' in str(e):
+            raise
+        data = pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([]))
+    finally:
+        yf.config.debug.hide_exceptions = hide_exceptions
+
+    # Shaped like yf.download(): exchange-local dates without a time zone for
+    # daily and longer bars, and (Price, Ticker) column levels
+    if interval[-1] not in 'mh' and isinstance(data.index, pd.DatetimeIndex) and data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    data.columns = pd.MultiIndex.from_product([data.columns, [ticker]], names=['Price', 'Ticker'])
+    data.index.name = 'Date'
+    return data
+
+def _yfinance_history(ticker, start=None, end=None, interval='1d'):
+    import yfinance as yf
+    return yf.Ticker(ticker).history(start=start, end=end, interval=interval)
+
+def _yfinance_info(ticker):
+    import yfinance as yf
+    return yf.Ticker(ticker).info
+
+# --- Replay source ---
+
+_replay_settings = {
+    'fixture_dir': DEFAULT_REPLAY_DIR,
+    'latency_ms': 0.0,
+    'jitter_ms': 0.0,
+    'failure_rate': 0.0,
+    'failure_mode': 'raise',
+    'rng': random.Random(0),
+}
+
+# Parsed fixtures, so a load test measures the pipeline and not repeated CSV parsing
+_replay_cache = {}
+
+def configure_replay(fixture_dir=None, latency_ms=0.0, jitter_ms=0.0, failure_rate=0.0, failure_mode='raise', seed=0):
+    """
+    Sets up the replay source.
+
+    Args:
+        fixture_dir (str, optional): Folder with '<TICKER>.csv' / '<TICKER>.json' fixtures.
+        latency_ms (float): Delay added to every request, in milliseconds.
+        jitter_ms (float): Uniform random extra delay, 0..jitter_ms milliseconds.
+        failure_rate (float): Probability (0-1) that a request fails.
+        failure_mode (str): 'raise' raises ConnectionError, as yfinance does for a
+                            throttled request; 'empty' returns no data, as for a
+                            delisted ticker.
+        seed (int): Seed of the latency/failure generator, for reproducible runs.
+    """
+    if failure_mode not in ('raise', 'empty'):
+        raise ValueError(f"Unknown failure mode '{failure_mode}'. Use 'raise' or 'empty'.")
+
+    _replay_settings.update({
+        'fixture_dir': fixture_dir or DEFAULT_REPLAY_DIR,
+        'latency_ms': float(latency_ms),
+        'jitter_ms': float(jitter_ms),
+        'failure_rate': float(failure_rate),
+        'failure_mode': failure_mode,
+        'rng': random.Random(seed),
+    })
+    _replay_cache.clear()
+
+def _replay_request(ticker):
+    """Applies the configured latency and decides whether this request fails."""
+    rng = _replay_settings['rng']
+    delay_ms = _replay_settings['latency_ms'] + rng.uniform(0, _replay_settings['jitter_ms'])
+    if delay_ms > 0:
+        time.sleep(delay_ms / 1000)
+
+    if rng.random() < _replay_settings['failure_rate']:
+        if _replay_settings['failure_mode'] == 'raise':
+            raise ConnectionError(f"Injected failure for {ticker}")
+        return False
+    return True
+
+def _load_replay_frame(ticker):
+    if ticker not in _replay_cache:
+        path = os.path.join(_replay_settings['fixture_dir'], f"{ticker}.csv")
+        if os.path.exists(path):
+            frame = pd.read_csv(path, index_col='date', parse_dates=True).sort_index()
+        else:
+            frame = pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name='date'))
+        _replay_cache[ticker] = frame
+    return _replay_cache[ticker]
+
+def _slice_replay_frame(frame, start=None, end=None, period=None):
+    if period is not None and period != 'max':
+        return frame.iloc[-REPLAY_PERIOD_DAYS[period]:]
+    if start is not None:
+        frame = frame[frame.index >= pd.Timestamp(start)]
+    if end is not None:
+        # Like yfinance, the end date is exclusive
+        frame = frame[frame.index < pd.Timestamp(end)]
+    return frame
+
+def _replay_download(ticker, start=None, end=None, interval='1d', period=None, auto_adjust=True, progress=True):
+    frame = _load_replay_frame(ticker)[OHLCV_COLUMNS]
+    if not _replay_request(ticker):
+        frame = frame.iloc[0:0]
+    frame = _slice_replay_frame(frame, start, end, period).copy()
+
+    if not auto_adjust:
+        frame.insert(3, 'Adj Close', frame['Close'])
+
+    # Match the (Price, Ticker) column levels of yf.download
+    frame.columns = pd.MultiIndex.from_product([frame.columns, [ticker]], names=['Price', 'Ticker'])
+    frame.index.name = 'Date'
+    return frame
+
+def _replay_history(ticker, start=None, end=None, interval='1d'):
+    frame = _load_replay_frame(ticker)[OHLCV_COLUMNS]
+    if not _replay_request(ticker):
+        frame = frame.iloc[0:0]
+    frame = _slice_replay_frame(frame, start, end).copy()
+
+    frame['Dividends'] = 0.0
+    frame['Stock Splits'] = 0.0
+    frame.index.name = 'Date'
+    return frame
+
+def _replay_info(ticker):
+    if not _replay_request(ticker):
+        return {}
+    path = os.path.join(_replay_settings['fixture_dir'], f"{ticker}.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+DATA_SOURCES = {
+    'yfinance': {'download': _yfinance_download, 'history': _yfinance_history, 'info': _yfinance_info},
+    'replay': {'download': _replay_download, 'history': _replay_history, 'info': _replay_info},
+}
+
+_active_source = {'name': None, 'functions': None}
+
+def use_data_source(name, **options):
+    """
+    Selects the market data source for this process.
+
+    Args:
+        name (str): A key of DATA_SOURCES ('yfinance' or 'replay').
+        **options: Passed to configure_replay() when name is 'replay'.
+    """
+    if name not in DATA_SOURCES:
+        raise ValueError(f"Unknown market data source '{name}'. Available: {', '.join(DATA_SOURCES)}")
+    if name == 'replay':
+        configure_replay(**options)
+    _active_source['name'] = name
+    _active_source['functions'] = DATA_SOURCES[name]
+
+def _active():
+    if _active_source['functions'] is None:
+        name = os.environ.get('MARKET_DATA_SOURCE', 'yfinance')
+        options = {}
+        if name == 'replay':
+            options = {
+                'fixture_dir': os.environ.get('MARKET_DATA_REPLAY_DIR', DEFAULT_REPLAY_DIR),
+                'latency_ms': float(os.environ.get('MARKET_DATA_LATENCY_MS', 0)),
+                'jitter_ms': float(os.environ.get('MARKET_DATA_JITTER_MS', 0)),
+                'failure_rate': float(os.environ.get('MARKET_DATA_FAILURE_RATE', 0)),
+                'failure_mode': os.environ.get('MARKET_DATA_FAILURE_MODE', 'raise'),
+                'seed': int(os.environ.get('MARKET_DATA_SEED', 0)),
+            }
+        use_data_source(name, **options)
+    return _active_source['functions']
+
+# Preloaded daily bars: ticker -> {'start', 'end', 'period', 'frame'}
+_preloaded = {}
+
+def preload(ticker, start=None, end=None, period=None):
+    """
+    Downloads a ticker's daily, adjusted bars once for the download() calls that follow.
+
+    Args:
+        ticker (str): The ticker symbol.
+        start (str, optional): First date, 'YYYY-MM-DD'.
+        end (str, optional): End date (exclusive), 'YYYY-MM-DD'.
+        period (str, optional): 'max' preloads the whole history instead of start..end.
+
+    Returns:
+        int: The number of bars preloaded; 0 keeps nothing.
+    """
+    data = download(ticker, start=start, end=end, period=period)
+    if data.empty:
+        _preloaded.pop(ticker, None)
+        return 0
+    _preloaded[ticker] = {'start': start, 'end': end, 'period': period, 'frame': data}
+    return len(data)
+
+def clear_preloaded(ticker=None):
+    """Drops the preloaded bars of one ticker, or of all tickers."""
+    if ticker is None:
+        _preloaded.clear()
+    else:
+        _preloaded.pop(ticker, None)
+
+def _from_preloaded(ticker, start, end, interval, period, auto_adjust):
+    """The preloaded bars a download() asks for, or None when they do not cover it."""
+    entry = _preloaded.get(ticker)
+    if entry is None or interval != '1d' or not auto_adjust:
+        return None
+    if entry['period'] == 'max':
+        if period not in (None, 'max'):
+            return None
+    elif period is not None:
+        return None
+    else:
+        if entry['start'] is not None and (start is None or pd.Timestamp(start) < pd.Timestamp(entry['start'])):
+            return None
+        if entry['end'] is not None and (end is None or pd.Timestamp(end) > pd.Timestamp(entry['end'])):
+            return None
+    if period == 'max':
+        return entry['frame'].copy()
+    return _slice_replay_frame(entry['frame'], start, end).copy()
+
+def _count_request(data):
+    """Adds one request, its rows and the in-memory size of its bars to the run metrics."""
+    if not runMetrics.metrics_enabled():
+        return
+    runMetrics.count('market_data_requests')
+    runMetrics.count('market_data_rows', len(data))
+    runMetrics.count('bytes_downloaded', int(data.memory_usage(index=True).sum()))
+
+# ==============================================================================
+# Public API - drop-in replacements for the yfinance calls
+# ==============================================================================
+
+def download(ticker, start=None, end=None, interval='1d', period=None, auto_adjust=True, progress=True):
+    """
+    Downloads OHLCV bars like yf.download() from the active source.
+
+    Returns:
+        pandas.DataFrame: Bars with (Price, Ticker) column levels; empty if none were found.
+    """
+    data = _from_preloaded(ticker, start, end, interval, period, auto_adjust)
+    if data is not None:
+        runMetrics.count('market_data_preload_hits')
+        return data
+    data = _active()['download'](ticker, start=start, end=end, interval=interval,
+                                 period=period, auto_adjust=auto_adjust, progress=progress)
+    _count_request(data)
+    return data
+
+def history(ticker, start=None, end=None, interval='1d'):
+    """
+    Returns OHLCV bars like yf.Ticker(ticker).history() from the active source.
+
+    Returns:
+        pandas.DataFrame: Bars with Open, High, Low, Close, Volume, Dividends and Stock Splits.
+    """
+    data = _active()['history'](ticker, start=start, end=end, interval=interval)
+    _count_request(data)
+    return data
+
+def info(ticker):
+    """
+    Returns the quote/fundamentals dict like yf.Ticker(ticker).info from the active source.
+    """
+    runMetrics.count('market_data_requests')
+    return _active()['info'](ticker)
+
+def save_fixture(ticker, bars, ticker_info=None, fixture_dir=DEFAULT_REPLAY_DIR):
+    """
+    Writes a replay fixture.
+
+    Args:
+        ticker (str): The ticker symbol.
+        bars (pandas.DataFrame): Bars with Open, High, Low, Close, Volume columns on a date index.
+        ticker_info (dict, optional): The info dict to replay.
+        fixture_dir (str): The fixture folder.
+    """
+    os.makedirs(fixture_dir, exist_ok=True)
+
+    bars = bars[OHLCV_COLUMNS].copy()
+    if bars.index.tz is not None:
+        bars.index = bars.index.tz_localize(None)
+    bars.index.name = 'date'
+    bars.to_csv(os.path.join(fixture_dir, f"{ticker}.csv"))
+
+    if ticker_info is not None:
+        with open(os.path.join(fixture_dir, f"{ticker}.json"), 'w') as f:
+            json.dump(ticker_info, f, default=str)
+
+def record_fixtures(ticker_list, start, end, fixture_dir=DEFAULT_REPLAY_DIR):
+    """
+    Records live yfinance bars and info as replay fixtures.
+
+    Returns:
+        list: The tickers that were recorded.
+    """
+    recorded = []
+    for ticker in ticker_list:
+        try:
+            bars = _yfinance_history(ticker, start=start, end=end)
+            if bars.empty:
+                print(f">>  No data for {ticker}. Skipping.")
+                continue
+            save_fixture(ticker, bars, _yfinance_info(ticker), fixture_dir)
+            recorded.append(ticker)
+            print(f">>  Recorded {len(bars)} bars for {ticker}")
+        except Exception as e:
+            print(f">>  An error occurred while recording {ticker}: {e}")
+    return recorded
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Records live market data as offline replay fixtures.")
+    parser.add_argument('tickers', nargs='+', help='Ticker symbols to record.')
+    parser.add_argument('--start', required=True, help='Start date, YYYY-MM-DD.')
+    parser.add_argument('--end', required=True, help='End date (exclusive), YYYY-MM-DD.')
+    parser.add_argument('--fixture-dir', default=DEFAULT_REPLAY_DIR, help='Folder for the fixtures.')
+    args = parser.parse_args()
+
+    record_fixtures([t.upper() for t in args.tickers], args.start, args.end, args.fixture_dir)
@@ -1,8 +1,11 @@
-import yfinance as yf
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 import os 
+import reportWriter
+import marketData
+import runMetrics
+import riskStats
 
 # --- 1. Define Dual Screening Criteria (GLOBAL CONSTANTS) ---
 CONSERVATIVE_CRITERIA = {
@@ -20,56 +23,76 @@ SPECULATIVE_CRITERIA = {
 }
 
 # --- 2. Core Technical and Fundamental Data Functions (Unchanged) ---
-def get_technical_data(ticker, period_days):
-    """Pulls historical data and calculates momentum, ATR, and Beta."""
-    end_date = datetime.today()
+def calculate_technical_metrics(long_data, short_data, beta=None):
+    """
+    Calculates momentum and ATR from daily OHLC history (no network access).
+
+    Args:
+        long_data (pandas.DataFrame): ~1 year of daily bars with 'High', 'Low' and 'Close'.
+        short_data (pandas.DataFrame): The short momentum window with a 'Close' column.
+        beta (float, optional): Passed through to the result.
+
+    Returns:
+        dict: '1Y_MOMENTUM', 'BETA', 'MOMENTUM_SHORT' and 'ATR' (None where not computable).
+    """
+    if len(long_data) >= 252:
+        mom_1y = (long_data['Close'].iloc[-1] - long_data['Close'].iloc[0]) / long_data['Close'].iloc[0]
+    else:
+        mom_1y = None
+    mom_short = None
+    if not short_data.empty and len(short_data) >= 2:
+        mom_short = (short_data['Close'].iloc[-1] - short_data['Close'].iloc[0]) / short_data['Close'].iloc[0]
+
+    if not long_data.empty:
+        long_data['TR1'] = long_data['High'] - long_data['Low']
+        long_data['TR2'] = abs(long_data['High'] - long_data['Close'].shift(1))
+        long_data['TR3'] = abs(long_data['Low'] - long_data['Close'].shift(1))
+        long_data['TR'] = long_data[['TR1', 'TR2', 'TR3']].max(axis=1)
+        atr = long_data['TR'].iloc[-14:].mean() if len(long_data) >= 14 else long_data['TR'].mean()
+    else:
+        atr = None
+
+    return {'1Y_MOMENTUM': mom_1y, 'BETA': beta, 'MOMENTUM_SHORT': mom_short, 'ATR': atr}
+
+def get_technical_data(ticker, period_days, end_date=None):
+    """Pulls historical data up to end_date (default: now) and calculates momentum, ATR, and Beta."""
+    end_date = end_date or datetime.today()
     start_date_long = end_date - timedelta(days=380)
     start_date_short = end_date - timedelta(days=period_days + 5)
     
     try:
-        long_data = yf.Ticker(ticker).history(start=start_date_long, end=end_date, interval="1d")
-        if len(long_data) >= 252:
-            mom_1y = (long_data['Close'].iloc[-1] - long_data['Close'].iloc[0]) / long_data['Close'].iloc[0]
-        else:
-            mom_1y = None
-        beta = yf.Ticker(ticker).info.get('beta')
-        short_data = yf.Ticker(ticker).history(start=start_date_short, end=end_date, interval="1d")
-        mom_short = None
-        if not short_data.empty and len(short_data) >= 2:
-            mom_short = (short_data['Close'].iloc[-1] - short_data['Close'].iloc[0]) / short_data['Close'].iloc[0]
-
-        if not long_data.empty:
-            long_data['TR1'] = long_data['High'] - long_data['Low']
-            long_data['TR2'] = abs(long_data['High'] - long_data['Close'].shift(1))
-            long_data['TR3'] = abs(long_data['Low'] - long_data['Close'].shift(1))
-            long_data['TR'] = long_data[['TR1', 'TR2', 'TR3']].max(axis=1)
-            atr = long_data['TR'].iloc[-14:].mean() if len(long_data) >= 14 else long_data['TR'].mean()
-        else:
-            atr = None
-            
-        return {'1Y_MOMENTUM': mom_1y, 'BETA': beta, 'MOMENTUM_SHORT': mom_short, 'ATR': atr}
+        long_data = marketData.history(ticker, start=start_date_long, end=end_date, interval="1d")
+        # Beta from the daily closes against the benchmark - no metadata request per ticker
+        benchmark_closes = riskStats.get_benchmark_closes(start_date_long, end_date)
+        beta = riskStats.series_beta(long_data['Close'], benchmark_closes) if benchmark_closes is not None else None
+        short_data = marketData.history(ticker, start=start_date_short, end=end_date, interval="1d")
+        return calculate_technical_metrics(long_data, short_data, beta)
 
     except Exception:
         return {'1Y_MOMENTUM': None, 'BETA': None, 'MOMENTUM_SHORT': None, 'ATR': None}
 
-def get_rsi(ticker):
-    end_date = datetime.today()
+def calculate_rsi(closes):
+    """Returns the latest 14-period RSI of a close series, or None with fewer than 28 closes."""
+    if closes.empty or len(closes) < 28: return None
+    delta = closes.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi.iloc[-1]
+
+def get_rsi(ticker, end_date=None):
+    end_date = end_date or datetime.today()
     start_date = end_date - timedelta(days=40)
     try:
-        data = yf.Ticker(ticker).history(start=start_date, end=end_date, interval="1d")['Close']
-        if data.empty or len(data) < 28: return None
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.iloc[-1]
+        data = marketData.history(ticker, start=start_date, end=end_date, interval="1d")['Close']
+        return calculate_rsi(data)
     except Exception:
         return None
 
 def get_fundamentals(ticker):
     try:
-        info = yf.Ticker(ticker).info
+        info = marketData.info(ticker)
         return {
             'PRICE_TO_EARNINGS': info.get('trailingPE'), 
             'PRICE_TO_BOOK': info.get('priceToBook'), 
@@ -82,7 +105,21 @@ def get_fundamentals(ticker):
             'RETURN_ON_EQUITY': None
         }
 
-# --- 3. Dual Output Helper Function (Unchanged) ---
+# --- 3. Dual Output Helper Function ---
+# Precompiled HTML fragments - rendered per metric row, collected in a list and joined once
+METRIC_ROW_TEMPLATE = reportWriter.compile_template(
+    '<tr>'
+    '<td style="border: 1px solid #ddd; padding: 4px;">{metric_key}</td>'
+    '<td style="border: 1px solid #ddd; padding: 4px;">{value_str}</td>'
+    '<td style="border: 1px solid #ddd; padding: 4px; font-weight: bold;">{op} {crit_str_req}</td>'
+    '</tr>'
+)
+TICKER_TABLE_HEADER_TEMPLATE = reportWriter.compile_template(
+    '<h4 style="color: #333; margin-top: 8px;">--- Ticker: {ticker} (✅ PASSED ALL CRITERIA) ---</h4>'
+    '<table style="width: 100%; border-collapse: collapse; margin-bottom: 8px;">'
+    '<tr style="background-color: #f0f0f0;"><th>Metric</th><th>Value</th><th>Required</th></tr>'
+)
+
 def format_output(results, criteria, title, color, emoji):
     """
     Generates both console output and HTML content for a single screen type.
@@ -106,16 +143,16 @@ def format_output(results, criteria, title, color, emoji):
     print(f">>  " + subsection_divider)
     
     # 2. HTML CONTENT GENERATION SETUP
-    html = ''
-    html += f'<div style="border: 2px solid {color}; padding: 4px; margin-bottom: 4px; border-radius: 8px;">'
-    html += f'<h4 style="color: {color}; border-bottom: 2px solid {color}; padding-bottom: 4px;">{title}</h4>'
-    html += f'<p style="font-style: italic;">**Filtering Criteria:** {crit_str_console.replace("Criteria: ", "")}</p>'
+    html = []
+    html.append(f'<div style="border: 2px solid {color}; padding: 4px; margin-bottom: 4px; border-radius: 8px;">')
+    html.append(f'<h4 style="color: {color}; border-bottom: 2px solid {color}; padding-bottom: 4px;">{title}</h4>')
+    html.append(f'<p style="font-style: italic;">**Filtering Criteria:** {crit_str_console.replace("Criteria: ", "")}</p>')
 
     if not results:
         print(f">>  ❌ NO STOCKS PASSED THIS SCREEN.")
-        html += '<p style="color: #e57f7f; font-weight: bold;">❌ NO STOCKS PASSED THIS SCREEN.</p>'
-        html += '</div>'
-        return html
+        html.append('<p style="color: #e57f7f; font-weight: bold;">❌ NO STOCKS PASSED THIS SCREEN.</p>')
+        html.append('</div>')
+        return ''.join(html)
 
     for ticker, result_data in results.items():
         metrics = result_data['metrics']
@@ -126,9 +163,7 @@ def format_output(results, criteria, title, color, emoji):
         print(f">>  --- Ticker: {ticker} (✅ PASSED ALL {len(criteria)} CRITERIA) ---")
 
         # HTML Output for passing stock
-        html += f'<h4 style="color: #333; margin-top: 8px;">--- Ticker: {ticker} (✅ PASSED ALL CRITERIA) ---</h4>'
-        html += '<table style="width: 100%; border-collapse: collapse; margin-bottom: 8px;">'
-        html += '<tr style="background-color: #f0f0f0;"><th>Metric</th><th>Value</th><th>Required</th></tr>'
+        html.append(TICKER_TABLE_HEADER_TEMPLATE({'ticker': ticker}))
         
         for metric_key, passed in pass_fail.items():
             value = metrics.get(metric_key)
@@ -172,19 +207,15 @@ def format_output(results, criteria, title, color, emoji):
             print(f">>  {metric_key:<20} | Value: {value_str:<10} | Result: ✅ PASS")
 
             # HTML OUTPUT (Table Row)
-            html += f'<tr>'
-            html += f'<td style="border: 1px solid #ddd; padding: 4px;">{metric_key}</td>'
-            html += f'<td style="border: 1px solid #ddd; padding: 4px;">{value_str}</td>' 
-            html += f'<td style="border: 1px solid #ddd; padding: 4px; font-weight: bold;">{op} {crit_str_req}</td>'
-            html += f'</tr>'
+            html.append(METRIC_ROW_TEMPLATE({'metric_key': metric_key, 'value_str': value_str, 'op': op, 'crit_str_req': crit_str_req}))
 
         print(f">>  " + "-" * 30) # Console separator
         print(f">>  ")
         
-        html += '</table>'
+        html.append('</table>')
     
-    html += '</div>'
-    return html
+    html.append('</div>')
+    return ''.join(html)
 
 
 # ----------------------------------------------------------------------
@@ -203,33 +234,51 @@ def safe_float_conversion(value):
     except (ValueError, TypeError):
         return None
         
-def run_stock_screener_report(ticker_list, folder_path=r"E:\_scripts_PYTHON\_personal\_REPORT"):
+def fetch_screener_metrics(ticker, end_date=None):
     """
-    Executes the dual-strategy stock screening process, prints results to the console,
-    and generates a dated HTML report file.
-    
-    :param ticker_list: A list of stock ticker symbols (e.g., ["AAPL", "GOOGL"]).
-    :param folder_path: The directory where the HTML report should be saved.
+    Fetches the raw metrics of one ticker that both screens evaluate - the
+    per-ticker (network) part of the screener, run on its own by the workers
+    of a queued batch. All tickers of a run should share one `end_date`
+    (default: now), so their windows match.
+
+    Returns:
+        dict: '1Y_MOMENTUM', '1M_MOMENTUM', '1W_MOMENTUM', 'ATR', 'BETA', 'RSI',
+              'PRICE_TO_EARNINGS', 'PRICE_TO_BOOK' and 'RETURN_ON_EQUITY'.
     """
-    
-    # --- 4a. Fetch All Raw Data ---
-    raw_data = {}
-    print(f">>  BEGINNING DUAL SCREENING PROCESS for {len(ticker_list)} Tickers...")
-    for ticker in ticker_list:
-        print(f">>  Fetching data for {ticker}...")
-        tech_30 = get_technical_data(ticker, 30)
-        tech_7 = get_technical_data(ticker, 7)
-        
-        raw_data[ticker] = {
+    with runMetrics.span('fetch', ticker=ticker):
+        tech_30 = get_technical_data(ticker, 30, end_date)
+        tech_7 = get_technical_data(ticker, 7, end_date)
+
+        return {
             '1Y_MOMENTUM': tech_30['1Y_MOMENTUM'],
             '1M_MOMENTUM': tech_30['MOMENTUM_SHORT'],
             '1W_MOMENTUM': tech_7['MOMENTUM_SHORT'],
             'ATR': tech_30['ATR'],
             'BETA': tech_30['BETA'],
-            'RSI': get_rsi(ticker),
+            'RSI': get_rsi(ticker, end_date),
             **get_fundamentals(ticker)
         }
 
+def run_stock_screener_report(ticker_list, folder_path=r"E:\_scripts_PYTHON\_personal\_REPORT", raw_data=None):
+    """
+    Executes the dual-strategy stock screening process, prints results to the console,
+    and generates a dated HTML report file.
+    
+    :param ticker_list: A list of stock ticker symbols (e.g., ["AAPL", "GOOGL"]).
+    :param folder_path: The directory where the HTML report should be saved.
+    :param raw_data: Ticker -> fetch_screener_metrics() already fetched (e.g. merged
+                     from a work queue); the tickers are then not fetched again.
+    """
+    
+    # --- 4a. Fetch All Raw Data ---
+    if raw_data is None:
+        raw_data = {}
+        end_date = datetime.today()
+        print(f">>  BEGINNING DUAL SCREENING PROCESS for {len(ticker_list)} Tickers...")
+        for ticker in ticker_list:
+            print(f">>  Fetching data for {ticker}...")
+            raw_data[ticker] = fetch_screener_metrics(ticker, end_date)
+
     # --- 4b. Conservative Screen Evaluation ---
     conservative_passes = {}
     for ticker, data in raw_data.items():
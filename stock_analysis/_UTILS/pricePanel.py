@@ -0,0 +1,256 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+# ==============================================================================
+# Price panel - OHLCV of many tickers in shared memory for process pools
+# ==============================================================================
+# Submitting a DataFrame to a ProcessPoolExecutor pickles it into the worker,
+# and with thousands of tickers that serialization costs more than the
+# analytics. A panel copies the bars of all tickers once into one
+# multiprocessing.shared_memory block, aligned on the union of their dates:
+#
+#   values[ticker row, field, date]     float64, NaN where a ticker has no bar
+#
+# Only a small handle (block name, shape, fields, dates and the ticker -> row
+# index) is pickled, once per worker. Workers attach to the block and read
+# each ticker's fields as numpy views, without copying, and should return
+# compact result records rather than frames.
+#
+#   handle = pricePanel.create_panel(frames)
+#   try:
+#       records = pricePanel.map_panel(worker_function, handle, workers=8)
+#   finally:
+#       pricePanel.close_panel(handle, unlink=True)
+#
+# with `frames` built from the history CSVs the signal scripts store, by
+# find_history_files() and load_panel_frames().
+
+PANEL_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+# Where the signal scripts store their downloads, read by find_history_files()
+DEFAULT_HISTORY_DIR = "E:/_scripts_PYTHON/_personal/_OUTPUT"
+
+# '20250911_AAPL_historical_data.csv' as written by the signal scripts, or a replay fixture 'AAPL.csv'
+HISTORY_FILE_PATTERN = re.compile(r'^(?:(\d{8})_)?([A-Z0-9.\-^=]+?)(?:_historical_data)?\.csv$')
+
+# Blocks attached in this process: block name -> (SharedMemory, values array)
+_attached = {}
+# Handle of the panel workers read through ticker_arrays() and ticker_frame()
+_current = {'handle': None}
+
+def find_history_files(history_dir, tickers=None):
+    """
+    Finds the newest stored history CSV of every ticker in a folder.
+
+    Returns:
+        dict: Ticker -> CSV path.
+    """
+    newest = {}
+    for name in sorted(os.listdir(history_dir)):
+        match = HISTORY_FILE_PATTERN.match(name)
+        if not match:
+            continue
+        # Skip other outputs that happen to share the date prefix, e.g. '_indicators_from_csv_output.csv'
+        if match.group(1) and not name.endswith('_historical_data.csv'):
+            continue
+        ticker = match.group(2)
+        if tickers and ticker not in tickers:
+            continue
+        # Files are visited in name order, so a later date prefix replaces an earlier one
+        newest[ticker] = os.path.join(history_dir, name)
+    return newest
+
+def load_panel_frames(csv_by_ticker, fields=PANEL_FIELDS):
+    """
+    Reads the historical data CSVs written by download_historical_data()
+    ('date' index, lowercase columns) for create_panel().
+
+    Args:
+        csv_by_ticker (dict): Ticker symbol -> CSV path.
+        fields (list): The columns to keep.
+
+    Returns:
+        dict: Ticker symbol -> DataFrame, for the files that could be read.
+    """
+    frames = {}
+    for ticker, path in csv_by_ticker.items():
+        try:
+            df = pd.read_csv(path, index_col='date', parse_dates=True)
+        except Exception as e:
+            print(f">>    Could not read '{path}' for the price panel: {e}")
+            continue
+        missing = [field for field in fields if field not in df.columns]
+        if missing:
+            print(f">>    {ticker} is missing {', '.join(missing)} - left out of the price panel")
+            continue
+        frames[ticker] = df[fields].apply(pd.to_numeric, errors='coerce')
+    return frames
+
+def create_panel(frames, fields=PANEL_FIELDS):
+    """
+    Copies the bars of many tickers into a new shared memory block.
+
+    Args:
+        frames (dict): Ticker symbol -> DataFrame with a DatetimeIndex and the `fields` columns.
+        fields (list): The columns to place in the panel, in this order.
+
+    Returns:
+        dict: The panel handle - small and picklable. The creating process
+              stays attached; call close_panel(handle, unlink=True) when done.
+    """
+    tickers = list(frames)
+    # One sort over all dates - a union per ticker is quadratic in the ticker count
+    stamps = {ticker: pd.DatetimeIndex(frames[ticker].index).as_unit('ns').asi8 for ticker in tickers}
+    dates = np.unique(np.concatenate(list(stamps.values()))) if stamps else np.array([], dtype=np.int64)
+
+    shape = (len(tickers), len(fields), len(dates))
+    nbytes = max(int(np.prod(shape)) * np.dtype(np.float64).itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=nbytes)
+    values = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+    values.fill(np.nan)
+
+    rows = {}
+    for row, ticker in enumerate(tickers):
+        df = frames[ticker]
+        # Selecting columns builds a new frame; skip it when the layout already matches
+        bars = (df if list(df.columns) == list(fields) else df[fields]).to_numpy(dtype=np.float64).T
+        positions = np.searchsorted(dates, stamps[ticker])
+        if len(positions) and (np.diff(positions) == 1).all():
+            values[row, :, positions[0]:positions[-1] + 1] = bars
+        else:
+            values[row][:, positions] = bars
+        # First and last date of the ticker, so workers can skip the padding around its history
+        rows[ticker] = (row, int(positions.min()) if len(positions) else 0, int(positions.max()) + 1 if len(positions) else 0)
+
+    handle = {
+        'name': block.name,
+        'shape': shape,
+        'fields': list(fields),
+        'dates': dates,
+        'tickers': rows,
+    }
+    _attached[block.name] = (block, values)
+    _current['handle'] = handle
+    return handle
+
+def attach_panel(handle):
+    """
+    Attaches this process to a panel; pass it as the pool initializer with the
+    handle as its argument (map_panel() does). Attaching twice is a no-op.
+    """
+    _current['handle'] = handle
+    if handle['name'] in _attached:
+        return
+    try:
+        block = shared_memory.SharedMemory(name=handle['name'], track=False)
+    except TypeError:
+        # Before Python 3.13 every attach registers the block with the resource
+        # tracker the workers share with the creator, which then unlinks it (or
+        # reports it as leaked) on its own; only the creator's registration is wanted
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            block = shared_memory.SharedMemory(name=handle['name'])
+        finally:
+            resource_tracker.register = register
+    values = np.ndarray(handle['shape'], dtype=np.float64, buffer=block.buf)
+    _attached[handle['name']] = (block, values)
+
+def panel_tickers():
+    """The tickers of the attached panel, in row order."""
+    return list(_current['handle']['tickers'])
+
+def ticker_arrays(ticker, trim=True):
+    """
+    Returns a ticker's fields as read-only numpy views into the shared block.
+
+    Args:
+        ticker (str): A ticker of the attached panel.
+        trim (bool): Cut the NaN padding before the first and after the last
+                     bar of the ticker. Dates another ticker traded on but
+                     this one did not stay NaN.
+
+    Returns:
+        dict: Field -> 1-D float64 view, plus 'date' -> int64 nanosecond
+              timestamps (a view of the handle's dates) of the same length.
+    """
+    handle = _current['handle']
+    row, first, last = handle['tickers'][ticker]
+    values = _attached[handle['name']][1]
+    window = slice(first, last) if trim else slice(None)
+
+    arrays = {}
+    for index, field in enumerate(handle['fields']):
+        view = values[row, index, window]
+        view.flags.writeable = False
+        arrays[field] = view
+    arrays['date'] = handle['dates'][window]
+    return arrays
+
+def field_array(field):
+    """
+    Returns one field of every ticker as a read-only (tickers x dates) view
+    into the shared block, rows in panel_tickers() order and columns on the
+    handle's 'dates'. For cross-sectional work over the whole panel at once.
+    """
+    handle = _current['handle']
+    view = _attached[handle['name']][1][:, handle['fields'].index(field), :]
+    view.flags.writeable = False
+    return view
+
+def ticker_frame(ticker):
+    """
+    Returns a ticker's bars as a DataFrame like the one it was loaded from.
+    Unlike ticker_arrays() this copies the data; use it to call existing
+    DataFrame-based functions.
+    """
+    arrays = ticker_arrays(ticker)
+    dates = pd.DatetimeIndex(arrays.pop('date'), name='date')
+    df = pd.DataFrame(arrays, index=dates)
+    return df.dropna(how='all')
+
+def map_panel(func, handle, tickers=None, workers=None, chunksize=16):
+    """
+    Calls func(ticker) for every ticker in worker processes attached to the panel.
+
+    Args:
+        func (callable): A module-level function that reads its ticker with
+                         ticker_arrays() or ticker_frame() and returns a small,
+                         picklable result.
+        handle (dict): The handle from create_panel().
+        tickers (list, optional): The tickers to process. Defaults to all.
+        workers (int, optional): Worker processes. Defaults to the CPU count.
+        chunksize (int): Tickers sent to a worker per task.
+
+    Returns:
+        list: func's results, in the order of `tickers`.
+    """
+    tickers = list(handle['tickers']) if tickers is None else list(tickers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=attach_panel, initargs=(handle,)) as pool:
+        return list(pool.map(func, tickers, chunksize=chunksize))
+
+def close_panel(handle, unlink=False):
+    """
+    Detaches this process from a panel. The creating process passes
+    unlink=True to free the block once the workers are done.
+    """
+    attached = _attached.pop(handle['name'], None)
+    if _current['handle'] is handle:
+        _current['handle'] = None
+    if attached is None:
+        return
+    block, values = attached
+    del values
+    try:
+        block.close()
+    except BufferError:
+        # Views from ticker_arrays() are still alive; the mapping goes with them
+        pass
+    if unlink:
+        block.unlink()
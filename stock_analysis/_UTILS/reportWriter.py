@@ -0,0 +1,159 @@
+import json
+
+# Reports with more rows than this switch to the compact JSON blob by default
+COMPACT_REPORT_THRESHOLD = 2000
+
+# Write buffer for report files - rows are streamed, never joined in memory
+REPORT_BUFFER_SIZE = 1 << 16
+
+PAGE_HEADER_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+{style}
+    </style>
+</head>
+<body>
+"""
+
+PAGE_FOOTER_TEMPLATE = """</body>
+</html>
+"""
+
+# Client-side renderer for tables written with write_json_table().
+# Emitted once per report; every table blob is a compact {"columns", "link", "rows"} object.
+# Values are escaped before they go into the markup - a ticker, headline or
+# description holding '<' or '&' is shown as text, never parsed as HTML.
+JSON_TABLE_RENDERER = """<script>
+function escapeHtml(value) {
+    return String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+}
+function renderJsonTable(tableId) {
+    var blob = JSON.parse(document.getElementById(tableId + '-data').textContent);
+    var table = document.getElementById(tableId);
+    var head = '<thead><tr>' + blob.columns.map(function (c) { return '<th>' + escapeHtml(c) + '</th>'; }).join('') + '</tr></thead>';
+    var body = blob.rows.map(function (row) {
+        return '<tr>' + row.map(function (cell, i) {
+            var text = escapeHtml(cell).replace(/\\n/g, '<br>');
+            if (i === 0 && blob.link) {
+                text = '<a href="' + escapeHtml(blob.link + cell) + '">' + text + '</a>';
+            }
+            return '<td>' + text + '</td>';
+        }).join('') + '</tr>';
+    }).join('');
+    table.innerHTML = head + '<tbody>' + body + '</tbody>';
+}
+</script>
+"""
+
+def compile_template(template_text):
+    """
+    Compiles an HTML template once so it can be rendered many times.
+
+    Args:
+        template_text (str): A str.format template with named fields.
+
+    Returns:
+        callable: The bound format_map of the template; call it with a mapping.
+    """
+    return template_text.format_map
+
+render_page_header = compile_template(PAGE_HEADER_TEMPLATE)
+
+def open_report(file_path):
+    """
+    Opens a report file for streaming writes with a large buffer.
+
+    Args:
+        file_path (str): The path of the HTML report to create.
+
+    Returns:
+        file: A text file handle; use it as a context manager.
+    """
+    return open(file_path, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE)
+
+def write_page_header(f, title, style=""):
+    """
+    Writes the document head and opens the body.
+
+    Args:
+        f (file): An open, writable text file.
+        title (str): The page title.
+        style (str, optional): Raw CSS placed inside the <style> element.
+    """
+    f.write(render_page_header({'title': title, 'style': style}))
+
+def write_page_footer(f):
+    """Closes the body and document."""
+    f.write(PAGE_FOOTER_TEMPLATE)
+
+def write_table(f, columns, rows, row_template, table_class="summary-table"):
+    """
+    Streams an HTML table to disk one row at a time.
+
+    Args:
+        f (file): An open, writable text file.
+        columns (list): The column headings.
+        rows (iterable): Mappings consumed by row_template; may be a generator.
+        row_template (callable): A template returned by compile_template().
+        table_class (str, optional): CSS class of the <table> element.
+
+    Returns:
+        int: The number of rows written.
+    """
+    f.write(f'<table class="{table_class}">\n<thead>\n<tr>')
+    f.writelines(f'<th>{column}</th>' for column in columns)
+    f.write('</tr>\n</thead>\n<tbody>\n')
+
+    row_count = 0
+    for row in rows:
+        f.write(row_template(row))
+        row_count += 1
+
+    f.write('</tbody>\n</table>\n')
+    return row_count
+
+def write_json_table(f, table_id, columns, rows, link_prefix=None, table_class="summary-table"):
+    """
+    Writes a table as a compact JSON data blob rendered in the browser.
+
+    Only the values travel in the file - the column names are written once and
+    the row markup is generated client-side by JSON_TABLE_RENDERER, which keeps
+    very large reports several times smaller than their expanded HTML.
+
+    Args:
+        f (file): An open, writable text file.
+        table_id (str): A unique id for the table within the report.
+        columns (list): The column headings.
+        rows (iterable): Sequences of cell values, in column order.
+        link_prefix (str, optional): If given, the first cell of each row is
+                                     rendered as a link to link_prefix + value.
+        table_class (str, optional): CSS class of the <table> element.
+
+    Returns:
+        int: The number of rows written.
+    """
+    f.write(f'<table id="{table_id}" class="{table_class}"></table>\n')
+    f.write(f'<script type="application/json" id="{table_id}-data">')
+    # '</' would close the script element early
+    f.write(json.dumps({'columns': list(columns), 'link': link_prefix}, separators=(',', ':'), default=str)[:-1].replace('</', '<\\/'))
+    f.write(',"rows":[')
+
+    row_count = 0
+    for row in rows:
+        if row_count:
+            f.write(',')
+        f.write(json.dumps(list(row), separators=(',', ':'), default=str).replace('</', '<\\/'))
+        row_count += 1
+
+    f.write(']}</script>\n')
+    f.write(f"<script>renderJsonTable('{table_id}');</script>\n")
+    return row_count
+
+def write_json_table_renderer(f):
+    """Writes the client-side renderer used by write_json_table(). Call once, before any JSON table."""
+    f.write(JSON_TABLE_RENDERER)
@@ -0,0 +1,253 @@
+import os
+import json
+import hashlib
+import inspect
+import numpy as np
+from datetime import datetime, timedelta
+
+import fileLock
+
+# ==============================================================================
+# Result cache - per-ticker signal results memoized across reruns
+# ==============================================================================
+# A batch rerun on the same inputs (after a crash, or to regenerate a report
+# with a changed template) looks every ticker up here first and only computes
+# the ones whose data or code changed. A result is keyed by:
+#
+#   ticker, last bar date, SHA-1 of the bars, the run parameters,
+#   a hash of the code that produced it, and the evaluation date
+#
+# The evaluation date is part of the key because the leaning/overall status
+# depends on how many days ago each signal fired.
+#
+# Entries live in one JSON file per pipeline. When it is saved, entries older
+# than RESULT_CACHE_MAX_AGE_DAYS are dropped, then the least recently used
+# ones until the file fits RESULT_CACHE_MAX_MB. Configuration:
+#
+#   RESULT_CACHE=0                 disable the cache (and same-day download reuse)
+#   RESULT_CACHE_DIR=<dir>         folder of the cache files (default: _OUTPUT/_CACHE)
+#   RESULT_CACHE_MAX_MB=<mb>       size cap of one cache file (default: 20)
+#   RESULT_CACHE_MAX_AGE_DAYS=<n>  drop entries not used for n days (default: 7)
+#
+# Concurrent runs (the workers of a work queue) share the file: a save merges
+# the entries on disk under a fileLock, keeping the more recently used of two
+# versions of an entry, so no process overwrites the others' results.
+
+DEFAULT_CACHE_DIR = "E:/_scripts_PYTHON/_personal/_OUTPUT/_CACHE"
+DEFAULT_MAX_MB = 20.0
+DEFAULT_MAX_AGE_DAYS = 7
+
+# Decimals of the bar values hashed by frame_fingerprint()
+FINGERPRINT_DECIMALS = 8
+
+_cache = {
+    'enabled': False,
+    'path': None,
+    'entries': {},      # key -> {'ticker', 'result', 'created', 'last_used'}
+    'dirty': False,
+    'hits': 0,
+    'misses': 0,
+    'max_bytes': int(DEFAULT_MAX_MB * 1024 * 1024),
+    'max_age_days': DEFAULT_MAX_AGE_DAYS,
+}
+
+def open_cache(name, cache_dir=None, max_mb=None, max_age_days=None):
+    """
+    Loads (or starts) the result cache of a pipeline.
+
+    Args:
+        name (str): Pipeline name; the cache file is '<name>_results.json'.
+        cache_dir (str, optional): Folder of the cache file. Defaults to
+                                   RESULT_CACHE_DIR or DEFAULT_CACHE_DIR.
+        max_mb (float, optional): Size cap of the cache file, in MB.
+        max_age_days (int, optional): Entries unused this long are evicted.
+
+    Returns:
+        str: The path of the cache file.
+    """
+    cache_dir = cache_dir or os.environ.get('RESULT_CACHE_DIR', DEFAULT_CACHE_DIR)
+    max_mb = max_mb if max_mb is not None else float(os.environ.get('RESULT_CACHE_MAX_MB', DEFAULT_MAX_MB))
+    max_age_days = max_age_days if max_age_days is not None else int(os.environ.get('RESULT_CACHE_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS))
+    path = os.path.join(cache_dir, f"{name}_results.json")
+
+    _cache.update({
+        'enabled': True,
+        'path': path,
+        'entries': _read_entries(path),
+        'dirty': False,
+        'hits': 0,
+        'misses': 0,
+        'max_bytes': int(max_mb * 1024 * 1024),
+        'max_age_days': max_age_days,
+    })
+    return path
+
+def _read_entries(path):
+    """The entries of a cache file; an empty dict for a missing or unreadable one."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('entries', {})
+    except Exception as e:
+        # A damaged cache only costs a full recompute
+        print(f">>  Ignoring unreadable result cache '{path}': {e}")
+        return {}
+
+def open_cache_from_env(name):
+    """Calls open_cache() unless RESULT_CACHE is set to a false value; returns the path or None."""
+    if os.environ.get('RESULT_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return open_cache(name)
+
+def cache_enabled():
+    return _cache['enabled']
+
+def code_version(functions, rules_version=1):
+    """
+    Hashes the source of the functions that produce a result, so editing
+    any of them invalidates the cached results. Logic that is not inside one
+    of the functions is covered by bumping `rules_version` instead.
+    """
+    digest = hashlib.sha1(str(rules_version).encode())
+    for function in functions:
+        digest.update(inspect.getsource(function).encode())
+    return digest.hexdigest()[:12]
+
+def file_fingerprint(csv_filepath):
+    """
+    Returns (last bar date, SHA-1 of the content) of a history CSV. The file
+    is read in blocks; the last bar date is the first field of its last line.
+    """
+    digest = hashlib.sha1()
+    tail = b''
+    with open(csv_filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+            tail = (tail + block)[-4096:]
+    lines = [line for line in tail.splitlines() if line.strip()]
+    last_bar = lines[-1].split(b',', 1)[0].decode(errors='replace') if lines else ''
+    return last_bar, digest.hexdigest()
+
+def frame_fingerprint(df):
+    """
+    Returns (last bar date, SHA-1 of the bars) of a DataFrame of bars. The
+    values are hashed rounded to FINGERPRINT_DECIMALS, so a frame and the same
+    frame read back from its CSV (pandas' default float parser can be off in
+    the last digit) have the same fingerprint.
+    """
+    dates = df.index.as_unit('ns').asi8 if hasattr(df.index, 'as_unit') else np.asarray(df.index)
+    digest = hashlib.sha1(np.ascontiguousarray(dates).tobytes())
+    for column in sorted(df.columns):
+        digest.update(str(column).encode())
+        digest.update(np.round(df[column].to_numpy(dtype=np.float64), FINGERPRINT_DECIMALS).tobytes())
+    last_bar = str(df.index[-1].date()) if len(df) and hasattr(df.index[-1], 'date') else ''
+    return last_bar, digest.hexdigest()
+
+def result_key(ticker, data, params, version, as_of=None):
+    """
+    Builds the cache key of one ticker's result.
+
+    Args:
+        ticker (str): The ticker symbol.
+        data (str or pandas.DataFrame): The history CSV the result is computed
+                                        from, or its bars already in memory.
+        params (dict): Run parameters that change the result (e.g. the timeframe).
+        version (str): code_version() of the producing code.
+        as_of (str, optional): Evaluation date, 'YYYY-MM-DD'. Defaults to today.
+
+    Returns:
+        str: The key, or None if the data cannot be read.
+    """
+    try:
+        if isinstance(data, str):
+            last_bar, content_hash = file_fingerprint(data)
+        else:
+            last_bar, content_hash = frame_fingerprint(data)
+    except (OSError, ValueError, TypeError):
+        return None
+    parts = {
+        'ticker': ticker,
+        'last_bar': last_bar,
+        'content': content_hash,
+        'params': params,
+        'code': version,
+        'as_of': as_of or datetime.now().strftime('%Y-%m-%d'),
+    }
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+def get_result(key):
+    """Returns the cached result for a key (and marks it used), or None."""
+    if not _cache['enabled'] or key is None:
+        return None
+    entry = _cache['entries'].get(key)
+    if entry is None:
+        _cache['misses'] += 1
+        return None
+    entry['last_used'] = datetime.now().isoformat(timespec='seconds')
+    _cache['dirty'] = True
+    _cache['hits'] += 1
+    return entry['result']
+
+def put_result(key, ticker, result):
+    """Stores one ticker's result. It is written to disk by save_cache()."""
+    if not _cache['enabled'] or key is None:
+        return
+    now = datetime.now().isoformat(timespec='seconds')
+    _cache['entries'][key] = {'ticker': ticker, 'result': result, 'created': now, 'last_used': now}
+    _cache['dirty'] = True
+
+def evict(entries, max_bytes, max_age_days, now=None):
+    """
+    Applies the eviction policy: entries unused for more than max_age_days
+    go first, then the least recently used until the JSON fits max_bytes.
+
+    Returns:
+        dict: The entries that are kept.
+    """
+    now = now or datetime.now()
+    oldest_kept = (now - timedelta(days=max_age_days)).isoformat(timespec='seconds')
+    kept = {k: e for k, e in entries.items() if e.get('last_used', '') >= oldest_kept}
+
+    sizes = {k: len(json.dumps(e, default=str)) + len(k) + 6 for k, e in kept.items()}
+    total = sum(sizes.values())
+    if total > max_bytes:
+        for k in sorted(kept, key=lambda k: kept[k].get('last_used', '')):
+            del kept[k]
+            total -= sizes[k]
+            if total <= max_bytes:
+                break
+    return kept
+
+def save_cache():
+    """
+    Merges the cache with the file on disk (other processes may have saved
+    theirs since it was loaded), evicts and writes it, through a temporary
+    file so a crash while saving never leaves a half-written cache.
+
+    Returns:
+        dict: 'hits', 'misses', 'entries' and 'evicted' counts, or None when disabled.
+    """
+    if not _cache['enabled']:
+        return None
+
+    with fileLock.file_lock(_cache['path']):
+        entries = _read_entries(_cache['path'])
+        for key, entry in _cache['entries'].items():
+            if entry.get('last_used', '') >= entries.get(key, {}).get('last_used', ''):
+                entries[key] = entry
+
+        before = len(entries)
+        _cache['entries'] = evict(entries, _cache['max_bytes'], _cache['max_age_days'])
+        evicted = before - len(_cache['entries'])
+
+        if _cache['dirty'] or evicted:
+            temp_path = fileLock.temp_path(_cache['path'])
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'saved': datetime.now().isoformat(timespec='seconds'), 'entries': _cache['entries']},
+                          f, default=str)
+            os.replace(temp_path, _cache['path'])
+            _cache['dirty'] = False
+
+    return {'hits': _cache['hits'], 'misses': _cache['misses'],
+            'entries': len(_cache['entries']), 'evicted': evicted}
@@ -0,0 +1,315 @@
+import os
+import io
+
+import numpy as np
+import pandas as pd
+
+import rsRanking
+import marketData
+
+# ==============================================================================
+# Risk statistics - beta, covariance and correlation from local daily returns
+# ==============================================================================
+# The screeners read BETA from yf.Ticker(ticker).info: one slow metadata
+# request per ticker, over a window yfinance does not document. Here beta is
+# computed from the daily closes already on disk:
+#
+#   beta = cov(ticker returns, benchmark returns) / var(benchmark returns)
+#
+# over the last BETA_WINDOW bars, for one series (series_beta()) or for
+# every ticker and date of a (tickers x dates) panel at once (rolling_beta(),
+# from running sums instead of a loop over the windows).
+#
+# For the whole universe a risk state keeps the last `window` daily returns of
+# every ticker and (tickers x tickers) matrices of pairwise sums: the bars two
+# tickers share, each one's sum and sum of squares over those shared bars, and
+# the sum of their products. New bars update them with matrix products for the
+# bars that enter the window and for those that leave it, so the covariance
+# and correlation matrices - and every ticker's beta against any ticker of the
+# universe - never need the whole window again. Each pair's statistics come
+# from the bars both tickers have, so a ticker listed partway through the
+# window is not diluted by the bars before its history. Gaps inside a history
+# count as a zero return (the close is carried over them); a ticker with fewer
+# than MIN_BARS own bars in the window has no statistics.
+
+DEFAULT_BENCHMARK = 'SPY'
+BETA_WINDOW = 252
+MIN_BARS = 126
+DEFAULT_RISK_DIR = "E:/_scripts_PYTHON/_personal/_OUTPUT/_RISK"
+RISK_STATE_FILE = "risk_state.npz"
+
+# The pairwise sums a risk state keeps; a saved state without them is rebuilt
+STATE_MATRICES = ['pair_counts', 'pair_sums', 'pair_squares', 'products']
+
+# Failed benchmark downloads of one window before the screeners stop asking
+MAX_BENCHMARK_ATTEMPTS = 3
+
+# Benchmark closes fetched once per run and window, for the screeners' local
+# betas, and the failed downloads per window
+_benchmark = {
+    'closes': {},
+    'failures': {},
+}
+
+def daily_returns(close):
+    """
+    Simple daily returns of a (tickers x dates) close array, the first
+    column and the dates outside each ticker's history NaN.
+    """
+    filled = rsRanking.fill_gaps(np.asarray(close, dtype=np.float64))
+    returns = np.full(filled.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[:, 1:] = filled[:, 1:] / filled[:, :-1] - 1.0
+    return returns
+
+def _window_sums(values, window):
+    """Sum of the last `window` columns at every column, from one cumulative sum."""
+    cumulative = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,))
+    np.cumsum(values, axis=-1, out=cumulative[..., 1:])
+    sums = cumulative[..., 1:].copy()
+    sums[..., window:] -= cumulative[..., 1:-window]
+    return sums
+
+def rolling_beta(returns, benchmark_returns, window=BETA_WINDOW, min_bars=MIN_BARS):
+    """
+    Computes the rolling beta of every ticker and date at once.
+
+    Args:
+        returns (numpy.ndarray): (tickers x dates) daily returns.
+        benchmark_returns (numpy.ndarray): The benchmark's daily returns on the same dates.
+        window (int): Bars per beta.
+        min_bars (int): Fewest bars with both returns a beta needs.
+
+    Returns:
+        numpy.ndarray: (tickers x dates) betas, NaN where fewer than
+                       `min_bars` of the window's bars have both returns.
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+    benchmark = np.broadcast_to(np.asarray(benchmark_returns, dtype=np.float64), returns.shape)
+    both = ~(np.isnan(returns) | np.isnan(benchmark))
+    x = np.where(both, benchmark, 0.0)
+    y = np.where(both, returns, 0.0)
+
+    n = _window_sums(both.astype(np.float64), window)
+    sum_x, sum_y = _window_sums(x, window), _window_sums(y, window)
+    sum_xy, sum_xx = _window_sums(x * y, window), _window_sums(x * x, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
+    beta[n < min_bars] = np.nan
+    return beta
+
+def series_beta(close, benchmark_close, window=BETA_WINDOW, min_bars=MIN_BARS):
+    """
+    Returns the latest beta of one close series against a benchmark close
+    series (both indexed by date), or None with too little overlap.
+    """
+    closes = pd.concat([close, benchmark_close], axis=1, join='inner').dropna()
+    if len(closes) < 2:
+        return None
+    returns = closes.pct_change().iloc[1:].tail(window).to_numpy()
+    if len(returns) < min(min_bars, window):
+        return None
+    variance = np.var(returns[:, 1], ddof=1)
+    if variance == 0:
+        return None
+    return float(np.cov(returns[:, 0], returns[:, 1], ddof=1)[0, 1] / variance)
+
+def get_benchmark_closes(start_date, end_date, benchmark=DEFAULT_BENCHMARK):
+    """
+    Returns the benchmark's daily closes over a window (datetimes), downloaded
+    on first use. A failed or empty download is not kept: the next call tries
+    again, up to MAX_BENCHMARK_ATTEMPTS times per window.
+
+    Returns:
+        pandas.Series: The closes, or None while the download fails.
+    """
+    key = (benchmark, start_date.date(), end_date.date())
+    if key not in _benchmark['closes']:
+        if _benchmark['failures'].get(key, 0) >= MAX_BENCHMARK_ATTEMPTS:
+            return None
+        try:
+            closes = marketData.history(benchmark, start=start_date, end=end_date, interval="1d")['Close']
+        except Exception:
+            closes = None
+        if closes is None or closes.empty:
+            _benchmark['failures'][key] = _benchmark['failures'].get(key, 0) + 1
+            return None
+        _benchmark['closes'][key] = closes
+    return _benchmark['closes'][key]
+
+def build_risk_state(returns, dates, tickers, window=BETA_WINDOW):
+    """
+    Builds the risk state from the last `window` columns of a returns panel.
+
+    Args:
+        returns (numpy.ndarray): (tickers x dates) daily returns.
+        dates (numpy.ndarray): The panel dates.
+        tickers (list): The tickers of the rows.
+        window (int): Bars the statistics cover.
+
+    Returns:
+        dict: The state: 'tickers', 'dates' (of the window), 'window',
+              'returns' and 'valid' (tickers x window), and the
+              (tickers x tickers) pairwise sums over the bars both tickers
+              have - 'pair_counts', 'pair_sums' and 'pair_squares' (row
+              ticker's returns and squared returns) and 'products'.
+    """
+    returns = np.asarray(returns, dtype=np.float64)[:, -window:]
+    valid = ~np.isnan(returns)
+    values = np.where(valid, returns, 0.0)
+    state = {
+        'tickers': np.asarray(tickers, dtype=str),
+        'dates': np.asarray(dates).astype('datetime64[ns]')[-window:],
+        'window': int(window),
+        'returns': values,
+        'valid': valid,
+    }
+    for name, matrix in _pair_sums(values, valid).items():
+        state[name] = matrix
+    return state
+
+def _pair_sums(values, valid):
+    """The pairwise sums of STATE_MATRICES over a block of bars (tickers x bars)."""
+    mask = valid.astype(np.float64)
+    return {
+        'pair_counts': mask @ mask.T,
+        'pair_sums': values @ mask.T,
+        'pair_squares': (values * values) @ mask.T,
+        'products': values @ values.T,
+    }
+
+def update_risk_state(state, returns, dates, tickers):
+    """
+    Moves the risk state's window forward over the dates of a returns panel
+    that are newer than its last date.
+
+    Returns:
+        int: The number of bars added, or None when the tickers differ from
+             the state's and it has to be rebuilt with build_risk_state().
+    """
+    if list(state['tickers']) != [str(ticker) for ticker in tickers]:
+        return None
+
+    dates = np.asarray(dates).astype('datetime64[ns]')
+    new = dates > state['dates'][-1] if len(state['dates']) else np.ones(len(dates), dtype=bool)
+    if not new.any():
+        return 0
+
+    incoming = np.asarray(returns, dtype=np.float64)[:, new][:, -state['window']:]
+    incoming_valid = ~np.isnan(incoming)
+    incoming = np.where(incoming_valid, incoming, 0.0)
+    added = incoming.shape[1]
+
+    # The window is full once it holds `window` bars; only then do old bars leave it
+    leaving = max(state['returns'].shape[1] + added - state['window'], 0)
+    outgoing = state['returns'][:, :leaving]
+
+    entering, dropped = _pair_sums(incoming, incoming_valid), _pair_sums(outgoing, state['valid'][:, :leaving])
+    for name in STATE_MATRICES:
+        state[name] += entering[name] - dropped[name]
+    state['returns'] = np.concatenate([state['returns'][:, leaving:], incoming], axis=1)
+    state['valid'] = np.concatenate([state['valid'][:, leaving:], incoming_valid], axis=1)
+    state['dates'] = np.concatenate([state['dates'][leaving:], dates[new][-added:]])
+    return added
+
+def _pair_moments(state, min_bars):
+    """
+    The tickers with at least `min_bars` own bars, and the co-moments of every
+    pair of them over the bars both have: covariance and the row ticker's
+    variance (the column ticker's is the transpose), NaN for a pair sharing
+    fewer than `min_bars` bars.
+    """
+    keep = np.diag(state['pair_counts']) >= min_bars
+    block = np.ix_(keep, keep)
+    n = state['pair_counts'][block]
+    sum_x = state['pair_sums'][block]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = (state['products'][block] - sum_x * sum_x.T / n) / (n - 1)
+        variance = (state['pair_squares'][block] - sum_x * sum_x / n) / (n - 1)
+    short = n < max(min_bars, 2)
+    covariance[short] = np.nan
+    variance[short] = np.nan
+    return state['tickers'][keep], covariance, variance
+
+def covariance_matrix(state, min_bars=MIN_BARS):
+    """
+    The sample covariance of the daily returns over the state's window, each
+    pair over the bars both tickers have.
+
+    Returns:
+        pandas.DataFrame: (tickers x tickers), only the tickers with at least `min_bars` own bars.
+    """
+    tickers, covariance, _ = _pair_moments(state, min_bars)
+    return pd.DataFrame(covariance, index=tickers, columns=tickers)
+
+def correlation_matrix(state, min_bars=MIN_BARS):
+    """The correlation matrix matching covariance_matrix(), each pair over the bars both tickers have."""
+    tickers, covariance, variance = _pair_moments(state, min_bars)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = covariance / np.sqrt(variance * variance.T)
+    return pd.DataFrame(correlation, index=tickers, columns=tickers)
+
+def state_betas(state, benchmark=DEFAULT_BENCHMARK, min_bars=MIN_BARS):
+    """
+    Every ticker's beta against a benchmark ticker of the state, over the bars
+    the ticker shares with the benchmark.
+
+    Returns:
+        pandas.Series: Ticker -> beta, or None when the benchmark is not in the state.
+    """
+    tickers, covariance, variance = _pair_moments(state, min_bars)
+    if benchmark not in tickers:
+        return None
+    column = list(tickers).index(benchmark)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        betas = covariance[:, column] / variance[column, :]
+    return pd.Series(betas, index=tickers, name=benchmark)
+
+def correlated_clusters(correlation, tickers, threshold=0.7):
+    """
+    Groups tickers (e.g. one day's screener hits) whose returns are correlated:
+    two tickers share a cluster when a chain of pairs with a correlation of
+    at least `threshold` connects them.
+
+    Returns:
+        list: The clusters of two or more tickers, largest first, each sorted.
+    """
+    from scipy.sparse.csgraph import connected_components
+
+    members = [ticker for ticker in dict.fromkeys(tickers) if ticker in correlation.index]
+    if len(members) < 2:
+        return []
+    linked = correlation.loc[members, members].to_numpy() >= threshold
+    n_clusters, labels = connected_components(linked, directed=False)
+
+    clusters = [sorted(str(ticker) for ticker in np.asarray(members)[labels == label]) for label in range(n_clusters)]
+    return sorted((c for c in clusters if len(c) > 1), key=lambda c: (-len(c), c))
+
+def save_risk_state(state, risk_dir=DEFAULT_RISK_DIR):
+    """Writes the risk state to '<risk_dir>/risk_state.npz' and returns the path."""
+    os.makedirs(risk_dir, exist_ok=True)
+    path = os.path.join(risk_dir, RISK_STATE_FILE)
+    buffer = io.BytesIO()
+    np.savez(buffer, **state)
+    # Written under a temporary name, so an interrupted save keeps the previous state
+    with open(path + '.tmp', 'wb') as f:
+        f.write(buffer.getvalue())
+    os.replace(path + '.tmp', path)
+    return path
+
+def load_risk_state(risk_dir=DEFAULT_RISK_DIR):
+    """Reads the saved risk state, or returns None without one."""
+    path = os.path.join(risk_dir, RISK_STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            state = {key: data[key] for key in data.files}
+    except (OSError, ValueError) as e:
+        print(f">>    Could not read the risk state '{path}': {e} - rebuilding it")
+        return None
+    if any(name not in state for name in STATE_MATRICES):
+        print(f">>    The risk state '{path}' predates the pairwise statistics - rebuilding it")
+        return None
+    state['window'] = int(state['window'])
+    return state
@@ -0,0 +1,217 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# Relative strength ranking - every ticker against the whole universe, per date
+# ==============================================================================
+# momentum.py measures one ticker's momentum and compares it with fixed
+# thresholds. This ranks the returns of every ticker of a price panel against
+# each other instead: the lookback returns of the whole (tickers x dates)
+# close array come from one shifted division each, and every date's returns
+# are turned into percentile ranks (0 - 100, the best return of the day
+# scores 100) in one more array operation.
+#
+# The ranks of every date are kept in a history folder and only dates newer
+# than the last stored one are ranked and appended on the next run:
+#
+#   rs_rank_history.csv   date, ticker and the rs_<lookback> percentiles, all dates
+#   rs_rank_latest.csv    returns and percentiles of the newest date, for screens
+#   rs_rank_meta.json     the lookbacks and the last stored date
+#
+# A change of the lookbacks rebuilds the history.
+
+# Lookback label -> trading days
+DEFAULT_LOOKBACKS = {'1W': 5, '1M': 21, '3M': 63, '6M': 126, '1Y': 252}
+DEFAULT_RS_DIR = "E:/_scripts_PYTHON/_personal/_OUTPUT/_RS"
+
+HISTORY_FILE = "rs_rank_history.csv"
+LATEST_FILE = "rs_rank_latest.csv"
+META_FILE = "rs_rank_meta.json"
+
+def fill_gaps(close):
+    """
+    Carries each ticker's last close over the dates it did not trade between
+    its first and last bar; the dates before and after stay NaN.
+    """
+    valid = ~np.isnan(close)
+    columns = np.arange(close.shape[1])
+    last_seen = np.maximum.accumulate(np.where(valid, columns[None, :], -1), axis=1)
+    filled = close[np.arange(close.shape[0])[:, None], np.maximum(last_seen, 0)]
+    filled[last_seen < 0] = np.nan
+
+    last_bar = close.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1) if close.shape[1] else np.zeros(0, dtype=int)
+    filled[columns[None, :] > last_bar[:, None]] = np.nan
+    return filled
+
+def lookback_returns(close, lookbacks=DEFAULT_LOOKBACKS):
+    """
+    Computes the return over every lookback for every ticker and date at once.
+
+    Args:
+        close (numpy.ndarray): (tickers x dates) closes, NaN where a ticker has
+                               no bar, e.g. pricePanel.field_array('close').
+        lookbacks (dict): Label -> bars.
+
+    Returns:
+        dict: Label -> (tickers x dates) array of close[t] / close[t - bars] - 1,
+              NaN until a ticker has `bars` bars of history.
+    """
+    filled = fill_gaps(np.asarray(close, dtype=np.float64))
+    returns = {}
+    for label, bars in lookbacks.items():
+        result = np.full(filled.shape, np.nan)
+        if bars < filled.shape[1]:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result[:, bars:] = filled[:, bars:] / filled[:, :-bars] - 1.0
+        returns[label] = result
+    return returns
+
+def percentile_ranks(returns):
+    """
+    Ranks a (tickers x dates) return array within every date.
+
+    Returns:
+        numpy.ndarray: Percentiles 0 - 100 of the same shape: the share of the
+                       date's other ranked tickers with a lower return (ties
+                       share their average rank). NaN where the return is NaN;
+                       a date with a single return ranks it 100.
+    """
+    # One row per date, so every sort below runs over contiguous memory
+    values = np.ascontiguousarray(np.asarray(returns, dtype=np.float64).T)
+    n_dates, n_tickers = values.shape
+    order = np.argsort(values, axis=1)    # NaN sorts last
+    ordered = np.take_along_axis(values, order, axis=1)
+    positions = np.arange(n_tickers)
+
+    # First and last sorted position of every run of equal returns; their mean
+    # is the average rank of a tie (NaN != NaN, so each NaN is a run of its own)
+    run_start = np.ones(ordered.shape, dtype=bool)
+    run_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    run_end = np.ones(ordered.shape, dtype=bool)
+    run_end[:, :-1] = run_start[:, 1:]
+    first = np.maximum.accumulate(np.where(run_start, positions, 0), axis=1)
+    last = np.minimum.accumulate(np.where(run_end, positions, n_tickers - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    counts = (~np.isnan(values)).sum(axis=1)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sorted_percentiles = np.where(counts > 1, (first + last) / 2 / (counts - 1), 1.0) * 100.0
+    sorted_percentiles[np.isnan(ordered)] = np.nan
+
+    percentiles = np.empty_like(values)
+    np.put_along_axis(percentiles, order, sorted_percentiles, axis=1)
+    return percentiles.T
+
+def rank_universe(close, lookbacks=DEFAULT_LOOKBACKS):
+    """
+    Returns (returns, ranks): label -> (tickers x dates) arrays of lookback_returns()
+    and their percentile_ranks().
+    """
+    returns = lookback_returns(close, lookbacks)
+    return returns, {label: percentile_ranks(values) for label, values in returns.items()}
+
+def _long_table(tickers, dates, arrays, prefix, columns):
+    """(tickers x dates) arrays of the selected date columns -> one row per (date, ticker) with a value."""
+    n_tickers = len(tickers)
+    table = pd.DataFrame({
+        'date': np.repeat(pd.DatetimeIndex(dates[columns]).strftime('%Y-%m-%d').to_numpy(), n_tickers),
+        'ticker': np.tile(np.asarray(tickers, dtype=object), len(columns)),
+    })
+    for label, values in arrays.items():
+        table[f'{prefix}{label}'] = values[:, columns].T.ravel()
+    value_columns = [f'{prefix}{label}' for label in arrays]
+    return table.dropna(subset=value_columns, how='all').reset_index(drop=True)
+
+def load_meta(rs_dir=DEFAULT_RS_DIR):
+    """The stored lookbacks and last ranked date, or None without a history."""
+    path = os.path.join(rs_dir, META_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f">>    Could not read the RS rank meta '{path}': {e} - rebuilding the history")
+        return None
+
+def update_rank_history(close, dates, tickers, lookbacks=DEFAULT_LOOKBACKS, rs_dir=DEFAULT_RS_DIR):
+    """
+    Ranks the dates of a panel not yet in the RS rank history and appends them.
+
+    Args:
+        close (numpy.ndarray): (tickers x dates) closes.
+        dates (numpy.ndarray): The panel dates (datetime64 or int64 nanoseconds).
+        tickers (list): The tickers of the rows.
+        lookbacks (dict): Label -> bars.
+        rs_dir (str): The history folder.
+
+    Returns:
+        dict: 'added' (dates appended), 'rebuilt' (bool), 'last_date' and
+              'latest' (the rs_rank_latest.csv frame, or None with no ranked date).
+    """
+    os.makedirs(rs_dir, exist_ok=True)
+    dates = pd.DatetimeIndex(np.asarray(dates).astype('datetime64[ns]'))
+    history_path = os.path.join(rs_dir, HISTORY_FILE)
+
+    meta = load_meta(rs_dir)
+    rebuilt = meta is None or meta.get('lookbacks') != dict(lookbacks) or not os.path.exists(history_path)
+    if rebuilt:
+        first_new = 0
+    else:
+        first_new = int(dates.searchsorted(pd.Timestamp(meta['last_date']), side='right'))
+
+    if first_new >= len(dates):
+        print(f">>    RS rank history is up to date ({meta['last_date']})")
+        latest_path = os.path.join(rs_dir, LATEST_FILE)
+        latest = pd.read_csv(latest_path) if os.path.exists(latest_path) else None
+        return {'added': 0, 'rebuilt': False, 'last_date': meta['last_date'], 'latest': latest}
+
+    # Only the new dates are ranked; the longest lookback before them is all they
+    # need, once the gaps are filled from the whole history
+    window_start = max(first_new - max(lookbacks.values()), 0)
+    returns, ranks = rank_universe(fill_gaps(np.asarray(close, dtype=np.float64))[:, window_start:], lookbacks)
+    new_columns = np.arange(first_new - window_start, len(dates) - window_start)
+    window_dates = dates[window_start:]
+
+    new_rows = _long_table(tickers, window_dates, ranks, 'rs_', new_columns)
+    if rebuilt:
+        temp_path = history_path + '.tmp'
+        new_rows.to_csv(temp_path, index=False, float_format='%.2f')
+        os.replace(temp_path, history_path)
+    else:
+        new_rows.to_csv(history_path, mode='a', header=False, index=False, float_format='%.2f')
+
+    last_column = np.array([len(window_dates) - 1])
+    latest = _long_table(tickers, window_dates, ranks, 'rs_', last_column)
+    latest_returns = _long_table(tickers, window_dates, returns, 'ret_', last_column)
+    latest = latest.merge(latest_returns, on=['date', 'ticker'], how='left')
+    temp_path = os.path.join(rs_dir, LATEST_FILE) + '.tmp'
+    latest.to_csv(temp_path, index=False)
+    os.replace(temp_path, os.path.join(rs_dir, LATEST_FILE))
+
+    last_date = dates[-1].strftime('%Y-%m-%d')
+    temp_path = os.path.join(rs_dir, META_FILE) + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({'lookbacks': dict(lookbacks), 'last_date': last_date}, f, indent=2)
+    os.replace(temp_path, os.path.join(rs_dir, META_FILE))
+
+    return {'added': len(new_columns), 'rebuilt': rebuilt, 'last_date': last_date, 'latest': latest}
+
+def load_latest_ranks(rs_dir=DEFAULT_RS_DIR):
+    """The rs_rank_latest.csv snapshot, or None before the first ranking."""
+    path = os.path.join(rs_dir, LATEST_FILE)
+    return pd.read_csv(path) if os.path.exists(path) else None
+
+def top_rs(ranks, lookback='3M', min_percentile=90.0):
+    """
+    Screens a rank table (rs_rank_latest.csv or rows of the history) for the
+    strongest tickers, e.g. the top decile of 3-month relative strength.
+
+    Returns:
+        pandas.DataFrame: The rows with rs_<lookback> >= min_percentile, strongest first.
+    """
+    column = f'rs_{lookback}'
+    selected = ranks[ranks[column] >= min_percentile]
+    return selected.sort_values([column, 'ticker'], ascending=[False, True], ignore_index=True)
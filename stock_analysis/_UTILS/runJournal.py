@@ -0,0 +1,169 @@
+import os
+import json
+import glob
+from datetime import datetime
+
+# ==============================================================================
+# Run journal - durable per-ticker results of a batch run, for resuming
+# ==============================================================================
+# A batch appends each finished ticker's result to a JSON-lines journal and
+# syncs it to disk, so a run that dies halfway (network, rate limit, sleep)
+# loses at most the ticker in progress. The first line describes the run:
+#
+#   {"type": "run", "run": ..., "started": ..., "params": {...}}
+#   {"type": "result", "ticker": "AAPL", "result": {...}}
+#   ...
+#   {"type": "end", "ended": ...}
+#
+# The 'end' record is written by close_journal() once the run got through its
+# whole input. A resumed run finds the newest journal with the same run name
+# and params - which should pin the download window, so a resume never mixes
+# days - and, unless that run ended, skips the tickers it already holds and
+# keeps appending to it. The report is
+# built from the journal, so it also covers the tickers of earlier attempts.
+# A line cut short by a crash is ignored when the journal is read.
+
+DEFAULT_JOURNAL_DIR = "E:/_scripts_PYTHON/_personal/_OUTPUT/_JOURNAL"
+
+_journal = {
+    'path': None,
+    'file': None,
+}
+
+def _journal_header(path):
+    """Returns the 'run' record of a journal, or None if it has none."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return header if header.get('type') == 'run' else None
+
+def _journal_ended(path):
+    """Whether the last record of a journal is its 'end' record."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(max(f.seek(0, os.SEEK_END) - 4096, 0))
+            lines = f.read().splitlines()
+        return bool(lines) and json.loads(lines[-1]).get('type') == 'end'
+    except (OSError, ValueError):
+        return False
+
+def find_latest_journal(run_name, params, journal_dir=DEFAULT_JOURNAL_DIR):
+    """
+    Finds the newest journal of a run with the same parameters, when that run
+    did not finish.
+
+    Args:
+        run_name (str): Name of the pipeline.
+        params (dict): Run parameters that must match (e.g. input file, timeframe).
+        journal_dir (str): Folder of the journals.
+
+    Returns:
+        str: The journal path, or None if there is none to resume.
+    """
+    expected = json.loads(json.dumps(params, default=str))
+    # The timestamp prefix sorts the names chronologically
+    for path in sorted(glob.glob(os.path.join(journal_dir, f"*_{run_name}_journal.jsonl")), reverse=True):
+        header = _journal_header(path)
+        if header is not None and header.get('params') == expected:
+            # A finished run is not resumed - and neither is an older attempt behind it
+            return None if _journal_ended(path) else path
+    return None
+
+def start_journal(run_name, params, journal_dir=DEFAULT_JOURNAL_DIR):
+    """
+    Starts a new journal and opens it for appending.
+
+    Returns:
+        str: The journal path.
+    """
+    os.makedirs(journal_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(journal_dir, f"{stamp}_{run_name}_journal.jsonl")
+    _open(path)
+    _append({'type': 'run', 'run': run_name, 'started': datetime.now().isoformat(timespec='seconds'),
+             'params': params})
+    return path
+
+def resume_journal(path):
+    """
+    Reopens an existing journal for appending.
+
+    Returns:
+        dict: Ticker -> result of the tickers the journal already holds.
+    """
+    _drop_torn_line(path)
+    completed = {}
+    for ticker, result in _read_results(path):
+        completed[ticker] = result
+    _open(path)
+    return completed
+
+def _drop_torn_line(path):
+    """Cuts a last line left without its newline by a crash, so appends start on a fresh line."""
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        tail_start = max(size - (1 << 20), 0)
+        f.seek(tail_start)
+        tail = f.read()
+        if tail.endswith(b'\n') or not tail:
+            return
+        f.truncate(tail_start + tail.rfind(b'\n') + 1)
+
+def _open(path):
+    close_journal()
+    _journal['path'] = path
+    _journal['file'] = open(path, 'a', encoding='utf-8')
+
+def _append(record):
+    f = _journal['file']
+    f.write(json.dumps(record, default=str) + '\n')
+    f.flush()
+    os.fsync(f.fileno())
+
+def record_result(ticker, result):
+    """Appends one finished ticker's result; a no-op when no journal is open."""
+    if _journal['file'] is not None:
+        _append({'type': 'result', 'ticker': ticker, 'result': result})
+
+def _read_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('type') == 'result':
+                yield record['ticker'], record['result']
+
+def load_results(path=None):
+    """
+    Reads the results of a journal (by default the open one), one per ticker.
+    A ticker that appears twice keeps its last result.
+
+    Returns:
+        list: The result dictionaries, in the order the tickers first finished.
+    """
+    path = path or _journal['path']
+    results = {}
+    for ticker, result in _read_results(path):
+        results[ticker] = result
+    return list(results.values())
+
+def journal_path():
+    return _journal['path']
+
+def close_journal(finished=False):
+    """
+    Closes the open journal.
+
+    Args:
+        finished (bool): The run got through its whole input; its journal gets
+                         the 'end' record and is no longer resumed.
+    """
+    if _journal['file'] is not None:
+        if finished:
+            _append({'type': 'end', 'ended': datetime.now().isoformat(timespec='seconds')})
+        _journal['file'].close()
+        _journal['file'] = None
@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import functools
+from contextlib import nullcontext
+from datetime import datetime
+
+# ==============================================================================
+# Run metrics - per-stage timing spans and counters for the batch pipelines
+# ==============================================================================
+# Disabled by default; a disabled span() is a shared no-op context manager and
+# count() returns immediately, so the instrumentation can stay in the hot loops.
+# Enable it with enable_metrics(), or for any pipeline with the environment:
+#
+#   RUN_METRICS=1          turn metrics on
+#   RUN_METRICS_DIR=<dir>  folder for the JSON-lines file (default: _REPORT)
+#
+# Every finished span and the end-of-run summary are appended to
+# '<YYYYMMDD_HHMMSS>_<run_name>_metrics.jsonl' as one JSON object per line.
+
+DEFAULT_METRICS_DIR = "E:/_scripts_PYTHON/_personal/_REPORT"
+
+_NO_SPAN = nullcontext()
+
+_metrics = {
+    'enabled': False,
+    'run_name': None,
+    'run_start': None,
+    'sink': None,
+    'sink_path': None,
+    'stack': [],          # Open spans: (stage, ticker)
+    'stages': {},         # stage path -> list of durations
+    'failures': {},       # stage path -> failed span count
+    'tickers': {},        # ticker -> total seconds in its outermost spans
+    'counters': {},       # counter name -> total
+}
+
+def enable_metrics(run_name, metrics_dir=None):
+    """
+    Turns metrics on for this process and opens the JSON-lines sink.
+
+    Args:
+        run_name (str): Name of the pipeline, used in the file name and every record.
+        metrics_dir (str, optional): Folder for the metrics file. Defaults to
+                                     RUN_METRICS_DIR or DEFAULT_METRICS_DIR.
+
+    Returns:
+        str: The path of the metrics file.
+    """
+    metrics_dir = metrics_dir or os.environ.get('RUN_METRICS_DIR', DEFAULT_METRICS_DIR)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    sink_path = os.path.join(metrics_dir, f"{stamp}_{run_name}_metrics.jsonl")
+
+    _metrics.update({
+        'enabled': True,
+        'run_name': run_name,
+        'run_start': time.perf_counter(),
+        'sink': open(sink_path, 'a', encoding='utf-8', buffering=1 << 16),
+        'sink_path': sink_path,
+        'stack': [],
+        'stages': {},
+        'failures': {},
+        'tickers': {},
+        'counters': {},
+    })
+    return sink_path
+
+def enable_metrics_from_env(run_name):
+    """Calls enable_metrics() when RUN_METRICS is set to a true value; returns the sink path or None."""
+    if os.environ.get('RUN_METRICS', '').lower() in ('1', 'true', 'yes', 'on'):
+        return enable_metrics(run_name)
+    return None
+
+def metrics_enabled():
+    return _metrics['enabled']
+
+def _write(record):
+    _metrics['sink'].write(json.dumps(record, default=str) + '\n')
+
+class _Span:
+    """A timed, nestable stage. Use through span()."""
+
+    __slots__ = ('stage', 'ticker', 'fields', 'start')
+
+    def __init__(self, stage, ticker, fields):
+        self.stage = stage
+        self.ticker = ticker
+        self.fields = fields
+
+    def __enter__(self):
+        # Nested spans inherit the ticker of the span around them
+        if self.ticker is None and _metrics['stack']:
+            self.ticker = _metrics['stack'][-1][1]
+        _metrics['stack'].append((self.stage, self.ticker))
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        stack = _metrics['stack']
+        path = '/'.join(stage for stage, _ in stack)
+        stack.pop()
+
+        _metrics['stages'].setdefault(path, []).append(duration)
+        if exc_type is not None:
+            _metrics['failures'][path] = _metrics['failures'].get(path, 0) + 1
+
+        # Only the outermost span of a ticker adds to its total, so nesting is not double counted
+        if self.ticker is not None and not any(ticker == self.ticker for _, ticker in stack):
+            _metrics['tickers'][self.ticker] = _metrics['tickers'].get(self.ticker, 0.0) + duration
+
+        record = {
+            'type': 'span',
+            'run': _metrics['run_name'],
+            'stage': path,
+            'ticker': self.ticker,
+            'duration_s': round(duration, 6),
+            'ok': exc_type is None,
+        }
+        if self.fields:
+            record.update(self.fields)
+        _write(record)
+        return False
+
+def span(stage, ticker=None, **fields):
+    """
+    Times a pipeline stage.
+
+        with runMetrics.span('download', ticker=ticker_symbol):
+            ...
+
+    Args:
+        stage (str): Stage name; nested spans are recorded as 'outer/inner'.
+        ticker (str, optional): The ticker being processed; inherited by nested spans.
+        **fields: Extra values written with the span record.
+
+    Returns:
+        A context manager (a shared no-op when metrics are disabled).
+    """
+    if not _metrics['enabled']:
+        return _NO_SPAN
+    return _Span(stage, ticker, fields)
+
+def timed(stage):
+    """
+    Decorator form of span() for functions that are always one stage.
+    A 'ticker' keyword argument of the call, if any, is attached to the span.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _metrics['enabled']:
+                return func(*args, **kwargs)
+            with _Span(stage, kwargs.get('ticker'), None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count(name, value=1):
+    """
+    Adds to a run counter, e.g. count('rows_processed', len(df)).
+    """
+    if not _metrics['enabled']:
+        return
+    _metrics['counters'][name] = _metrics['counters'].get(name, 0) + value
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+def summarize_metrics():
+    """
+    Aggregates the run so far.
+
+    Returns:
+        dict: 'run', 'wall_s', 'stages' (per-stage calls, total, mean, p50, p95,
+              max and failures), 'counters' and 'slowest_tickers'.
+    """
+    stages = {}
+    for path, durations in _metrics['stages'].items():
+        ordered = sorted(durations)
+        stages[path] = {
+            'calls': len(ordered),
+            'total_s': sum(ordered),
+            'mean_s': sum(ordered) / len(ordered),
+            'p50_s': _percentile(ordered, 0.50),
+            'p95_s': _percentile(ordered, 0.95),
+            'max_s': ordered[-1],
+            'failures': _metrics['failures'].get(path, 0),
+        }
+
+    slowest = sorted(_metrics['tickers'].items(), key=lambda item: item[1], reverse=True)[:10]
+    return {
+        'run': _metrics['run_name'],
+        'wall_s': time.perf_counter() - _metrics['run_start'],
+        'stages': stages,
+        'counters': dict(_metrics['counters']),
+        'slowest_tickers': slowest,
+    }
+
+def print_summary_table(summary):
+    """Prints the end-of-run stage table, counters and slowest tickers."""
+    wall = summary['wall_s'] or 1.0
+
+    print(f">> ")
+    print(f">> --------------------------------------------------------------------")
+    print(f">> RUN METRICS - {summary['run']} - {summary['wall_s']:.2f}s wall clock")
+    print(f">> --------------------------------------------------------------------")
+    print(f">>  {'Stage':<36} {'Calls':>6} {'Total s':>9} {'Mean ms':>9} {'p95 ms':>9} {'Max ms':>9} {'% Run':>6} {'Fail':>5}")
+    for path, s in sorted(summary['stages'].items()):
+        print(f">>  {path:<36} {s['calls']:>6} {s['total_s']:>9.2f} {s['mean_s'] * 1000:>9.1f} "
+              f"{s['p95_s'] * 1000:>9.1f} {s['max_s'] * 1000:>9.1f} {s['total_s'] / wall * 100:>5.1f}% {s['failures']:>5}")
+
+    if summary['counters']:
+        print(f">> ")
+        for name, value in sorted(summary['counters'].items()):
+            print(f">>  {name:<36} {value:>14,}")
+
+    if summary['slowest_tickers']:
+        print(f">> ")
+        print(f">>  Slowest Tickers: " + ", ".join(f"{t} ({d:.2f}s)" for t, d in summary['slowest_tickers']))
+    print(f">> ")
+
+def finish_metrics():
+    """
+    Writes the summary record, prints the summary table and closes the sink.
+    Does nothing when metrics are disabled.
+    """
+    if not _metrics['enabled']:
+        return None
+
+    summary = summarize_metrics()
+    _write({'type': 'summary', **summary})
+    _metrics['sink'].close()
+    _metrics['enabled'] = False
+
+    print_summary_table(summary)
+    print(f">>  Metrics saved to '{_metrics['sink_path']}'")
+    return summary
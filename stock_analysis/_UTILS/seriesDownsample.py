@@ -0,0 +1,108 @@
+import numpy as np
+
+# Charts are ~1400 px wide; more points than this only cost rendering time
+DEFAULT_MAX_POINTS = 1500
+
+def lttb_indices(x, y, n_out):
+    """
+    Picks the points of a line that keep its visual shape, using the
+    Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always kept. The points in between are split
+    into n_out - 2 buckets, and from each bucket the point forming the largest
+    triangle with the previously kept point and the average of the next bucket
+    is kept.
+
+    Args:
+        x (numpy.ndarray): Increasing x values (e.g. matplotlib date numbers).
+        y (numpy.ndarray): The y values; NaNs are treated as 0 for selection only.
+        n_out (int): The number of points to keep.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+
+    # Bucket edges over the inner points 1..n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # Average point of every bucket, computed once from prefix sums
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.maximum(edges[1:] - edges[:-1], 1)
+    x_avgs = (x_sums[edges[1:]] - x_sums[edges[:-1]]) / counts
+    y_avgs = (y_sums[edges[1:]] - y_sums[edges[:-1]]) / counts
+
+    # The bucket after the last one is the final point itself
+    x_avgs = np.append(x_avgs, x[-1])
+    y_avgs = np.append(y_avgs, y[-1])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0] = 0
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        bx = x[start:stop]
+        by = y[start:stop]
+        # Twice the triangle area; the constant factor does not change the argmax
+        areas = np.abs((x[previous] - x_avgs[bucket + 1]) * (by - y[previous])
+                       - (x[previous] - bx) * (y_avgs[bucket + 1] - y[previous]))
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    kept[-1] = n - 1
+
+    return np.unique(kept)
+
+def extreme_indices(values, n_out):
+    """
+    Picks the largest-magnitude value of each of n_out equal buckets, so
+    downsampled histograms keep their peaks.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the kept values.
+    """
+    n = len(values)
+    if n_out >= n:
+        return np.arange(n)
+
+    magnitude = np.nan_to_num(np.abs(np.asarray(values, dtype=np.float64)), nan=-1.0)
+    edges = np.linspace(0, n, n_out + 1).astype(np.int64)[:-1]
+    bucket_max = np.maximum.reduceat(magnitude, edges)
+
+    # First position in each bucket that reaches the bucket maximum
+    bucket_of = np.repeat(np.arange(len(edges)), np.diff(np.append(edges, n)))
+    hits = np.flatnonzero(magnitude == bucket_max[bucket_of])
+    _, first_hit = np.unique(bucket_of[hits], return_index=True)
+    return hits[first_hit]
+
+def downsample_positions(x, columns, n_out=DEFAULT_MAX_POINTS, keep=None):
+    """
+    Chooses the rows to draw for several lines that share one x axis.
+
+    Every line contributes its own LTTB points, and the `keep` positions
+    (crossover bars and the bar before each, so markers still sit on the line
+    where it crosses) are always included.
+
+    Args:
+        x (numpy.ndarray): Increasing x values.
+        columns (list): y arrays, one per line.
+        n_out (int): Target points per line.
+        keep (numpy.ndarray, optional): Positions that must be kept.
+
+    Returns:
+        numpy.ndarray: Sorted row positions.
+    """
+    if len(x) <= n_out:
+        return np.arange(len(x))
+
+    parts = [lttb_indices(x, y, n_out) for y in columns]
+    if keep is not None and len(keep):
+        keep = np.asarray(keep, dtype=np.int64)
+        parts.append(keep)
+        parts.append(np.clip(keep - 1, 0, len(x) - 1))
+    return np.unique(np.concatenate(parts))
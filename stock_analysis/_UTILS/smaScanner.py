@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# SMA crossover scanner - many (fast, slow) pairs over many tickers at once
+# ==============================================================================
+# smaBuy / smaSell / plotSMA answer one (fast, slow) pair for one ticker with
+# two rolling().mean() calls. The scanner stacks the closes of all tickers
+# into one array (each row right-aligned, so the last bars share a column),
+# takes a single cumulative sum and derives every SMA window from it with
+# one subtraction per window. The crossover rules are those of smaBuy,
+# smaSell and plotSMA.generate_crossover_signals():
+#
+#   buy  - close crosses above SMA_Slow
+#   sell - close crosses below SMA_Fast
+#
+# and, as there, only bars where both SMAs of the pair exist on the bar and the
+# bar before can signal. The SMAs match rolling().mean() to the last bit or
+# two; a close that ties its SMA at that precision can resolve differently.
+
+# (fast, slow) pairs tried in plotSMA; (21, 7) is the one smaBuy / smaSell use
+DEFAULT_SMA_PAIRS = [(21, 7), (15, 45), (22, 7), (20, 7), (21, 4)]
+
+def stack_closes(closes):
+    """
+    Stacks the close series of many tickers into one right-aligned array.
+
+    Args:
+        closes (dict): Ticker -> pandas.Series of closes with a DatetimeIndex,
+                       NaNs already dropped and sorted by date.
+
+    Returns:
+        tuple: (tickers, close array, date array, first valid column per row).
+               The arrays are (tickers x longest series); the columns before a
+               ticker's first bar hold NaN / NaT.
+    """
+    tickers = list(closes)
+    length = max((len(series) for series in closes.values()), default=0)
+    close_array = np.full((len(tickers), length), np.nan)
+    date_array = np.full((len(tickers), length), np.datetime64('NaT'), dtype='datetime64[ns]')
+    first = np.empty(len(tickers), dtype=np.int64)
+
+    for row, ticker in enumerate(tickers):
+        series = closes[ticker]
+        first[row] = length - len(series)
+        close_array[row, first[row]:] = series.to_numpy(dtype=np.float64)
+        date_array[row, first[row]:] = series.index.to_numpy(dtype='datetime64[ns]')
+
+    return tickers, close_array, date_array, first
+
+def rolling_means(close_array, first, windows):
+    """
+    Computes the simple moving averages of every window from one cumulative sum.
+
+    The closes of each row are taken relative to its first close before summing,
+    which keeps the running sum small and the SMAs within rounding of rolling().mean().
+
+    Returns:
+        dict: Window -> array like close_array, NaN until the window is full.
+    """
+    n_rows, length = close_array.shape
+    columns = np.arange(length)
+    base = close_array[np.arange(n_rows), np.minimum(first, max(length - 1, 0))][:, None] if length else np.zeros((n_rows, 1))
+    centered = np.nan_to_num(close_array - base)
+    cumulative = np.zeros((n_rows, length + 1))
+    np.cumsum(centered, axis=1, out=cumulative[:, 1:])
+
+    # Bars each close has been repeated for: rolling().mean() returns a window of
+    # identical closes exactly, which decides crossovers on flat stretches
+    repeated = np.zeros((n_rows, length), dtype=bool)
+    repeated[:, 1:] = close_array[:, 1:] == close_array[:, :-1]
+    run_start = np.maximum.accumulate(np.where(repeated, 0, columns[None, :]), axis=1) if length else repeated
+    repeats = columns[None, :] - run_start
+
+    means = {}
+    for window in sorted(set(windows)):
+        sma = np.full((n_rows, length), np.nan)
+        if window <= length:
+            sma[:, window - 1:] = (cumulative[:, window:] - cumulative[:, :length - window + 1]) / window + base
+        flat = repeats >= window - 1
+        sma[flat] = close_array[flat]
+        # A window is full once it holds `window` bars of the ticker itself
+        sma[columns[None, :] < first[:, None] + window - 1] = np.nan
+        means[window] = sma
+    return means
+
+def _last_true(mask):
+    """Column of the last True per row, or -1."""
+    if mask.shape[1] == 0:
+        return np.full(mask.shape[0], -1)
+    last = mask.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+    return np.where(mask.any(axis=1), last, -1)
+
+def scan_crossovers(closes, pairs=DEFAULT_SMA_PAIRS):
+    """
+    Evaluates the SMA crossover rules of every pair for every ticker.
+
+    Args:
+        closes (dict): Ticker -> pandas.Series of closes (see stack_closes()).
+        pairs (list): (fast, slow) SMA periods.
+
+    Returns:
+        pandas.DataFrame: One row per ticker and pair with 'ticker', 'fast',
+                          'slow', 'buy_signal' / 'sell_signal' (a crossover on
+                          the latest bar, as check_buy_signal() / check_sell_signal())
+                          and 'last_buy' / 'last_sell' (dates of the most recent
+                          crossovers, as get_last_*_signal_date(), or None).
+    """
+    tickers, close_array, date_array, first = stack_closes(closes)
+    means = rolling_means(close_array, first, [w for pair in pairs for w in pair])
+    length = close_array.shape[1]
+    columns = np.arange(length)
+    previous_close = np.roll(close_array, 1, axis=1)
+
+    rows = []
+    for fast, slow in pairs:
+        sma_fast, sma_slow = means[fast], means[slow]
+        # Both SMAs must exist on this bar and the one before (the dropna() + shift(1) of the scripts)
+        can_signal = columns[None, :] >= first[:, None] + max(fast, slow)
+        with np.errstate(invalid='ignore'):
+            buys = can_signal & (close_array > sma_slow) & (previous_close <= np.roll(sma_slow, 1, axis=1))
+            sells = can_signal & (close_array < sma_fast) & (previous_close >= np.roll(sma_fast, 1, axis=1))
+
+        last_buy, last_sell = _last_true(buys), _last_true(sells)
+        for row, ticker in enumerate(tickers):
+            rows.append({
+                'ticker': ticker,
+                'fast': fast,
+                'slow': slow,
+                'buy_signal': bool(length and buys[row, -1]),
+                'sell_signal': bool(length and sells[row, -1]),
+                'last_buy': pd.Timestamp(date_array[row, last_buy[row]]).date() if last_buy[row] >= 0 else None,
+                'last_sell': pd.Timestamp(date_array[row, last_sell[row]]).date() if last_sell[row] >= 0 else None,
+            })
+
+    return pd.DataFrame(rows, columns=['ticker', 'fast', 'slow', 'buy_signal', 'sell_signal', 'last_buy', 'last_sell'])
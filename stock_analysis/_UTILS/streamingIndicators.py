@@ -0,0 +1,182 @@
+import math
+from collections import deque
+
+# ==============================================================================
+# Bar-by-bar (streaming) versions of the batch indicators
+# ==============================================================================
+# Each make_*_consumer() returns an on_bar(ticker, bar) function that keeps its
+# own state per ticker, updates it with one bar and returns the signals that
+# bar triggered as a list of (strategy, 'BUY' | 'SELL') tuples. A bar is a dict
+# with lowercase 'open', 'high', 'low', 'close' and 'volume' keys.
+#
+# The signal rules are the same as the batch code they mirror:
+#
+#   EVWMA      - evaluate_*_evwma_signals() in price2EVWMA / cnsBtchPrc2EVWMA
+#   SMA        - plotSMA.generate_crossover_signals()
+#   Bollinger  - bollinger.analyze_boom_bust_cycle()
+
+def _crossed(previous_a, previous_b, a, b):
+    """'BUY' when a crosses above b, 'SELL' when it crosses below, else None."""
+    if previous_a < previous_b and a >= b:
+        return 'BUY'
+    if previous_a > previous_b and a <= b:
+        return 'SELL'
+    return None
+
+def _tail(values, n):
+    """The last n items of a deque, without copying the whole deque."""
+    return (values[i] for i in range(len(values) - n, len(values)))
+
+def make_evwma_consumer(volume_span_short=40_500_000, volume_span_long=120_000_000, signal_period=9):
+    """
+    Streaming EVWMA short/long, oscillator and signal line, with the single,
+    oscillator and double EVWMA crossover signals.
+
+    Args:
+        volume_span_short (float): Volume span of the short EVWMA.
+        volume_span_long (float): Volume span of the long EVWMA.
+        signal_period (int): EMA period of the oscillator's signal line.
+
+    Returns:
+        function: on_bar(ticker, bar) -> list of (strategy, side) tuples.
+                  The latest values per ticker are in on_bar.state.
+    """
+    ema_alpha = 2.0 / (signal_period + 1)
+    state = {}
+
+    def on_bar(ticker, bar):
+        close, volume = bar['close'], bar['volume']
+        previous = state.get(ticker)
+        if previous is None:
+            state[ticker] = {'close': close, 'evwma_short': close, 'evwma_long': close,
+                             'evwma_oscillator': 0.0, 'evwma_signal': 0.0}
+            return []
+
+        alpha_short = min(volume / volume_span_short, 1.0)
+        alpha_long = min(volume / volume_span_long, 1.0)
+        evwma_short = alpha_short * close + (1 - alpha_short) * previous['evwma_short']
+        evwma_long = alpha_long * close + (1 - alpha_long) * previous['evwma_long']
+        oscillator = evwma_short - evwma_long
+        signal = ema_alpha * oscillator + (1 - ema_alpha) * previous['evwma_signal']
+
+        current = {'close': close, 'evwma_short': evwma_short, 'evwma_long': evwma_long,
+                   'evwma_oscillator': oscillator, 'evwma_signal': signal}
+        state[ticker] = current
+
+        signals = []
+        for strategy, a, b in (('evwma_single', 'close', 'evwma_short'),
+                               ('evwma_oscillator', 'evwma_oscillator', 'evwma_signal'),
+                               ('evwma_double', 'evwma_short', 'evwma_long')):
+            side = _crossed(previous[a], previous[b], current[a], current[b])
+            if side:
+                signals.append((strategy, side))
+        return signals
+
+    on_bar.state = state
+    return on_bar
+
+def make_sma_crossover_consumer(fast_period=21, slow_period=7):
+    """
+    Streaming SMA_Fast / SMA_Slow with the plotSMA crossover rules: buy when
+    the close crosses above SMA_Slow, sell when it crosses below SMA_Fast.
+
+    Returns:
+        function: on_bar(ticker, bar) -> list of (strategy, side) tuples.
+    """
+    longest = max(fast_period, slow_period)
+    state = {}
+
+    def on_bar(ticker, bar):
+        ticker_state = state.get(ticker)
+        if ticker_state is None:
+            ticker_state = state[ticker] = {'closes': deque(maxlen=longest), 'previous': None}
+        closes = ticker_state['closes']
+        closes.append(bar['close'])
+
+        # Like rolling().mean(), an SMA is None (NaN) until its window is full;
+        # re-summing the short windows avoids the rounding drift of a running sum
+        sma_fast = sum(_tail(closes, fast_period)) / fast_period if len(closes) >= fast_period else None
+        sma_slow = sum(_tail(closes, slow_period)) / slow_period if len(closes) >= slow_period else None
+        close = bar['close']
+        previous = ticker_state['previous']
+        ticker_state['previous'] = (close, sma_fast, sma_slow)
+        if previous is None:
+            return []
+
+        # Any comparison with a missing SMA is False, as with NaN in generate_crossover_signals()
+        signals = []
+        if sma_slow is not None and previous[2] is not None and close > sma_slow and previous[0] <= previous[2]:
+            signals.append(('sma_crossover', 'BUY'))
+        if sma_fast is not None and previous[1] is not None and close < sma_fast and previous[0] >= previous[1]:
+            signals.append(('sma_crossover', 'SELL'))
+        return signals
+
+    on_bar.state = state
+    return on_bar
+
+def make_bollinger_squeeze_consumer(lookback_period=10, std_dev=2, volatility_threshold=0.8, b_width_avg_period=30):
+    """
+    Streaming Bollinger bands, bandwidth and bandwidth average with the
+    boom-bust signals of bollinger.py (same defaults). As there, the signal of
+    a bar is decided from the previous bar's values.
+
+    Returns:
+        function: on_bar(ticker, bar) -> list of (strategy, side) tuples.
+    """
+    state = {}
+
+    def on_bar(ticker, bar):
+        ticker_state = state.get(ticker)
+        if ticker_state is None:
+            ticker_state = state[ticker] = {
+                'closes': deque(maxlen=lookback_period),
+                'b_widths': deque(maxlen=b_width_avg_period),
+                'bars': 0,
+                'previous': None,
+            }
+        closes = ticker_state['closes']
+        close = float(bar['close'])
+        closes.append(close)
+        index = ticker_state['bars']
+        ticker_state['bars'] += 1
+
+        upper = lower = b_width = None
+        if len(closes) == lookback_period:
+            sma = sum(closes) / lookback_period
+            # Sample standard deviation as statistics.stdev(), in plain floats (it is much slower)
+            stdev = math.sqrt(sum((c - sma) ** 2 for c in closes) / (lookback_period - 1))
+            upper = sma + stdev * std_dev
+            lower = sma - stdev * std_dev
+            b_width = (upper - lower) / sma
+            if not math.isfinite(b_width):
+                b_width = None
+        if b_width is not None:
+            ticker_state['b_widths'].append(b_width)
+
+        b_width_avg = None
+        if index >= b_width_avg_period - 1 and len(ticker_state['b_widths']) == b_width_avg_period:
+            b_width_avg = sum(ticker_state['b_widths']) / b_width_avg_period
+
+        previous = ticker_state['previous']
+        ticker_state['previous'] = (close, upper, lower, b_width, b_width_avg)
+
+        if index < b_width_avg_period or previous is None or None in previous:
+            return []
+
+        close_y, upper_y, lower_y, b_width_y, b_width_avg_y = previous
+        # Overbought wins over a squeeze buy on the same bar, as in analyze_boom_bust_cycle()
+        if close_y >= upper_y:
+            return [('bollinger_squeeze', 'SELL')]
+        if b_width_y < b_width_avg_y * volatility_threshold and close_y <= lower_y:
+            return [('bollinger_squeeze', 'BUY')]
+        return []
+
+    on_bar.state = state
+    return on_bar
+
+# Consumers the replay engine subscribes by default
+DEFAULT_CONSUMERS = {
+    'evwma': make_evwma_consumer,
+    'sma_crossover': make_sma_crossover_consumer,
+    'bollinger_squeeze': make_bollinger_squeeze_consumer,
+}
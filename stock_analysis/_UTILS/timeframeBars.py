@@ -0,0 +1,214 @@
+import os
+import pandas as pd
+
+# ==============================================================================
+# Weekly / monthly bars derived from the stored daily bars
+# ==============================================================================
+# The indicator scripts download daily bars only. Instead of downloading every
+# ticker again per interval, the weekly and monthly bars are aggregated from
+# the daily ones and cached per ticker as '<TICKER>_<timeframe>.csv'. Each run
+# only folds the daily bars newer than the cache into it.
+
+DEFAULT_CACHE_DIR = "E:/_scripts_PYTHON/_personal/_OUTPUT/_TIMEFRAMES"
+
+# rule: pandas resample rule, labelled by the last calendar day of the period
+# bars_per_period: trading days in one bar, used to scale volume-based spans
+TIMEFRAMES = {
+    '1d': {'rule': None, 'bars_per_period': 1},
+    '1wk': {'rule': 'W-FRI', 'bars_per_period': 5},
+    '1mo': {'rule': 'ME', 'bars_per_period': 21},
+}
+
+# How each OHLCV column is aggregated, by lowercase column name
+OHLCV_AGGREGATION = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'adj_close': 'last',
+    'adj close': 'last',
+    'volume': 'sum',
+}
+
+# Date of the newest daily bar folded into each cached row
+LAST_BAR_COLUMN = 'last_bar'
+
+def _flatten_columns(daily):
+    """Drops the ticker level that yfinance adds to the columns of a single-ticker download."""
+    if isinstance(daily.columns, pd.MultiIndex):
+        daily = daily.copy()
+        daily.columns = daily.columns.droplevel(1)
+    return daily
+
+def _check_timeframe(timeframe):
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Unknown timeframe '{timeframe}'. Use one of: {', '.join(TIMEFRAMES)}.")
+
+def scale_span(span, timeframe):
+    """
+    Scales a volume span (e.g. the EVWMA volume spans) tuned on daily bars, so
+    it covers about the same number of bars on a longer timeframe.
+    """
+    _check_timeframe(timeframe)
+    return span * TIMEFRAMES[timeframe]['bars_per_period']
+
+def file_suffix(timeframe):
+    """Returns '' for daily bars and e.g. '_1wk' otherwise, for output file names."""
+    return '' if TIMEFRAMES[timeframe]['rule'] is None else f"_{timeframe}"
+
+def resample_ohlcv(daily, timeframe):
+    """
+    Aggregates daily bars into weekly or monthly bars.
+
+    Columns are matched case-insensitively, so both the lowercase CSVs of the
+    signal scripts and raw yfinance frames work. Other columns are dropped.
+
+    Args:
+        daily (pandas.DataFrame): Daily bars with a DatetimeIndex.
+        timeframe (str): '1d', '1wk' or '1mo'.
+
+    Returns:
+        pandas.DataFrame: One row per period with a 'last_bar' column holding
+                          the date of the newest daily bar in the period.
+    """
+    _check_timeframe(timeframe)
+    daily = _flatten_columns(daily)
+    aggregation = {col: OHLCV_AGGREGATION[str(col).lower()]
+                   for col in daily.columns if str(col).lower() in OHLCV_AGGREGATION}
+
+    if TIMEFRAMES[timeframe]['rule'] is None:
+        bars = daily[list(aggregation)].copy()
+        bars[LAST_BAR_COLUMN] = bars.index
+        return bars
+
+    frame = daily[list(aggregation)].copy()
+    frame[LAST_BAR_COLUMN] = frame.index
+    aggregation[LAST_BAR_COLUMN] = 'max'
+
+    bars = frame.resample(TIMEFRAMES[timeframe]['rule']).agg(aggregation)
+    # Holiday weeks or months without any daily bar come out as empty rows
+    return bars.dropna(subset=[LAST_BAR_COLUMN])
+
+def update_resampled(cached, daily, timeframe):
+    """
+    Folds the daily bars newer than the cache into the cached bars.
+
+    The newest cached bar may be for a period that is still running; it is
+    merged with the new daily bars of the same period rather than recomputed,
+    so `daily` only needs to reach back to the last cached bar.
+
+    Args:
+        cached (pandas.DataFrame): Bars from resample_ohlcv() or an earlier update.
+        daily (pandas.DataFrame): Daily bars, either the full series or just the tail.
+        timeframe (str): The timeframe of `cached`.
+
+    Returns:
+        pandas.DataFrame: The updated bars.
+    """
+    if cached is None or cached.empty:
+        return resample_ohlcv(daily, timeframe)
+
+    daily = _flatten_columns(daily)
+    last_bar = cached[LAST_BAR_COLUMN].iloc[-1]
+    new_bars = resample_ohlcv(daily[daily.index > last_bar], timeframe)
+    if new_bars.empty:
+        return cached
+
+    if new_bars.index[0] == cached.index[-1]:
+        # The running period gained more days: combine the two partial bars
+        previous, latest = cached.iloc[-1], new_bars.iloc[0]
+        merged = latest.copy()
+        for col in new_bars.columns:
+            how = OHLCV_AGGREGATION.get(str(col).lower())
+            if how == 'first':
+                merged[col] = previous[col]
+            elif how == 'max':
+                merged[col] = max(previous[col], latest[col])
+            elif how == 'min':
+                merged[col] = min(previous[col], latest[col])
+            elif how == 'sum':
+                merged[col] = previous[col] + latest[col]
+        new_bars = new_bars.copy()
+        new_bars.iloc[0] = merged
+        cached = cached.iloc[:-1]
+
+    return pd.concat([cached, new_bars])
+
+def _is_restated(cached, daily):
+    """
+    True if the daily bars disagree with the cache on the last day they share.
+    Adjusted prices are rewritten after every dividend or split, which makes
+    the whole cached history stale.
+    """
+    daily = _flatten_columns(daily)
+    close_column = next((col for col in daily.columns if str(col).lower() == 'close'), None)
+    if close_column is None or close_column not in cached.columns:
+        return False
+
+    shared = cached[cached[LAST_BAR_COLUMN].isin(daily.index)]
+    if shared.empty:
+        return False
+
+    row = shared.iloc[-1]
+    daily_close = daily.loc[row[LAST_BAR_COLUMN], close_column]
+    return abs(float(daily_close) - float(row[close_column])) > 1e-6 * max(abs(float(daily_close)), 1.0)
+
+def _dated_by_last_bar(bars, index_name):
+    bars = bars.set_index(LAST_BAR_COLUMN)
+    bars.index.name = index_name
+    return bars
+
+def _cache_path(ticker, timeframe, cache_dir):
+    return os.path.join(cache_dir, f"{ticker.upper()}_{timeframe}.csv")
+
+def load_cached_bars(ticker, timeframe, cache_dir=DEFAULT_CACHE_DIR):
+    """Reads the cached bars of a ticker, or returns None if there are none."""
+    path = _cache_path(ticker, timeframe, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_csv(path, index_col=0, parse_dates=[0, LAST_BAR_COLUMN])
+    except Exception as e:
+        print(f">>    Ignoring unreadable timeframe cache '{path}': {e}")
+        return None
+
+def get_timeframe_bars(ticker, daily, timeframe, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns the bars of a ticker on the requested timeframe, built from its
+    daily bars and kept up to date in the cache.
+
+    Args:
+        ticker (str): The ticker symbol, used as the cache key. With None, or
+                      with cache_dir None, nothing is cached.
+        daily (pandas.DataFrame): Daily bars with a DatetimeIndex.
+        timeframe (str): '1d', '1wk' or '1mo'. '1d' returns `daily` unchanged.
+        cache_dir (str, optional): Folder of the cached bars.
+
+    Returns:
+        pandas.DataFrame: The bars, with the same OHLCV columns as `daily`. Each
+                          bar is dated by its newest daily bar, so the running
+                          week or month never carries a date in the future.
+    """
+    _check_timeframe(timeframe)
+    if TIMEFRAMES[timeframe]['rule'] is None:
+        return daily
+
+    daily = daily.sort_index()
+    if ticker is None or cache_dir is None:
+        return _dated_by_last_bar(resample_ohlcv(daily, timeframe), daily.index.name)
+
+    cached = load_cached_bars(ticker, timeframe, cache_dir)
+    if cached is not None and not cached.empty:
+        # A cache from another column layout, or with adjusted prices since rewritten, is rebuilt
+        same_columns = set(cached.columns) == set(resample_ohlcv(daily.iloc[:1], timeframe).columns)
+        if not same_columns or _is_restated(cached, daily) or daily.index[0] > cached[LAST_BAR_COLUMN].iloc[-1]:
+            cached = None
+
+    bars = update_resampled(cached, daily, timeframe)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    bars.to_csv(_cache_path(ticker, timeframe, cache_dir))
+
+    # The cache may reach further back than this download; return the same span
+    bars = bars[bars[LAST_BAR_COLUMN] >= daily.index[0]]
+    return _dated_by_last_bar(bars, daily.index.name)
@@ -0,0 +1,239 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# Trading calendar - NYSE sessions for date arithmetic over datetime64 arrays
+# ==============================================================================
+# The batch scripts count "days since the last signal" in calendar days with
+# one strptime() per date and sized their download window in calendar days
+# plus a day for yfinance's exclusive end. Here the NYSE sessions (weekdays
+# without the exchange holidays) are generated once into a sorted
+# datetime64[D] array, and every question is a np.searchsorted() over it -
+# for one date or thousands at once:
+#
+#   trading_days_between(start, end)    sessions after start, up to and including end
+#   previous_session(dates)             the session before each date
+#   sessions_back(dates, n)             the session n sessions before each date
+#   download_window(n)                  start / exclusive end of the last n sessions
+#   session_close(day)                  when a session closes, as a POSIX timestamp
+#
+# The holidays follow the current NYSE rules (New Year's Day is not moved
+# back onto a Saturday's Friday, Juneteenth from 2022) plus the one-off
+# closures since 1990. Half days close at 13:00: the day before Independence
+# Day and Christmas Eve on a Monday to Thursday, and the day after
+# Thanksgiving. The index covers CALENDAR_START_YEAR to two years past today
+# and is extended when a date outside it is asked for.
+
+CALENDAR_START_YEAR = 1990
+
+# The exchange clock the closes are on
+EXCHANGE_TIMEZONE = 'America/New_York'
+
+# Sessions the batch scripts download per ticker (cnsBtchPrc2EVWMA, cnsBtchCharts,
+# cnsBtchSMAScan) - one window, so they reuse each other's CSVs of the day
+BATCH_DOWNLOAD_SESSIONS = 378
+
+# Closures outside the yearly rules: national days of mourning, 9/11, Hurricane Sandy
+SPECIAL_CLOSURES = [
+    '1994-04-27', '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14',
+    '2004-06-11', '2007-01-02', '2012-10-29', '2012-10-30', '2018-12-05',
+    '2025-01-09',
+]
+
+# The session index: first and last year covered, sessions and half days
+_calendar = {'first_year': None, 'last_year': None, 'sessions': None, 'half_days': None}
+
+def _nth_weekday(year, month, weekday, n):
+    """The n-th (1-based; -1 the last) weekday (Monday = 0) of a month."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _easter(year):
+    """Easter Sunday of the Gregorian calendar (the anonymous computus)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def _observed(day):
+    """A fixed-date holiday on a Saturday is observed on the Friday, on a Sunday on the Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+def holidays(year):
+    """The full-day NYSE closures of a year that fall on weekdays, sorted."""
+    closed = [
+        _nth_weekday(year, 2, 0, 3),                # Washington's Birthday
+        _easter(year) - timedelta(days=2),          # Good Friday
+        _nth_weekday(year, 5, 0, -1),               # Memorial Day
+        _observed(date(year, 7, 4)),                # Independence Day
+        _nth_weekday(year, 9, 0, 1),                # Labor Day
+        _nth_weekday(year, 11, 3, 4),               # Thanksgiving Day
+        _observed(date(year, 12, 25)),              # Christmas Day
+    ]
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        closed.append(_observed(new_year))
+    if year >= 1998:
+        closed.append(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    if year >= 2022:
+        closed.append(_observed(date(year, 6, 19))) # Juneteenth
+    closed += [date.fromisoformat(day) for day in SPECIAL_CLOSURES if day.startswith(str(year))]
+    return sorted(day for day in set(closed) if day.weekday() < 5)
+
+def half_days(year):
+    """The 13:00 early closes of a year, sorted."""
+    early = [_nth_weekday(year, 11, 3, 4) + timedelta(days=1)]
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        if day.weekday() < 4:
+            early.append(day)
+    return sorted(early)
+
+def _build(first_year, last_year):
+    """Generates the session index for whole years."""
+    start = np.datetime64(f'{first_year}-01-01', 'D')
+    end = np.datetime64(f'{last_year + 1}-01-01', 'D')
+    closed = [day for year in range(first_year, last_year + 1) for day in holidays(year)]
+    days = np.arange(start, end, dtype='datetime64[D]')
+    sessions = days[np.is_busday(days, holidays=np.array(closed, dtype='datetime64[D]'))]
+    early = np.array([day for year in range(first_year, last_year + 1) for day in half_days(year)], dtype='datetime64[D]')
+
+    _calendar.update({
+        'first_year': first_year,
+        'last_year': last_year,
+        'sessions': sessions,
+        'half_days': early[np.isin(early, sessions)],
+    })
+
+def _as_days(dates):
+    """Strings, dates, Timestamps or datetime64 values -> a datetime64[D] array."""
+    days = np.asarray(dates)
+    if days.dtype.kind != 'M' or days.dtype != np.dtype('datetime64[D]'):
+        days = days.astype('datetime64[D]')
+    return days
+
+def _sessions_for(days):
+    """The session index, extended first when `days` fall outside it."""
+    first_year = CALENDAR_START_YEAR if _calendar['first_year'] is None else _calendar['first_year']
+    last_year = date.today().year + 2 if _calendar['last_year'] is None else _calendar['last_year']
+    valid = days[~np.isnat(days)]
+    if valid.size:
+        years = valid.astype('datetime64[Y]').astype(int) + 1970
+        # A year either side, so the sessions around the dates are in the index too
+        first_year, last_year = min(first_year, int(years.min()) - 1), max(last_year, int(years.max()) + 1)
+    if (first_year, last_year) != (_calendar['first_year'], _calendar['last_year']):
+        _build(first_year, last_year)
+    return _calendar['sessions']
+
+def _result(values):
+    """Unwraps the result of a scalar input."""
+    return values[()] if np.ndim(values) == 0 else values
+
+def as_dates(dates):
+    """The dates as datetime64[D]; a string that is not a date raises ValueError."""
+    return _result(_as_days(dates))
+
+def sessions(start, end):
+    """The sessions from start to end, both inclusive, as a datetime64[D] array."""
+    days = _as_days([start, end])
+    index = _sessions_for(days)
+    return index[np.searchsorted(index, days[0], side='left'):np.searchsorted(index, days[1], side='right')]
+
+def is_session(dates):
+    """True for the dates the exchange is open."""
+    days = _as_days(dates)
+    index = _sessions_for(days)
+    positions = np.minimum(np.searchsorted(index, days), len(index) - 1)
+    return _result(index[positions] == days)
+
+def is_half_day(dates):
+    """True for the sessions that close at 13:00."""
+    days = _as_days(dates)
+    _sessions_for(days)
+    return _result(np.isin(days, _calendar['half_days']))
+
+def previous_session(dates, inclusive=False):
+    """
+    The last session before each date; with inclusive=True a session date
+    is its own previous session.
+    """
+    days = _as_days(dates)
+    index = _sessions_for(days)
+    positions = np.searchsorted(index, days, side='right' if inclusive else 'left') - 1
+    return _result(index[positions])
+
+def session_close(day):
+    """
+    The close of one session - 16:00 exchange time, 13:00 on a half day - as a
+    POSIX timestamp, comparable with file modification times.
+    """
+    day = _as_days(day)
+    close_time = '13:00' if is_half_day(day) else '16:00'
+    return pd.Timestamp(f"{day} {close_time}").tz_localize(EXCHANGE_TIMEZONE).timestamp()
+
+def next_session(dates, inclusive=False):
+    """The first session after each date; with inclusive=True a session date is its own next session."""
+    days = _as_days(dates)
+    index = _sessions_for(days + np.timedelta64(7, 'D'))
+    positions = np.searchsorted(index, days, side='left' if inclusive else 'right')
+    return _result(index[positions])
+
+def sessions_back(dates, n):
+    """
+    The session n sessions before each date, counted from the date itself
+    when it is a session (n=0) and from its previous session otherwise.
+    """
+    days = _as_days(dates)
+    index = _sessions_for(days)
+    positions = np.searchsorted(index, days, side='right') - 1 - np.asarray(n)
+    if np.any(positions < 0):
+        _build(_calendar['first_year'] - (int(np.max(n)) // 240 + 1), _calendar['last_year'])
+        return sessions_back(dates, n)
+    return _result(_calendar['sessions'][positions])
+
+def trading_days_between(start, end):
+    """
+    The number of sessions after `start` up to and including `end`: 0 from a
+    session to itself, 1 from a session to the next one, negative when end
+    is before start. Either argument may be an array.
+
+    Args:
+        start: Dates as strings ('YYYY-MM-DD'), dates or datetime64 values.
+        end: Dates of the same kinds.
+
+    Returns:
+        numpy.ndarray | numpy.int64: The session counts.
+    """
+    start_days, end_days = _as_days(start), _as_days(end)
+    index = _sessions_for(np.concatenate([start_days.ravel(), end_days.ravel()]))
+    counts = np.searchsorted(index, end_days, side='right') - np.searchsorted(index, start_days, side='right')
+    return _result(counts)
+
+def download_window(n_sessions, end=None):
+    """
+    The yfinance download window of the last `n_sessions` sessions.
+
+    Args:
+        n_sessions (int): Sessions the window holds.
+        end (optional): The last date of the window. Defaults to today.
+
+    Returns:
+        tuple: (start, end) 'YYYY-MM-DD' strings - the first session and the
+               day after `end`, as yfinance's end date is exclusive.
+    """
+    end_day = _as_days(date.today() if end is None else end)
+    start_day = sessions_back(end_day, n_sessions - 1)
+    return str(start_day), str(end_day + np.timedelta64(1, 'D'))
@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+# ==============================================================================
+# Work queue - one batch run spread over worker processes on several hosts
+# ==============================================================================
+# A coordinator puts the tickers of a run into a SQLite file in a queue folder
+# that every host can reach (a local folder, or a share such as E: mapped on
+# each machine). Any number of workers - processes on one host or on many -
+# claim batches of tickers from it, process them and write each result back;
+# a final merge step reads the results into the consolidated report:
+#
+#   python cnsBtchPrc2EVWMA.py --queue-dir Q --role coordinator   (prompts for the input CSV)
+#   python cnsBtchPrc2EVWMA.py --queue-dir Q --role worker        (start as many as wanted)
+#   python cnsBtchPrc2EVWMA.py --queue-dir Q --role merge
+#
+# cnsBtchMomentum.py takes the same options for the momentum screener.
+#
+# A claimed ticker is leased to its worker for `lease_seconds`, renewed before
+# each ticker of the batch. A worker that dies leaves its leases to run out,
+# and the tickers go to the next worker that claims a batch; after
+# MAX_ATTEMPTS claims (or errors) a ticker is marked failed. A ticker finished
+# twice - by a slow worker and the one that took over its lease - keeps the
+# first result.
+#
+# Every change is one short IMMEDIATE transaction, so the file lock is the only
+# coordination and no process has to stay up. The rollback journal (not WAL,
+# which needs shared memory on one host) keeps the file usable over a network
+# share; the hosts' clocks should agree to well within the lease.
+
+QUEUE_FILE = "work_queue.sqlite"
+DEFAULT_BATCH_SIZE = 25
+DEFAULT_LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 10
+
+QUEUE_STATES = ['pending', 'leased', 'done', 'failed']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    name TEXT NOT NULL,
+    params TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    item TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    finished TEXT
+);
+CREATE INDEX IF NOT EXISTS items_state ON items (state, position);
+"""
+
+def queue_path(queue_dir):
+    return os.path.join(queue_dir, QUEUE_FILE)
+
+def default_worker_id():
+    """'<host>:<pid>' - unique across the hosts sharing a queue."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+@contextmanager
+def _transaction(queue_dir):
+    """One IMMEDIATE transaction on the queue file: the write lock is taken up front, so claims never interleave."""
+    connection = sqlite3.connect(queue_path(queue_dir), timeout=60, isolation_level=None)
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+    finally:
+        connection.close()
+
+def create_queue(queue_dir, run_name, params, items):
+    """
+    Creates the queue of a run, or adds the items it does not hold yet to an
+    existing queue of the same run and params.
+
+    Args:
+        queue_dir (str): Folder of the queue file, shared by all workers.
+        run_name (str): Name of the pipeline.
+        params (dict): Run parameters every worker reads back (e.g. timeframe,
+                       download window), JSON-serializable.
+        items (list): The work items (tickers), processed in this order.
+
+    Returns:
+        int: The number of items added.
+
+    Raises:
+        ValueError: When the folder holds the queue of a different run.
+    """
+    os.makedirs(queue_dir, exist_ok=True)
+    params = json.loads(json.dumps(params, default=str))
+    connection = sqlite3.connect(queue_path(queue_dir), timeout=60)
+    try:
+        connection.executescript(_SCHEMA)
+    finally:
+        connection.close()
+
+    with _transaction(queue_dir) as db:
+        row = db.execute("SELECT name, params FROM run").fetchone()
+        if row is None:
+            db.execute("INSERT INTO run (id, name, params, created) VALUES (1, ?, ?, ?)",
+                       (run_name, json.dumps(params), datetime.now().isoformat(timespec='seconds')))
+        elif row[0] != run_name or json.loads(row[1]) != params:
+            raise ValueError(f"'{queue_path(queue_dir)}' holds the queue of another run ({row[0]}, {row[1]})")
+
+        start = db.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM items").fetchone()[0]
+        before = db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        db.executemany("INSERT OR IGNORE INTO items (item, position) VALUES (?, ?)",
+                       ((str(item), start + offset) for offset, item in enumerate(dict.fromkeys(items))))
+        return db.execute("SELECT COUNT(*) FROM items").fetchone()[0] - before
+
+def queue_info(queue_dir):
+    """The run of a queue: {'name', 'params', 'created'}, or None without a queue."""
+    if not os.path.exists(queue_path(queue_dir)):
+        return None
+    with _transaction(queue_dir) as db:
+        row = db.execute("SELECT name, params, created FROM run").fetchone()
+    return None if row is None else {'name': row[0], 'params': json.loads(row[1]), 'created': row[2]}
+
+def claim_batch(queue_dir, worker_id, batch_size=DEFAULT_BATCH_SIZE, lease_seconds=DEFAULT_LEASE_SECONDS,
+                max_attempts=MAX_ATTEMPTS):
+    """
+    Leases the next pending items - and the items whose lease ran out - to a worker.
+
+    Returns:
+        list: The claimed items in queue order; empty when none is available.
+    """
+    now = time.time()
+    with _transaction(queue_dir) as db:
+        # An item whose worker died on its last attempt is given up
+        db.execute("UPDATE items SET state = 'failed', error = COALESCE(error, 'lease expired') "
+                   "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?", (now, max_attempts))
+        items = [row[0] for row in db.execute(
+            "SELECT item FROM items WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?) "
+            "ORDER BY position LIMIT ?", (now, batch_size))]
+        db.executemany("UPDATE items SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                       "WHERE item = ?", ((worker_id, now + lease_seconds, item) for item in items))
+    return items
+
+def renew_lease(queue_dir, worker_id, items, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """Extends the worker's leases on items it still holds."""
+    with _transaction(queue_dir) as db:
+        db.executemany("UPDATE items SET lease_until = ? WHERE item = ? AND state = 'leased' AND worker = ?",
+                       ((time.time() + lease_seconds, item, worker_id) for item in items))
+
+def release_items(queue_dir, worker_id, items):
+    """Hands the worker's unprocessed items back to the queue without counting the attempt."""
+    with _transaction(queue_dir) as db:
+        db.executemany("UPDATE items SET state = 'pending', worker = NULL, lease_until = NULL, attempts = attempts - 1 "
+                       "WHERE item = ? AND state = 'leased' AND worker = ?", ((item, worker_id) for item in items))
+
+def complete_item(queue_dir, worker_id, item, result):
+    """
+    Stores an item's result (None for an item without one, e.g. no data).
+
+    Returns:
+        bool: False when the item was already finished, by a worker that took over the lease.
+    """
+    with _transaction(queue_dir) as db:
+        updated = db.execute(
+            "UPDATE items SET state = 'done', worker = ?, lease_until = NULL, result = ?, error = NULL, finished = ? "
+            "WHERE item = ? AND state != 'done'",
+            (worker_id, None if result is None else json.dumps(result, default=str),
+             datetime.now().isoformat(timespec='seconds'), item)).rowcount
+    return updated == 1
+
+def fail_item(queue_dir, worker_id, item, error, max_attempts=MAX_ATTEMPTS):
+    """Records a failed attempt: the item is retried, or failed for good after `max_attempts`."""
+    with _transaction(queue_dir) as db:
+        db.execute("UPDATE items SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                   "worker = NULL, lease_until = NULL, error = ? WHERE item = ? AND state = 'leased' AND worker = ?",
+                   (max_attempts, str(error), item, worker_id))
+
+def queue_counts(queue_dir):
+    """Items per state: {'pending', 'leased', 'done', 'failed'}."""
+    with _transaction(queue_dir) as db:
+        counts = dict(db.execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall())
+    return {state: counts.get(state, 0) for state in QUEUE_STATES}
+
+def failed_items(queue_dir):
+    """The failed items with their last error, in queue order."""
+    with _transaction(queue_dir) as db:
+        return db.execute("SELECT item, error FROM items WHERE state = 'failed' ORDER BY position").fetchall()
+
+def load_results(queue_dir):
+    """
+    Reads the stored results for the merge step.
+
+    Returns:
+        list: The result of every finished item that has one, in queue order.
+    """
+    with _transaction(queue_dir) as db:
+        rows = db.execute("SELECT result FROM items WHERE state = 'done' AND result IS NOT NULL ORDER BY position").fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+def run_worker(queue_dir, process_item, worker_id=None, batch_size=DEFAULT_BATCH_SIZE,
+               lease_seconds=DEFAULT_LEASE_SECONDS, poll_seconds=POLL_SECONDS, max_attempts=MAX_ATTEMPTS):
+    """
+    Claims and processes batches until the queue has no pending or leased items left.
+
+    Args:
+        queue_dir (str): Folder of the queue file.
+        process_item (callable): process_item(item, params) -> result (JSON-serializable
+                                 or None), with the params the coordinator stored.
+        worker_id (str, optional): Defaults to default_worker_id().
+        batch_size (int): Items claimed at a time.
+        lease_seconds (int): How long an item stays leased without a renewal;
+                             longer than any single item takes.
+        poll_seconds (int): Wait between claims while other workers hold the
+                            remaining items, in case one of their leases runs out.
+        max_attempts (int): Claims / errors before an item is failed for good.
+
+    Returns:
+        dict: 'batches', 'done' and 'failed' counts of this worker.
+    """
+    worker_id = worker_id or default_worker_id()
+    params = queue_info(queue_dir)['params']
+    stats = {'batches': 0, 'done': 0, 'failed': 0}
+    while True:
+        batch = claim_batch(queue_dir, worker_id, batch_size, lease_seconds, max_attempts)
+        if not batch:
+            counts = queue_counts(queue_dir)
+            if counts['pending'] + counts['leased'] == 0:
+                return stats
+            time.sleep(poll_seconds)
+            continue
+
+        stats['batches'] += 1
+        for position, item in enumerate(batch):
+            renew_lease(queue_dir, worker_id, batch[position:], lease_seconds)
+            try:
+                result = process_item(item, params)
+            except KeyboardInterrupt:
+                release_items(queue_dir, worker_id, batch[position:])
+                raise
+            except Exception as e:
+                print(f">>  {worker_id}: {item} failed: {e}")
+                fail_item(queue_dir, worker_id, item, f"{type(e).__name__}: {e}", max_attempts)
+                stats['failed'] += 1
+                continue
+            complete_item(queue_dir, worker_id, item, result)
+            stats['done'] += 1
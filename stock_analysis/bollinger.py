@@ -1,8 +1,18 @@
-import yfinance as yf
+import os
 import statistics
 import sys
 import math
 
+# Get the path to the 'utils' folder
+utils = os.path.join(os.path.dirname(__file__), '_UTILS')
+
+# Add the folder to the system path
+sys.path.append(utils)
+
+# Now you can import the script as a module
+import marketData
+import timeframeBars
+
 # ==============================================================================
 # 📈 STRATEGY PARAMETERS
 # ==============================================================================
@@ -58,17 +68,22 @@ def calculate_stdev(data, window):
 
 # ------------------------------------------------------------------------------
 
-def get_stock_data(ticker, period='max'):
-    """Fetches historical stock data from yfinance and returns a list of closing prices."""
+def get_stock_data(ticker, period='max', timeframe='1d'):
+    """
+    Fetches historical stock data from yfinance and returns a list of closing prices.
+    With timeframe '1wk' or '1mo' the closes are those of weekly or monthly bars
+    aggregated from the daily download.
+    """
     print(f"Fetching data for {ticker}...")
     
     try:
         # Fetch data using the specified period (default 'max')
-        data = yf.download(ticker, period=period, progress=False, auto_adjust=True)
+        data = marketData.download(ticker, period=period, progress=False, auto_adjust=True)
         if data.empty:
             print(f"Error: Could not find data for ticker symbol '{ticker}'.")
             sys.exit(1)
             
+        data = timeframeBars.get_timeframe_bars(ticker, data, timeframe)
         print(data)
         # FIX: Ensure 'Close' is extracted as a simple Python list of floats
         return data['Close'].values.tolist()
@@ -389,18 +404,32 @@ def analyze_boom_bust_cycle(closes, ticker):
 # 🚀 EXECUTION AND OUTPUT
 # ==============================================================================
 
-if __name__ == '__main__':
-    
-    TICKER = input("Enter the stock ticker symbol (e.g., TSLA, AAPL, SPY): ").upper()
+def analyze_ticker(ticker_symbol, timeframe='1d'):
+    """
+    Runs the boom-bust cycle analysis of one ticker over its whole history -
+    the interactive run without the prompts, so the job runner can call it for
+    many tickers in one process.
+
+    Args:
+        ticker_symbol (str): The ticker, upper case.
+        timeframe (str): '1d', '1wk' or '1mo'.
+
+    Returns:
+        dict: 'signal' (1 accumulate, -1 sell/exit, 0 hold) and 'close' of the
+              last bar, or None when the timeframe is unknown.
+    """
+    if timeframe not in timeframeBars.TIMEFRAMES:
+        print(f"Error: Unknown timeframe '{timeframe}'. Use one of: {', '.join(timeframeBars.TIMEFRAMES)}.")
+        return None
 
     # 1. Get data (using 'max' to ensure sufficient history for B_WIDTH_AVG)
-    stock_closes = get_stock_data(TICKER, period='max') 
+    stock_closes = get_stock_data(ticker_symbol, period='max', timeframe=timeframe) 
 
     # 2. Analyze data
-    analyzed_data = analyze_boom_bust_cycle(stock_closes, TICKER)
+    analyzed_data = analyze_boom_bust_cycle(stock_closes, ticker_symbol)
 
     # --- Output Summary ---
-    print(f"\n--- {TICKER} Boom-Bust Cycle Trading Signals (Last 10 Days) ---")
+    print(f"\n--- {ticker_symbol} Boom-Bust Cycle Trading Signals (Last 10 Days) ---")
 
     # Critical check: Ensure valid data exists
     #if not analyzed_data:
@@ -434,4 +463,13 @@ if __name__ == '__main__':
         print(f"Current Close: **${last_close:.2f}**. Consider locking in profits.")
     else:
         print(f"HOLD/WAIT: No high-conviction signal on the last day. Current Close: **${last_close:.2f}**.")
-        print("Price is likely consolidating within the Bollinger Bands.")
\ No newline at end of file
+        print("Price is likely consolidating within the Bollinger Bands.")
+
+    return {'signal': last_signal, 'close': last_close}
+
+if __name__ == '__main__':
+    
+    ticker_symbol = input("Enter the stock ticker symbol (e.g., TSLA, AAPL, SPY): ").upper()
+    timeframe = input("Enter the timeframe (1d, 1wk, 1mo, press Enter for 1d): ").strip() or '1d'
+
+    analyze_ticker(ticker_symbol, timeframe)
@@ -14,10 +14,13 @@ sys.path.append(get_path)
 sys.path.append(utils)
 
 # Now you can import the script as a module
-import extractTickers
-import newsEvents
-import generateScreenerReport
-import appendToDictionary
+# The news screener and the report (requests, pandas, momentum) load on first use
+from lazyImport import lazy_import
+
+extractTickers = lazy_import('extractTickers')
+newsEvents = lazy_import('newsEvents')
+generateScreenerReport = lazy_import('generateScreenerReport')
+appendToDictionary = lazy_import('appendToDictionary')
 
 def main():
     print(">>  BEGIN - PROCESSING - Stock News Screeners ...")
@@ -15,20 +15,36 @@ sys.path.append(get_path)
 sys.path.append(utils)
 
 # Now you can import the script as a module
-import lightningPlay
-import oversoldBouncePlay
-import shortSqueeze
-import buyAndHold
-import offMABouncePlay
-import breakOut
-import channelUp
-import volatility
-import earlyMomentum
-import generateScreenerReport
-import appendToDictionary
+# The screeners and the report (requests, pandas, momentum) load on first use
+from lazyImport import lazy_import
+import runMetrics
+
+lightningPlay = lazy_import('lightningPlay')
+oversoldBouncePlay = lazy_import('oversoldBouncePlay')
+shortSqueeze = lazy_import('shortSqueeze')
+buyAndHold = lazy_import('buyAndHold')
+offMABouncePlay = lazy_import('offMABouncePlay')
+breakOut = lazy_import('breakOut')
+channelUp = lazy_import('channelUp')
+volatility = lazy_import('volatility')
+earlyMomentum = lazy_import('earlyMomentum')
+generateScreenerReport = lazy_import('generateScreenerReport')
+appendToDictionary = lazy_import('appendToDictionary')
+
+def run_screener_download(screener_name, download_function, url, output_dir, output_filename):
+    """
+    Runs one screener download inside a metrics span and counts the bytes saved.
+    """
+    with runMetrics.span('screener_download', screener=screener_name):
+        download_function(url=url, output_dir=output_dir, output_filename=output_filename)
+
+    output_path = os.path.join(output_dir, output_filename)
+    if os.path.exists(output_path):
+        runMetrics.count('bytes_downloaded', os.path.getsize(output_path))
 
 def main():
     print(">> BEGIN - PROCESSING - Stock Screeners...")
+    runMetrics.enable_metrics_from_env("processScreeners")
 
     # Get today's date in YYYYMMDD format
     today_date_str = datetime.now().strftime('%Y%m%d')
@@ -44,7 +60,7 @@ def main():
     
     output_filename_LightningPlay = f"{today_date_str}_LightningPlay.csv"
     
-    lightningPlay.download_LightningPlay(url=url_LightningPlay, output_dir=screener_output_dir, output_filename=output_filename_LightningPlay)
+    run_screener_download("LightningPlay", lightningPlay.download_LightningPlay, url=url_LightningPlay, output_dir=screener_output_dir, output_filename=output_filename_LightningPlay)
     
     # Add a delay of 1 to 5 seconds to avoid rate limiting
     time.sleep(3) 
@@ -54,7 +70,7 @@ def main():
     url_OversoldBouncePlay = "https://elite.finviz.com/export.ashx?v=151&c=1,2,3,4,5,6,7,28,30,31,44,46,62,63&f=sh_price_o3%2Csh_relvol_1to3%2Cta_change_1to100%2Cta_rsi_os30&ft=4&o=-change&auth=5c4e80ff-b219-4a31-8fb8-10725a640658"
     output_filename_OversoldBouncePlay = f"{today_date_str}_OverSoldBouncePlay.csv"
     
-    oversoldBouncePlay.download_OverSoldBouncePlay(url=url_OversoldBouncePlay, output_dir=screener_output_dir, output_filename=output_filename_OversoldBouncePlay)
+    run_screener_download("OverSoldBouncePlay", oversoldBouncePlay.download_OverSoldBouncePlay, url=url_OversoldBouncePlay, output_dir=screener_output_dir, output_filename=output_filename_OversoldBouncePlay)
     
     # Add a delay of 1 to 5 seconds to avoid rate limiting
     time.sleep(3) 
@@ -64,7 +80,7 @@ def main():
     url_ShortSqueeze = "https://elite.finviz.com/export.ashx?v=151&c=1,2,3,4,5,6,7,28,30,31,44,46,62,63&f=an_recom_buybetter|holdbetter,sh_float_x40to100,sh_instown_10to100,sh_price_0.75to8.25,sh_short_o20,ta_change_u,ta_perf_1wup&ft=4&o=-price&auth=5c4e80ff-b219-4a31-8fb8-10725a640658"
     output_filename_ShortSqueeze = f"{today_date_str}_ShortSqueeze.csv"
     
-    shortSqueeze.download_ShortSqueeze(url=url_ShortSqueeze, output_dir=screener_output_dir, output_filename=output_filename_ShortSqueeze)
+    run_screener_download("ShortSqueeze", shortSqueeze.download_ShortSqueeze, url=url_ShortSqueeze, output_dir=screener_output_dir, output_filename=output_filename_ShortSqueeze)
     
     # Add a delay of 1 to 5 seconds to avoid rate limiting
     time.sleep(3) 
@@ -74,7 +90,7 @@ def main():
     url_BuyAndHold = "https://elite.finviz.com/export.ashx?v=151&c=1,2,3,4,5,6,7,28,30,31,44,46,62,63&f=cap_microover,fa_curratio_o1.5,fa_eps5years_o10,fa_roe_o15,ta_beta_o1.5,ta_change_u,ta_sma20_pa&ft=4&o=-change&auth=5c4e80ff-b219-4a31-8fb8-10725a640658"
     output_filename_BuyAndHold = f"{today_date_str}_BuyAndHold.csv"
     
-    buyAndHold.download_BuyAndHold(url=url_BuyAndHold, output_dir=screener_output_dir, output_filename=output_filename_BuyAndHold)    
+    run_screener_download("BuyAndHold", buyAndHold.download_BuyAndHold, url=url_BuyAndHold, output_dir=screener_output_dir, output_filename=output_filename_BuyAndHold)    
     
     # Add a delay of 1 to 5 seconds to avoid rate limiting
     time.sleep(3) 
@@ -94,7 +110,7 @@ def main():
     url_BreakOut = "https://elite.finviz.com/export.ashx?v=151&c=1,2,3,4,5,6,7,28,30,31,44,46,62,63&f=sh_avgvol_o400%2Csh_curvol_o2000%2Csh_relvol_o1%2Cta_change_u2%2Cta_sma20_pa%2Cta_sma50_pb&ft=4&o=-change&auth=5c4e80ff-b219-4a31-8fb8-10725a640658"    
     output_filename_BreakOut = f"{today_date_str}_BreakOut.csv"
     
-    breakOut.download_BreakOut(url=url_BreakOut, output_dir=screener_output_dir, output_filename=output_filename_BreakOut)
+    run_screener_download("BreakOut", breakOut.download_BreakOut, url=url_BreakOut, output_dir=screener_output_dir, output_filename=output_filename_BreakOut)
     
     # Add a delay of 1 to 5 seconds to avoid rate limiting
     time.sleep(3) 
@@ -104,7 +120,7 @@ def main():
     url_ChannelUp = "https://elite.finviz.com/export.ashx?v=151&c=1,2,3,4,5,6,7,28,30,31,44,46,62,63&f=sh_price_u40,sh_relvol_o1,ta_change_u1,ta_pattern_channelup,ta_perf_4wup,ta_perf2_1wup,ta_sma20_pa,ta_sma50_pa,ta_volatility_wo6&ft=4&o=-change&auth=5c4e80ff-b219-4a31-8fb8-10725a640658"
     output_filename_ChannelUp = f"{today_date_str}_ChannelUp.csv"
     
-    channelUp.download_ChannelUp(url=url_ChannelUp, output_dir=screener_output_dir, output_filename=output_filename_ChannelUp)
+    run_screener_download("ChannelUp", channelUp.download_ChannelUp, url=url_ChannelUp, output_dir=screener_output_dir, output_filename=output_filename_ChannelUp)
 
     # Add a delay of 1 to 5 seconds to avoid rate limiting
     time.sleep(3) 
@@ -114,7 +130,7 @@ def main():
     url_Volatility = "https://elite.finviz.com/export.ashx?v=151&c=1,2,3,4,5,6,7,28,30,31,44,46,62,63&f=sh_opt_optionshort,sh_price_u10,ta_change_1to5,ta_volatility_8to20x5to8&ft=4&o=-change&auth=5c4e80ff-b219-4a31-8fb8-10725a640658"
     output_filename_Volatility = f"{today_date_str}_Volatility.csv"
     
-    volatility.download_Volatility(url=url_Volatility, output_dir=screener_output_dir, output_filename=output_filename_Volatility)
+    run_screener_download("Volatility", volatility.download_Volatility, url=url_Volatility, output_dir=screener_output_dir, output_filename=output_filename_Volatility)
     
     # Add a delay of 1 to 5 seconds to avoid rate limiting
     time.sleep(3) 
@@ -124,7 +140,7 @@ def main():
     url_EarlyMomentum = "https://elite.finviz.com/export.ashx?v=151&c=1,2,3,4,5,6,7,28,30,31,44,46,62,63&f=sec_technology|healthcare|industrials,sh_avgvol_o500,sh_curvol_o200,sh_relvol_o0.25,ta_change_u,ta_rsi_49to70,ta_sma20_pa,ta_sma50_pa,ta_volatility_wo15,tad_0_close::close:w|abveq:::|sma:50:sma:d&ft=4&o=-change&auth=5c4e80ff-b219-4a31-8fb8-10725a640658"
     output_filename_EarlyMomentum = f"{today_date_str}_EarlyMomentum.csv"
     
-    volatility.download_Volatility(url=url_EarlyMomentum, output_dir=screener_output_dir, output_filename=output_filename_EarlyMomentum)
+    run_screener_download("EarlyMomentum", volatility.download_Volatility, url=url_EarlyMomentum, output_dir=screener_output_dir, output_filename=output_filename_EarlyMomentum)
     
     # Add a delay of 1 to 5 seconds to avoid rate limiting
     time.sleep(3) 
@@ -148,13 +164,15 @@ def main():
     for section_title, file_path in all_screeners_data.items():
         tickers = []
         try:
-            with open(file_path, 'r', newline='') as csvfile:
-                reader = csv.reader(csvfile)
-                # Skip the header row
-                next(reader, None)
-                for row in reader:
-                    if row:
-                        tickers.append(row[0].strip())
+            with runMetrics.span('screener_parse', screener=section_title):
+                with open(file_path, 'r', newline='') as csvfile:
+                    reader = csv.reader(csvfile)
+                    # Skip the header row
+                    next(reader, None)
+                    for row in reader:
+                        if row:
+                            tickers.append(row[0].strip())
+            runMetrics.count('rows_processed', len(tickers))
         except FileNotFoundError:
             print(f"Error: The file '{file_path}' was not found.")
         except Exception as e:
@@ -165,12 +183,16 @@ def main():
     # #############################################################
     # 7 - Generate a single consolidated report
     reporttype = "Stock_Indicator"
-    generateScreenerReport.process_consolidated_report(reporttype, all_tickers)
+    with runMetrics.span('report'):
+        generateScreenerReport.process_consolidated_report(reporttype, all_tickers)
     
-    appendToDictionary.push_tickers_todictionary(reporttype, all_tickers, "stock_screener.dict")
+    with runMetrics.span('dictionary'):
+        appendToDictionary.push_tickers_todictionary(reporttype, all_tickers, "stock_screener.dict")
     
     print(">> ")
     print(">> END - PROCESSING - Stock Screeners...")
 
+    runMetrics.finish_metrics()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file